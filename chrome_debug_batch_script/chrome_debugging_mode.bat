@@ -4,7 +4,7 @@
 
 cd c:\program files\google\chrome\application
 
-start chrome.exe --remote-debugging-port=9222 --user-data-dir="C:\Users\Public"
+start chrome.exe --remote-debugging-port=9222 --user-data-dir="C:\Users\Public" --disable-background-timer-throttling --disable-renderer-backgrounding --disable-backgrounding-occluded-windows --disable-features=CalculateNativeWinOcclusion,IntensiveWakeUpThrottling
 
 goto: EOF
 
@@ -0,0 +1,282 @@
+"""
+=====================
+Chrome Fleet Launcher
+=====================
+
+A launcher for running several PIM Data Cleanup workers on one Linux machine.  It starts N Chrome (or Chromium)
+instances in debugging mode, each with its own user data directory and debugging port, keeps an eye on them, and
+restarts any instance which crashes.
+
+* FOR ADDITIONAL DETAILS, PLEASE CONSULT THE README.
+
+====================
+Implementation Notes
+====================
+
+Profiles and Ports:
+
+        Chrome only allows one instance per user data directory, so every worker gets its own profile directory under
+        profile_root (worker_0, worker_1, ...) and its own debugging port (base_port, base_port + 1, ...).  The profile
+        directories are kept between runs, so each worker only has to log in to the PIM system once.
+
+Handing Off to the Cleanup Program:
+
+        Once every instance is up, the launcher writes a fleet file (JSON) listing each worker's debugger address and
+        profile directory, and prints the command to start a cleanup worker against each instance.  The cleanup
+        program reads its debugger address from the PIM_DEBUGGER_ADDRESS environment variable.  PIM_FLEET_MANAGED
+        tells the cleanup program that the launcher is responsible for restarting Chrome, so its session supervisor
+        waits for the instance to come back instead of launching a second copy.
+
+Health Checks:
+
+        An instance is considered healthy if its process is still running and the DevTools HTTP endpoint
+        (/json/version) answers.  The launcher checks every instance every health_check_interval_seconds and
+        restarts any which fail, up to max_restarts times per worker.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import argparse
+import subprocess
+import urllib.request
+
+# Chrome and Chromium binaries to look for, in order of preference
+chrome_binary_names = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+
+# Fleet settings
+base_port = 9222
+profile_root = os.path.expanduser("~/.pim_automation/chrome_profiles")
+fleet_file_path = os.path.expanduser("~/.pim_automation/chrome_fleet.json")
+pim_url = "PLACEHOLDER"
+
+# Keep Chrome from throttling timers and rendering in background, minimized, or covered windows
+anti_throttling_flags = ["--disable-background-timer-throttling",
+                         "--disable-renderer-backgrounding",
+                         "--disable-backgrounding-occluded-windows",
+                         "--disable-features=CalculateNativeWinOcclusion,IntensiveWakeUpThrottling"]
+
+# Health check settings
+startup_timeout_seconds = 30  # Time to wait for a new instance to open its debugging port
+health_check_interval_seconds = 10
+health_check_timeout_seconds = 5
+max_restarts = 10  # Number of times a worker's instance can be restarted before the launcher gives up on it
+
+
+def find_chrome_binary():
+
+    for binary_name in chrome_binary_names:
+        binary_path = shutil.which(binary_name)
+        if binary_path:
+            return binary_path
+
+    return None
+
+
+def build_chrome_command(chrome_binary, worker, headless):
+
+    chrome_command = [chrome_binary,
+                      "--remote-debugging-port=" + str(worker["port"]),
+                      "--user-data-dir=" + worker["profile_dir"],
+                      "--no-first-run",
+                      "--no-default-browser-check"] + anti_throttling_flags
+
+    if headless:
+        chrome_command.append("--headless=new")
+
+    chrome_command.append(pim_url)
+
+    return chrome_command
+
+
+def launch_worker_instance(chrome_binary, worker, headless, stop_requested=lambda: False):
+
+    os.makedirs(worker["profile_dir"], exist_ok=True)
+
+    try:
+        # Each instance gets its own process group so stopping the fleet also stops Chrome's child processes
+        worker["process"] = subprocess.Popen(build_chrome_command(chrome_binary, worker, headless),
+                                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                             start_new_session=True)
+    except Exception as e:
+        print("Error:: Unable to launch Chrome for worker " + str(worker["worker"]) + ": " + str(e))
+        worker["process"] = None
+        return False
+
+    # Setting loop variable to handle wait
+    startup_deciseconds = 0
+
+    # Wait for the instance to open its debugging port, but stop right away if asked to
+    while startup_deciseconds < startup_timeout_seconds * 10:
+        if stop_requested():
+            return False
+        if is_worker_healthy(worker):
+            return True
+        time.sleep(.1)
+        startup_deciseconds += 1
+
+    print("Error:: Chrome for worker " + str(worker["worker"]) + " did not open port " + str(worker["port"]))
+    return False
+
+
+def is_worker_healthy(worker):
+
+    if worker["process"] is None or worker["process"].poll() is not None:
+        return False
+
+    try:
+        with urllib.request.urlopen("http://" + worker["debugger_address"] + "/json/version",
+                                    timeout=health_check_timeout_seconds) as response:
+            return response.status == 200
+    except Exception as e:
+        return False
+
+
+def stop_worker_instance(worker):
+
+    if worker["process"] is None or worker["process"].poll() is not None:
+        return
+
+    try:
+        os.killpg(worker["process"].pid, signal.SIGTERM)
+        worker["process"].wait(timeout=10)
+    except Exception as e:
+        try:
+            os.killpg(worker["process"].pid, signal.SIGKILL)
+        except Exception as e:
+            pass
+
+
+def restart_worker_instance(chrome_binary, worker, headless, stop_requested=lambda: False):
+
+    worker["restarts"] += 1
+
+    print("Restarting Chrome for worker " + str(worker["worker"]) + " (restart " + str(worker["restarts"]) + " of " +
+          str(max_restarts) + ")")
+
+    stop_worker_instance(worker)
+
+    return launch_worker_instance(chrome_binary, worker, headless, stop_requested)
+
+
+def save_fleet_file(workers):
+
+    fleet_data = [{"worker": worker["worker"],
+                   "debugger_address": worker["debugger_address"],
+                   "profile_dir": worker["profile_dir"]} for worker in workers]
+
+    os.makedirs(os.path.dirname(fleet_file_path), exist_ok=True)
+
+    with open(fleet_file_path, "w") as fleet_file:
+        json.dump(fleet_data, fleet_file, indent=2)
+
+
+def print_worker_commands(workers):
+
+    cleanup_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pim_data_cleanup",
+                                  "pim_data_cleanup.py")
+
+    print("\nStart one cleanup worker per instance:\n")
+
+    for worker in workers:
+        print("PIM_DEBUGGER_ADDRESS=" + worker["debugger_address"] + " PIM_FLEET_MANAGED=1 python " +
+              os.path.normpath(cleanup_script))
+
+    print("\nFleet file: " + fleet_file_path + "\n")
+
+
+def monitor_fleet(chrome_binary, workers, headless, stop_requested):
+
+    while not stop_requested():
+
+        for worker in workers:
+
+            if worker["restarts"] > max_restarts or is_worker_healthy(worker):
+                continue
+
+            if worker["restarts"] == max_restarts:
+                print("Error:: Chrome for worker " + str(worker["worker"]) + " failed too many times.  Giving up on it.")
+                worker["restarts"] += 1
+                stop_worker_instance(worker)
+                continue
+
+            restart_worker_instance(chrome_binary, worker, headless, stop_requested)
+
+        # Setting loop variable to handle wait
+        health_check_deciseconds = 0
+
+        # Wait for the next health check, but stop right away if asked to
+        while health_check_deciseconds < health_check_interval_seconds * 10 and not stop_requested():
+            time.sleep(.1)
+            health_check_deciseconds += 1
+
+
+def main():
+    """
+    The Main Method
+    """
+
+    parser = argparse.ArgumentParser(description="Start a fleet of Chrome instances in debugging mode for the PIM "
+                                                 "Data Cleanup program.")
+    parser.add_argument("workers", type=int, help="number of Chrome instances to start")
+    parser.add_argument("--headless", action="store_true", help="run Chrome without a window")
+    parser.add_argument("--chrome", help="path to the Chrome or Chromium binary")
+    args = parser.parse_args()
+
+    chrome_binary = args.chrome or find_chrome_binary()
+
+    if chrome_binary is None:
+        print("Error:: Chrome or Chromium not found.  Use --chrome to give the path to the binary.")
+        sys.exit(1)
+
+    workers = []
+
+    for worker_index in range(args.workers):
+        workers.append({"worker": worker_index,
+                        "port": base_port + worker_index,
+                        "debugger_address": "127.0.0.1:" + str(base_port + worker_index),
+                        "profile_dir": os.path.join(profile_root, "worker_" + str(worker_index)),
+                        "process": None,
+                        "restarts": 0})
+
+    # Stop the whole fleet on Ctrl+C or a kill signal
+    stop_signals = []
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_signals.append(signum))
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_signals.append(signum))
+    stop_requested = lambda: len(stop_signals) > 0
+
+    fleet_started = True
+
+    try:
+        for worker in workers:
+            if not launch_worker_instance(chrome_binary, worker, args.headless, stop_requested):
+                if not stop_requested():
+                    print("Error:: Unable to start the fleet.")
+                fleet_started = False
+                break
+
+            print("Worker " + str(worker["worker"]) + " ready at " + worker["debugger_address"])
+
+        if fleet_started:
+            save_fleet_file(workers)
+            print_worker_commands(workers)
+
+            print("Monitoring the fleet.  Hit Ctrl+C to stop every instance.\n")
+
+            monitor_fleet(chrome_binary, workers, args.headless, stop_requested)
+
+    finally:
+        print("\nStopping the fleet...")
+        for worker in workers:
+            stop_worker_instance(worker)
+
+    # Exit with an error once the instances which did start are stopped, so a supervisor knows the fleet failed
+    if not fleet_started and not stop_requested():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+PIM Data Cleanup
+---
+Importing the package has no side effects (no banner, prompts, or directories), so the cleanup can be driven from other
+Python code through CleanupEngine.  Run the interactive program with:
+
+    python -m pim_data_cleanup
+"""
+from .pim_data_cleanup import CleanupEngine, attribute_rules, main
@@ -0,0 +1,8 @@
+import sys
+
+from .pim_data_cleanup import main
+
+main()
+
+# If program flow does not get caught by exceptions to trigger save_and_quit method, program exits here
+sys.exit()
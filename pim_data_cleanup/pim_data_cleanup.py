@@ -47,6 +47,11 @@ Start Availability Date Time:
         provides the ability to access the actual value of the Start Availability Date Time attribute to truly and
         accurately remove validation errors with the smallest amount of impact on processing time as possible.
 
+        When intercept_grid_data is on, the program reads the values from the backend response the main grid is
+        rendered from instead (see capture_grid_data).  The response holds the true value, so the edit attribute dialog
+        is only opened to correct the value.  If the response can't be read, the program falls back to the main grid
+        and the edit attribute dialog as described above.
+
 Custom Waits:
 
         The built-in selenium waits were not working as expected when attempting to wait until particular DOM elements
@@ -58,13 +63,13 @@ Custom Waits:
 
 Multi-Thread Program Flow Handling:
 
-        The program uses the python keyboard module to assign a hotkey to stop the program and save the various files
-        needed to ensure we have an accurate record of the program's activity.  This, however, means that the program
-        utilizes multiple threads when a hotkey event is detected.  In order to manage the program flow between the
-        threads, this program includes a threading.Event named freeze_event.  When the hotkey is detected, the secondary
-        thread runs and finishes by setting the freeze_event.  The main thread is coded to alter several of its
-        operations when freeze_event.is_set() including the main program loop as well as several blocks within the
-        main loop.
+        The program can be stopped with Ctrl+C, a SIGTERM from a supervisor, or the python keyboard module hotkey
+        (Alt+C, where the keyboard module is available).  All three only request a shutdown by setting a
+        threading.Event named shutdown_event (see Shutdown Controller).  The main program loops stop picking up new
+        products once it is set, so the product in progress finishes and its dialog gets closed before the activity
+        files are saved.  save_and_quit finishes by setting another threading.Event named freeze_event, and the main
+        thread is coded to alter several of its operations when freeze_event.is_set() including the main program loop
+        as well as several blocks within the main loop.
 
 lui_MainGrid:
 
@@ -85,6 +90,32 @@ lui_MainGrid:
         Based selenium-waits for many activities in this program on this cycle since it was the most reliable method
         identified during development.
 
+Targeting Modes:
+
+        The full view walk cycles through every product in the 'Validation Automation' view, which means visiting the
+        whole catalog (1,000,000+ products) even though only a fraction of them have validation errors.  The
+        validation error filter passes use the PIM system's own search panel to restrict the main grid to the products
+        failing validation for one attribute at a time (see validation_filters).  Fixed products drop out of the
+        search results, so each filtered pass re-runs the search once it reaches the end of the results.  It starts
+        over from the first page whenever the number of results changed, and only skips ahead past the products which
+        are still in the results when the count is the same.
+
+Traversal:
+
+        Saving a correction reloads the main grid.  If a product's sort key or view membership changes, the rows
+        shift, so counting rows could skip a product or review one twice.  Instead, the main program loops read a
+        snapshot of the product numbers on the page after every reload (see read_page_snapshot) and review the first
+        product which is not in the seen set yet (see SeenProductNumbers).  The end of the records is reached when the
+        last page, according to the latest paging info, has no unseen products left.
+
+Session Supervisor:
+
+        Chrome crashes, renderer hangs, and dropped debugger connections used to end a run, and the progress of the
+        traversal with it.  The main program loops now check that WebDriver is still responding, once a minute and
+        after every hiccup (see supervise_browser_session).  If it isn't, the supervisor re-attaches to the debugger
+        address, or relaunches Chrome in debugging mode and restores the view preference and the last known page.  The
+        seen set and other cursor state stay in memory, so the loop carries on where it left off.
+
 iframes:
 
         The program switches to the main grid iframe of the webpage before switching to the edit dialog iframe because
@@ -92,6 +123,21 @@ iframes:
 """
 import os
 import threading
+import collections
+import subprocess
+import hashlib
+import json
+import functools
+import argparse
+import signal
+import queue
+import array
+import sqlite3
+import mmap
+import csv
+import multiprocessing
+import random
+import math
 
 from selenium import webdriver
 from selenium.webdriver import ActionChains
@@ -99,6 +145,7 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.support.select import Select
 from selenium.webdriver.common.keys import Keys
 import sys
 import time
@@ -107,23 +154,49 @@ import datetime
 import ctypes
 from ctypes import wintypes
 import numpy
-import keyboard
-
-print("/////////////////////////////////////////////////////////////////////\n"
-      "/                       PIM - Data Cleanup 1.0                      /\n"
-      "/////////////////////////////////////////////////////////////////////\n"
-      "\n"
-      "This program automatically cycles through product records correcting the \n"
-      "data in the following attributes:\n\n"
-      "  * Manufacturer Number\n"
-      "  * Start Availability Start Date\n"
-      "  * Master GTIN\n"
-      "  * Company Net Content\n"
-      "  * Net Content\n\n"
-      "=====================================================================\n"
-      "\n")
-
-input("Press ENTER to continue\n")
+
+# The keyboard module is only needed for the shutdown hotkey (it needs a desktop session, or root on Linux), so
+# the program still runs without it
+try:
+    import keyboard
+except ImportError:
+    keyboard = None
+
+# pyarrow is only needed for the columnar export of the activity files (see Columnar Export)
+try:
+    import pyarrow
+    import pyarrow.csv
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+"""
+Banner and Output Directories
+---
+Nothing is printed, prompted, or created when the module is imported.  main() (or CleanupEngine) calls print_banner and
+init_directories when a run starts, so the module can be imported by worker processes, benchmarks, and other tools.
+"""
+
+
+def print_banner():
+
+    print("/////////////////////////////////////////////////////////////////////\n"
+          "/                       PIM - Data Cleanup 1.0                      /\n"
+          "/////////////////////////////////////////////////////////////////////\n"
+          "\n"
+          "This program automatically cycles through product records correcting the \n"
+          "data in the following attributes:\n\n"
+          "  * Manufacturer Number\n"
+          "  * Start Availability Start Date\n"
+          "  * Master GTIN\n"
+          "  * Company Net Content\n"
+          "  * Net Content\n\n"
+          "=====================================================================\n"
+          "\n")
+
+    input("Press ENTER to continue\n")
+
 
 '''
 Managing files and file directories 
@@ -132,39 +205,259 @@ reviewed_path = "Reviewed Record Files"
 corrected_path = "Corrected Record Files"
 summary_path = "Activity Summary Files"
 log_path = "Log Files"
-
-# Check to see if each directory already exists
-reviewed_exists = os.path.exists(reviewed_path)
-corrected_exists = os.path.exists(corrected_path)
-summary_exists = os.path.exists(summary_path)
-log_exists = os.path.exists(log_path)
-
-# If a directory doesn't exist yet, create the directory
-if not reviewed_exists:
-    os.makedirs(reviewed_path)
-if not corrected_exists:
-    os.makedirs(corrected_path)
-if not summary_exists:
-    os.makedirs(summary_path)
-if not log_exists:
-    os.makedirs(log_path)
-
-# Global arrays to keep record of products reviewed and products updated
-reviewed = ["Company Product Number", "Manufacturer Number", "Start Availability Date Time", "Master GTIN",
-            "Net Content", "Company Net Content"]
-fixed = ["Company Product Number", "Original Manufacturer Number", "Corrected Manufacturer",
-         "Original Start Availability Date Time", "Corrected Start Availability Date Time", "Original Master GTIN",
-         "Corrected Master GTIN", "Original Net Content", "Corrected Net Content", "Original Company Net Content",
-         "Corrected Company Net Content"]
-
-# Global counters
-items_reviewed_counter = 0
-items_fixed_counter = 0
-errors_fixed_counter = 0
+trace_path = "Trace Files"
+
+
+def init_directories():
+
+    # Check to see if each directory already exists
+    reviewed_exists = os.path.exists(reviewed_path)
+    corrected_exists = os.path.exists(corrected_path)
+    summary_exists = os.path.exists(summary_path)
+    log_exists = os.path.exists(log_path)
+    trace_exists = os.path.exists(trace_path)
+
+    # If a directory doesn't exist yet, create the directory
+    if not reviewed_exists:
+        os.makedirs(reviewed_path)
+    if not corrected_exists:
+        os.makedirs(corrected_path)
+    if not summary_exists:
+        os.makedirs(summary_path)
+    if not log_exists:
+        os.makedirs(log_path)
+    if not trace_exists:
+        os.makedirs(trace_path)
+
+
+# Chrome debugging mode settings (same as chrome_debug_batch_script/chrome_debugging_mode.bat), used to attach
+# WebDriver and to relaunch Chrome if the browser goes down during a run.  When the program runs as one of the workers
+# started by chrome_fleet_launcher, the launcher passes the debugger address and restarts Chrome itself.
+debugger_address = os.environ.get("PIM_DEBUGGER_ADDRESS", "127.0.0.1:9222")
+browser_managed_by_fleet = os.environ.get("PIM_FLEET_MANAGED") == "1"
+chrome_path = "C:/Program Files/Google/Chrome/Application/chrome.exe"
+chrome_user_data_dir = "C:/Users/Public"
+pim_url = "PLACEHOLDER"
+
+# Chrome throttles timers and rendering in minimized or covered windows, which stretches every grid reload and dialog
+# animation when the program runs in the background.  These flags turn that off for any Chrome the program launches.
+anti_throttling_flags = ["--disable-background-timer-throttling",
+                         "--disable-renderer-backgrounding",
+                         "--disable-backgrounding-occluded-windows",
+                         "--disable-features=CalculateNativeWinOcclusion,IntensiveWakeUpThrottling"]
+
+# Resources the PIM page pulls in on every grid reload and dialog open which the program doesn't need (fonts, images,
+# analytics beacons, etc.).  When block_nonessential_resources is on, requests matching blocked_url_patterns are blocked
+# through the Chrome DevTools Protocol unless they also match allowed_url_patterns.  Patterns use URL Pattern syntax.
+block_nonessential_resources = True
+blocked_url_patterns = ["*://*/*.woff", "*://*/*.woff2", "*://*/*.ttf", "*://*/*.otf",
+                        "*://*/*.png", "*://*/*.jpg", "*://*/*.jpeg", "*://*/*.gif", "*://*/*.svg", "*://*/*.ico",
+                        "*://*.google-analytics.com/*", "*://*.googletagmanager.com/*", "*://*.doubleclick.net/*"]
+allowed_url_patterns = []  # e.g. "*://PLACEHOLDER/*/grid_icons/*" if the grid needs some of the blocked resources
+
+# The main grid is filled in from the JSON responses of a backend data request.  When intercept_grid_data is on, the
+# program reads those responses from Chrome's performance log instead of scraping each cell.  grid_data_url_pattern is
+# part of the URL of the grid data request and grid_data_fields maps each attribute to its field in a payload row
+# (a field name, or a column index if the rows come back as lists of cells).
+intercept_grid_data = True
+grid_data_url_pattern = "PLACEHOLDER"
+grid_data_fields = {"Company Product Number": "PLACEHOLDER",
+                    "Manufacturer Number": "PLACEHOLDER",
+                    "Start Availability Date Time": "PLACEHOLDER",
+                    "Master GTIN": "PLACEHOLDER",
+                    "Net Content": "PLACEHOLDER",
+                    "Company Net Content": "PLACEHOLDER"}
+
+# When record_reload_trace is on, every main grid reload (page loads and the reloads after saving a correction) is
+# written to a trace file in trace_path along with the browser's performance metrics and network timing for the reload.
+# The time spent on each product and the attributes corrected on it go to a product trace file next to it (the capacity
+# planner reads both).
+record_reload_trace = True
+
+# Session supervisor settings
+heartbeat_timeout_seconds = 30  # WebDriver is considered unresponsive if a trivial command takes longer than this
+heartbeat_interval_seconds = 60  # Time between heartbeats while the run is going smoothly (a hiccup forces one)
+max_session_restores = 5  # Number of times the session can be restored before the program gives up
+health_check_wait_seconds = 45  # Time to wait for the fleet launcher to restart a crashed instance
+
+# Tab recycling settings.  The PIM page leaks memory over thousands of grid reloads and dialog opens, so the program
+# swaps in a fresh tab once the page crosses any of these limits.  The limits are checked every
+# tab_check_interval iterations of the main program loop.
+tab_check_interval = 25
+tab_recycle_heap_mb = 1024  # JS heap used by the page
+tab_recycle_dom_nodes = 500000  # DOM nodes held by the page (including detached nodes which haven't been collected)
+tab_recycle_grid_reloads = 3000  # Main grid reloads since the tab was opened
+
+# PIM state the program depends on.  Unattended runs (see run_unattended) and CleanupEngine verify these from the DOM
+# before starting and fix them where they can (see verify_prerequisites) instead of asking the user to confirm them.
+required_repo_name = "Staging Product"
+required_view_preference = "Validation Automation"
+required_records_per_page = "50"
+
+# Records on a full page of the main grid.  Detected from the page size selector and the paging text (see
+# update_records_per_page) and used for all of the page math.  Larger pages mean fewer page turns, and every page turn
+# costs a navigation plus a full grid reload.  When use_largest_page_size is on, the largest page size the PIM system
+# offers is selected instead of required_records_per_page (see benchmark_page_sizes for the tradeoff).
+records_per_page = 50
+use_largest_page_size = False
+
+# Page of search results the program is working on, used to restore the grid after a page reload or browser relaunch
+last_known_page = 1
+
+# Number of times the session supervisor has restored the browser session during the run
+session_restores = 0
+
+# When the session supervisor last sent a heartbeat, and whether a hiccup asked for one at the next check
+last_heartbeat_time = 0.0
+heartbeat_due = True
+
+# Number of session supervisor checks since the tab's memory was last checked, and the number of main grid reloads
+# when the current tab was opened
+iterations_since_tab_check = 0
+grid_reloads_at_tab_open = 0
+
+# Global hiccup counter shared by every pass of the main program loop
+number_of_hiccups = 0
+
+# Sliding window hiccup budget.  The program stops if it encounters hiccup_limit hiccups within hiccup_window_seconds,
+# which would likely only happen if there were a significant issue like a prolonged loss of internet connectivity.
+hiccup_limit = 10
+hiccup_window_seconds = 600  # 10 minutes
+recent_hiccup_times = collections.deque()
+
+# Number of times each browser recovery path was used and the total seconds spent on it: {action: [count, seconds]}
+recovery_stats = {}
+
+# Attribute values for each row on the current page from the latest grid data response: {row id: {attribute: value}}
+grid_data_records = {}
+
+# Number of products read from the grid data response and from the rendered cells: {"grid_data"/"cells": count}
+grid_data_stats = {"grid_data": 0, "cells": 0}
+
+# Network events read from Chrome's performance log which haven't been used yet, one list for the grid data capture
+# and one for the reload trace
+grid_network_events = []
+trace_network_events = []
+
+# Reload trace file and the cumulative performance metrics at the end of the previous reload
+reload_trace_file = None
+product_trace_file = None
+previous_page_metrics = {}
+
+# Number of main grid reloads and the total seconds spent waiting on them: [count, seconds]
+grid_reload_stats = [0, 0.0]
+
+# Maximum number of results kept by the correction cache for each validator / calculator (see attribute_rules)
+correction_cache_size = 100000
+
+# Number of products reviewed and the total seconds spent on them by page visibility, to compare throughput with the
+# window in the foreground and in the background: {"visible"/"hidden": [count, seconds]}
+throughput_stats = {}
+
+# Poison row quarantine.  A product which fails quarantine_threshold times in a row is moved to the deferred retry
+# queue so one malformed product can't burn through the hiccup budget.  The queue is retried at the end of the run and
+# whatever is still in it gets saved to a file which can be used as a work list in a later run.
+quarantine_threshold = 3
+product_failure_counts = {}
+quarantined_products = []
 
 # Threading event to handle the save_and_quit function
 freeze_event = threading.Event()
 
+# Threading event set when a shutdown is requested (see Shutdown Controller), and the number of seconds the program gets
+# to finish the product in progress and save its files before it is forced to save and exit
+shutdown_event = threading.Event()
+shutdown_grace_seconds = 120
+
+# Reasons given for each shutdown request, and the threading event set by a second request to stop without waiting
+shutdown_reasons = []
+force_shutdown_event = threading.Event()
+
+# Page of the view the full view walk starts on (set by a checkpoint to resume a stopped run)
+start_page = 1
+
+# Work list product numbers which were not reviewed when the work list stopped early, kept for the checkpoint
+work_list_remaining = []
+
+# Attributes reviewed by the program, named exactly as they appear in the edit attribute dialog titles
+target_attribute_names = ["Manufacturer Number", "Start Availability Date Time", "Master GTIN", "Company Net Content",
+                          "Net Content"]
+
+# Number of Company product numbers looked up per search when running a work list, or 0 to match the records per page
+# the grid is showing (see get_work_list_batch_size) so each batch of search results loads in a single page
+work_list_batch_size = 0
+
+# Search criteria used by the validation error filter passes.  Each attribute maps to a list of
+# (attribute, operator, value) criteria entered into the PIM search panel.  The criteria for an attribute are combined
+# with "Match Any" so the grid only shows products failing validation for that attribute.
+validation_filters = {
+    "Manufacturer Number": [("Manufacturer Number", "Is Empty", ""),
+                            ("Manufacturer Number", "Length Less Than", "6")],
+    "Start Availability Date Time": [("Start Availability Date Time", "Is Before", "01/01/1982 00:00:00")],
+    "Master GTIN": [("Master GTIN", "Length Less Than", "14"),
+                    ("Master GTIN", "Length Greater Than", "14")],
+    "Company Net Content": [("Company Net Content", "Is Empty", ""),
+                            ("Company Net Content", "Length Greater Than", "9"),
+                            ("Company Net Content", "Matches", "*.???*")],
+    "Net Content": [("Net Content", "Is Empty", ""),
+                    ("Net Content", "Equals", "-1")]
+}
+
+
+class SeenProductNumbers:
+    """
+    Memory-compact set of the Company product numbers the program has already reviewed.
+
+    Each product number is stored as one 64-bit key in a sorted numpy array (8 bytes per product), so the 1,000,000+
+    products in a full view walk take about 8 MB instead of the ~75 MB a set of strings would use.  Product numbers
+    made of digits are stored as their integer value; anything else is stored as a 64-bit hash with the top bit set so
+    the two kinds of keys never overlap.  New keys go into a small buffer which gets merged into the sorted array once
+    it fills up.
+    """
+
+    def __init__(self):
+        self.sorted_keys = numpy.empty(0, dtype=numpy.uint64)
+        self.buffered_keys = set()
+
+    @staticmethod
+    def product_key(product_number):
+
+        if product_number.isdigit() and len(product_number) <= 18 and (product_number[0] != "0" or product_number == "0"):
+            return int(product_number)
+
+        hashed_number = hashlib.blake2b(product_number.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(hashed_number, 'big') | (1 << 63)
+
+    def add(self, product_number):
+
+        key = self.product_key(product_number)
+
+        if self.has_key(key):
+            return
+
+        self.buffered_keys.add(key)
+
+        # Let the buffer grow with the array so merging stays cheap on long runs
+        if len(self.buffered_keys) >= max(4096, len(self.sorted_keys) // 32):
+            new_keys = numpy.sort(numpy.fromiter(self.buffered_keys, dtype=numpy.uint64, count=len(self.buffered_keys)))
+            self.sorted_keys = numpy.insert(self.sorted_keys, numpy.searchsorted(self.sorted_keys, new_keys), new_keys)
+            self.buffered_keys = set()
+
+    def has_key(self, key):
+
+        if key in self.buffered_keys:
+            return True
+
+        key = numpy.uint64(key)
+        key_index = numpy.searchsorted(self.sorted_keys, key)
+        return bool(key_index < len(self.sorted_keys) and self.sorted_keys[key_index] == key)
+
+    def __contains__(self, product_number):
+        return self.has_key(self.product_key(product_number))
+
+    def __len__(self):
+        return len(self.sorted_keys) + len(self.buffered_keys)
+
 
 def init_logger():
 
@@ -190,9 +483,10 @@ def init_logger():
 Flash Window
 ---
 Utilizing FlashWindowEx to let user know when main program loop is completed  
+The Windows libraries are loaded by init_window_flash when a run starts.  On other platforms the window isn't flashed.
 """
-kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-user32 = ctypes.WinDLL('user32', use_last_error=True)
+kernel32 = None
+user32 = None
 
 
 class WindowFlash(ctypes.Structure):
@@ -211,8 +505,36 @@ class WindowFlash(ctypes.Structure):
         self.timeout = 0
 
 
+def init_window_flash():
+
+    global kernel32
+    global user32
+
+    if sys.platform != "win32":
+        return False
+
+    try:
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        user32 = ctypes.WinDLL('user32', use_last_error=True)
+
+        kernel32.GetConsoleWindow.restype = wintypes.HWND
+        user32.FlashWindowEx.argtypes = (ctypes.POINTER(WindowFlash),)
+
+    except Exception as e:
+        logging.error("Exception occurred during the init_window_flash method.\n", exc_info=True)
+        kernel32 = None
+        user32 = None
+        return False
+
+    return True
+
+
 def flash_window():
 
+    # Nothing to flash if the Windows libraries aren't loaded
+    if user32 is None:
+        return
+
     try:
 
         h_wnd = kernel32.GetConsoleWindow()
@@ -236,7 +558,7 @@ def get_user_input_prerequisites():
               " * Open the Staging Product repo\n"
               " * Make sure the Staging Product repo is the active tab in the PIM system\n"
               " * Switch the View Preference to 'Validation Automation'\n"
-              " * Ensure the records per page is set to 50\n"
+              " * Ensure the records per page is set to " + required_records_per_page + "\n"
               "\n"
               "==========================================================================\n"              
               "\n")
@@ -265,7 +587,7 @@ def get_user_input_prerequisites():
                       " * Open the Staging Product repo\n"
                       " * Make sure the Staging Product repo is the active tab in the PIM system\n"
                       " * Switch the View Preference to 'Validation Automation'\n"
-                      " * Ensure the records per page is set to 50\n"
+                      " * Ensure the records per page is set to " + required_records_per_page + "\n"
                       "\n"
                       "==========================================================================\n"              
                       "\n")
@@ -278,7 +600,7 @@ def get_user_input_prerequisites():
                       " * Open the Staging Product repo\n"
                       " * Make sure the Staging Product repo is the active tab in the PIM system\n"
                       " * Switch the View Preference to 'Validation Automation'\n"
-                      " * Ensure the records per page is set to 50\n"
+                      " * Ensure the records per page is set to " + required_records_per_page + "\n"
                       "\n"
                       "==========================================================================\n"              
                       "\n")
@@ -291,6 +613,124 @@ def get_user_input_prerequisites():
         sys.exit()
 
 
+def get_user_input_targeting_mode():
+    """
+    Prompts the user to choose how the program finds the products to review.
+
+    * Full view walk: cycles through every product in the 'Validation Automation' view
+    * Validation error filter passes: uses the PIM search panel to restrict the grid to products failing validation for
+      one attribute at a time, so only the error population gets visited
+    * Work list: looks up an explicit list of Company product numbers read from a file
+
+    Returns a tuple of (targeting mode, targeting details) where the details are None for the full view walk, the
+    list of attribute names for the filtered passes, or the list of Company product numbers for the work list.
+    """
+
+    try:
+
+        print("\nPlease select a targeting mode:\n"
+              "\n"
+              " 1 - Full view walk (review every product in the view)\n"
+              " 2 - Validation error filter passes (review only products with validation errors)\n"
+              " 3 - Work list (review the Company product numbers listed in a file)\n"
+              "\n")
+
+        while True:
+            mode_input = input("Targeting mode (1/2/3): ").strip()
+
+            if mode_input == "1":
+                return "full_view", None
+
+            elif mode_input == "2":
+                return "filtered", get_user_input_filter_attributes()
+
+            elif mode_input == "3":
+                return "work_list", get_user_input_work_list()
+
+            else:
+                print("\nInvalid input.  Please try again.\n")
+
+    except Exception as e:
+        print("Exception occurred during the get_user_input_targeting_mode method.")
+        print("Exiting program.")
+        logging.error("Exception occurred during the get_user_input_targeting_mode method.", exc_info=True)
+        time.sleep(3)
+        sys.exit()
+
+
+def get_user_input_filter_attributes():
+
+    print("\nAttributes available for filtered passes:\n")
+    for attribute_number, attribute_name in enumerate(target_attribute_names, start=1):
+        print(" " + str(attribute_number) + " - " + attribute_name)
+
+    while True:
+        attributes_input = input("\nEnter the attribute numbers separated by commas, or press ENTER for all: ")
+
+        if attributes_input.strip() == "":
+            return list(target_attribute_names)
+
+        try:
+            selected_attributes = []
+            for attribute_number in attributes_input.split(','):
+                attribute_index = int(attribute_number) - 1
+                if attribute_index < 0:
+                    raise ValueError("Attribute number less than 1")
+                attribute_name = target_attribute_names[attribute_index]
+                if attribute_name not in selected_attributes:
+                    selected_attributes.append(attribute_name)
+            return selected_attributes
+        except:
+            print("\nInvalid input.  Please try again.\n")
+
+
+def get_user_input_work_list():
+
+    while True:
+        work_list_path = input("\nEnter the path to the work list file (one Company product number per line): ")
+        work_list_path = work_list_path.strip().strip('"')
+
+        product_numbers = load_work_list(work_list_path)
+
+        if product_numbers == "error":
+            print("\nUnable to read the work list file.  Please try again.\n")
+        elif len(product_numbers) == 0:
+            print("\nThe work list file does not contain any product numbers.  Please try again.\n")
+        else:
+            print("\nLoaded " + str(len(product_numbers)) + " product numbers from the work list.\n")
+            return product_numbers
+
+
+def load_work_list(work_list_path):
+    """
+    Reads the Company product numbers from a work list file.  The file can be a plain list with one product number per
+    line or a csv file with the product number in the first column (a header row is skipped).  Duplicate product
+    numbers are dropped while keeping the order of the file.
+    """
+
+    try:
+        product_numbers = []
+        seen_product_numbers = set()
+
+        with open(work_list_path, 'r') as work_list_file:
+            for line in work_list_file:
+                product_number = line.split(',')[0].strip().strip('"')
+
+                if product_number == "" or product_number == "Company Product Number":
+                    continue
+
+                if product_number not in seen_product_numbers:
+                    seen_product_numbers.add(product_number)
+                    product_numbers.append(product_number)
+
+    except Exception as e:
+        logging.error("Exception occurred while attempting to load the work list file: " + str(work_list_path),
+                      exc_info=True)
+        return "error"
+
+    return product_numbers
+
+
 def init_webdriver():
 
     try:
@@ -299,10 +739,7 @@ def init_webdriver():
         The following approach for initializing webdriver is not ideal, but it was used in lieu of the preferred 
         implementation in order to meet enterprise system requirements.
         """
-        service = ChromeService()
-        options = Options()
-        options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-        web_driver = webdriver.Chrome(service=service, options=options)
+        web_driver = attach_webdriver()
 
         return web_driver
 
@@ -314,3789 +751,5816 @@ def init_webdriver():
         sys.exit()
 
 
-def parse_paging_info(driver):
+def attach_webdriver():
+
+    # Attach to the Chrome instance running in debugging mode
+    service = ChromeService()
+    options = Options()
+    options.add_experimental_option("debuggerAddress", debugger_address)
+
+    # The performance log carries the network events used to read the grid data responses and time the reloads
+    if intercept_grid_data or record_reload_trace:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    web_driver = webdriver.Chrome(service=service, options=options)
+
+    emulate_focus(web_driver)
 
+    if block_nonessential_resources:
+        block_resources(web_driver)
+
+    return web_driver
+
+
+def emulate_focus(web_driver):
+    """
+    Uses the Chrome DevTools Protocol to make the PIM tab behave as if it were focused and active, even when the window
+    is minimized or behind other windows.  Launch flags can't be added to a Chrome which is already running, so this is
+    the part of the anti-throttling setup which also works when attaching to a browser started by hand.
     """
-    Example of paging_info_elmt.text = "View 401 - 450 of 1,003,948"
 
-    [substring_1: "View"]
-    [substring_2: "401"]
-    [substring_3: "-"]
-    [substring_4: "450"]
-    [substring_5: "of"]
-    [substring_6: "1,003,948"]
+    try:
+        web_driver.execute_cdp_cmd("Emulation.setFocusEmulationEnabled", {"enabled": True})
+        web_driver.execute_cdp_cmd("Page.setWebLifecycleState", {"state": "active"})
+    except Exception as e:
+        logging.warning("Unable to turn on focus emulation.  The PIM tab may be throttled while in the background.",
+                        exc_info=True)
+
+
+def block_resources(web_driver):
+    """
+    Blocks the requests matching blocked_url_patterns through the Chrome DevTools Protocol so each grid reload and
+    dialog open only downloads what the program needs.  Allowed patterns are listed first since the first matching
+    pattern decides whether a request is blocked.
+
+    Older versions of Chrome only take a plain list of blocked URLs.  There, the blocked patterns are applied on their
+    own if there is no allow list, and nothing is blocked if there is one, since blocking without the exceptions could
+    break the grid.  Request interception (the Fetch domain) would keep the allow list working on those versions, but
+    every paused request has to be answered from a DevTools event listener, which execute_cdp_cmd can't provide.
     """
 
     try:
-        # Retrieve the paging info element
-        paging_info_elmt = driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/div")
+        web_driver.execute_cdp_cmd("Network.enable", {})
+    except Exception as e:
+        logging.warning("Unable to enable the Network domain.  Resources will not be blocked.", exc_info=True)
+        return False
 
-        # Pull text from the paging_info_elmt
-        paging_text = paging_info_elmt.text
+    url_patterns = [{"urlPattern": pattern, "block": False} for pattern in allowed_url_patterns]
+    url_patterns += [{"urlPattern": pattern, "block": True} for pattern in blocked_url_patterns]
 
-        # Error handling
-        if paging_text == "":
-            print("Error:: Paging info was an empty string.")
-            logging.error("Paging info was an empty string.")
-            time.sleep(1)
-            save_and_quit()
-        elif paging_text is None:
-            print("Error:: Paging info was None (null).")
-            logging.error("Paging info was None (null).")
-            time.sleep(1)
-            save_and_quit()
-        elif paging_text == 'No records to view':
-            return paging_text
-        else:
-            # Parse the paging text
-            paging_text_parsed = paging_text.split(' ')
+    try:
+        web_driver.execute_cdp_cmd("Network.setBlockedURLs", {"urlPatterns": url_patterns})
+    except Exception as e:
 
-            return paging_text_parsed
+        if allowed_url_patterns:
+            print("Error:: This version of Chrome does not support allowed URL patterns.  Resources will not be "
+                  "blocked.  Update Chrome or empty allowed_url_patterns to block them.")
+            logging.error("This version of Chrome does not support allowed URL patterns, so resources were not blocked",
+                          exc_info=True)
+            return False
 
-    except:
-        print("Error:: Exception occurred while attempting to parse the paging info.")
-        logging.error("Exception occurred while attempting to parse the paging info.", exc_info=True)
-        time.sleep(1)
-        save_and_quit()
+        try:
+            web_driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns})
+        except Exception as e:
+            logging.warning("Unable to block non-essential resources.", exc_info=True)
+            return False
+
+    logging.info("Blocking " + str(len(blocked_url_patterns)) + " URL patterns (" + str(len(allowed_url_patterns)) +
+                 " allowed)")
+    return True
 
 
-def get_total_records(paging_info):
+def swap_webdriver_session(web_driver):
+    """
+    Attaches a new WebDriver session to the Chrome instance running in debugging mode and swaps it into the existing
+    WebDriver object, so every function holding a reference to the driver keeps working.  The old chromedriver process
+    is stopped first.  Stopping the service doesn't close Chrome, since WebDriver only attached to it.
+    """
 
     try:
-        # Extract total records and remove commas
-        total_recs_text_raw = paging_info[5]  # index 5 = substring 6
-        total_recs_text = total_recs_text_raw.replace(',', '')
-        total_recs = int(total_recs_text)
+        web_driver.service.stop()
+    except Exception as e:
+        logging.warning("Unable to stop the old chromedriver process", exc_info=True)
 
-        if total_recs < 1:
-            logging.error("Error:: Parsed total record value less than 1.")
-            print("Error:: Parsed total record value less than 1.")
-            time.sleep(1)
-            save_and_quit()
+    new_web_driver = attach_webdriver()
 
-        return total_recs
+    web_driver.command_executor = new_web_driver.command_executor
+    web_driver.session_id = new_web_driver.session_id
+    web_driver.service = new_web_driver.service
+    web_driver.caps = new_web_driver.caps
 
-    except:
-        logging.error("Unable to extract total records from paging info.", exc_info=True)
-        print("Error:: Unable to extract total records from paging info.")
-        time.sleep(1)
-        save_and_quit()
 
+def reattach_webdriver(web_driver):
+    """
+    Re-attaches an existing WebDriver object to the Chrome instance running in debugging mode after the session was
+    lost (see swap_webdriver_session).
+    """
 
-def get_total_pages(total_recs):
+    swap_webdriver_session(web_driver)
 
-    try:
-        # Calculate total pages
-        if total_recs % 50 == 0:
-            total_pgs = (int(total_recs) // 50)
-        else:
-            total_pgs = (int(total_recs) // 50) + 1
+    return switch_to_maingrid_iframe(web_driver)
 
-        return total_pgs
 
-    except:
-        logging.error("Unable to calculate total pages from paging info.", exc_info=True)
-        print("Error:: Unable to calculate total pages from paging info.")
-        time.sleep(1)
-        save_and_quit()
+"""
+Session Supervisor
+---
+Keeps long unattended runs alive through transient browser problems.  The main program loops call
+supervise_browser_session at the top of every iteration, which sends a heartbeat every heartbeat_interval_seconds and
+at the first check after a hiccup.  If WebDriver is dead or unresponsive, the supervisor re-attaches to the debugger
+address, or relaunches Chrome and restores the grid view and page if re-attaching fails.
+The loops keep their in-memory cursor (seen set, pending products, etc.), so they resume where they left off.
+"""
 
 
-def get_first_record_on_page(paging_info):
+def is_session_responsive(web_driver):
 
-    try:
-        # Extract current records and remove commas
-        first_rec_text_raw = paging_info[1]  # index 1 = substring 2
-        first_rec_text = first_rec_text_raw.replace(',', '')
-        first_rec = int(first_rec_text)
+    heartbeat_result = []
 
-        return first_rec
+    def heartbeat():
+        try:
+            heartbeat_result.append(web_driver.execute_script("return 1;") == 1)
+        except Exception as e:
+            heartbeat_result.append(False)
 
-    except:
-        logging.error("Unable to extract first record on page from paging info.", exc_info=True)
-        print("Error:: Unable to extract first record on page from paging info.")
-        time.sleep(1)
-        save_and_quit()
+    # Run the heartbeat on its own thread so a hung WebDriver call can't block the main program loop
+    heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+    heartbeat_thread.start()
+    heartbeat_thread.join(heartbeat_timeout_seconds)
 
+    return len(heartbeat_result) > 0 and heartbeat_result[0]
 
-def get_last_record_on_page(paging_info):
 
-    try:
-        # Extract current records and remove commas
-        last_rec_text_raw = paging_info[3]  # index 3 = substring 4
-        last_rec_text = last_rec_text_raw.replace(',', '')
-        last_rec = int(last_rec_text)
+def is_heartbeat_due():
 
-        return last_rec
+    global last_heartbeat_time
+    global heartbeat_due
 
-    except:
-        logging.error("Unable to extract last record on page from paging info.", exc_info=True)
-        print("Error:: Unable to extract last record on page from paging info.")
-        time.sleep(1)
-        save_and_quit()
+    if not heartbeat_due and time.monotonic() - last_heartbeat_time < heartbeat_interval_seconds:
+        return False
 
+    heartbeat_due = False
+    last_heartbeat_time = time.monotonic()
 
-def get_current_page(top_of_pg_rec):
+    return True
 
-    try:
-        # Calculate starting page
-        if top_of_pg_rec % 50 == 0:
-            current_pg = (int(top_of_pg_rec) // 50)
-        else:
-            current_pg = (int(top_of_pg_rec) // 50) + 1
 
-        return current_pg
+def supervise_browser_session(web_driver):
+    """
+    Checks that WebDriver can still talk to the browser and restores the session if it can't.  The heartbeat starts a
+    thread and a script in the page, so it only runs when one is due (see is_heartbeat_due).
 
-    except:
-        logging.error("Unable to calculate current page from paging info.", exc_info=True)
-        print("Error:: Unable to calculate current page from paging info.")
-        time.sleep(1)
-        save_and_quit()
+    Also recycles the tab once it crosses the memory or grid reload limits (see is_tab_recycle_due).
 
+    Returns "ok" if the session was healthy, "restored" if the session had to be re-attached, the browser relaunched, or
+    the tab recycled (the caller should re-read the grid and re-run any search), or "error" if the session could not be
+    restored.
+    """
 
-def print_initial_values(total_pgs, total_recs):
+    if not is_heartbeat_due() or is_session_responsive(web_driver):
 
-    # Print initial values used for main program loop
-    print("\n\n======================\n"
-          "\n"
-          "Total Pages: " + str(total_pgs) + "\n"         
-          "Total Records: " + str(total_recs) + "\n"
-          "\n"
-          "======================\n"
-          "\n")
+        # Swap in a fresh tab if the current one has grown too large
+        if is_tab_recycle_due(web_driver):
+            if run_recovery_action("recycle_tab", recycle_tab, web_driver) is not True:
+                report_hiccup(web_driver)
+            return "restored"
 
-    # Print status message
-    print("=========================================================================\n"
-          "Initialization complete. Proceeding with product reviews and corrections.\n"
-          "=========================================================================\n"
-          "\n")
-    # log initial values used for main program loop
-    logging.info("\n\n======================\n"
-          "Total Pages: " + str(total_pgs) + "\n"         
-          "Total Records: " + str(total_recs) + "\n"
-          "======================\n"
-          "\n")
-    # Log status message
-    logging.info("\n\n===========================================================\n"
-                 "Initialization complete. Proceeding with main program loop.\n"
-                 "===========================================================\n"
-                 "\n")
+        return "ok"
 
+    print("\nWebDriver is not responding.  Attempting to restore the browser session...\n")
+    logging.warning("WebDriver is not responding.  Attempting to restore the browser session.")
 
-def check_lui_maingrid(web_driver):
-    '''
-    # Need to wait for the main grid to load completely before moving forward in main program loop.
-    #  - Each time the main grid loads, the lui_MainGrid element goes from style="display: none" to
-    #    style="display: block" and then back to style="display: none"
-    #  - Attempts to use selenium waits and expected conditions like visibility_of_element_located
-    #    failed to capture the actual loading status of the grid.
-    '''
+    if restore_browser_session(web_driver):
+        return "restored"
 
-    # Variable to control program flow through the check_lui_maingraid method
-    is_lui_finished = False
+    return "error"
 
-    # Setting loop variable to handle wait
-    lui_maingrid_deciseconds = 0  # Loop variable
 
-    while lui_maingrid_deciseconds < 600:  # 60 seconds
+def read_page_metrics(web_driver):
+    """
+    Returns the Chrome DevTools Protocol performance metrics for the current tab as a dictionary (ex: JSHeapUsedSize,
+    Nodes, Documents, ScriptDuration, LayoutDuration), or an empty dictionary if they can't be read.
+    """
+
+    try:
+        web_driver.execute_cdp_cmd("Performance.enable", {})
+        page_metrics = web_driver.execute_cdp_cmd("Performance.getMetrics", {})
+        return {metric["name"]: metric["value"] for metric in page_metrics["metrics"]}
+    except Exception as e:
+        logging.warning("Unable to read the page performance metrics", exc_info=True)
+        return {}
+
+
+def is_tab_recycle_due(web_driver):
+
+    global iterations_since_tab_check
+
+    iterations_since_tab_check += 1
+
+    if iterations_since_tab_check < tab_check_interval:
+        return False
+
+    iterations_since_tab_check = 0
+
+    grid_reloads_in_tab = grid_reload_stats[0] - grid_reloads_at_tab_open
+    page_metrics = read_page_metrics(web_driver)
+    heap_mb = page_metrics.get("JSHeapUsedSize", 0) / 1048576
+    dom_nodes = page_metrics.get("Nodes", 0)
+
+    logging.info("Tab check: " + format(heap_mb, ".0f") + " MB JS heap, " + format(dom_nodes, ".0f") + " DOM nodes, " +
+                 str(grid_reloads_in_tab) + " grid reloads")
+
+    return (heap_mb >= tab_recycle_heap_mb or dom_nodes >= tab_recycle_dom_nodes or
+            grid_reloads_in_tab >= tab_recycle_grid_reloads)
+
+
+def recycle_tab(web_driver):
+    """
+    Opens the PIM system in a fresh tab, closes the old one to release its memory, and restores the view preference and
+    the page the program was on (see restore_grid_view).
+    """
+
+    global grid_reloads_at_tab_open
+
+    print("\nRecycling the browser tab to release memory...\n")
+
+    old_tab = web_driver.current_window_handle
+
+    web_driver.switch_to.new_window('tab')
+    new_tab = web_driver.current_window_handle
+    web_driver.get(pim_url)
+
+    web_driver.switch_to.window(old_tab)
+    web_driver.close()
+    web_driver.switch_to.window(new_tab)
+
+    # The DevTools settings belong to the old tab, so apply them to the new one
+    emulate_focus(web_driver)
+    if block_nonessential_resources:
+        block_resources(web_driver)
+
+    grid_reloads_at_tab_open = grid_reload_stats[0]
+
+    return restore_grid_view(web_driver)
+
+
+def restore_browser_session(web_driver):
+
+    global session_restores
+
+    if session_restores >= max_session_restores:
+        logging.error("Browser session was already restored " + str(session_restores) + " times.  Giving up.")
+        return False
+
+    session_restores += 1
+
+    # Cheapest fix first: Chrome is still up, so re-attach WebDriver to it
+    if run_recovery_action("reattach_driver", reattach_webdriver, web_driver) is True:
+        if is_session_responsive(web_driver):
+            return True
+
+    # Chrome itself is gone or hung, so relaunch it and put the grid back the way it was
+    if run_recovery_action("relaunch_browser", relaunch_browser, web_driver) is True:
+        if is_session_responsive(web_driver):
+            return True
+
+    print("Error:: Unable to restore the browser session")
+    logging.error("Unable to restore the browser session")
+    return False
+
+
+def relaunch_browser(web_driver):
+
+    if browser_managed_by_fleet:
+        # The fleet launcher restarts crashed instances, so give it a chance to bring this one back
+        time.sleep(health_check_wait_seconds)
+    else:
+        # Start Chrome in debugging mode the same way as the batch script
+        subprocess.Popen([chrome_path, "--remote-debugging-port=" + debugger_address.split(':')[-1],
+                          "--user-data-dir=" + chrome_user_data_dir] + anti_throttling_flags + [pim_url])
+
+        # Give Chrome a chance to open the debugging port
+        time.sleep(5)
+
+    swap_webdriver_session(web_driver)
+
+    return restore_grid_view(web_driver)
+
+
+def set_last_known_page(page_number):
+
+    global last_known_page
+    last_known_page = page_number
+
+
+def restore_grid_view(web_driver):
+    """
+    Puts a freshly loaded PIM page back into the state the program expects (see verify_prerequisites) and goes back to
+    the page of search results the program was working on.  The user data directory keeps the PIM login, so no
+    credentials are needed.
+    """
+
+    if not verify_prerequisites(web_driver):
+        return False
+
+    # Go back to the page the program was on
+    if last_known_page > 1:
+        if not navigate_to_page(web_driver, last_known_page):
+            return False
+        return check_lui_maingrid(web_driver)
+
+    return True
+
+
+def verify_prerequisites(web_driver, fix_problems=True):
+    """
+    Checks the PIM state the program depends on by reading it from the DOM: the required repo is the active tab, the
+    View Preference is the required view, and the records per page matches the page math (see required_repo_name,
+    required_view_preference, and required_records_per_page).  If fix_problems is True, anything which doesn't match is
+    switched over.  Leaves the driver in the main grid iframe.
+
+    Returns True if every prerequisite is met, or False if one isn't and couldn't be fixed (the problem is logged).
+    """
+
+    web_driver.switch_to.default_content()
+
+    # Wait to make sure the driver finds the repo tab
+    try:
+        repo_tab_wait = WebDriverWait(web_driver, timeout=60).until(
+            lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
+    except Exception as e:
+        print("Error:: " + required_repo_name + " repo tab not found.  The PIM login may have expired.")
+        logging.error(required_repo_name + " repo tab not found", exc_info=True)
+        return False
+
+    # Check which repo is the active tab
+    try:
+        active_repo_name = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']//*[@aria-selected='true']").text
+    except:
+        active_repo_name = ""
+
+    repo_tab_switched = False
+
+    if required_repo_name not in active_repo_name:
+        logging.info("Active repo tab was '" + active_repo_name + "' instead of " + required_repo_name)
+
+        if not fix_problems:
+            print("Error:: The " + required_repo_name + " repo is not the active tab.")
+            return False
+
+        # Make the required repo the active tab
         try:
-            # Locate the lui_maingrid element
-            lui_element = web_driver.find_element(By.ID, "PLACEHOLDER")
-            if "display: block" in lui_element.get_dom_attribute("style"):
-                is_display_block = True
-                lui_maingrid_deciseconds = 600
-                continue
-            else:
-                lui_maingrid_deciseconds += 1
-                time.sleep(.1)
-        except:
-            logging.error("lui main grid display never shifted to block\n")
+            repo_tab = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+            repo_tab.click()
+            repo_tab_switched = True
+        except Exception as e:
+            print("Error:: Unable to switch to the " + required_repo_name + " repo tab.")
+            logging.error("Unable to switch to the " + required_repo_name + " repo tab", exc_info=True)
             return False
 
-    # Resetting loop variable
-    lui_maingrid_deciseconds = 0  # Loop variable
+    if not switch_to_maingrid_iframe(web_driver):
+        return False
 
-    while lui_maingrid_deciseconds < 600:  # 60 seconds
+    # Wait for the repo's main grid to finish loading before reading its settings
+    if repo_tab_switched and not check_lui_maingrid(web_driver):
+        return False
+
+    # Check the View Preference
+    try:
+        view_preference_select = Select(web_driver.find_element(By.XPATH, "//select[@id='PLACEHOLDER']"))
+        active_view_preference = view_preference_select.first_selected_option.text
+    except Exception as e:
+        print("Error:: View Preference not found.")
+        logging.error("View Preference not found", exc_info=True)
+        return False
+
+    if active_view_preference != required_view_preference:
+        logging.info("View Preference was '" + active_view_preference + "' instead of " + required_view_preference)
+
+        if not fix_problems:
+            print("Error:: The View Preference is not set to '" + required_view_preference + "'.")
+            return False
+
+        # Switch the View Preference
         try:
-            # Locate the lui_maingrid element
-            lui_element = web_driver.find_element(By.ID, "PLACEHOLDER")
-            if "display: none" in lui_element.get_dom_attribute("style"):
-                is_display_none = True
-                is_lui_finished = True
-                lui_maingrid_deciseconds = 600
-                continue
-            else:
-                lui_maingrid_deciseconds += 1
-                time.sleep(.1)
-        except:
-            logging.error("lui main grid display never shifted to none\n")
+            view_preference_select.select_by_visible_text(required_view_preference)
+        except Exception as e:
+            print("Error:: The View Preference '" + required_view_preference + "' was not found.")
+            logging.error("Unable to select the View Preference " + required_view_preference, exc_info=True)
             return False
 
-    # If WebDriver registered expected lui_maingrid behavior
-    if is_lui_finished:
-        return True
-    else:
-        print("Error:: WebDriver was not able to verify that the maingrid loaded properly")
-        logging.error("WebDriver was not able to verify that the maingrid loaded properly")
+        if not check_lui_maingrid(web_driver):
+            return False
+
+    global records_per_page
+
+    # Check the records per page
+    try:
+        records_per_page_select = Select(web_driver.find_element(By.XPATH, "//select[@id='PLACEHOLDER']"))
+        active_records_per_page = records_per_page_select.first_selected_option.text.strip()
+    except Exception as e:
+        print("Error:: Records per page selector not found.")
+        logging.error("Records per page selector not found", exc_info=True)
         return False
 
+    # Aim for the largest page size on offer, leaving the configured required_records_per_page as it is
+    target_records_per_page = required_records_per_page
 
-def check_lui_maingrid_click(web_driver):
-    '''
-    # Need to wait for the main grid to load completely before moving forward in main program loop.
-    #  - Each time the main grid loads, the lui_MainGrid element goes from style="display: none" to
-    #    style="display: block" and then back to style="display: none"
-    #  - Specifically for use when preparing to check the checkbox for a record
-    #  - Attempts to use selenium waits and expected conditions like visibility_of_element_located
-    #    failed to capture the actual loading status of the grid.
-    '''
+    if use_largest_page_size:
+        offered_page_sizes = get_offered_page_sizes(records_per_page_select)
+        if offered_page_sizes:
+            target_records_per_page = str(max(offered_page_sizes))
 
-    # Variable to control program flow through the check_lui_maingraid method
-    is_lui_finished = False
+    if active_records_per_page != target_records_per_page:
+        logging.info("Records per page was " + active_records_per_page + " instead of " + target_records_per_page)
 
-    # Setting loop variable to handle wait
-    lui_maingrid_deciseconds = 0  # Loop variable
+        if not fix_problems:
+            print("Error:: The records per page is not set to " + target_records_per_page + ".")
+            return False
 
-    while lui_maingrid_deciseconds < 600:  # 60 seconds
+        # Switch the records per page
         try:
-            # Locate the lui_maingrid element
-            lui_element = web_driver.find_element(By.ID, "PLACEHOLDER")
-            if "display: none" in lui_element.get_dom_attribute("style"):
-                is_display_none = True
-                is_lui_finished = True
-                lui_maingrid_deciseconds = 600
-                continue
-        except:
-            lui_maingrid_deciseconds += 1
-            time.sleep(.1)
+            records_per_page_select.select_by_visible_text(target_records_per_page)
+        except Exception as e:
+            print("Error:: The PIM system doesn't offer " + target_records_per_page + " records per page.")
+            logging.error("Unable to select " + target_records_per_page + " records per page", exc_info=True)
+            return False
 
-    # If WebDriver registered expected lui_maingrid behavior
-    if is_lui_finished:
-        return True
-    else:
-        print("Error:: WebDriver was not able to verify that the maingrid loaded properly")
-        logging.error("WebDriver was not able to verify that the maingrid loaded properly")
+        if not check_lui_maingrid(web_driver):
+            return False
+
+    records_per_page = int(target_records_per_page)
+
+    # Make sure the main grid has finished loading
+    if not check_lui_maingrid_click(web_driver):
         return False
 
+    logging.info("Prerequisites verified: " + required_repo_name + " repo, '" + required_view_preference + "' view, " +
+                 target_records_per_page + " records per page")
+
+    return True
+
+
+def parse_paging_info(driver):
+
+    """
+    Example of paging_info_elmt.text = "View 401 - 450 of 1,003,948"
+
+    [substring_1: "View"]
+    [substring_2: "401"]
+    [substring_3: "-"]
+    [substring_4: "450"]
+    [substring_5: "of"]
+    [substring_6: "1,003,948"]
+    """
+
+    try:
+        # Retrieve the paging info element
+        paging_info_elmt = driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/div")
+
+        # Pull text from the paging_info_elmt
+        paging_text = paging_info_elmt.text
+
+        # Error handling
+        if paging_text == "":
+            print("Error:: Paging info was an empty string.")
+            logging.error("Paging info was an empty string.")
+            time.sleep(1)
+            save_and_quit()
+        elif paging_text is None:
+            print("Error:: Paging info was None (null).")
+            logging.error("Paging info was None (null).")
+            time.sleep(1)
+            save_and_quit()
+        elif paging_text == 'No records to view':
+            return paging_text
+        else:
+            # Parse the paging text
+            paging_text_parsed = paging_text.split(' ')
+
+            return paging_text_parsed
+
+    except:
+        print("Error:: Exception occurred while attempting to parse the paging info.")
+        logging.error("Exception occurred while attempting to parse the paging info.", exc_info=True)
+        time.sleep(1)
+        save_and_quit()
+
+
+def get_total_records(paging_info):
+
+    try:
+        # Extract total records and remove commas
+        total_recs_text_raw = paging_info[5]  # index 5 = substring 6
+        total_recs_text = total_recs_text_raw.replace(',', '')
+        total_recs = int(total_recs_text)
+
+        if total_recs < 1:
+            logging.error("Error:: Parsed total record value less than 1.")
+            print("Error:: Parsed total record value less than 1.")
+            time.sleep(1)
+            save_and_quit()
+
+        return total_recs
+
+    except:
+        logging.error("Unable to extract total records from paging info.", exc_info=True)
+        print("Error:: Unable to extract total records from paging info.")
+        time.sleep(1)
+        save_and_quit()
+
+
+def get_total_pages(total_recs):
+
+    try:
+        # Calculate total pages
+        if total_recs % records_per_page == 0:
+            total_pgs = (int(total_recs) // records_per_page)
+        else:
+            total_pgs = (int(total_recs) // records_per_page) + 1
+
+        return total_pgs
+
+    except:
+        logging.error("Unable to calculate total pages from paging info.", exc_info=True)
+        print("Error:: Unable to calculate total pages from paging info.")
+        time.sleep(1)
+        save_and_quit()
+
+
+def get_first_record_on_page(paging_info):
+
+    try:
+        # Extract current records and remove commas
+        first_rec_text_raw = paging_info[1]  # index 1 = substring 2
+        first_rec_text = first_rec_text_raw.replace(',', '')
+        first_rec = int(first_rec_text)
+
+        return first_rec
+
+    except:
+        logging.error("Unable to extract first record on page from paging info.", exc_info=True)
+        print("Error:: Unable to extract first record on page from paging info.")
+        time.sleep(1)
+        save_and_quit()
+
+
+def get_last_record_on_page(paging_info):
+
+    try:
+        # Extract current records and remove commas
+        last_rec_text_raw = paging_info[3]  # index 3 = substring 4
+        last_rec_text = last_rec_text_raw.replace(',', '')
+        last_rec = int(last_rec_text)
+
+        return last_rec
+
+    except:
+        logging.error("Unable to extract last record on page from paging info.", exc_info=True)
+        print("Error:: Unable to extract last record on page from paging info.")
+        time.sleep(1)
+        save_and_quit()
+
+
+def get_current_page(top_of_pg_rec):
+
+    try:
+        # Calculate starting page
+        if top_of_pg_rec % records_per_page == 0:
+            current_pg = (int(top_of_pg_rec) // records_per_page)
+        else:
+            current_pg = (int(top_of_pg_rec) // records_per_page) + 1
+
+        return current_pg
+
+    except:
+        logging.error("Unable to calculate current page from paging info.", exc_info=True)
+        print("Error:: Unable to calculate current page from paging info.")
+        time.sleep(1)
+        save_and_quit()
+
+
+def get_offered_page_sizes(records_per_page_select):
+    """
+    Returns the page sizes offered by the records per page selector as integers (options like "All" are skipped).
+    """
+
+    offered_page_sizes = []
+
+    for page_size_option in records_per_page_select.options:
+        page_size_text = page_size_option.text.strip()
+        if page_size_text.isdigit():
+            offered_page_sizes.append(int(page_size_text))
+
+    return offered_page_sizes
+
+
+def update_records_per_page(paging_info):
+    """
+    Detects the records per page from the paging text (ex: "View 401 - 450 of 1,003,948" is 50 records per page) so
+    the page math works with whatever page size the grid is showing.  The last page can be short, so it only counts
+    when it is also the first page and holds more records than the current setting.
+    """
+
+    global records_per_page
+
+    if paging_info == 'No records to view':
+        return
+
+    first_rec = get_first_record_on_page(paging_info)
+    last_rec = get_last_record_on_page(paging_info)
+    total_recs = get_total_records(paging_info)
+    detected_records_per_page = last_rec - first_rec + 1
+
+    # A short last page doesn't show the page size
+    if last_rec == total_recs and (first_rec != 1 or detected_records_per_page < records_per_page):
+        return
+
+    if detected_records_per_page != records_per_page:
+        logging.info("Records per page detected from the paging text: " + str(detected_records_per_page))
+        records_per_page = detected_records_per_page
+
+
+def get_work_list_batch_size():
+    """
+    Returns the number of product numbers per work list search: work_list_batch_size, or the records per page if it's 0.
+    """
+
+    return work_list_batch_size or records_per_page
+
+
+def print_initial_values(total_pgs, total_recs):
+
+    # Print initial values used for main program loop
+    print("\n\n======================\n"
+          "\n"
+          "Total Pages: " + str(total_pgs) + "\n"         
+          "Total Records: " + str(total_recs) + "\n"
+          "Records per Page: " + str(records_per_page) + "\n"
+          "\n"
+          "======================\n"
+          "\n")
+
+    # Print status message
+    print("=========================================================================\n"
+          "Initialization complete. Proceeding with product reviews and corrections.\n"
+          "=========================================================================\n"
+          "\n")
+    # log initial values used for main program loop
+    logging.info("\n\n======================\n"
+          "Total Pages: " + str(total_pgs) + "\n"         
+          "Total Records: " + str(total_recs) + "\n"
+          "Records per Page: " + str(records_per_page) + "\n"
+          "======================\n"
+          "\n")
+    # Log status message
+    logging.info("\n\n===========================================================\n"
+                 "Initialization complete. Proceeding with main program loop.\n"
+                 "===========================================================\n"
+                 "\n")
+
+
+def check_lui_maingrid(web_driver):
+    '''
+    # Need to wait for the main grid to load completely before moving forward in main program loop.
+    #  - Each time the main grid loads, the lui_MainGrid element goes from style="display: none" to
+    #    style="display: block" and then back to style="display: none"
+    #  - Attempts to use selenium waits and expected conditions like visibility_of_element_located
+    #    failed to capture the actual loading status of the grid.
+    '''
+
+    # Variable to control program flow through the check_lui_maingraid method
+    is_lui_finished = False
+
+    # Time the reload so the activity summary can show the effect of resource blocking
+    reload_start = time.monotonic()
+
+    # Setting loop variable to handle wait
+    lui_maingrid_deciseconds = 0  # Loop variable
+
+    while lui_maingrid_deciseconds < 600:  # 60 seconds
+        try:
+            # Locate the lui_maingrid element
+            lui_element = web_driver.find_element(By.ID, "PLACEHOLDER")
+            if "display: block" in lui_element.get_dom_attribute("style"):
+                is_display_block = True
+                lui_maingrid_deciseconds = 600
+                continue
+            else:
+                lui_maingrid_deciseconds += 1
+                time.sleep(.1)
+        except:
+            logging.error("lui main grid display never shifted to block\n")
+            return False
+
+    # Resetting loop variable
+    lui_maingrid_deciseconds = 0  # Loop variable
+
+    while lui_maingrid_deciseconds < 600:  # 60 seconds
+        try:
+            # Locate the lui_maingrid element
+            lui_element = web_driver.find_element(By.ID, "PLACEHOLDER")
+            if "display: none" in lui_element.get_dom_attribute("style"):
+                is_display_none = True
+                is_lui_finished = True
+                lui_maingrid_deciseconds = 600
+                continue
+            else:
+                lui_maingrid_deciseconds += 1
+                time.sleep(.1)
+        except:
+            logging.error("lui main grid display never shifted to none\n")
+            return False
+
+    # If WebDriver registered expected lui_maingrid behavior
+    if is_lui_finished:
+        grid_reload_stats[0] += 1
+        grid_reload_stats[1] += time.monotonic() - reload_start
+        if record_reload_trace:
+            record_reload_span(web_driver, "page_load", time.monotonic() - reload_start)
+        return True
+    else:
+        print("Error:: WebDriver was not able to verify that the maingrid loaded properly")
+        logging.error("WebDriver was not able to verify that the maingrid loaded properly")
+        return False
+
+
+def check_lui_maingrid_click(web_driver, reload_kind=None):
+    '''
+    # Need to wait for the main grid to load completely before moving forward in main program loop.
+    #  - Each time the main grid loads, the lui_MainGrid element goes from style="display: none" to
+    #    style="display: block" and then back to style="display: none"
+    #  - Specifically for use when preparing to check the checkbox for a record
+    #  - Attempts to use selenium waits and expected conditions like visibility_of_element_located
+    #    failed to capture the actual loading status of the grid.
+    '''
+
+    # Variable to control program flow through the check_lui_maingraid method
+    is_lui_finished = False
+
+    # Time the wait so reloads after saving a correction can be added to the reload trace
+    reload_start = time.monotonic()
+
+    # Setting loop variable to handle wait
+    lui_maingrid_deciseconds = 0  # Loop variable
+
+    while lui_maingrid_deciseconds < 600:  # 60 seconds
+        try:
+            # Locate the lui_maingrid element
+            lui_element = web_driver.find_element(By.ID, "PLACEHOLDER")
+            if "display: none" in lui_element.get_dom_attribute("style"):
+                is_display_none = True
+                is_lui_finished = True
+                lui_maingrid_deciseconds = 600
+                continue
+        except:
+            lui_maingrid_deciseconds += 1
+            time.sleep(.1)
+
+    # If WebDriver registered expected lui_maingrid behavior
+    if is_lui_finished:
+        if record_reload_trace and reload_kind is not None:
+            record_reload_span(web_driver, reload_kind, time.monotonic() - reload_start)
+        return True
+    else:
+        print("Error:: WebDriver was not able to verify that the maingrid loaded properly")
+        logging.error("WebDriver was not able to verify that the maingrid loaded properly")
+        return False
+
+
+def get_row_id(web_driver, crnt_row):
+
+    try:
+        crnt_row = str(crnt_row)
+
+        # Build an xpath for the top row element
+        crnt_row_path = "PLACEHOLDER[" + crnt_row + "]"
+
+        # Wait to make sure the driver finds the current table row
+        try:
+            crnt_row_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, crnt_row_path))
+        except Exception as e:
+            print("Error:: Current row element not found")
+            logging.error("Current row element not found", exc_info=True)
+            return "error"
+
+        try:
+            # Find the current row of the main grid table
+            crnt_table_row = web_driver.find_element(By.XPATH, crnt_row_path)
+        except Exception as e:
+            print("Error:: WebDriver was not able to locate the current row of the main grid table")
+            logging.error("WebDriver was not able to locate the current row of the main grid table", exc_info=True)
+            return "error"
+
+        # Setting loop variable to handle wait
+        row_id_deciseconds = 0  # Loop variable
+        crnt_row_id = ""
+
+        while row_id_deciseconds < 200:  # 20 seconds
+            try:
+                # Pull the current row element's id
+                crnt_row_id = crnt_table_row.get_attribute('id')
+                row_id_deciseconds = 200
+                continue
+            except:
+                row_id_deciseconds += 1
+                time.sleep(.1)
+
+        if crnt_row_id == "":
+                logging.error("Unable to pull the current row element's id\n")
+                print("Error:: Unable to pull the current row element's id\n")
+                return "error"
+
+    except Exception as e:
+        print("Error:: Encountered problem with the get_row_id function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return crnt_row_id
+
+
+def get_Company_prod_number(web_driver, crnt_row_id):
+
+    try:
+        # Build an xpath for the Company product number field based on the current row id
+        Company_prod_number_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+
+        try:
+            # Wait for the Company product number element in the current row to be found
+            Company_prod_num_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, Company_prod_number_path))
+        except Exception as e:
+            print("Error:: Company prod number element not found")
+            logging.error("Company prod number element not found", exc_info=True)
+            return "error"
+
+        try:
+            # Find the Company product number element in the current row
+            Company_prod_num_elmt = web_driver.find_element(By.XPATH, Company_prod_number_path)
+        except Exception as e:
+            print("Error:: WebDriver was not able to locate the Company prod number element of the current row")
+            logging.error("Error:: WebDriver was not able to locate the Company prod number element of the current row", exc_info=True)
+            return "error"
+
+        # Setting loop variable to handle wait
+        Company_prod_num_deciseconds = 0  # Loop variable
+        Company_prod_num = "webdriver_failed_to_pull_Company_prod_number"
+
+        while Company_prod_num_deciseconds < 200:  # 20 seconds
+            try:
+                # Get the Company prod number from the current row Company prod number field
+                Company_prod_num = Company_prod_num_elmt.text
+                Company_prod_num_deciseconds = 200
+                continue
+            except:
+                Company_prod_num_deciseconds += 1
+                time.sleep(.1)
+
+        if Company_prod_num == "webdriver_failed_to_pull_Company_prod_number":
+                print("Error:: Encountered problem with the get_Company_prod_number function.\n")
+                logging.error("Unable to pull the current Company product number\n")
+                return "error"
+
+    except Exception as e:
+        print("Error:: Encountered problem with the get_Company_prod_number function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    if Company_prod_num == "":
+        Company_prod_num = "blank_in_main_grid"
+
+    return Company_prod_num
+
+
+def read_network_events(web_driver):
+    """
+    Moves the network events from Chrome's performance log into the lists used by the grid data capture and the reload
+    trace.  Reading the log empties it, so both features share this function instead of reading the log themselves.
+    """
+
+    for log_entry in web_driver.get_log("performance"):
+        network_event = json.loads(log_entry["message"])["message"]
+
+        if network_event["method"] not in ("Network.responseReceived", "Network.loadingFinished"):
+            continue
+
+        if intercept_grid_data:
+            grid_network_events.append(network_event)
+        if record_reload_trace:
+            trace_network_events.append(network_event)
+
+
+def record_reload_span(web_driver, reload_kind, reload_seconds):
+    """
+    Writes one span to the reload trace for a main grid reload.  Along with the time the program spent waiting on the
+    reload, each span holds the browser's script, layout, and style recalculation time during the reload, its JS heap
+    and DOM node count, and the network timing for the requests involved (the grid data request's server wait and
+    total time).  Comparing those shows whether a slow reload was backend time, rendering time, or the program's own
+    polling.
+    """
+
+    global reload_trace_file
+    global previous_page_metrics
+
+    try:
+        if reload_trace_file is None:
+            trace_dtnow = datetime.datetime.now()
+            reload_trace_file = open(trace_path + "/" + trace_dtnow.strftime("%m.%d.%Y_%H.%M.%S") +
+                                     "_reload_trace.csv", "w")
+            reload_trace_file.write("Timestamp,Reload Kind,Reload Seconds,Requests,Bytes Received,Grid Server ms,"
+                                    "Grid Total ms,Script ms,Layout ms,Style ms,Task ms,JS Heap MB,DOM Nodes\n")
+
+        # Network timing for the requests which finished during the reload
+        read_network_events(web_driver)
+
+        request_count = 0
+        bytes_received = 0
+        grid_request_id = None
+        grid_request_start = 0
+        grid_server_ms = 0
+        grid_total_ms = 0
+
+        for network_event in trace_network_events:
+            event_params = network_event["params"]
+
+            if network_event["method"] == "Network.responseReceived":
+                response_timing = event_params["response"].get("timing")
+                if grid_data_url_pattern in event_params["response"]["url"] and response_timing:
+                    grid_request_id = event_params["requestId"]
+                    grid_request_start = response_timing["requestTime"]
+                    grid_server_ms = response_timing["receiveHeadersEnd"] - response_timing["sendEnd"]
+            else:
+                request_count += 1
+                bytes_received += event_params.get("encodedDataLength", 0)
+                if event_params["requestId"] == grid_request_id:
+                    grid_total_ms = (event_params["timestamp"] - grid_request_start) * 1000
+
+        trace_network_events.clear()
+
+        # Browser-side time spent during the reload (the duration metrics are running totals for the tab)
+        page_metrics = read_page_metrics(web_driver)
+        metric_deltas = {}
+        for metric_name in ("ScriptDuration", "LayoutDuration", "RecalcStyleDuration", "TaskDuration"):
+            metric_deltas[metric_name] = page_metrics.get(metric_name, 0) - previous_page_metrics.get(metric_name, 0)
+            if metric_deltas[metric_name] < 0:  # The tab was recycled, so the totals started over
+                metric_deltas[metric_name] = page_metrics.get(metric_name, 0)
+        previous_page_metrics = page_metrics
+
+        reload_trace_file.write(
+            datetime.datetime.now().strftime("%m/%d/%Y %H:%M:%S.%f")[:-3] + "," + reload_kind + "," +
+            format(reload_seconds, ".3f") + "," + str(request_count) + "," + str(int(bytes_received)) + "," +
+            format(grid_server_ms, ".0f") + "," + format(grid_total_ms, ".0f") + "," +
+            format(metric_deltas["ScriptDuration"] * 1000, ".0f") + "," +
+            format(metric_deltas["LayoutDuration"] * 1000, ".0f") + "," +
+            format(metric_deltas["RecalcStyleDuration"] * 1000, ".0f") + "," +
+            format(metric_deltas["TaskDuration"] * 1000, ".0f") + "," +
+            format(page_metrics.get("JSHeapUsedSize", 0) / 1048576, ".1f") + "," +
+            format(page_metrics.get("Nodes", 0), ".0f") + "\n")
+        reload_trace_file.flush()
+
+    except Exception as e:
+        logging.warning("Unable to record the reload span", exc_info=True)
+
+
+def record_product_span(product_number, product_seconds, read_source, attributes_fixed):
+    """
+    Writes one span to the product trace for a reviewed product: the time review_product took (reading, validating,
+    and correcting, including the reloads after saving), where the values were read from ("grid_data" or "cells"), and
+    the attributes corrected on the product.
+    """
+
+    global product_trace_file
+
+    try:
+        if product_trace_file is None:
+            trace_dtnow = datetime.datetime.now()
+            product_trace_file = open(trace_path + "/" + trace_dtnow.strftime("%m.%d.%Y_%H.%M.%S") +
+                                      "_product_trace.csv", "w")
+            product_trace_file.write("Timestamp,Company Product Number,Product Seconds,Read Source,Attributes Fixed\n")
+
+        product_trace_file.write(
+            datetime.datetime.now().strftime("%m/%d/%Y %H:%M:%S.%f")[:-3] + "," + product_number.replace(",", " ") +
+            "," + format(product_seconds, ".3f") + "," + read_source + "," + "|".join(attributes_fixed) + "\n")
+        product_trace_file.flush()
+
+    except Exception as e:
+        logging.warning("Unable to record the product span", exc_info=True)
+
+
+def capture_grid_data(web_driver):
+    """
+    Reads the grid data responses received since the last call from Chrome's performance log and parses the latest one
+    into per-row attribute records (see grid_data_records).  The payload holds the values the grid is rendered from,
+    including the true Start Availability Date Time, which the main grid shows as blank when the value is invalid.
+
+    Returns the number of rows captured, or 0 if no new grid data response was found (the records from the previous
+    response are dropped either way, so stale values are never used for a reloaded page).
+    """
+
+    global grid_data_records
+
+    grid_data_records = {}
+
+    try:
+        # Find the grid data requests which finished loading since the last call
+        grid_request_ids = []
+        finished_request_ids = set()
+
+        read_network_events(web_driver)
+
+        for network_event in grid_network_events:
+
+            if network_event["method"] == "Network.responseReceived":
+                if grid_data_url_pattern in network_event["params"]["response"]["url"]:
+                    grid_request_ids.append(network_event["params"]["requestId"])
+            elif network_event["method"] == "Network.loadingFinished":
+                finished_request_ids.add(network_event["params"]["requestId"])
+
+        grid_network_events.clear()
+
+        grid_request_ids = [request_id for request_id in grid_request_ids if request_id in finished_request_ids]
+
+        if not grid_request_ids:
+            return 0
+
+        # Only the latest response matches what the grid is showing
+        response_body = web_driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": grid_request_ids[-1]})
+        grid_payload = json.loads(response_body["body"])
+
+        for payload_row in grid_payload["rows"]:
+            row_cells = payload_row.get("cell", payload_row)
+            grid_record = {}
+
+            for attribute_name, field in grid_data_fields.items():
+                if isinstance(row_cells, list):
+                    attribute_value = row_cells[field]
+                else:
+                    attribute_value = row_cells.get(field)
+                grid_record[attribute_name] = "" if attribute_value is None else str(attribute_value).strip()
+
+            grid_data_records[str(payload_row["id"])] = grid_record
+
+    except Exception as e:
+        logging.warning("Unable to read the grid data response.  Reading values from the grid cells instead.",
+                        exc_info=True)
+        grid_data_records = {}
+        return 0
+
+    return len(grid_data_records)
+
+
+def normalize_grid_datetime(attrib_value):
+    """
+    Converts an ISO datetime from the grid data response (ex: "2018-02-06T00:00:01") to the format shown in the edit
+    attribute dialog (ex: "02/06/2018 00:00:01") so the usual validity checks and corrections apply.  Values already in
+    the dialog format, blanks, and anything else which can't be parsed are returned unchanged.
+    """
+
+    if len(attrib_value) < 19 or attrib_value[4] != '-' or attrib_value[10] not in ('T', ' '):
+        return attrib_value
+
+    try:
+        return datetime.datetime.strptime(attrib_value[:19].replace('T', ' '),
+                                          "%Y-%m-%d %H:%M:%S").strftime("%m/%d/%Y %H:%M:%S")
+    except ValueError:
+        return attrib_value
+
+
+def read_page_snapshot(web_driver):
+    """
+    Reads the identity of every row on the current page of the main grid in a single pass.
+
+    Returns a list of (row_number, row_id, product_identity) tuples in grid order, or "error".  The product identity is
+    the Company product number, or the row id for the rare rows where the Company product number is blank.  The main
+    program loops pick their next row from a fresh snapshot after every grid reload instead of counting rows, so a
+    product moving up or down the grid after a save is never skipped or reviewed twice.
+    """
+
+    # Make sure the main grid is not in the middle of a reload
+    if not check_lui_maingrid_click(web_driver):
+        return "error"
+
+    # Pick up the data response behind this page of the grid
+    if intercept_grid_data:
+        capture_grid_data(web_driver)
+
+    try:
+        # Wait to make sure the driver finds the table rows
+        try:
+            rows_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, "PLACEHOLDER"))
+        except Exception as e:
+            # An empty page has no rows to wait for
+            paging_info = parse_paging_info(web_driver)
+            if paging_info == 'No records to view':
+                return []
+
+            print("Error:: Main grid rows not found")
+            logging.error("Main grid rows not found", exc_info=True)
+            return "error"
+
+        page_snapshot = []
+
+        for row_number, row_elmt in enumerate(web_driver.find_elements(By.XPATH, "PLACEHOLDER"), start=1):
+            row_id = row_elmt.get_attribute('id')
+            Company_prod_num = row_elmt.find_element(By.XPATH, "./PLACEHOLDER").text
+
+            if Company_prod_num == "":
+                product_identity = "row_id:" + row_id
+            else:
+                product_identity = Company_prod_num
+
+            page_snapshot.append((row_number, row_id, product_identity))
+
+    except Exception as e:
+        print("Error:: Encountered problem with the read_page_snapshot function.\n")
+        logging.error("Exception occurred while reading the page snapshot", exc_info=True)
+        return "error"
+
+    return page_snapshot
+
+
+def get_attribute_value(web_driver, crnt_row_id, attribute_rule):
+    """
+    Reads the value of an attribute from the current row of the main grid, using the column locator from the attribute
+    rule (see attribute_rules).  Blank values are returned as "blank_in_main_grid".
+    """
+
+    attribute_label = attribute_rule["label"]
+
+    try:
+
+        # Build an xpath for the attribute field based on the current row id
+        attribute_path = "//*[@id='" + crnt_row_id + "']/" + attribute_rule["column_path"]
+
+        try:
+            # Wait for the attribute element in the current row to be found
+            attrib_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, attribute_path))
+        except Exception as e:
+            print("Error:: " + attribute_label + " not found")
+            logging.error(attribute_label + " not found", exc_info=True)
+            return "error"
+
+        try:
+            # Find the attribute element in the current row
+            attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
+        except Exception as e:
+            print("Error:: WebDriver was not able to locate the " + attribute_label + " element of the current row")
+            logging.error("WebDriver was not able to locate the " + attribute_label + " element of the current row",
+                          exc_info=True)
+            return "error"
+
+        # Setting loop variable to handle wait
+        attrib_deciseconds = 0  # Loop variable
+
+        attrib_value = "webdriver_failed_to_pull_attribute_value"
+
+        while attrib_deciseconds < 200:  # 20 seconds
+            try:
+                # Get the attribute value from the current row attribute field
+                attrib_value = attribute_elmt.get_attribute('title')
+                attrib_deciseconds = 200
+                continue
+            except:
+                attrib_deciseconds += 1
+                time.sleep(.1)
+
+        if attrib_value == "webdriver_failed_to_pull_attribute_value":
+            print("Error:: Encountered problem reading the " + attribute_label + ".\n")
+            logging.error("Unable to pull the current " + attribute_label + "\n")
+            return "error"
+
+    except Exception as e:
+        print("Error:: Encountered problem reading the " + attribute_label + ".\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    if attrib_value == "":
+        attrib_value = "blank_in_main_grid"
+
+    return attrib_value
+
+
+def get_brand_type(web_driver, crnt_row_id):
+
+    try:
+
+        # Build an xpath for the attribute field based on the current row id
+        attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+
+        try:
+            # Wait for the attribute element in the current row to be found
+            attrib_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, attribute_path))
+        except Exception as e:
+            print("Error:: brand type not found")
+            logging.error("brand type not found", exc_info=True)
+            return "error"
+
+        try:
+            # Find the attribute element in the current row
+            attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
+        except Exception as e:
+            print("Error:: WebDriver was not able to locate the brand type element of the current row")
+            logging.error("Error:: WebDriver was not able to locate the brand type element of the current row",
+                          exc_info=True)
+            return "error"
+
+        # Setting loop variable to handle wait
+        attrib_deciseconds = 0  # Loop variable
+        attrib_value = "webdriver_failed_to_pull_attribute_value"
+
+        while attrib_deciseconds < 200:  # 20 seconds
+            try:
+                # Get the attribute value from the current row attribute field
+                attrib_value = attribute_elmt.get_attribute('title')
+                attrib_deciseconds = 200
+                continue
+            except:
+                attrib_deciseconds += 1
+                time.sleep(.1)
+
+        if attrib_value == "webdriver_failed_to_pull_attribute_value":
+                print("Error:: Encountered problem with the get_brand_type function.\n")
+                logging.error("Unable to pull the current brand type\n")
+                return "error"
+
+    except Exception as e:
+        print("Error:: Encountered problem with the get_brand_type function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    if attrib_value == "":
+        attrib_value = "blank_in_main_grid"
+
+    return attrib_value
+
+
+def is_digit_string(attrib_value):
+    """
+    Checks that a value is made up of nothing but the digits 0-9.  Unlike int(), this doesn't accept signs, whitespace,
+    underscores, or non-ASCII digits, and it doesn't raise an exception for values which aren't numbers.
+    """
+
+    return attrib_value.isdigit() and attrib_value.isascii()
+
+
+def get_start_availability_year(attrib_value):
+    """
+    Pulls the year out of a start availability date time (ex: 2018 from "02/06/2018 00:00:01").
+
+    Returns the year as an integer, None if the date isn't 10 characters long or the year isn't a number, or "error" if
+    the date is missing its forward slashes.
+    """
+
+    # The date is everything before the first space, and it should be 10 characters long
+    date = attrib_value.partition(' ')[0]
+
+    if len(date) != 10:
+        return None
+
+    # Parse the date by forward slash, should yield a list with 3 elements
+    date_parsed = date.split('/')
+
+    if len(date_parsed) < 3:
+        print("Error:: Encountered problem parsing the start availability date time.\n")
+        logging.error("Start availability date time is missing the forward slashes in the date: " + attrib_value)
+        return "error"
+
+    # pull the year from the parsed date
+    year = date_parsed[2]
+
+    if not (year.isdigit() and year.isascii()):
+        return None
+
+    return int(year)
+
+
+def is_manufacturer_number_valid(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Value should be numeric
+    * Number of Digits = 6
+    """
+
+    # Blanks ("" or "blank_in_main_grid") aren't digit strings, so they are invalid
+    if attrib_value is None or not is_digit_string(attrib_value):
+        return False
+
+    # Check if manufacturer number has less than 6 characters
+    return len(attrib_value) >= 6
+
+
+def is_start_availability_valid(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * The year of the datetime can't have 00 for the first two digits (ex: can't be 0007, must be 2007)
+    * Based on product searches, oldest valid datetime has a year of 1982
+    * Parse the datetime, if year less than 1982 then it's invalid
+    * NOTE: Invalid values appear to be blank from the maingrid, so they should be considered invalid in this function
+    """
+
+    # Example of attribute value = "02/06/2018 00:00:01"
+
+    # Check if attribute value is blank
+    if attrib_value == "" or attrib_value == "blank_in_main_grid" or attrib_value is None:
+        return False
+
+    year = get_start_availability_year(attrib_value)
+
+    if year is None:
+        return False
+    elif year == "error":
+        return "error"
+
+    # check if year is within valid range
+    return year >= 1982
+
+
+def doublecheck_start_availability(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * The year of the datetime can't have 00 for the first two digits (ex: can't be 0007, must be 2007)
+    * Based on product searches, oldest valid datetime has a year of 1982
+    * Parse the datetime, if year less than 1982 then it's invalid
+    * This function is designed to check values taken from the edit attribute dialog (see main method for function call
+      and arguments). Unlike values read from the maingrid, the edit attribute dialog properly displays values for the
+      start availability date time even if they are invalid.  Therefore, blank values are considered valid in this
+      function.
+    """
+
+    # Example of attribute value = "02/06/2018 00:00:01"
+
+    # Check if attribute value is blank
+    if attrib_value == "" or attrib_value == "blank_in_main_grid" or attrib_value is None:
+        return True
+
+    year = get_start_availability_year(attrib_value)
+
+    if year is None:
+        return False
+    elif year == "error":
+        return "error"
+
+    # check if year is within valid range
+    return year >= 1982
+
+
+def is_master_gtin_valid(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * If value present, must be 14 digits long
+    * If value present and less than 14 digits, pad the front with leading zeros until it is 14 digits
+    * Blank values are allowed
+    """
+
+    # Check if the value is blank
+    if attrib_value == "blank_in_main_grid":
+        return True
+
+    if attrib_value is None or not is_digit_string(attrib_value):
+        return False
+
+    # Check if the value has valid character length
+    return len(attrib_value) == 14
+
+
+def is_net_content_blank(net_cntnt):
+    """
+    This function can be used instead of the is_net_content_valid function if the pim_net_content_fix program has
+    already been run on the record set.  It will check for the following conditions:
+    * net content is blank
+    * net content is -1
+    """
+
+    try:
+        # Variable for whether the value in net content is valid, initialized to False
+        is_blank_nc = False
+
+        # Check to see if net content is blank
+        if net_cntnt == "":
+            is_blank_nc = True
+            return is_blank_nc
+        elif net_cntnt == "blank_in_main_grid":
+            is_blank_nc = True
+            return is_blank_nc
+
+        # Check to see if net content is -1 (means the net content was previously flagged as blank)
+        elif net_cntnt == "-1":
+            is_blank_nc = True
+            return is_blank_nc
+
+    except Exception as e:
+        print("Error:: Encountered problem with the is_net_content_blank function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return is_blank_nc
+
+
+def is_Company_net_content_valid(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Maximum Number of Characters = 9
+    * No more than 2 digits to the right of the decimal
+    * Should not be blank
+    """
+
+    try:
+        # Variable for whether the value is valid, initialized to False
+        is_valid_value = False
+
+        # Check to see if the field is blank
+        if attrib_value == "":
+            return is_valid_value
+        elif attrib_value == "blank_in_main_grid":
+            return is_valid_value
+
+        # Check to see if Company net content has more than 9 characters
+        if len(attrib_value) > 9:
+            return is_valid_value
+
+        # Check to see if Company net content contains a dash
+        has_dash = False
+
+        if "-" in attrib_value:
+            has_dash = True
+
+        # Check to see if Company net content contains a decimal point
+        has_decimal = False
+
+        if "." in attrib_value:
+            has_decimal = True
+
+        # If the Company net content contains a dash, the only thing we need to check for is the character length
+        if has_dash:
+
+            if len(attrib_value) <= 9:
+                is_valid_value = True
+            else:
+                is_valid_value = False
+
+            # return now because the decimal checks and whole number checks don't matter if has_dash
+            return is_valid_value
+
+        if has_decimal:
+
+            # Parse the Company net content
+            Company_net_content_parsed = attrib_value.split('.')  # returns a list containing 2 strings
+
+            # Get the digits to the left of the decimal point
+            whole_number_digits = Company_net_content_parsed[0]  # use index to access the digits to the left of the decimal
+
+            # Get the digits to the right of the decimal point
+            decimal_digits = Company_net_content_parsed[1]  # use index to access the digits to the right of the decimal
+
+            if len(attrib_value) <= 9 and len(decimal_digits) <= 2:
+                is_valid_value = True
+
+        else:  # no decimal or dash
+
+            if len(attrib_value) <= 9:
+                is_valid_value = True
+
+    except Exception as e:
+        print("Error:: Encountered problem with the is_Company_net_content_valid function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return is_valid_value
+
+
+def calculate_manufacturer_number(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Value should be numeric
+    * Number of Digits = 6
+    * If less than 6 digits, pad the value with leading zeros
+    """
+
+    if attrib_value == "blank_in_main_grid":
+        return "000000"
+
+    try:
+
+        # capture the length of the attribute value
+        length = len(attrib_value)
+
+        if length > 6:
+            return "exceeds character limit"
+
+        if length < 6:
+            return attrib_value.zfill(6)
+
+        # check if value contains only numeric digits
+        if not is_digit_string(attrib_value):
+            return "not_a_number"
+
+    except Exception as e:
+        print("Error:: Encountered problem with the calculate_manufacturer_number function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return ""
+
+
+def calculate_master_gtin(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Value should be numeric
+    * Number of Digits = 14
+    * If less than 14 digits, pad the value with leading zeros
+    """
+
+    try:
+
+        # capture the length of the attribute value
+        length = len(attrib_value)
+
+        if length > 14:
+            return "exceeds character limit"
+
+        if length < 14:
+            return attrib_value.zfill(14)
+
+        # check if value contains only numeric digits
+        if not is_digit_string(attrib_value):
+            return "not_a_number"
+
+    except Exception as e:
+        print("Error:: Encountered problem with the calculate_master_gtin function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return ""
+
+
+def calculate_start_availability(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Parse the datetime, if year less than 1982, clear the datetime completely
+    """
+
+    return ""
+
+
+def calculate_Company_net_content(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Maximum Number of Characters = 9
+    * No more than 2 digits to the right of the decimal
+    * Should not be blank
+    ---------------------
+    * All values with more than 2 decimal digits should be modified to include only 2
+    * Blank values should be modified to -1 to show that the program has already checked the value
+
+    The attribute value should be read from the edit attribute dialog or the grid data response, since the main grid
+    doesn't show values which exceed the character limit.  Returns None if the value can't be corrected automatically.
+    """
+
+    try:
+
+        # Check to see if net content contains a dash
+        has_dash = False
+        if "-" in attrib_value:
+            has_dash = True
+
+        # Check to see if Company net content contains a decimal point
+        has_decimal = False
+        if "." in attrib_value:
+            has_decimal = True
+
+        if has_dash:
+
+            # Parse the Company net content by the dash
+            Company_net_content_parsed_dash = attrib_value.split('-')  # returns a list containing 2 strings
+
+            # Get the value to the left of the dash
+            min_value = Company_net_content_parsed_dash[0]  # use index to access the value to the left of the dash
+
+            # Get the value to the right of the dash
+            max_value = Company_net_content_parsed_dash[1]  # use index to access the value to the right of the dash
+
+            # Check the character length of the minimum value
+            if len(min_value) > 4:
+
+                # use only the first 4 digits
+                min_value = min_value[0:4]
+
+                # if the 4th character in min_value is a decimal point, remove it
+                if min_value[3] == ".":
+
+                    # use only the first 3 digits
+                    min_value = min_value[0:3]
+
+            # build the fixed value
+            fixed_attribute_value = min_value + "-" + max_value
+
+            # go ahead and return the value since the additional checks / corrections are irrelevant when has_dash
+            return fixed_attribute_value
+
+        if has_decimal:
+
+            # Parse the Company net content
+            Company_net_content_parsed = attrib_value.split('.')  # returns a list containing 2 strings
+
+            # Get the digits to the left of the decimal point
+            whole_number_digits = Company_net_content_parsed[0]  # use index to access the digits to the left of the decimal
+
+            # Get the digits to the right of the decimal point
+            decimal_digits = Company_net_content_parsed[1]  # use index to access the digits to the right of the decimal
+
+            if len(decimal_digits) > 2:
+
+                # use only the 2 digits immediately to the right of decimal
+                decimal_digits = decimal_digits[0:2]
+
+                if len(whole_number_digits) > 6:
+                    whole_number_digits = whole_number_digits[0:6]
+
+                # build the fixed value
+                fixed_attribute_value = whole_number_digits + "." + decimal_digits
+
+                return fixed_attribute_value
+
+        else:  # if no decimal (original value is blank)
+
+            # update value to -1
+            fixed_attribute_value = "-1"
+            return fixed_attribute_value
+
+    except Exception as e:
+        print("Error:: Encountered problem with the calculate_Company_net_content function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return None
+
+
+def is_net_content_valid(net_cntnt):
+    """
+    Net Content is considered invalid when it is blank or flagged as blank with a -1 (see is_net_content_blank).
+    """
+
+    net_content_blank = is_net_content_blank(net_cntnt)
+
+    if net_content_blank == "error":
+        return "error"
+
+    return not net_content_blank
+
+
+def calculate_net_content(attrib_value, Company_net_content, fixed_Company_net_content):
+    """
+    This function is designed to fill in blank values in the Net Content field based on the value from the Company Net
+    Content field.  This provides an opportunity to clear even more validation errors in Net Content for products where
+    the Net Content was blank but the Company Net Content was not.
+    * Use the Company Net Content if it is valid, or the corrected Company Net Content if it was fixed
+    * Otherwise, flag the Net Content as blank with a -1 (unless it is already -1)
+
+    Returns None if the Net Content should be left as is.
+    """
+
+    if is_Company_net_content_valid(Company_net_content) is True:
+        return Company_net_content
+
+    if fixed_Company_net_content and is_Company_net_content_valid(fixed_Company_net_content) is True:
+        return fixed_Company_net_content
+
+    if attrib_value != '-1':
+        return '-1'
+
+    return None
+
+
+def click_attribute(web_driver, crnt_row_id, attribute_rule):
+    """
+    Double-clicks an attribute field in the current row of the main grid to open the edit attribute dialog.
+    """
+
+    attribute_label = attribute_rule["label"]
+
+    # Build an xpath for the attribute field based on the current row id
+    attribute_path = "//*[@id='" + crnt_row_id + "']/" + attribute_rule["column_path"]
+
+    # Wait to make sure the driver finds the attribute field for the current record
+    try:
+        attribute_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, attribute_path))
+    except Exception as e:
+        print("Error:: WebDriver was not able to locate the " + attribute_label + " element of the current row")
+        logging.error("WebDriver was not able to locate the " + attribute_label + " element of the current row",
+                      exc_info=True)
+        return False
+
+    try:
+        # Find the attribute element in the current row
+        attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
+    except Exception as e:
+        print("Error:: WebDriver was not able to locate the " + attribute_label + " element of the current row")
+        logging.error("WebDriver was not able to locate the " + attribute_label + " element of the current row",
+                      exc_info=True)
+        return False
+
+    # If frame is scrolled so attribute field is not visible, will scroll to the attribute element
+    try:
+
+        # Scroll to the element
+        ActionChains(web_driver) \
+            .scroll_to_element(attribute_elmt) \
+            .perform()
+
+    except Exception as e:
+        print("Error:: could not scroll to " + attribute_label + " field")
+        logging.error("could not scroll to " + attribute_label + " field", exc_info=True)
+        return False
+
+    # Make sure the main grid has finished loading
+    if not check_lui_maingrid_click(web_driver):
+        return False
+
+    try:
+        # Double-click the attribute field
+        dbl_click_action = ActionChains(web_driver)
+        dbl_click_action.double_click(attribute_elmt).perform()
+
+    except Exception as e:
+        print("Error:: WebDriver was not able to double-click the " + attribute_label + " field")
+        logging.error("WebDriver was not able to double-click the " + attribute_label + " field", exc_info=True)
+        return False
+
+    # When function completes without any errors
+    return True
+
+
+def open_edit_dialog(web_driver, attribute_rule):
+    """
+    Waits for the edit attribute dialog opened by click_attribute, makes sure it is editing the attribute from the
+    attribute rule, and switches to the cell edit iframe.  Returns the attribute value field, or False.
+    """
+
+    edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
+    dialog_title = attribute_rule["dialog_title"]
+
+    # Wait to make sure the driver finds the edit attribute dialog
+    try:
+        edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, edit_attrib_path))
+    except Exception as e:
+        print("Error:: Edit Attribute dialog not found")
+        logging.error("Edit Attribute dialog not found", exc_info=True)
+        return False
+
+    # Setting loop variable to handle wait
+    edit_attrib_deciseconds = 0  # Loop variable
+
+    # Waiting until the edit attribute dialog display switches to block in the DOM
+    while edit_attrib_deciseconds < 200:  # 20 seconds
+        try:
+
+            # Locate the edit attribute dialog element
+            edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
+            edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+
+            if "display: block" in edit_elmt_display:
+                edit_attrib_deciseconds = 200
+                continue
+            else:
+                edit_attrib_deciseconds += 1
+                time.sleep(.1)
+        except:
+            logging.error("edit attribute dialog display never shifted to block\n")
+            return False
+
+    # Wait to make sure the driver finds the edit attribute dialog
+    try:
+        edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
+    except Exception as e:
+        print("Error:: Edit Attribute dialog not found")
+        logging.error("Edit Attribute dialog not found", exc_info=True)
+        return False
+
+    try:
+        # Find the edit attribute dialog
+        edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+    except Exception as e:
+        print("Error:: WebDriver was not able to locate the edit attribute dialog")
+        logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
+        return False
+
+    # Setting loop variable to handle wait
+    edit_title_deciseconds = 0  # Loop variable
+
+    # Waiting until the edit attribute title includes the attribute name
+    while edit_title_deciseconds < 200:  # 20 seconds
+        try:
+            if dialog_title in edit_attribute_dialog.text:
+                edit_title_deciseconds = 200
+                continue
+        except:
+            pass
+        edit_title_deciseconds += 1
+        time.sleep(0.1)
+
+    # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
+    edit_attribute_title = edit_attribute_dialog.text
+
+    if edit_attribute_title != dialog_title:
+        print("Error:: The attribute selected was not " + dialog_title)
+        logging.error("The attribute selected was not " + dialog_title)
+        return False
+
+    # Wait to make sure the driver finds the cell edit iframe
+    try:
+        cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
+    except Exception as e:
+        print("Error:: Cell Edit iframe not found")
+        logging.error("Cell Edit iframe not found", exc_info=True)
+        return False
+
+    # Switch to the cell edit iframe
+    iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
+    web_driver.switch_to.frame(iframe)
+
+    # Wait to make sure the driver finds the attribute value field
+    try:
+        attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
+    except Exception as e:
+        print("Error:: Attribute Value field not found")
+        logging.error("Attribute Value field not found", exc_info=True)
+        return False
+
+    try:
+        # Find the attribute value field
+        attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+    except Exception as e:
+        print("Error:: WebDriver was not able to locate the attribute value field")
+        logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
+        return False
+
+    return attribute_value_field
+
+
+def close_edit_dialog(web_driver, button_name):
+    """
+    Clicks the Save or Cancel button of the edit attribute dialog, switches back to the main grid iframe, and waits for
+    the dialog to leave the DOM.
+    """
+
+    edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
+
+    # Wait to make sure the driver finds the button
+    try:
+        button_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
+    except Exception as e:
+        print("Error:: " + button_name + " button not found")
+        logging.error(button_name + " button not found", exc_info=True)
+        return False
+
+    try:
+        # Find the button
+        dialog_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+    except Exception as e:
+        print("Error:: WebDriver was not able to locate the " + button_name + " button")
+        logging.error("WebDriver was not able to locate the " + button_name + " button", exc_info=True)
+        return False
+
+    # Click the button
+    dialog_button.click()
+
+    # Wait to make sure the driver finds the maingrid iframe
+    try:
+        maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
+    except Exception as e:
+        print("Error:: maingrid iframe not found")
+        logging.error("maingrid iframe not found", exc_info=True)
+        return False
+
+    # Switch to the main grid iframe
+    iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
+    web_driver.switch_to.frame(iframe)
+
+    # Setting loop variable to handle wait
+    edit_attrib_deciseconds = 0  # Loop variable
+
+    # Used in loop below
+    is_edit_attrib_closed = False
+
+    # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
+    while edit_attrib_deciseconds < 200:  # 20 seconds
+        # For this situation the except code block is the outcome we're looking for
+        try:
+            # Check to see if web driver finds the element
+            edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
+            edit_attrib_deciseconds += 1
+            time.sleep(.1)
+        except:
+            is_edit_attrib_closed = True
+            edit_attrib_deciseconds = 200
+            continue
+
+    if not is_edit_attrib_closed:
+        print("Error:: Encountered problem with the close_edit_dialog function.\n")
+        logging.error("The edit attribute dialog never left the DOM")
+        return False
+
+    return True
+
+
+def read_attribute_dialog(web_driver, crnt_row_id, attribute_rule):
+    """
+    Reads the full value of an attribute from the edit attribute dialog and cancels out of the dialog.  The dialog is
+    the only place in the UI which shows values that exceed the character limit or fail validation (the main grid shows
+    some of those as blank).
+    """
+
+    attribute_label = attribute_rule["label"]
+
+    # Double-click the attribute field to open the edit attribute dialog
+    if not click_attribute(web_driver, crnt_row_id, attribute_rule):
+        print("Error:: WebDriver was not able to double-click the " + attribute_label + " element of the current row")
+        logging.error("WebDriver was not able to double-click the " + attribute_label + " element of the current row")
+        return "error"
+
+    try:
+        attribute_value_field = open_edit_dialog(web_driver, attribute_rule)
+
+        if attribute_value_field is False:
+            return "error"
+
+        # Retrieve the value from the attribute value field
+        if attribute_rule["dialog_value_attribute"] == "text":
+            original_attribute_value = attribute_value_field.text
+        else:
+            original_attribute_value = attribute_value_field.get_attribute(attribute_rule["dialog_value_attribute"])
+
+        if not close_edit_dialog(web_driver, "Cancel"):
+            return "error"
+
+    except Exception as e:
+        print("Error:: WebDriver was not able to retrieve the " + attribute_label + " value")
+        logging.error("WebDriver was not able to retrieve the " + attribute_label + " value", exc_info=True)
+        return "error"
+
+    return original_attribute_value
+
+
+def update_attribute_value(attrib_value, web_driver, attribute_rule):
+    """
+    Enters the corrected value in the edit attribute dialog opened by click_attribute and saves it.  An empty value
+    clears the attribute.
+    """
+
+    attribute_label = attribute_rule["label"]
+
+    try:
+        attribute_value_field = open_edit_dialog(web_driver, attribute_rule)
+
+        if attribute_value_field is False:
+            return False
+
+        try:
+            # Clear the existing attribute value input text
+            attribute_value_field.clear()
+
+            # Enter the fixed attribute value
+            if attrib_value != "":
+                attribute_value_field.send_keys(attrib_value)
+
+        except:
+            # Back out of the dialog without saving
+            close_edit_dialog(web_driver, "Cancel")
+            return False
+
+        return close_edit_dialog(web_driver, "Save")
+
+    except Exception as e:
+        print("Error:: Exception encountered when attempting to update the " + attribute_label)
+        logging.error("Exception encountered when attempting to update the " + attribute_label, exc_info=True)
+        return False
+
+
+"""
+Attribute Rules
+---
+Each attribute the program cleans up is described by one entry in attribute_rules.  The entries are listed in the
+order the attributes are corrected (Net Content is filled in from the Company Net Content, so it comes last).
+
+    name:                   attribute name, as used in the grid data fields and the validation filters
+    label:                  name used in messages
+    column_path:            xpath of the attribute cell, relative to the row of the main grid
+    dialog_title:           title of the edit attribute dialog for the attribute
+    dialog_value_attribute: where the edit attribute dialog keeps the value ("value" or "text")
+    validator:              function(value) returning True, False, or "error"
+    dialog_validator:       if the main grid can hide invalid values, function(value) used to double-check the value
+                            from the edit attribute dialog, otherwise None
+    calculator:             function(value) returning the corrected value, None if the value should be left as is, or
+                            "error" (function(value, source value, corrected source value) if depends_on is set)
+    calculate_from_dialog:  True if the corrected value has to be calculated from the full value in the edit attribute
+                            dialog rather than the value shown in the main grid
+    depends_on:             name of the attribute whose value is used to calculate this one, otherwise None
+    audit_columns:          (reviewed column, original column, corrected column) for the activity files
+    audit_position:         position of the attribute's columns in the activity files
+
+Adding an attribute means adding an entry here.  review_product drives reading, validating, calculating, and updating
+every attribute from these entries.
+
+Attribute values repeat heavily across the catalog (blank values, -1, the same net content ranges), so the validators
+and calculators in the entries are wrapped in a least recently used cache (see init_correction_cache).  Each function
+keeps the results for up to correction_cache_size distinct values, so a value which has been checked before for the
+same attribute is a dictionary lookup instead of another round of parsing.  The functions only depend on their
+arguments, which is what makes this safe.  "error" results aren't cached, so the value is checked again the next time
+it comes up.
+"""
+
+attribute_rules = [
+    {"name": "Manufacturer Number",
+     "label": "manufacturer number",
+     "column_path": "PLACEHOLDER",
+     "dialog_title": "Manufacturer Number",
+     "dialog_value_attribute": "value",
+     "validator": is_manufacturer_number_valid,
+     "dialog_validator": None,
+     "calculator": calculate_manufacturer_number,
+     "calculate_from_dialog": False,
+     "depends_on": None,
+     "audit_columns": ("Manufacturer Number", "Original Manufacturer Number", "Corrected Manufacturer"),
+     "audit_position": 1},
+    {"name": "Start Availability Date Time",
+     "label": "start availability date time",
+     "column_path": "PLACEHOLDER",
+     "dialog_title": "Start Availability Date Time",
+     "dialog_value_attribute": "value",
+     "validator": is_start_availability_valid,
+     "dialog_validator": doublecheck_start_availability,
+     "calculator": calculate_start_availability,
+     "calculate_from_dialog": False,
+     "depends_on": None,
+     "audit_columns": ("Start Availability Date Time", "Original Start Availability Date Time",
+                       "Corrected Start Availability Date Time"),
+     "audit_position": 2},
+    {"name": "Master GTIN",
+     "label": "master gtin",
+     "column_path": "PLACEHOLDER",
+     "dialog_title": "Master GTIN",
+     "dialog_value_attribute": "value",
+     "validator": is_master_gtin_valid,
+     "dialog_validator": None,
+     "calculator": calculate_master_gtin,
+     "calculate_from_dialog": False,
+     "depends_on": None,
+     "audit_columns": ("Master GTIN", "Original Master GTIN", "Corrected Master GTIN"),
+     "audit_position": 3},
+    {"name": "Company Net Content",
+     "label": "Company net content",
+     "column_path": "PLACEHOLDER",
+     "dialog_title": "Company Net Content",
+     "dialog_value_attribute": "text",
+     "validator": is_Company_net_content_valid,
+     "dialog_validator": None,
+     "calculator": calculate_Company_net_content,
+     "calculate_from_dialog": True,
+     "depends_on": None,
+     "audit_columns": ("Company Net Content", "Original Company Net Content", "Corrected Company Net Content"),
+     "audit_position": 5},
+    {"name": "Net Content",
+     "label": "net content",
+     "column_path": "PLACEHOLDER",
+     "dialog_title": "Net Content",
+     "dialog_value_attribute": "value",
+     "validator": is_net_content_valid,
+     "dialog_validator": None,
+     "calculator": calculate_net_content,
+     "calculate_from_dialog": False,
+     "depends_on": "Company Net Content",
+     "audit_columns": ("Net Content", "Original Net Content", "Corrected Net Content"),
+     "audit_position": 4},
+]
+
+
+class UncachedCorrectionResult(Exception):
+    """
+    Raised inside the correction cache for an "error" result, since lru_cache doesn't keep results which raise.
+    """
+
+
+def cache_correction_function(correction_function):
+    """
+    Wraps a validator or calculator in a least recently used cache of correction_cache_size results which leaves out
+    "error" results.
+    """
+
+    def raise_on_error(*arguments):
+        correction_result = correction_function(*arguments)
+        if correction_result == "error":
+            raise UncachedCorrectionResult
+        return correction_result
+
+    cached_function = functools.lru_cache(maxsize=correction_cache_size)(raise_on_error)
+
+    @functools.wraps(correction_function)
+    def cached_correction_function(*arguments):
+        try:
+            return cached_function(*arguments)
+        except UncachedCorrectionResult:
+            return "error"
+
+    cached_correction_function.cache_info = cached_function.cache_info
+    cached_correction_function.cache_clear = cached_function.cache_clear
+
+    return cached_correction_function
+
+
+def init_correction_cache():
+    """
+    Wraps the validators and calculators in attribute_rules in a fresh correction cache sized by correction_cache_size.
+    Called when the module is loaded and again when correction_cache_size is changed (see CleanupEngine.configure),
+    which also starts the cache statistics over.
+    """
+
+    for attribute_rule in attribute_rules:
+        for function_name in ["validator", "dialog_validator", "calculator"]:
+            if attribute_rule[function_name] is not None:
+                # Wrap the original function, not the previous cache
+                correction_function = getattr(attribute_rule[function_name], "__wrapped__",
+                                              attribute_rule[function_name])
+                attribute_rule[function_name] = cache_correction_function(correction_function)
+
+
+init_correction_cache()
+
+
+def get_correction_cache_stats():
+    """
+    Returns the correction cache hits and misses for each attribute, totalled across the attribute's validators and
+    calculator: {attribute: (hits, misses)}
+    """
+
+    cache_stats = {}
+
+    for attribute_rule in attribute_rules:
+        cache_hits = 0
+        cache_misses = 0
+
+        for function_name in ["validator", "dialog_validator", "calculator"]:
+            if attribute_rule[function_name] is not None:
+                cache_info = attribute_rule[function_name].cache_info()
+                cache_hits += cache_info.hits
+                cache_misses += cache_info.misses
+
+        cache_stats[attribute_rule["name"]] = (cache_hits, cache_misses)
+
+    return cache_stats
+
+
+# Attribute rules in the order their columns appear in the activity files
+audit_rules = sorted(attribute_rules, key=lambda attribute_rule: attribute_rule["audit_position"])
+
+# Header rows of the reviewed and corrected record files
+reviewed_header = ["Company Product Number"] + [attribute_rule["audit_columns"][0] for attribute_rule in audit_rules]
+fixed_header = ["Company Product Number"]
+for attribute_rule in audit_rules:
+    fixed_header.extend(attribute_rule["audit_columns"][1:])
+
+
+"""
+Audit Tables
+---
+The reviewed and corrected rows are kept column by column rather than as lists of strings.  The attribute values repeat
+heavily ("blank_in_main_grid", "-1", blanks, the same net contents and manufacturer numbers), so every value is stored
+once in a ValueDictionary and the columns only hold 4-byte codes.  That keeps hundreds of thousands of products to a
+fraction of the memory of a list of strings per row, and a report can read one column without decoding the rest.
+"""
+
+
+class ValueDictionary:
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+        # The most common values get the first codes
+        for common_value in ["", "blank_in_main_grid", "-1"]:
+            self.encode(common_value)
+
+    def encode(self, value):
+
+        code = self.codes.get(value)
+
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+
+        return code
+
+    def decode(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class AuditTable:
+
+    __slots__ = ("column_names", "value_dictionary", "columns")
+
+    def __init__(self, column_names, value_dictionary):
+        self.column_names = list(column_names)
+        self.value_dictionary = value_dictionary
+        self.columns = [array.array('I') for column_name in self.column_names]
+
+    def append(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(self.value_dictionary.encode(value))
+
+    def get_row(self, row_index):
+        values = self.value_dictionary.values
+        return [values[column[row_index]] for column in self.columns]
+
+    def get_rows(self):
+        values = self.value_dictionary.values
+        return [[values[code] for code in row_codes] for row_codes in zip(*self.columns)]
+
+    def get_column(self, column_name):
+        values = self.value_dictionary.values
+        return [values[code] for code in self.columns[self.column_names.index(column_name)]]
+
+    def count_values(self, column_name):
+        """
+        Returns how many rows hold each value in a column: {value: count}.  Counts the codes before decoding them, so
+        it's cheap even for large tables.
+        """
+
+        code_counts = collections.Counter(self.columns[self.column_names.index(column_name)])
+        return {self.value_dictionary.decode(code): count for code, count in code_counts.items()}
+
+    def __len__(self):
+        return len(self.columns[0])
+
+
+"""
+Run Recorder
+---
+The run results (the product counters and the rows for the reviewed and corrected record files) are owned by a single
+RunRecorder.  The record methods only put an update on a queue, so any thread can report into it without waiting, and a
+writer thread applies the updates in order.  Readers like the activity summary, save_and_quit, and CleanupEngine get a
+consistent snapshot once the updates queued before the call have been applied.
+"""
+
+
+class RunRecorder:
+
+    def __init__(self, reviewed_header_row, fixed_header_row):
+
+        # The reviewed and corrected rows share one dictionary since the original values appear in both
+        self.value_dictionary = ValueDictionary()
+        self.reviewed_rows = AuditTable(reviewed_header_row, self.value_dictionary)
+        self.fixed_rows = AuditTable(fixed_header_row, self.value_dictionary)
+        self.items_reviewed = 0
+        self.items_fixed = 0
+        self.errors_fixed = 0
+
+        self.update_queue = queue.SimpleQueue()
+        self.state_lock = threading.Lock()
+
+        # The writer thread is started with the first update so importing the module doesn't start a thread
+        self.writer_lock = threading.Lock()
+        self.writer_thread = None
+
+        # Functions called with (table name, row) on the writer thread as rows are recorded.  They're called after
+        # state_lock is released, so a slow listener (like a columnar file writing a row group) doesn't hold up readers.
+        self.row_listeners = []
+
+    def put_update(self, update):
+
+        if self.writer_thread is None:
+            with self.writer_lock:
+                if self.writer_thread is None:
+                    self.writer_thread = threading.Thread(target=self.write_updates, daemon=True)
+                    self.writer_thread.start()
+
+        self.update_queue.put(update)
+
+    def record_reviewed(self, reviewed_row):
+        self.put_update(("reviewed", reviewed_row))
+
+    def record_error_fixed(self):
+        self.put_update(("error_fixed", None))
+
+    def record_fixed(self, fixed_row):
+        self.put_update(("fixed", fixed_row))
+
+    def write_updates(self):
+
+        while True:
+            update_type, update_data = self.update_queue.get()
+
+            if update_type == "flush":
+                update_data.set()
+                continue
+
+            with self.state_lock:
+                if update_type == "reviewed":
+                    self.reviewed_rows.append(update_data)
+                    self.items_reviewed += 1
+                elif update_type == "error_fixed":
+                    self.errors_fixed += 1
+                elif update_type == "fixed":
+                    self.fixed_rows.append(update_data)
+                    self.items_fixed += 1
+
+                row_listeners = list(self.row_listeners) if update_type != "error_fixed" else []
+
+            for row_listener in row_listeners:
+                try:
+                    row_listener(update_type, update_data)
+                except Exception as e:
+                    logging.error("Exception occurred in a run recorder row listener.", exc_info=True)
+
+    def add_row_listener(self, row_listener):
+        with self.state_lock:
+            self.row_listeners.append(row_listener)
+
+    def remove_row_listener(self, row_listener):
+        """
+        Stops calling a row listener once the rows queued so far have been passed to it.
+        """
+
+        self.wait_for_writer("remove_row_listener")
+
+        with self.state_lock:
+            self.row_listeners.remove(row_listener)
+
+    def flush(self, timeout=10):
+        """
+        Waits until the updates queued so far have been applied.  Returns False if the writer didn't catch up in time.
+        """
+
+        if self.writer_thread is None:
+            return True
+
+        flushed = threading.Event()
+        self.update_queue.put(("flush", flushed))
+
+        return flushed.wait(timeout)
+
+    def wait_for_writer(self, reader_name):
+        """
+        Flushes before a read and reports it if the writer thread didn't catch up, since the read may then be missing
+        the latest updates.
+        """
+
+        if self.flush():
+            return True
+
+        print("Error:: The run results were read before every update was recorded (" + reader_name + ").")
+        logging.error("Run recorder flush timed out in " + reader_name + ".  " + str(self.update_queue.qsize()) +
+                      " updates were still queued.")
+        return False
+
+    def get_counts(self):
+        """
+        Returns (products reviewed, products fixed, errors fixed).
+        """
+
+        self.wait_for_writer("get_counts")
+
+        with self.state_lock:
+            return self.items_reviewed, self.items_fixed, self.errors_fixed
+
+    def get_snapshot(self):
+        """
+        Returns copies of the counters and the reviewed and corrected rows (header row first).
+        """
+
+        self.wait_for_writer("get_snapshot")
+
+        with self.state_lock:
+            return {"items_reviewed": self.items_reviewed,
+                    "items_fixed": self.items_fixed,
+                    "errors_fixed": self.errors_fixed,
+                    "reviewed": [list(self.reviewed_rows.column_names)] + self.reviewed_rows.get_rows(),
+                    "fixed": [list(self.fixed_rows.column_names)] + self.fixed_rows.get_rows()}
+
+    def count_values(self, table_name, column_name):
+        """
+        Returns how many products hold each value in a column of the "reviewed" or "fixed" rows: {value: count}.
+        """
+
+        self.wait_for_writer("count_values")
+
+        with self.state_lock:
+            if table_name == "reviewed":
+                return self.reviewed_rows.count_values(column_name)
+            return self.fixed_rows.count_values(column_name)
+
+
+# Run results for this process
+run_recorder = RunRecorder(reviewed_header, fixed_header)
+
+
+"""
+Audit Store
+---
+Optional SQLite database which keeps the review and correction history of every run in one place, so questions like
+"what was the original value of this product" or "what changed last week" don't mean grepping hundreds of csv files.
+Turn it on by setting audit_store_path.  Every reviewed product gets one row per attribute with the run id, time, and
+original value, plus the corrected value for the attributes the program fixed.  Rows are indexed by product number and
+by attribute.
+
+The database runs in WAL mode so it can be queried while a run is writing to it, and the writes are batched into
+transactions by a background thread (see AuditStore) so the main program loop never waits on the disk.  The csv files
+for any run can be generated from it again (see export_audit_run).
+
+    python pim_data_cleanup.py --product-history 100001
+"""
+
+# Path of the SQLite audit store, or None to turn it off
+audit_store_path = None
+
+# Most rows written in one transaction, and the longest a row waits in the queue before its transaction is committed
+audit_store_batch_size = 500
+audit_store_commit_seconds = 1.0
+
+
+class AuditStore:
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self.run_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + str(os.getpid())
+        self.review_number = 0
+        self.write_queue = queue.SimpleQueue()
+
+        # Set up the tables and register the run before handing the connection over to the writer thread
+        connection = open_audit_store(store_path)
+        with connection:
+
+            # A run started again within the same second (like a CleanupEngine run after save) gets a numbered run id
+            run_id = self.run_id
+            run_number = 1
+            while connection.execute("SELECT 1 FROM runs WHERE run_id = ?", (self.run_id,)).fetchone():
+                run_number += 1
+                self.run_id = run_id + "_" + str(run_number)
+
+            connection.execute("INSERT INTO runs (run_id, started_at) VALUES (?, ?)",
+                               (self.run_id, get_audit_timestamp()))
+        connection.close()
+
+        self.writer_thread = threading.Thread(target=self.write_rows, daemon=True)
+        self.writer_thread.start()
+
+    def record_product(self, product_number, product_values, attributes_fixed):
+        """
+        Queues one row per attribute for a reviewed product.  product_values is the {attribute: {"original", "fixed"}}
+        dictionary from review_product, and the corrected value is only kept for the attributes in attributes_fixed.
+        """
+
+        self.review_number += 1
+        recorded_at = get_audit_timestamp()
+
+        for attribute_rule in audit_rules:
+            attribute_name = attribute_rule["name"]
+            attribute_values = product_values[attribute_name]
+
+            if attribute_name in attributes_fixed:
+                corrected_value = attribute_values["fixed"]
+            else:
+                corrected_value = None
+
+            self.write_queue.put((self.run_id, self.review_number, recorded_at, product_number, attribute_name,
+                                  attribute_values["original"], corrected_value))
+
+    def write_rows(self):
+
+        connection = open_audit_store(self.store_path)
+        is_closing = False
+
+        while not is_closing:
+
+            # Wait for the first row of the next batch, then collect rows until the batch is full or old enough
+            audit_row = self.write_queue.get()
+            batch_deadline = time.perf_counter() + audit_store_commit_seconds
+            audit_rows = []
+
+            while True:
+                if audit_row is None:
+                    is_closing = True
+                    break
+
+                audit_rows.append(audit_row)
+
+                if len(audit_rows) >= audit_store_batch_size:
+                    break
+
+                try:
+                    audit_row = self.write_queue.get(timeout=max(batch_deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+
+            if not audit_rows:
+                continue
+
+            try:
+                with connection:
+                    connection.executemany("INSERT INTO audit_values (run_id, review_number, recorded_at, "
+                                           "product_number, attribute, original_value, corrected_value) "
+                                           "VALUES (?, ?, ?, ?, ?, ?, ?)", audit_rows)
+            except Exception as e:
+                print("Error:: Exception occurred while writing to the audit store.")
+                logging.error("Exception occurred while writing " + str(len(audit_rows)) + " rows to the audit store.",
+                              exc_info=True)
+
+        # Mark the run as finished
+        try:
+            with connection:
+                connection.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                                   (get_audit_timestamp(), self.run_id))
+            connection.close()
+        except Exception as e:
+            logging.error("Exception occurred while closing the audit store.", exc_info=True)
+
+    def close(self, timeout=30):
+        """
+        Writes the rows still in the queue and closes the store.  Returns False if the writer didn't finish in time.
+        """
+
+        self.write_queue.put(None)
+        self.writer_thread.join(timeout)
+
+        return not self.writer_thread.is_alive()
+
+
+# Audit store for this run, or None if it's turned off (see init_audit_store)
+audit_store = None
+
+
+def get_audit_timestamp():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def open_audit_store(store_path):
+    """
+    Opens the SQLite audit store in WAL mode, creating the tables and indexes if they don't exist yet.
+    """
+
+    connection = sqlite3.connect(store_path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    with connection:
+        connection.execute("CREATE TABLE IF NOT EXISTS runs ("
+                           "run_id TEXT PRIMARY KEY, started_at TEXT, finished_at TEXT)")
+        connection.execute("CREATE TABLE IF NOT EXISTS audit_values ("
+                           "run_id TEXT, review_number INTEGER, recorded_at TEXT, product_number TEXT, attribute TEXT, "
+                           "original_value TEXT, corrected_value TEXT)")
+        connection.execute("CREATE INDEX IF NOT EXISTS audit_values_product ON audit_values (product_number)")
+        connection.execute("CREATE INDEX IF NOT EXISTS audit_values_attribute ON audit_values (attribute, recorded_at)")
+        connection.execute("CREATE INDEX IF NOT EXISTS audit_values_run ON audit_values (run_id, review_number)")
+
+    return connection
+
+
+def init_audit_store():
+    """
+    Opens the audit store for the run if audit_store_path is set.  A problem with the store is logged and the run
+    carries on without it, since the csv files are still saved.
+    """
+
+    global audit_store
+
+    if audit_store_path is None or audit_store is not None:
+        return
+
+    try:
+        audit_store = AuditStore(audit_store_path)
+        logging.info("Recording to the audit store " + audit_store_path + " as run " + audit_store.run_id)
+
+    except Exception as e:
+        print("Error:: Unable to open the audit store.  Continuing without it.")
+        logging.error("Unable to open the audit store " + str(audit_store_path), exc_info=True)
+        audit_store = None
+
+
+def close_audit_store():
+
+    global audit_store
+
+    if audit_store is None:
+        return
+
+    if not audit_store.close():
+        logging.error("The audit store writer did not finish within the time limit")
+
+    audit_store = None
+
+
+def find_product_history(store_path, product_number):
+    """
+    Returns every recorded value of a product across runs, oldest first, as
+    (run_id, recorded_at, attribute, original_value, corrected_value) tuples.
+    """
+
+    connection = open_audit_store(store_path)
+
+    try:
+        return connection.execute("SELECT run_id, recorded_at, attribute, original_value, corrected_value "
+                                  "FROM audit_values WHERE product_number = ? ORDER BY recorded_at, review_number",
+                                  (product_number,)).fetchall()
+    finally:
+        connection.close()
+
+
+def find_corrections_since(store_path, since_timestamp, attribute_name=None):
+    """
+    Returns the corrections made since a "YYYY-MM-DD HH:MM:SS" timestamp, optionally for one attribute, as
+    (recorded_at, product_number, attribute, original_value, corrected_value) tuples.
+    """
+
+    query = ("SELECT recorded_at, product_number, attribute, original_value, corrected_value FROM audit_values "
+             "WHERE corrected_value IS NOT NULL AND recorded_at >= ?")
+    parameters = [since_timestamp]
+
+    if attribute_name is not None:
+        query += " AND attribute = ?"
+        parameters.append(attribute_name)
+
+    connection = open_audit_store(store_path)
+
+    try:
+        return connection.execute(query + " ORDER BY recorded_at", parameters).fetchall()
+    finally:
+        connection.close()
+
+
+def export_audit_run(store_path, run_id):
+    """
+    Generates the reviewed and corrected csv files for a run from the audit store, in the same layout as the files
+    saved by save_and_quit.  Returns the (reviewed file, corrected file) paths, or "error".
+    """
+
+    try:
+        connection = open_audit_store(store_path)
+
+        try:
+            audit_rows = connection.execute("SELECT review_number, product_number, attribute, original_value, "
+                                            "corrected_value FROM audit_values WHERE run_id = ? "
+                                            "ORDER BY review_number", (run_id,)).fetchall()
+        finally:
+            connection.close()
+
+        # Group the attribute rows by product review
+        product_reviews = {}
+        for review_number, product_number, attribute_name, original_value, corrected_value in audit_rows:
+            product_review = product_reviews.setdefault(review_number, [product_number, {}])
+            product_review[1][attribute_name] = (original_value, corrected_value)
+
+        reviewed_rows = [reviewed_header]
+        fixed_rows = [fixed_header]
+
+        for product_number, attribute_values in product_reviews.values():
+            reviewed_rows.append([product_number] + [attribute_values[attribute_rule["name"]][0]
+                                                     for attribute_rule in audit_rules])
+
+            if any(corrected_value is not None for original_value, corrected_value in attribute_values.values()):
+                fixed_row = [product_number]
+                for attribute_rule in audit_rules:
+                    original_value, corrected_value = attribute_values[attribute_rule["name"]]
+                    fixed_row.extend([original_value, corrected_value or ""])
+                fixed_rows.append(fixed_row)
+
+        reviewed_file_path = reviewed_path + "/" + run_id + "_audit_store_reviewed.csv"
+        corrected_file_path = corrected_path + "/" + run_id + "_audit_store_fixed.csv"
+
+        numpy.savetxt(reviewed_file_path, numpy.array(reviewed_rows, dtype=str), fmt='%s', delimiter=",")
+        numpy.savetxt(corrected_file_path, numpy.array(fixed_rows, dtype=str), fmt='%s', delimiter=",")
+
+    except Exception as e:
+        print("Error:: Exception occurred while exporting run " + str(run_id) + " from the audit store.")
+        logging.error("Exception occurred while exporting run " + str(run_id) + " from the audit store.",
+                      exc_info=True)
+        return "error"
+
+    return reviewed_file_path, corrected_file_path
+
+
+"""
+
+Columnar Export
+---
+The reviewed and corrected record files run to millions of rows, and parsing csv is most of the time it takes to load
+them into pandas.  Setting columnar_export_format to "parquet" or "arrow" also streams the rows into compressed
+columnar files next to the csv files while the run is going, one row group (record batch) every
+columnar_row_group_size rows, so a run that is stopped early still leaves readable files.  load_columnar_file
+memory-maps them back in, and convert_csv_to_columnar converts the csv files saved by earlier runs:
+
+    python pim_data_cleanup.py --convert-csv "Reviewed Files/09.06.2023_08.00.00_data_cleanup_reviewed.csv"
+
+Every column is kept as a string, the same as in the csv files.  Needs the pyarrow package.
+"""
+
+# "parquet", "arrow" (Arrow IPC file), or None to only save the csv files
+columnar_export_format = None
+
+# Rows per row group (record batch) in the columnar files
+columnar_row_group_size = 10000
+
+# Compression codec for the columnar files
+columnar_compression = "zstd"
+
+# File extension for each columnar format
+columnar_extensions = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+class ColumnarWriter:
+
+    def __init__(self, file_path, column_names, export_format):
+
+        self.file_path = file_path
+        self.column_names = list(column_names)
+        self.export_format = export_format
+        self.schema = pyarrow.schema([(column_name, pyarrow.string()) for column_name in self.column_names])
+        self.buffered_columns = [[] for column_name in self.column_names]
+        self.row_count = 0
+
+        if export_format == "parquet":
+            self.file_writer = pyarrow.parquet.ParquetWriter(file_path, self.schema, compression=columnar_compression)
+        else:
+            self.file_writer = pyarrow.ipc.new_file(
+                file_path, self.schema, options=pyarrow.ipc.IpcWriteOptions(compression=columnar_compression))
+
+    def write_row(self, row):
+
+        for column_values, value in zip(self.buffered_columns, row):
+            column_values.append(str(value))
+
+        if len(self.buffered_columns[0]) >= columnar_row_group_size:
+            self.write_row_group()
+
+    def write_batch(self, record_batch):
+        self.file_writer.write_table(pyarrow.Table.from_batches([record_batch], schema=self.schema))
+        self.row_count += record_batch.num_rows
+
+    def write_row_group(self):
+
+        if not self.buffered_columns[0]:
+            return
+
+        self.write_batch(pyarrow.record_batch(self.buffered_columns, schema=self.schema))
+        self.buffered_columns = [[] for column_name in self.column_names]
+
+    def close(self):
+        self.write_row_group()
+        self.file_writer.close()
+
+
+# Columnar files for this run, or None if the export is turned off (see init_columnar_export)
+columnar_writers = None
+
+
+def init_columnar_export():
+    """
+    Opens the columnar files for the run if columnar_export_format is set.  A problem with the export is logged and the
+    run carries on without it, since the csv files are still saved.
+    """
+
+    global columnar_writers
+
+    if columnar_export_format is None or columnar_writers is not None:
+        return
+
+    if pyarrow is None:
+        print("Error:: The pyarrow package is needed for the columnar export.  Continuing without it.")
+        logging.error("columnar_export_format is set but the pyarrow package is not installed")
+        return
+
+    if columnar_export_format not in columnar_extensions:
+        print("Error:: Unknown columnar export format " + str(columnar_export_format) + ".  Continuing without it.")
+        logging.error("Unknown columnar export format " + str(columnar_export_format))
+        return
+
+    file_datetime = datetime.datetime.now().strftime("%m.%d.%Y_%H.%M.%S")
+    file_extension = columnar_extensions[columnar_export_format]
+
+    try:
+        columnar_writers = {
+            "reviewed": ColumnarWriter(reviewed_path + "/" + file_datetime + "_data_cleanup_reviewed" + file_extension,
+                                       reviewed_header, columnar_export_format),
+            "fixed": ColumnarWriter(corrected_path + "/" + file_datetime + "_data_cleanup_fixed" + file_extension,
+                                    fixed_header, columnar_export_format)}
+        run_recorder.add_row_listener(write_columnar_row)
+
+    except Exception as e:
+        print("Error:: Unable to open the columnar files.  Continuing without them.")
+        logging.error("Unable to open the columnar files", exc_info=True)
+        columnar_writers = None
+
+
+def write_columnar_row(table_name, row):
+    """
+    Row listener for the RunRecorder (runs on its writer thread), which streams each row into its columnar file.
+    """
+
+    try:
+        columnar_writers[table_name].write_row(row)
+    except Exception as e:
+        logging.error("Exception occurred while writing a row to the " + table_name + " columnar file.", exc_info=True)
+
+
+def close_columnar_export():
+    """
+    Writes the last row groups and closes the columnar files.  Returns the paths of the files, or [].
+    """
+
+    global columnar_writers
+
+    if columnar_writers is None:
+        return []
+
+    run_recorder.remove_row_listener(write_columnar_row)
+    file_paths = []
+
+    for table_name, columnar_writer in columnar_writers.items():
+        try:
+            columnar_writer.close()
+            file_paths.append(columnar_writer.file_path)
+        except Exception as e:
+            print("Error:: Exception occurred while saving the " + table_name + " columnar file.")
+            logging.error("Exception occurred while saving the " + table_name + " columnar file.", exc_info=True)
+
+    columnar_writers = None
+
+    return file_paths
+
+
+def load_columnar_file(file_path):
+    """
+    Loads a Parquet or Arrow file saved by the columnar export as a pyarrow Table.  The file is memory-mapped, so the
+    values are read from the page cache rather than copied (Arrow files aren't copied at all).  Use
+    .to_pandas() on the result for a DataFrame.
+    """
+
+    if file_path.endswith(columnar_extensions["arrow"]):
+        with pyarrow.memory_map(file_path) as mapped_file:
+            return pyarrow.ipc.open_file(mapped_file).read_all()
+
+    return pyarrow.parquet.read_table(file_path, memory_map=True)
+
+
+def convert_csv_to_columnar(csv_path, export_format="parquet"):
+    """
+    Converts a reviewed or corrected csv file saved by numpy.savetxt to a columnar file next to it.  The csv is read in
+    blocks and each block is written as its own row group, so memory use doesn't grow with the size of the file.
+
+    numpy.savetxt doesn't quote values, so a row holding a value with a comma in it has too many columns to convert.
+    Those rows are skipped and logged.  Returns the path of the columnar file, or "error".
+    """
+
+    if pyarrow is None:
+        print("Error:: The pyarrow package is needed to convert csv files.")
+        logging.error("Unable to convert " + csv_path + ", the pyarrow package is not installed")
+        return "error"
+
+    skipped_rows = []
+
+    def skip_row(invalid_row):
+        skipped_rows.append(invalid_row.number)
+        return "skip"
+
+    columnar_path = os.path.splitext(csv_path)[0] + columnar_extensions[export_format]
+
+    try:
+        with open(csv_path, newline="") as csv_file:
+            column_names = csv_file.readline().rstrip("\r\n").split(",")
+
+        csv_reader = pyarrow.csv.open_csv(
+            csv_path,
+            read_options=pyarrow.csv.ReadOptions(block_size=16 << 20),
+            parse_options=pyarrow.csv.ParseOptions(quote_char=False, invalid_row_handler=skip_row),
+            convert_options=pyarrow.csv.ConvertOptions(
+                column_types={column_name: pyarrow.string() for column_name in column_names},
+                strings_can_be_null=False, quoted_strings_can_be_null=False))
+
+        columnar_writer = ColumnarWriter(columnar_path, column_names, export_format)
+
+        try:
+            for record_batch in csv_reader:
+                columnar_writer.write_batch(record_batch)
+        finally:
+            columnar_writer.close()
+
+    except Exception as e:
+        print("Error:: Exception occurred while converting " + csv_path + ".")
+        logging.error("Exception occurred while converting " + csv_path, exc_info=True)
+        return "error"
+
+    if skipped_rows:
+        print("Skipped " + str(len(skipped_rows)) + " rows of " + csv_path + " with extra commas in their values")
+        logging.warning("Skipped rows of " + csv_path + " with extra commas in their values: " + str(skipped_rows))
+
+    return columnar_path
+
+
+def process_product(driver, current_row_id, Company_product_number):
+    """
+    Reviews the product in the current row (see review_product) and records the time it took by page visibility, so
+    the activity summary can compare throughput with the window in the foreground and in the background.
+    """
+
+    # Check whether the window is visible before starting on the product
+    try:
+        visibility_state = driver.execute_script("return document.visibilityState;")
+    except Exception as e:
+        visibility_state = "unknown"
+
+    read_source = "grid_data" if current_row_id in grid_data_records else "cells"
+    product_start = time.monotonic()
+
+    attributes_fixed = review_product(driver, current_row_id, Company_product_number)
+
+    if attributes_fixed != "error":
+        product_seconds = time.monotonic() - product_start
+        product_stats = throughput_stats.setdefault(visibility_state, [0, 0.0])
+        product_stats[0] += 1
+        product_stats[1] += product_seconds
+
+        if record_reload_trace:
+            record_product_span(Company_product_number, product_seconds, read_source, attributes_fixed)
+
+    return attributes_fixed
+
+
+def review_product(driver, current_row_id, Company_product_number):
+    """
+    Reads, validates, and corrects the attributes for the product in the current row of the main grid.  This is the
+    body of the main program loop, pulled into its own function so the same logic can be used by each of the targeting
+    modes (full view walk, validation error filter passes, etc.).  Every attribute is handled the same way, driven by
+    its entry in attribute_rules.
+
+    When a calculator returns None (the value can't be corrected automatically, ex: a Company Net Content with too many
+    whole number digits), the update is skipped and the value is left as is.  Before attribute_rules, None was passed
+    to the update and the failed update sent the product back as "error" until it was quarantined.
+
+    Returns the list of attribute names which were corrected on the product (empty list if the product was already
+    valid) or "error" if the program encountered a hiccup and the row needs to be reviewed again.
+    """
+
+    # Original value, validity, and corrected value for each attribute: {attribute: {"original", "valid", "fixed"}}
+    product_values = {}
+
+    # Set product_updated to False, will flip to True if product is updated in sections below
+    product_updated = False
+
+    # Names of the attributes corrected on this product
+    attributes_fixed = []
+
+    # Values for the current record from the grid data response, if one was captured for this page
+    grid_record = grid_data_records.get(current_row_id)
+
+    if grid_record is not None:
+        grid_data_stats["grid_data"] += 1
+    else:
+        grid_data_stats["cells"] += 1
+
+    '''
+    Reading values, checking them for validity, and calculating valid values
+    '''
+
+    for attribute_rule in attribute_rules:
+
+        attribute_name = attribute_rule["name"]
+
+        # Get the attribute value from the current record
+        if grid_record is not None:
+
+            # The response holds the true value, even when the main grid shows it as blank
+            original_value = normalize_grid_datetime(grid_record[attribute_name])
+
+            # Blanks are recorded the same way the getters record them (unless the main grid hides invalid values)
+            if original_value == "" and attribute_rule["dialog_validator"] is None:
+                original_value = "blank_in_main_grid"
+
+        else:
+            original_value = get_attribute_value(driver, current_row_id, attribute_rule)
+
+            if original_value == "error":
+                return "error"
+
+        # Check to see if the value is valid (values from the grid data response are the true values, so they are
+        # checked the same way as values from the edit attribute dialog)
+        if grid_record is not None and attribute_rule["dialog_validator"] is not None:
+            value_valid = attribute_rule["dialog_validator"](original_value)
+        else:
+            value_valid = attribute_rule["validator"](original_value)
+
+        # If error
+        if value_valid == "error":
+            return "error"
+
+        # Doublecheck the value by checking the edit attribute dialog if the main grid can hide invalid values
+        if not value_valid and grid_record is None and attribute_rule["dialog_validator"] is not None:
+
+            # capture the value from the edit attribute dialog
+            original_value = read_attribute_dialog(driver, current_row_id, attribute_rule)
+
+            # If error
+            if original_value == "error":
+                return "error"
+
+            # Check to see if the value from the edit attribute dialog is valid
+            value_valid = attribute_rule["dialog_validator"](original_value)
+
+            # If error
+            if value_valid == "error":
+                return "error"
+
+        fixed_value = ""
+
+        # Calculate the valid value if the value is invalid
+        if not value_valid:
+
+            if attribute_rule["depends_on"] is not None:
+                source_values = product_values[attribute_rule["depends_on"]]
+                fixed_value = attribute_rule["calculator"](original_value, source_values["original"],
+                                                           source_values["fixed"])
+
+            elif attribute_rule["calculate_from_dialog"] and grid_record is None:
+
+                # The main grid doesn't show the full value, so calculate from the edit attribute dialog
+                dialog_value = read_attribute_dialog(driver, current_row_id, attribute_rule)
+
+                # If error
+                if dialog_value == "error":
+                    return "error"
+
+                fixed_value = attribute_rule["calculator"](dialog_value)
+
+            else:
+                fixed_value = attribute_rule["calculator"](original_value)
+
+            # If error
+            if fixed_value == "error":
+                return "error"
+
+        product_values[attribute_name] = {"original": original_value, "valid": value_valid, "fixed": fixed_value}
+
+    '''
+    Updating products to fix invalid data
+    '''
+
+    for attribute_rule in attribute_rules:
+
+        # Manage program flow related to threading in case the alt+c hotkey is pressed
+        if freeze_event.is_set():
+            break
+
+        attribute_name = attribute_rule["name"]
+        attribute_values = product_values[attribute_name]
+
+        # Nothing to do if the value is valid or can't be corrected automatically
+        if attribute_values["valid"] or attribute_values["fixed"] is None:
+            continue
+
+        # Double-click the attribute field to open the edit attribute dialog
+        if not click_attribute(driver, current_row_id, attribute_rule):
+            return "error"
+
+        # Update the attribute for the selected record
+        if not update_attribute_value(attribute_values["fixed"], driver, attribute_rule):
+            return "error"
+
+        # Make sure the main grid has finished loading
+        if not check_lui_maingrid_click(driver, "post_save"):
+            return "error"
+
+        product_updated = True
+        attributes_fixed.append(attribute_name)
+
+        # Update error counter
+        run_recorder.record_error_fixed()
 
-def get_row_id(web_driver, crnt_row):
+        print("Original " + attribute_name + ": " + str(attribute_values["original"]))
+        print("Corrected " + attribute_name + ": " + attribute_values["fixed"])
 
-    try:
-        crnt_row = str(crnt_row)
+    # Manage program flow related to threading in case the alt+c hotkey is pressed
+    if not freeze_event.is_set():
 
-        # Build an xpath for the top row element
-        crnt_row_path = "PLACEHOLDER[" + crnt_row + "]"
+        # Record the Company product number and attribute values for the current item (updates the reviewed counter)
+        current_reviewed_data = [Company_product_number]
+        for attribute_rule in audit_rules:
+            current_reviewed_data.append(product_values[attribute_rule["name"]]["original"])
+        run_recorder.record_reviewed(current_reviewed_data)
 
-        # Wait to make sure the driver finds the current table row
-        try:
-            crnt_row_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, crnt_row_path))
-        except Exception as e:
-            print("Error:: Current row element not found")
-            logging.error("Current row element not found", exc_info=True)
-            return "error"
+    if product_updated:
 
-        try:
-            # Find the current row of the main grid table
-            crnt_table_row = web_driver.find_element(By.XPATH, crnt_row_path)
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the current row of the main grid table")
-            logging.error("WebDriver was not able to locate the current row of the main grid table", exc_info=True)
-            return "error"
+        # Record the Company product number, original attribute values, and fixed values (updates the fixed counter)
+        current_fixed_data = [Company_product_number]
+        for attribute_rule in audit_rules:
+            attribute_values = product_values[attribute_rule["name"]]
+            current_fixed_data.extend([attribute_values["original"], attribute_values["fixed"] or ""])
+        run_recorder.record_fixed(current_fixed_data)
 
-        # Setting loop variable to handle wait
-        row_id_deciseconds = 0  # Loop variable
-        crnt_row_id = ""
+    # Keep the review and corrections in the audit store
+    if audit_store is not None and (product_updated or not freeze_event.is_set()):
+        audit_store.record_product(Company_product_number, product_values, attributes_fixed)
 
-        while row_id_deciseconds < 200:  # 20 seconds
-            try:
-                # Pull the current row element's id
-                crnt_row_id = crnt_table_row.get_attribute('id')
-                row_id_deciseconds = 200
-                continue
-            except:
-                row_id_deciseconds += 1
-                time.sleep(.1)
+    if product_updated:
 
-        if crnt_row_id == "":
-                logging.error("Unable to pull the current row element's id\n")
-                print("Error:: Unable to pull the current row element's id\n")
-                return "error"
+        # Manage program flow related to threading in case the alt+c hotkey is pressed
+        if not freeze_event.is_set():
 
-    except Exception as e:
-        print("Error:: Encountered problem with the get_row_id function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+            items_reviewed_count, items_fixed_count, errors_fixed_count = run_recorder.get_counts()
 
-    return crnt_row_id
+            # Print items fixed counter
+            print("\nTotal Products Updated: " + str(items_fixed_count))
 
+            # Print errors corrected counter
+            print("Total Errors Corrected: " + str(errors_fixed_count) + "\n")
 
-def get_Company_prod_number(web_driver, crnt_row_id):
+    return attributes_fixed
 
-    try:
-        # Build an xpath for the Company product number field based on the current row id
-        Company_prod_number_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
 
-        try:
-            # Wait for the Company product number element in the current row to be found
-            Company_prod_num_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, Company_prod_number_path))
-        except Exception as e:
-            print("Error:: Company prod number element not found")
-            logging.error("Company prod number element not found", exc_info=True)
-            return "error"
+def navigate_to_nextpage(web_driver, current_pg):
 
-        try:
-            # Find the Company product number element in the current row
-            Company_prod_num_elmt = web_driver.find_element(By.XPATH, Company_prod_number_path)
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the Company prod number element of the current row")
-            logging.error("Error:: WebDriver was not able to locate the Company prod number element of the current row", exc_info=True)
-            return "error"
+    current_pg_int = int(current_pg)
+    next_pg = current_pg_int + 1
 
-        # Setting loop variable to handle wait
-        Company_prod_num_deciseconds = 0  # Loop variable
-        Company_prod_num = "webdriver_failed_to_pull_Company_prod_number"
+    return navigate_to_page(web_driver, next_pg)
 
-        while Company_prod_num_deciseconds < 200:  # 20 seconds
-            try:
-                # Get the Company prod number from the current row Company prod number field
-                Company_prod_num = Company_prod_num_elmt.text
-                Company_prod_num_deciseconds = 200
-                continue
-            except:
-                Company_prod_num_deciseconds += 1
-                time.sleep(.1)
 
-        if Company_prod_num == "webdriver_failed_to_pull_Company_prod_number":
-                print("Error:: Encountered problem with the get_Company_prod_number function.\n")
-                logging.error("Unable to pull the current Company product number\n")
-                return "error"
+def navigate_to_page(web_driver, page_number):
 
+    # Using page_number_input instead of the next element because the next element is not directly interactable
+    try:
+        # Wait to make sure the driver finds the page_number_input field
+        page_number_input_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, "//input[@class='PLACEHOLDER']"))
     except Exception as e:
-        print("Error:: Encountered problem with the get_Company_prod_number function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+        print("Error:: Page Number Input field not found")
+        logging.error("Page Number Input field not found", exc_info=True)
+        return False
 
-    if Company_prod_num == "":
-        Company_prod_num = "blank_in_main_grid"
+    # Brief wait to account for browser latency
+    time.sleep(1)
 
-    return Company_prod_num
+    try:
+        # Retrieve updated data for the page number input field
+        page_number_input = web_driver.find_element(By.XPATH, "//input[@class='PLACEHOLDER']")
+
+        # Clear the page_number_input text
+        page_number_input.clear()
+        # Brief delay to account for browser latency
+        time.sleep(.5)
+        # Enter the number for the page
+        page_number_input.send_keys(str(int(page_number)))
+        # Brief delay to account for browser latency
+        time.sleep(.5)
+        # Hit the RETURN key to navigate to the page of search results
+        page_number_input.send_keys(Keys.RETURN)
+
+    except Exception as e:
+        print("Error:: Encountered problem with the navigate_to_page function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return False
+
+    # When function completes without any errors
+    return True
 
 
-def get_manufacturer_number(web_driver, crnt_row_id):
+def apply_validation_filter(web_driver, attribute_name):
+    """
+    Drives the PIM search panel to restrict the main grid to the products failing validation for the given attribute.
+    The search criteria come from the validation_filters dictionary and are combined with "Match Any".  Calling this
+    function again re-runs the search, which is how the filtered passes drop the products that have already been fixed.
+    """
 
     try:
+        criteria = validation_filters[attribute_name]
+    except KeyError:
+        print("Error:: No validation filter defined for " + str(attribute_name))
+        logging.error("No validation filter defined for " + str(attribute_name))
+        return False
+
+    return apply_search_criteria(web_driver, criteria)
 
-        # Build an xpath for the attribute field based on the current row id
-        attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
 
+def apply_search_criteria(web_driver, criteria):
+    """
+    Enters a list of (attribute, operator, value) criteria into the PIM search panel, combined with "Match Any", and
+    runs the search.  Returns True once the main grid has finished loading the search results.
+    """
+
+    try:
+        # Wait to make sure the driver finds the search panel button
         try:
-            # Wait for the attribute element in the current row to be found
-            attrib_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, attribute_path))
+            search_button_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
         except Exception as e:
-            print("Error:: manufacturer number not found")
-            logging.error("manufacturer number not found", exc_info=True)
-            return "error"
+            print("Error:: Search panel button not found")
+            logging.error("Search panel button not found", exc_info=True)
+            return False
 
+        # Open the search panel
+        search_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+        search_button.click()
+
+        # Wait to make sure the driver finds the search panel
         try:
-            # Find the attribute element in the current row
-            attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
+            search_panel_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, "//div[@id='PLACEHOLDER']"))
         except Exception as e:
-            print("Error:: WebDriver was not able to locate the manufacturer number element of the current row")
-            logging.error("Error:: WebDriver was not able to locate the manufacturer number element of the current row",
-                          exc_info=True)
-            return "error"
+            print("Error:: Search panel not found")
+            logging.error("Search panel not found", exc_info=True)
+            return False
 
-        # Setting loop variable to handle wait
-        attrib_deciseconds = 0  # Loop variable
-        attrib_value = "webdriver_failed_to_pull_attribute_value"
+        # Remove any criteria left over from a previous search
+        clear_criteria_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+        clear_criteria_button.click()
+
+        # Combine the criteria with OR so any failing rule puts the product in the grid
+        match_select = Select(web_driver.find_element(By.XPATH, "//select[@id='PLACEHOLDER']"))
+        match_select.select_by_visible_text("Match Any")
+
+        for criteria_number, (criteria_attribute, criteria_operator, criteria_value) in enumerate(criteria, start=1):
+
+            # Add a new criteria row to the search panel
+            add_criteria_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+            add_criteria_button.click()
+
+            # Build an xpath for the criteria row which was just added
+            criteria_row_path = "//div[@id='PLACEHOLDER']/div[" + str(criteria_number) + "]"
 
-        while attrib_deciseconds < 200:  # 20 seconds
             try:
-                # Get the attribute value from the current row attribute field
-                attrib_value = attribute_elmt.get_attribute('title')
-                attrib_deciseconds = 200
-                continue
-            except:
-                attrib_deciseconds += 1
-                time.sleep(.1)
+                criteria_row_wait = WebDriverWait(web_driver, timeout=20).until(
+                    lambda document: document.find_element(By.XPATH, criteria_row_path))
+            except Exception as e:
+                print("Error:: Search criteria row not found")
+                logging.error("Search criteria row not found", exc_info=True)
+                return False
 
-        if attrib_value == "webdriver_failed_to_pull_attribute_value":
-                print("Error:: Encountered problem with the get_manufacturer_number function.\n")
-                logging.error("Unable to pull the current manufacturer number\n")
-                return "error"
+            attribute_select = Select(web_driver.find_element(By.XPATH, criteria_row_path + "/PLACEHOLDER"))
+            attribute_select.select_by_visible_text(criteria_attribute)
 
-    except Exception as e:
-        print("Error:: Encountered problem with the get_manufacturer_number function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+            operator_select = Select(web_driver.find_element(By.XPATH, criteria_row_path + "/PLACEHOLDER"))
+            operator_select.select_by_visible_text(criteria_operator)
 
-    if attrib_value == "":
-        attrib_value = "blank_in_main_grid"
+            if criteria_value != "":
+                criteria_value_field = web_driver.find_element(By.XPATH, criteria_row_path + "/PLACEHOLDER")
+                criteria_value_field.clear()
+                criteria_value_field.send_keys(criteria_value)
 
-    return attrib_value
+        # Run the search
+        run_search_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+        run_search_button.click()
 
+    except Exception as e:
+        print("Error:: Encountered problem with the apply_search_criteria function.\n")
+        logging.error("Exception occurred while applying the search criteria: " + str(criteria), exc_info=True)
+        return False
 
-def get_brand_type(web_driver, crnt_row_id):
+    # Make sure the main grid has finished loading the search results
+    return check_lui_maingrid(web_driver)
 
-    try:
 
-        # Build an xpath for the attribute field based on the current row id
-        attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+def clear_validation_filter(web_driver):
+    """
+    Clears the search criteria so the main grid goes back to showing every product in the view.
+    """
 
+    try:
+        # Wait to make sure the driver finds the clear search button
         try:
-            # Wait for the attribute element in the current row to be found
-            attrib_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, attribute_path))
+            clear_search_wait = WebDriverWait(web_driver, timeout=20).until(
+                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
         except Exception as e:
-            print("Error:: brand type not found")
-            logging.error("brand type not found", exc_info=True)
-            return "error"
+            print("Error:: Clear search button not found")
+            logging.error("Clear search button not found", exc_info=True)
+            return False
 
-        try:
-            # Find the attribute element in the current row
-            attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the brand type element of the current row")
-            logging.error("Error:: WebDriver was not able to locate the brand type element of the current row",
-                          exc_info=True)
-            return "error"
+        clear_search_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+        clear_search_button.click()
 
-        # Setting loop variable to handle wait
-        attrib_deciseconds = 0  # Loop variable
-        attrib_value = "webdriver_failed_to_pull_attribute_value"
+    except Exception as e:
+        print("Error:: Encountered problem with the clear_validation_filter function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return False
 
-        while attrib_deciseconds < 200:  # 20 seconds
-            try:
-                # Get the attribute value from the current row attribute field
-                attrib_value = attribute_elmt.get_attribute('title')
-                attrib_deciseconds = 200
-                continue
-            except:
-                attrib_deciseconds += 1
-                time.sleep(.1)
+    # Make sure the main grid has finished loading
+    return check_lui_maingrid(web_driver)
 
-        if attrib_value == "webdriver_failed_to_pull_attribute_value":
-                print("Error:: Encountered problem with the get_brand_type function.\n")
-                logging.error("Unable to pull the current brand type\n")
-                return "error"
 
-    except Exception as e:
-        print("Error:: Encountered problem with the get_brand_type function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+def print_activity_summary():
 
-    if attrib_value == "":
-        attrib_value = "blank_in_main_grid"
+    # Call the flash_window function
+    flash_window()
 
-    return attrib_value
+    logging.info("\n\n                               *********************************\n"
+                 "                               *        Activity Summary        *\n"
+                 "                               *********************************")
+
+    print("\n\n*********************************\n"
+          "*        Activity Summary       *\n"
+          "*********************************\n"
+          "                               ")
+    items_reviewed_count, items_fixed_count, errors_fixed_count = run_recorder.get_counts()
 
+    logging.info(
+        "\n\n                               Total Products Reviewed: " + str(items_reviewed_count))
+    print("Total Products Reviewed:  " + str(items_reviewed_count))
 
-def get_start_availability(web_driver, crnt_row_id):
+    logging.info(
+        "\n\n                               Total Products Fixed:    " + str(items_fixed_count))
+    print("Total Products Corrected: " + str(items_fixed_count))
 
-    try:
+    logging.info(
+        "\n\n                               Fixed " + str(errors_fixed_count))
+    print("Total Errors Corrected:   " + str(errors_fixed_count) + "\n")
+
+    # How many products were read from the grid data response instead of the rendered cells
+    logging.info("Products read from the grid data response: " + str(grid_data_stats["grid_data"]) +
+                 ", from the grid cells: " + str(grid_data_stats["cells"]))
+
+    # Average main grid reload time, to compare runs with and without resource blocking
+    if grid_reload_stats[0] > 0:
+        average_reload_seconds = grid_reload_stats[1] / grid_reload_stats[0]
+        logging.info("Main grid reloads: " + str(grid_reload_stats[0]) + ", " + format(average_reload_seconds, ".2f") +
+                     " seconds average, resource blocking " + ("on" if block_nonessential_resources else "off"))
+        print("Grid Reload Average:  " + format(average_reload_seconds, ".2f") + " s (blocking " +
+              ("on" if block_nonessential_resources else "off") + ")")
+
+    # Review throughput with the window in the foreground and in the background
+    for visibility_state, (product_count, product_seconds) in throughput_stats.items():
+        products_per_hour = product_count * 3600 / product_seconds if product_seconds else 0
+        logging.info("Products reviewed while " + visibility_state + ": " + str(product_count) + ", " +
+                     format(product_seconds / product_count, ".2f") + " seconds per product, " +
+                     format(products_per_hour, ".0f") + " products per hour")
+        print("Products/Hour (" + visibility_state + "): " + format(products_per_hour, ".0f") + " (" +
+              str(product_count) + " products)")
+
+    # Correction cache hit rate for each attribute
+    for attribute_name, (cache_hits, cache_misses) in get_correction_cache_stats().items():
+        if cache_hits + cache_misses > 0:
+            hit_rate = cache_hits * 100 / (cache_hits + cache_misses)
+            logging.info("Correction cache " + attribute_name + ": " + str(cache_hits) + " hits, " +
+                         str(cache_misses) + " misses, " + format(hit_rate, ".1f") + "% hit rate")
+            print("Cache Hit Rate (" + attribute_name + "): " + format(hit_rate, ".1f") + "%")
+
+    # Browser recovery paths used during the run and their time cost
+    for action_name, (action_count, action_seconds) in recovery_stats.items():
+        logging.info("Recovery action " + action_name + ": used " + str(action_count) + " times, " +
+                     format(action_seconds, ".1f") + " seconds total")
+        print("Recovery " + action_name + ": " + str(action_count) + " (" + format(action_seconds, ".1f") + " s)")
 
-        # Build an xpath for the attribute field based on the current row id
-        attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+    print("*********************************\n")
 
-        try:
-            # Wait for the attribute element in the current row to be found
-            attrib_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, attribute_path))
-        except Exception as e:
-            print("Error:: start availability date time not found")
-            logging.error("start availability date time not found", exc_info=True)
-            return "error"
 
-        try:
-            # Find the attribute element in the current row
-            attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the start availability date time element of the current row")
-            logging.error("Error:: WebDriver was not able to locate the start availability date time element of the current row",
-                          exc_info=True)
-            return "error"
+def save_and_quit():
+    """
+    Saves program activity to files and exits the program. Saves data for the records which were reviewed to one file,
+    and saves data for the records which were corrected to another file.
+    The hotkey and shutdown signals end up here once the product in progress is finished (see Shutdown Controller), and
+    it is called right away if the program doesn't stop within the grace period.
+    *******************
+    *  Hotkey: <Alt+C>  *
+    *******************
+    """
 
-        # Setting loop variable to handle wait
-        attrib_deciseconds = 0  # Loop variable
-        attrib_value = "webdriver_failed_to_pull_attribute_value"
+    try:
+        print("\n\n*********************************\n"
+              "Preparing data to be saved to file...\n")
+    except Exception as e:
+        logging.error("Exception occurred while attempting to save and exit.",
+                      exc_info=True)
+        print("Error:: Exception occurred while attempting to save and exit.")
 
-        while attrib_deciseconds < 200:  # 20 seconds
-            try:
-                # Get the attribute value from the current row attribute field
-                attrib_value = attribute_elmt.get_attribute('title')
-                attrib_deciseconds = 200
-                continue
-            except:
-                attrib_deciseconds += 1
-                time.sleep(.1)
+    # Write the rest of the queued rows to the audit store
+    close_audit_store()
 
-        if attrib_value == "webdriver_failed_to_pull_attribute_value":
-                print("Error:: Encountered problem with the get_start_availability function.\n")
-                logging.error("Unable to pull the current start availability date time\n")
-                return "error"
+    # Write the last row groups of the columnar files
+    columnar_file_paths = close_columnar_export()
+    if columnar_file_paths:
+        print("Columnar files saved: " + ", ".join(columnar_file_paths) + "\n")
 
-    except Exception as e:
-        print("Error:: Encountered problem with the get_start_availability function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+    try:
+        # Consistent copy of the run results (see RunRecorder)
+        run_snapshot = run_recorder.get_snapshot()
 
-    if attrib_value == "":
-        attrib_value = "blank_in_main_grid"
+        try:
+            # Create 2D numpy arrays (one row per product, header row first)
+            reviewed_items = numpy.array(run_snapshot["reviewed"], dtype=str)
+            fixed_items = numpy.array(run_snapshot["fixed"], dtype=str)
 
-    return attrib_value
+            print("Data preparation completed.  Saving data to files...\n")
 
+        except Exception as e:
+            logging.error("Exception occurred while attempting to create numpy arrays for reviewed and corrected items.",
+                          exc_info=True)
+            print("Error:: Exception occurred while attempting to create numpy arrays for reviewed and corrected items.")
 
-def get_master_gtin(web_driver, crnt_row_id):
+        # Capture current datatime
+        file_dtnow = datetime.datetime.now()
 
-    try:
+        # Format datetime
+        file_datetime = file_dtnow.strftime("%m.%d.%Y_%H.%M.%S")
 
-        # Build an xpath for the attribute field based on the current row id
-        attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+        # Define filenames for each file
+        summary_filename = file_datetime + '_data_cleanup_summary.txt'
+        reviewed_filename = file_datetime + '_data_cleanup_reviewed.csv'
+        corrected_filename = file_datetime + '_data_cleanup_fixed.csv'
 
+        # Save the activity summary data to a txt file
         try:
-            # Wait for the attribute element in the current row to be found
-            attrib_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, attribute_path))
+            with open(summary_path + "/" + summary_filename, 'w') as summary_file:
+                summary_file.write(
+                    "PIM Data Cleanup Activity Summary\n"
+                    "----------------------------------\n"
+                    "Total Products Reviewed: " + str(run_snapshot["items_reviewed"]) + "\n"
+                    "Total Products Fixed:    " + str(run_snapshot["items_fixed"]) + "\n"
+                    "Total Errors Fixed:      " + str(run_snapshot["errors_fixed"]) + "\n"
+                    "Products Left in Retry Queue: " + str(len(quarantined_products)) + "\n"
+                )
+                if grid_reload_stats[0] > 0:
+                    average_reload_seconds = grid_reload_stats[1] / grid_reload_stats[0]
+                    summary_file.write("Grid Reload Average Seconds: " + format(average_reload_seconds, ".2f") +
+                                       " (resource blocking " + ("on" if block_nonessential_resources else "off") +
+                                       ")\n")
+                for visibility_state, (product_count, product_seconds) in throughput_stats.items():
+                    summary_file.write("Seconds per Product (" + visibility_state + "): " +
+                                       format(product_seconds / product_count, ".2f") + " over " +
+                                       str(product_count) + " products\n")
+                for attribute_name, (cache_hits, cache_misses) in get_correction_cache_stats().items():
+                    if cache_hits + cache_misses > 0:
+                        summary_file.write("Correction Cache Hit Rate (" + attribute_name + "): " +
+                                           format(cache_hits * 100 / (cache_hits + cache_misses), ".1f") + "%\n")
         except Exception as e:
-            print("Error:: master gtin not found")
-            logging.error("master gtin not found", exc_info=True)
-            return "error"
+            logging.error("Exception occurred while attempting to save activity summary data to txt file.",
+                          exc_info=True)
+            print(
+                "Error:: Exception occurred while attempting to save activity summary data to txt file.")
 
+        # Save the products left in the deferred retry queue so they can be used as a work list in a later run
+        if quarantined_products:
+            save_product_number_report(quarantined_products, "retry_queue")
+
+        # Save the reviewed items data to a csv file
         try:
-            # Find the attribute element in the current row
-            attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
+            numpy.savetxt(reviewed_path + "/" + reviewed_filename, reviewed_items, fmt='%s', delimiter=",")
+            print("Reviewed item data saved successfully.  Now saving corrected item data...\n")
         except Exception as e:
-            print("Error:: WebDriver was not able to locate the master gtin element of the current row")
-            logging.error("Error:: WebDriver was not able to locate the master gtin element of the current row",
-                          exc_info=True)
-            return "error"
+            logging.error("Exception occurred while attempting to save reviewed item data to csv file.", exc_info=True)
+            print(
+                "Error:: Exception occurred while attempting to save reviewed item data to csv file.")
 
-        # Setting loop variable to handle wait
-        attrib_deciseconds = 0  # Loop variable
-        attrib_value = "webdriver_failed_to_pull_attribute_value"
+        # Save the fixed items data to a csv file
+        try:
+            numpy.savetxt(corrected_path + "/" + corrected_filename, fixed_items, fmt='%s', delimiter=",")
+            print("Corrected item data saved successfully.\n")
+            print("Please close the application.")
 
-        while attrib_deciseconds < 200:  # 20 seconds
-            try:
-                # Get the attribute value from the current row attribute field
-                attrib_value = attribute_elmt.get_attribute('title')
-                attrib_deciseconds = 200
-                continue
-            except:
-                attrib_deciseconds += 1
-                time.sleep(.1)
+            # Effectively freeze the program to give user an opportunity to review console info before closing
+            freeze_event.set()
 
-        if attrib_value == "webdriver_failed_to_pull_attribute_value":
-                print("Error:: Encountered problem with the get_master_gtin function.\n")
-                logging.error("Unable to pull the current master gtin\n")
-                return "error"
+
+        except Exception as e:
+            logging.error("Exception occurred while attempting to save reviewed item data to csv file.", exc_info=True)
+            print(
+                "Error:: Exception occurred while attempting to save reviewed item data to csv file.")
+            print("Please close the application.")
+
+            # Effectively freeze the program to give user an opportunity to review console info before closing
+            freeze_event.set()
+
+        # Effectively freeze the program to give user an opportunity to review console info before closing
+        freeze_event.set()
 
     except Exception as e:
-        print("Error:: Encountered problem with the get_master_gtin function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+        logging.error("Exception occurred while attempting to create reviewed and corrected files.", exc_info=True)
+        print("Error:: Exception occurred while attempting to create reviewed and corrected files.")
+        print("Please close the application.")
 
-    if attrib_value == "":
-        attrib_value = "blank_in_main_grid"
+        # Effectively freeze the program to give user an opportunity to review console info before closing
+        freeze_event.set()
 
-    return attrib_value
+    # Effectively freeze the program to give user an opportunity to review console info before closing
+    freeze_event.set()
 
 
-def get_net_content(web_driver, crnt_row_id):
+def report_hiccup(web_driver, product_identity=None):
+    """
+    Records a hiccup so the main program loop can try to overcome the system hiccup without crashing, then puts the
+    browser back into a known good state (see recover_browser_state) before the loop tries again.
 
-    try:
+    If the hiccup happened while reviewing a product, the failure is also counted against that product.  Returns True
+    if the product has now failed quarantine_threshold times and was moved to the deferred retry queue, in which case
+    the caller should move on to the next product instead of trying the same row again.
+    """
 
-        # Build an xpath for the net content field based on the current row id
-        net_content_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+    global number_of_hiccups
+    global heartbeat_due
 
-        try:
-            # Wait for the net content element in the current row to be found
-            net_cntnt_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, net_content_path))
-        except Exception as e:
-            print("Error:: net content not found")
-            logging.error("net content not found", exc_info=True)
-            return "error"
+    number_of_hiccups += 1
+    recent_hiccup_times.append(time.monotonic())
 
-        try:
-            # Find the net content element in the current row
-            net_content_elmt = web_driver.find_element(By.XPATH, net_content_path)
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the net content element of the current row")
-            logging.error("Error:: WebDriver was not able to locate the net content element of the current row", exc_info=True)
-            return "error"
+    # The hiccup may have been a lost session, so check it at the top of the next iteration
+    heartbeat_due = True
 
-        # Setting loop variable to handle wait
-        net_cntnt_deciseconds = 0  # Loop variable
-        net_cntnt = "webdriver_failed_to_pull_net_cntnt"
+    print("\nEncountered hiccup in the system.\n"
+          "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n"
+          "Hiccups in the last " + str(hiccup_window_seconds // 60) + " minutes: " +
+          str(count_recent_hiccups()) + " of " + str(hiccup_limit) + "\n")
+    flash_window()
 
-        while net_cntnt_deciseconds < 200:  # 20 seconds
-            try:
-                # Get the net content value from the current row net content field
-                net_cntnt = net_content_elmt.get_attribute('title')
-                net_cntnt_deciseconds = 200
-                continue
-            except:
-                net_cntnt_deciseconds += 1
-                time.sleep(.1)
+    recover_browser_state(web_driver)
 
-        if net_cntnt == "webdriver_failed_to_pull_net_cntnt":
-                print("Error:: Encountered problem with the get_net_content function.\n")
-                logging.error("Unable to pull the current net content\n")
-                return "error"
+    if product_identity is None:
+        return False
 
-    except Exception as e:
-        print("Error:: Encountered problem with the get_net_content function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+    failure_count = product_failure_counts.get(product_identity, 0) + 1
+
+    if failure_count < quarantine_threshold:
+        product_failure_counts[product_identity] = failure_count
+        return False
+
+    # Move the product to the deferred retry queue
+    product_failure_counts.pop(product_identity, None)
+    quarantined_products.append(product_identity)
+
+    print("Product " + str(product_identity) + " failed " + str(failure_count) + " times in a row.  Moving it to the "
+          "deferred retry queue.\n")
+    logging.warning("Product " + str(product_identity) + " failed " + str(failure_count) + " times in a row and was "
+                    "moved to the deferred retry queue.")
+
+    return True
 
-    if net_cntnt == "":
-        net_cntnt = "blank_in_main_grid"
 
-    return net_cntnt
+def diagnose_browser_state(web_driver):
+    """
+    Works out what state the browser was left in after a hiccup, without waiting on any elements.
 
+    Returns a dictionary with the following keys:
+    * session_alive: whether WebDriver can still talk to the browser
+    * frame: which frame WebDriver is switched to ("main_grid", "cell_edit", "top", or "unknown")
+    * edit_dialog_open: whether an edit attribute dialog was left open over the main grid
+    * grid_loading: whether the main grid is in the middle of a reload (lui_MainGrid is display: block)
+    """
 
-def get_Company_net_content(web_driver, crnt_row_id):
+    browser_state = {"session_alive": False, "frame": "unknown", "edit_dialog_open": False, "grid_loading": False}
 
     try:
+        is_top_frame = web_driver.execute_script("return window.self === window.top;")
+        browser_state["session_alive"] = True
+    except Exception as e:
+        return browser_state
 
-        # Build an xpath for the attribute field based on the current row id
-        attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+    try:
+        if is_top_frame:
+            browser_state["frame"] = "top"
 
-        try:
-            # Wait for the attribute element in the current row to be found
-            attrib_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, attribute_path))
-        except Exception as e:
-            print("Error:: Company net content not found")
-            logging.error("Company net content not found", exc_info=True)
-            return "error"
+        # The lui_MainGrid element only exists in the main grid iframe
+        elif web_driver.find_elements(By.ID, "PLACEHOLDER"):
+            browser_state["frame"] = "main_grid"
 
-        try:
-            # Find the attribute element in the current row
-            attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the Company net content element of the current row")
-            logging.error("Error:: WebDriver was not able to locate the Company net content element of the current row",
-                          exc_info=True)
-            return "error"
+        # The attribute value field only exists in the cell edit iframe
+        elif web_driver.find_elements(By.XPATH, "//*[@id='PLACEHOLDER']"):
+            browser_state["frame"] = "cell_edit"
 
-        # Setting loop variable to handle wait
-        attrib_deciseconds = 0  # Loop variable
-        attrib_value = "webdriver_failed_to_pull_attribute_value"
+        if browser_state["frame"] == "main_grid":
 
-        while attrib_deciseconds < 200:  # 20 seconds
-            try:
-                # Get the attribute value from the current row attribute field
-                attrib_value = attribute_elmt.get_attribute('title')
-                attrib_deciseconds = 200
-                continue
-            except:
-                attrib_deciseconds += 1
-                time.sleep(.1)
+            lui_elements = web_driver.find_elements(By.ID, "PLACEHOLDER")
+            browser_state["grid_loading"] = "display: block" in (lui_elements[0].get_dom_attribute("style") or "")
 
-        if attrib_value == "webdriver_failed_to_pull_attribute_value":
-                print("Error:: Encountered problem with the get_Company_net_content function.\n")
-                logging.error("Unable to pull the current Company net content\n")
-                return "error"
+            edit_dialogs = web_driver.find_elements(By.XPATH, "//div[@aria-labelledby='PLACEHOLDER']")
+            browser_state["edit_dialog_open"] = len(edit_dialogs) > 0
 
     except Exception as e:
-        print("Error:: Encountered problem with the get_Company_net_content function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+        logging.error("Exception occurred while diagnosing the browser state", exc_info=True)
 
-    if attrib_value == "":
-        attrib_value = "blank_in_main_grid"
+    return browser_state
 
-    return attrib_value
 
+def is_browser_state_ready(browser_state):
+    return (browser_state["session_alive"] and browser_state["frame"] == "main_grid" and
+            not browser_state["edit_dialog_open"] and not browser_state["grid_loading"])
 
-def is_manufacturer_number_valid(attrib_value):
+
+def recover_browser_state(web_driver):
     """
-    Based on the following requirements from the PIM Business Analyst:
-    * Value should be numeric
-    * Number of Digits = 6
+    Diagnoses the browser state after a hiccup and runs the cheapest fix which gets the program back to the main grid
+    with no dialogs open.  From cheapest to most expensive:
+
+    * Cancel an edit attribute dialog left open in the cell edit iframe
+    * Switch back to the main grid iframe
+    * Cancel a stray edit attribute dialog over the main grid
+    * Wait for a main grid reload to finish
+    * Re-attach WebDriver to the browser (or relaunch the browser) if the session was lost
+    * Reload the page and go back to the page of search results the program was on
+
+    Each recovery path and its time cost is logged and added to recovery_stats.  Returns True if the browser ended up
+    in a good state.
     """
 
-    try:
-        # Variable for whether the value is valid, initialized to False
-        is_valid_value = False
+    browser_state = diagnose_browser_state(web_driver)
 
-        # Check if the value contains only numeric digits
-        try:
-            int(attrib_value)
-        except:
-            return is_valid_value
+    if is_browser_state_ready(browser_state):
+        return True
 
-        # Check if the field is blank
-        if attrib_value == "":
-            return is_valid_value
+    logging.info("Recovering browser state: " + str(browser_state))
 
-        elif attrib_value == "blank_in_main_grid":
-            return is_valid_value
+    if not browser_state["session_alive"]:
+        restore_browser_session(web_driver)
+        browser_state = diagnose_browser_state(web_driver)
 
-        # Check if manufacturer number has less than 6 characters
-        elif len(attrib_value) < 6:
-            return is_valid_value
+    if browser_state["frame"] == "cell_edit":
+        run_recovery_action("cancel_dialog_in_cell_edit", cancel_dialog_in_cell_edit, web_driver)
+        browser_state = diagnose_browser_state(web_driver)
 
-        else:
-            is_valid_value = True
+    if browser_state["session_alive"] and browser_state["frame"] != "main_grid":
+        run_recovery_action("switch_to_main_grid", switch_to_maingrid_iframe, web_driver)
+        browser_state = diagnose_browser_state(web_driver)
 
-    except Exception as e:
-        print("Error:: Encountered problem with the is_manufacturer_number_valid function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+    if browser_state["edit_dialog_open"]:
+        run_recovery_action("cancel_stray_dialog", cancel_stray_edit_dialog, web_driver)
+        browser_state = diagnose_browser_state(web_driver)
 
-    return is_valid_value
+    if browser_state["grid_loading"]:
+        run_recovery_action("wait_for_grid", check_lui_maingrid_click, web_driver)
+        browser_state = diagnose_browser_state(web_driver)
 
+    # Fall back to reloading the page if the cheaper fixes did not work
+    if browser_state["session_alive"] and not is_browser_state_ready(browser_state):
+        run_recovery_action("reload_page", reload_pim_page, web_driver)
+        browser_state = diagnose_browser_state(web_driver)
 
-def is_start_availability_valid(attrib_value):
-    """
-    Based on the following requirements from the PIM Business Analyst:
-    * The year of the datetime can't have 00 for the first two digits (ex: can't be 0007, must be 2007)
-    * Based on product searches, oldest valid datetime has a year of 1982
-    * Parse the datetime, if year less than 1982 then it's invalid
-    * NOTE: Invalid values appear to be blank from the maingrid, so they should be considered invalid in this function
-    """
+    if not is_browser_state_ready(browser_state):
+        print("Error:: Unable to recover the browser state")
+        logging.error("Unable to recover the browser state: " + str(browser_state))
+        return False
 
-    # Example of attribute value = "02/06/2018 00:00:01"
+    return True
 
-    try:
 
-        # Variable for whether the value is valid, initialized to False
-        is_valid_value = False
+def run_recovery_action(action_name, action_function, web_driver):
 
-        # Check if attribute value is blank
-        if attrib_value == "":
-            return is_valid_value
-        elif attrib_value == "blank_in_main_grid":
-            return is_valid_value
-        elif attrib_value is None:
-            return is_valid_value
+    action_start = time.monotonic()
 
-        # If not blank, parse the value and check for validity
-        else:
-            # Parse the attribute value by space, should yield a list with 2 elements
-            attrib_value_parsed = attrib_value.split(' ')
+    try:
+        action_result = action_function(web_driver)
+    except Exception as e:
+        logging.error("Exception occurred during the " + action_name + " recovery action", exc_info=True)
+        action_result = False
 
-        # pull the date from the parsed attribute value
-        date = attrib_value_parsed[0]
+    action_seconds = time.monotonic() - action_start
 
-        # check length of the date value
-        if len(date) != 10:
-            return is_valid_value
-        else:
-            # Parse the date by forward slash, should yield a list with 3 elements
-            date_parsed = date.split('/')
+    # Keep a running count and time cost for each recovery path
+    action_stats = recovery_stats.setdefault(action_name, [0, 0.0])
+    action_stats[0] += 1
+    action_stats[1] += action_seconds
 
-        # pull the year from the parsed date
-        year = date_parsed[2]
+    print("Recovery action: " + action_name + " (" + format(action_seconds, ".1f") + " seconds)")
+    logging.info("Recovery action: " + action_name + ", succeeded: " + str(action_result is not False) +
+                 ", seconds: " + format(action_seconds, ".2f"))
 
-        try:
-            # Convert year to an integer
-            year = int(year)
-        except:
-            return is_valid_value
+    return action_result
 
-        # check if year is within valid range
-        if year < 1982:
-            return is_valid_value
-        elif year >= 1982:
-            is_valid_value = True
 
+def switch_to_maingrid_iframe(web_driver):
+
+    web_driver.switch_to.default_content()
+
+    # Wait to make sure the driver finds the maingrid iframe
+    try:
+        maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
+            lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
     except Exception as e:
-        print("Error:: Encountered problem with the is_start_availability_valid function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+        print("Error:: maingrid iframe not found")
+        logging.error("maingrid iframe not found", exc_info=True)
+        return False
 
-    return is_valid_value
+    # Switch to the main grid iframe
+    iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
+    web_driver.switch_to.frame(iframe)
 
+    return True
 
-def doublecheck_start_availability(attrib_value):
-    """
-    Based on the following requirements from the PIM Business Analyst:
-    * The year of the datetime can't have 00 for the first two digits (ex: can't be 0007, must be 2007)
-    * Based on product searches, oldest valid datetime has a year of 1982
-    * Parse the datetime, if year less than 1982 then it's invalid
-    * This function is designed to check values taken from the edit attribute dialog (see main method for function call
-      and arguments). Unlike values read from the maingrid, the edit attribute dialog properly displays values for the
-      start availability date time even if they are invalid.  Therefore, blank values are considered valid in this
-      function.
-    """
 
-    # Example of attribute value = "02/06/2018 00:00:01"
+def cancel_dialog_in_cell_edit(web_driver):
 
-    try:
+    # The cancel button lives in the cell edit iframe
+    cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
+    cancel_button.click()
 
-        # Variable for whether the value is valid, initialized to False
-        is_valid_value = False
+    return switch_to_maingrid_iframe(web_driver)
 
-        # Check if attribute value is blank
-        if attrib_value == "":
-            is_valid_value = True
-            return is_valid_value
-        elif attrib_value == "blank_in_main_grid":
-            is_valid_value = True
-            return is_valid_value
-        elif attrib_value is None:
-            is_valid_value = True
-            return is_valid_value
 
-        # If not blank, parse the value and check for validity
-        else:
-            # Parse the attribute value by space, should yield a list with 2 elements
-            attrib_value_parsed = attrib_value.split(' ')
+def cancel_stray_edit_dialog(web_driver):
 
-        # pull the date from the parsed attribute value
-        date = attrib_value_parsed[0]
+    # Switch to the cell edit iframe of the dialog which was left open
+    iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
+    web_driver.switch_to.frame(iframe)
+
+    if not cancel_dialog_in_cell_edit(web_driver):
+        return False
+
+    # Setting loop variable to handle wait
+    edit_attrib_deciseconds = 0  # Loop variable
 
-        # check length of the date value
-        if len(date) != 10:
-            return is_valid_value
-        else:
-            # Parse the date by forward slash, should yield a list with 3 elements
-            date_parsed = date.split('/')
+    # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
+    while edit_attrib_deciseconds < 200:  # 20 seconds
+        if not web_driver.find_elements(By.XPATH, "//div[@aria-labelledby='PLACEHOLDER']"):
+            return True
+        edit_attrib_deciseconds += 1
+        time.sleep(.1)
 
-        # pull the year from the parsed date
-        year = date_parsed[2]
+    return False
 
-        try:
-            # Convert year to an integer
-            year = int(year)
-        except:
-            return is_valid_value
 
-        # check if year is within valid range
-        if year < 1982:
-            return is_valid_value
-        elif year >= 1982:
-            is_valid_value = True
+def reload_pim_page(web_driver):
 
+    # Remember which page of search results the program was on, if the paging info can still be read
+    current_page = last_known_page
+    try:
+        paging_text = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/div").text
+        current_page = get_current_page(int(paging_text.split(' ')[1].replace(',', '')))
     except Exception as e:
-        print("Error:: Encountered problem with the is_start_availability_valid function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+        logging.info("Paging info not available before reloading the page")
 
-    return is_valid_value
+    web_driver.switch_to.default_content()
+    web_driver.refresh()
 
+    if not switch_to_maingrid_iframe(web_driver):
+        return False
 
-def is_master_gtin_valid(attrib_value):
-    """
-    Based on the following requirements from the PIM Business Analyst:
-    * If value present, must be 14 digits long
-    * If value present and less than 14 digits, pad the front with leading zeros until it is 14 digits
-    * Blank values are allowed
-    """
+    if not check_lui_maingrid_click(web_driver):
+        return False
 
-    try:
-        # Variable for whether the value is valid, initialized to False
-        is_valid_value = False
+    # Go back to the page the program was on
+    if current_page > 1:
+        if not navigate_to_page(web_driver, current_page):
+            return False
+        return check_lui_maingrid(web_driver)
 
-        # Check if the value is blank
-        if attrib_value == "blank_in_main_grid":
-            is_valid_value = True
-            return is_valid_value
+    return True
 
-        # Check if the value contains only numeric digits
-        try:
-            int(attrib_value)
-        except:
-            return is_valid_value
 
-        # Check if the value has valid character length
-        if len(attrib_value) < 14:
-            return is_valid_value
-        elif len(attrib_value) > 14:
-            return is_valid_value
-        elif len(attrib_value) == 14:
-            is_valid_value = True
+def count_recent_hiccups():
 
-    except Exception as e:
-        print("Error:: Encountered problem with the is_master_gtin_valid function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+    # Drop the hiccups which have aged out of the sliding window
+    while recent_hiccup_times and time.monotonic() - recent_hiccup_times[0] > hiccup_window_seconds:
+        recent_hiccup_times.popleft()
 
-    return is_valid_value
+    return len(recent_hiccup_times)
 
 
-def is_net_content_blank(net_cntnt):
+def is_hiccup_limit_reached():
+    return count_recent_hiccups() >= hiccup_limit
+
+
+def is_run_stopping():
     """
-    This function can be used instead of the is_net_content_valid function if the pim_net_content_fix program has
-    already been run on the record set.  It will check for the following conditions:
-    * net content is blank
-    * net content is -1
+    True once a shutdown has been requested or the activity files have been saved, so the main program loops shouldn't
+    pick up another product.
     """
 
-    try:
-        # Variable for whether the value in net content is valid, initialized to False
-        is_blank_nc = False
-
-        # Check to see if net content is blank
-        if net_cntnt == "":
-            is_blank_nc = True
-            return is_blank_nc
-        elif net_cntnt == "blank_in_main_grid":
-            is_blank_nc = True
-            return is_blank_nc
+    return shutdown_event.is_set() or freeze_event.is_set()
 
-        # Check to see if net content is -1 (means the net content was previously flagged as blank)
-        elif net_cntnt == "-1":
-            is_blank_nc = True
-            return is_blank_nc
 
-    except Exception as e:
-        print("Error:: Encountered problem with the is_net_content_blank function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+def run_full_view_walk(driver):
+    """
+    Cycles through every product in the view, one page at a time.
 
-    return is_blank_nc
+    General flow:
 
+        - Get original values for the product
+        - Check values to see if any are invalid
+        - For any invalid values:
+            - calculate valid value
+            - fix it
 
-def is_Company_net_content_valid(attrib_value):
-    """
-    Based on the following requirements from the PIM Business Analyst:
-    * Maximum Number of Characters = 9
-    * No more than 2 digits to the right of the decimal
-    * Should not be blank
+    Traversal is keyed on product identity rather than on row numbers.  Each page is read into a snapshot (see
+    read_page_snapshot) and the next product to review is the first one in the snapshot which is not in the seen set.
+    Saving a correction reloads the grid, so the snapshot is re-read after every update.  That way a product whose sort
+    key or view membership changed is neither skipped nor reviewed twice.  The end of the records is reached when the
+    current page has no unseen products left and it is the last page according to the latest paging info.
     """
 
-    try:
-        # Variable for whether the value is valid, initialized to False
-        is_valid_value = False
+    # Initializing program flow variables for the loop
+    seen_products = SeenProductNumbers()  # Products reviewed so far
+    page_snapshot = None  # Snapshot of the rows on the current page, None when it needs to be re-read
+    is_finished = False
 
-        # Check to see if the field is blank
-        if attrib_value == "":
-            return is_valid_value
-        elif attrib_value == "blank_in_main_grid":
-            return is_valid_value
+    # Resume from the page saved in a checkpoint
+    if start_page > 1:
+        print("Resuming the full view walk on page " + str(start_page) + "\n")
+        logging.info("Resuming the full view walk on page " + str(start_page))
 
-        # Check to see if Company net content has more than 9 characters
-        if len(attrib_value) > 9:
-            return is_valid_value
+        if navigate_to_page(driver, start_page) and check_lui_maingrid(driver):
+            set_last_known_page(start_page)
+        else:
+            report_hiccup(driver)
 
-        # Check to see if Company net content contains a dash
-        has_dash = False
+    while not is_hiccup_limit_reached() and not is_finished and not is_run_stopping():
 
-        if "-" in attrib_value:
-            has_dash = True
+        # Make sure the browser session is still alive before touching the grid
+        session_status = supervise_browser_session(driver)
 
-        # Check to see if Company net content contains a decimal point
-        has_decimal = False
+        if session_status == "error":
+            report_hiccup(driver)
+            continue
 
-        if "." in attrib_value:
-            has_decimal = True
+        if session_status == "restored":
+            page_snapshot = None
 
-        # If the Company net content contains a dash, the only thing we need to check for is the character length
-        if has_dash:
+        # Read the rows on the current page after every grid reload
+        if page_snapshot is None:
 
-            if len(attrib_value) <= 9:
-                is_valid_value = True
-            else:
-                is_valid_value = False
+            page_snapshot = read_page_snapshot(driver)
 
-            # return now because the decimal checks and whole number checks don't matter if has_dash
-            return is_valid_value
+            if page_snapshot == "error":
+                page_snapshot = None
+                report_hiccup(driver)
+                continue
 
-        if has_decimal:
+        '''
+        Finding the next product to review
+        '''
 
-            # Parse the Company net content
-            Company_net_content_parsed = attrib_value.split('.')  # returns a list containing 2 strings
+        unseen_rows = [row for row in page_snapshot if row[2] not in seen_products]
 
-            # Get the digits to the left of the decimal point
-            whole_number_digits = Company_net_content_parsed[0]  # use index to access the digits to the left of the decimal
+        # Every product on the page has been reviewed, so move on to the next page or finish
+        if not unseen_rows:
 
-            # Get the digits to the right of the decimal point
-            decimal_digits = Company_net_content_parsed[1]  # use index to access the digits to the right of the decimal
+            # Get the updated paging info
+            paging_info = parse_paging_info(driver)
 
-            if len(attrib_value) <= 9 and len(decimal_digits) <= 2:
-                is_valid_value = True
+            if paging_info == 'No records to view':
+                is_finished = True
+                break
 
-        else:  # no decimal or dash
+            first_record_on_page = get_first_record_on_page(paging_info)
+            last_record_on_page = get_last_record_on_page(paging_info)
+            current_page = get_current_page(first_record_on_page)
+            total_records = get_total_records(paging_info)
 
-            if len(attrib_value) <= 9:
-                is_valid_value = True
+            # Check to see if the program has reviewed all records
+            if last_record_on_page >= total_records:
 
-    except Exception as e:
-        print("Error:: Encountered problem with the is_Company_net_content_valid function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+                is_finished = True
+                print("\n===============================\n"
+                      "End of product records.\n"
+                      "===============================\n")
+                logging.info("\n\n==========================\n"
+                             "End of product records.\n"
+                             "==========================\n")
 
-    return is_valid_value
+                # Exit the while loop
+                break
 
+            print("\nNavigating to next page...\n")
+            print("Hit Alt+C at any time to save program activity to file and exit.\n")
 
-def calculate_manufacturer_number(attrib_value):
-    """
-    Based on the following requirements from the PIM Business Analyst:
-    * Value should be numeric
-    * Number of Digits = 6
-    * If less than 6 digits, pad the value with leading zeros
-    """
+            # Navigate to the next page of search results
+            if not navigate_to_nextpage(driver, current_page):
+                report_hiccup(driver)
+                page_snapshot = None
+                continue
 
-    try:
+            # Make sure the main grid has finished loading
+            if not check_lui_maingrid(driver):
+                report_hiccup(driver)
+                page_snapshot = None
+                continue
 
-        calculated_value = ""
+            set_last_known_page(current_page + 1)
+            page_snapshot = None
+            continue
 
-        if attrib_value == "blank_in_main_grid":
-            calculated_value = "000000"
-            return calculated_value
+        current_row_on_page, current_row_id, product_identity = unseen_rows[0]
 
-        # check if value contains only numeric digits
-        try:
-            int(attrib_value)
-        except:
-            calculated_value = "not_a_number"
+        '''
+        Collecting data from the current product record
+        '''
 
-        # capture the length of the attribute value
-        length = len(attrib_value)
+        # The Company product number comes from the page snapshot (row ids stand in for blank product numbers)
+        if product_identity.startswith("row_id:"):
+            Company_product_number = "blank_in_main_grid"
+        else:
+            Company_product_number = product_identity
+        print("Company Product Number: " + str(Company_product_number))
 
+        # Review the product and correct any invalid values
+        attributes_fixed = process_product(driver, current_row_id, Company_product_number)
 
+        if attributes_fixed == "error":
 
-        if length > 6:
-            calculated_value = "exceeds character limit"
+            # Quarantined products are left for the deferred retry queue
+            if report_hiccup(driver, product_identity):
+                seen_products.add(product_identity)
 
-        if length < 6:
-            calculated_value = attrib_value.zfill(6)
+            page_snapshot = None
+            continue
 
-    except Exception as e:
-        print("Error:: Encountered problem with the calculate_manufacturer_number function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+        product_failure_counts.pop(product_identity, None)
+        seen_products.add(product_identity)
 
-    return calculated_value
+        # Saving a correction reloads the grid, so the rows may have moved
+        if attributes_fixed:
+            page_snapshot = None
 
 
-def get_start_availability_dialog(web_driver, crnt_row_id):
+def run_filtered_pass(driver, attribute_name):
     """
-    Based on the following requirements from the PIM Business Analyst:
-    * Maximum Number of Characters = 9
-    * No more than 2 digits to the right of the decimal
-    * Should not be blank
-    ---------------------
-    * All values with more than 2 decimal digits should be modified to include only 2
-    * Blank values should be modified to -1 to show that the program has already checked the value
+    Reviews only the products failing validation for one attribute by restricting the main grid with the PIM search
+    panel (see apply_validation_filter).
+
+    Products whose attribute gets fixed drop out of the search results, so the pass keys its traversal on product
+    identity (see run_full_view_walk) rather than on row numbers.  Once the last page has no unseen products left, the
+    search is re-run so the fixed products drop out.  If the number of search results changed since the last query
+    (products were fixed, or the data changed under the program), the order of the results can't be trusted, so the
+    pass reads them again from page 1 and skips the products it has already reviewed.  Only when the count is unchanged
+    does the cursor jump to the page holding record number products_left_in_filter + 1 (the products in front of it are
+    the ones already reviewed but not fixed).  The pass is over when a re-query turns up no products which have not
+    been reviewed yet.
     """
 
-    # Build an xpath for the attribute field based on the current row id
-    attrib_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+    print("\n=====================================================================\n"
+          "Starting validation error filter pass: " + attribute_name + "\n"
+          "=====================================================================\n")
+    logging.info("Starting validation error filter pass: " + attribute_name)
 
-    try:
-        # Find the attribute element in the current row
-        attrib_elmt = web_driver.find_element(By.XPATH, attrib_path)
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the start availability date time element of the current row")
-        logging.error("Error:: WebDriver was not able to locate the start availability date time element of the current row",
-                      exc_info=True)
-        return "error"
+    # Initializing program flow variables for the loop
+    products_left_in_filter = 0  # Products reviewed during this pass which are still in the search results
+    reviewed_in_pass = SeenProductNumbers()  # Products reviewed during this pass
+    found_unseen_since_requery = False
+    page_snapshot = None  # Snapshot of the rows on the current page, None when it needs to be re-read
+    needs_requery = True
+    total_records_at_last_query = None
+    is_finished = False
 
-    # Click on the attribute element to open the edit attribute dialog
-    if not click_start_availability(web_driver, crnt_row_id):
-        print("Error:: WebDriver was not able to double-click the start availability date time element of the current row")
-        logging.error("Error:: WebDriver was not able to double-click the start availability date time element of the current row",
-                      exc_info=True)
-        return "error"
+    while not is_hiccup_limit_reached() and not is_finished and not is_run_stopping():
 
-    # Get the attribute value from the edit attribute dialog (only way to see values which exceed character limit)
-    try:
+        # Make sure the browser session is still alive before touching the grid
+        session_status = supervise_browser_session(driver)
 
-        edit_attrib_path = "//div[PLACEHOLDER]"
+        if session_status == "error":
+            report_hiccup(driver)
+            continue
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, edit_attrib_path))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+        if session_status == "restored":
+            page_snapshot = None
+            needs_requery = True
 
-        # Setting loop variable to handle wait
-        edit_attrib_deciseconds = 0  # Loop variable
+        if needs_requery:
 
-        # Waiting until the edit attribute dialog display switches to block in the DOM
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            try:
+            # Re-run the search so the products fixed since the last query drop out of the grid
+            if not apply_validation_filter(driver, attribute_name):
+                report_hiccup(driver)
+                continue
 
-                # Locate the edit attribute dialog element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+            paging_info = parse_paging_info(driver)
 
-                if "display: block" in edit_elmt_display:
-                    is_display_block = True
-                    edit_attrib_deciseconds = 200
-                    continue
-                else:
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-            except:
-                logging.error("edit attribute dialog display never shifted to block\n")
-                return False
+            if paging_info == 'No records to view':
+                is_finished = True
+                break
 
-        # Resetting edit attribute seconds variable for use later in this method
-        edit_attrib_deciseconds = 0
+            total_records = get_total_records(paging_info)
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+            # Every product left in the search results has already been reviewed during this pass
+            if products_left_in_filter >= total_records:
+                is_finished = True
+                break
 
-        try:
-            # Find the edit attribute dialog
-            edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the edit attribute dialog")
-            logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
-            return False
+            # Move the cursor to the page of the first product which has not been reviewed yet, or start over from the
+            # first page if the search results changed since the last query
+            if total_records == total_records_at_last_query:
+                target_page = get_current_page(products_left_in_filter + 1)
+            else:
+                target_page = 1
 
-        # Setting loop variable to handle wait
-        edit_title_deciseconds = 0  # Loop variable
+            total_records_at_last_query = total_records
+            set_last_known_page(1)
 
-        # Waiting until the edit attribute title includes the text: Start Availability Date Time
-        while edit_title_deciseconds < 200:  # 20 seconds
-            try:
-                is_net_content = "Start Availability Date Time" in edit_attribute_dialog.text
+            if target_page > 1:
 
-                if is_net_content:
-                    edit_title_deciseconds = 200
+                if not navigate_to_page(driver, target_page):
+                    report_hiccup(driver)
                     continue
-            except:
-                edit_title_deciseconds += 1
-                time.sleep(0.1)
 
-        # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
-        edit_attribute_title = edit_attribute_dialog.text
+                # Make sure the main grid has finished loading
+                if not check_lui_maingrid(driver):
+                    report_hiccup(driver)
+                    continue
 
-        if edit_attribute_title != "Start Availability Date Time":
-            print("Error:: The attribute selected was not Start Availability Date Time")
-            logging.error("The attribute selected was not Start Availability Date Time")
-            return False
+                set_last_known_page(target_page)
 
-        # Wait to make sure the driver finds the cell edit iframe
-        try:
-            cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: Cell Edit iframe not found")
-            logging.error("Cell Edit iframe not found", exc_info=True)
-            return False
+            found_unseen_since_requery = False
+            page_snapshot = None
+            needs_requery = False
 
-        # Switch to the cell edit iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='cellEditDiv']/iframe")
-        web_driver.switch_to.frame(iframe)
+        # Read the rows on the current page after every grid reload
+        if page_snapshot is None:
 
-        # Wait to make sure the driver finds the attribute value field
-        try:
-            attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Attribute Value field not found")
-            logging.error("Attribute Value field not found", exc_info=True)
-            return False
+            page_snapshot = read_page_snapshot(driver)
 
-        try:
-            # Find the attribute value field
-            attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the attribute value field")
-            logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
-            return False
+            if page_snapshot == "error":
+                page_snapshot = None
+                report_hiccup(driver)
+                needs_requery = True
+                continue
 
-        try:
-            # Retrieve the value from the attribute value field
-            original_attribute_value = attribute_value_field.get_attribute('value')
+        unseen_rows = [row for row in page_snapshot if row[2] not in reviewed_in_pass]
 
-            # Wait to make sure the driver finds the cancel button
-            try:
-                cancel_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-            except Exception as e:
-                print("Error:: Cancel button not found")
-                logging.error("Cancel button not found", exc_info=True)
-                return False
+        # Every product on the page has been reviewed, so move on to the next page or re-query
+        if not unseen_rows:
 
-            try:
-                # Find the cancel button
-                cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-            except Exception as e:
-                print("Error:: WebDriver was not able to locate the cancel button")
-                logging.error("WebDriver was not able to locate the cancel button", exc_info=True)
-                return False
+            # Get the updated paging info
+            paging_info = parse_paging_info(driver)
 
-            # Click the cancel button
-            cancel_button.click()
+            if paging_info == 'No records to view':
+                needs_requery = True
+                continue
 
-            # Wait to make sure the driver finds the maingrid iframe
-            try:
-                maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-            except Exception as e:
-                print("Error:: maingrid iframe not found")
-                logging.error("maingrid iframe not found", exc_info=True)
-                return False
+            first_record_on_page = get_first_record_on_page(paging_info)
+            last_record_on_page = get_last_record_on_page(paging_info)
+            current_page = get_current_page(first_record_on_page)
+            total_records = get_total_records(paging_info)
 
-            # Switch to the main grid iframe
-            iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-            web_driver.switch_to.frame(iframe)
+            if last_record_on_page >= total_records:
 
-            # Used in loop below
-            is_edit_attrib_closed = False
+                # Re-query to drop the fixed products, unless the last scan found nothing new
+                if found_unseen_since_requery:
+                    needs_requery = True
+                else:
+                    is_finished = True
 
-            # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
-            while edit_attrib_deciseconds < 200:  # 20 seconds
-                # For this situation the except code block is the outcome we're looking for
-                try:
-                    # Check to see if web driver finds the element
-                    edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-                except:
-                    is_edit_attrib_closed = True
-                    edit_attrib_deciseconds = 200
-                    continue
+                continue
 
-            # If edit attribute dialog does not close
-            if not is_edit_attrib_closed:
-                print("Error:: Encountered problem with the get_start_availability_dialog function.\n")
-                logging.error("The edit attribute dialog never left the DOM")
-                return False
+            # Navigate to the next page of search results
+            if not navigate_to_nextpage(driver, current_page):
+                report_hiccup(driver)
+                needs_requery = True
+                continue
 
-        except Exception as e:
-            print("Error:: WebDriver was not able to retrieve the start availability date time value")
-            logging.error("WebDriver was not able to retrieve the start availability date time value", exc_info=True)
-            return False
+            # Make sure the main grid has finished loading
+            if not check_lui_maingrid(driver):
+                report_hiccup(driver)
+                needs_requery = True
+                continue
 
-    except Exception as e:
-        print("Error:: Encountered problem with the get_start_availability_dialog function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+            set_last_known_page(current_page + 1)
+            page_snapshot = None
+            continue
 
-    return original_attribute_value
+        current_row_on_page, current_row_id, product_identity = unseen_rows[0]
+        found_unseen_since_requery = True
 
+        # The Company product number comes from the page snapshot (row ids stand in for blank product numbers)
+        if product_identity.startswith("row_id:"):
+            Company_product_number = "blank_in_main_grid"
+        else:
+            Company_product_number = product_identity
+        print("Company Product Number: " + str(Company_product_number))
 
-def calculate_master_gtin(attrib_value):
-    """
-    Based on the following requirements from the PIM Business Analyst:
-    * Value should be numeric
-    * Number of Digits = 14
-    * If less than 14 digits, pad the value with leading zeros
-    """
+        # Review the product and correct any invalid values
+        attributes_fixed = process_product(driver, current_row_id, Company_product_number)
 
-    try:
+        if attributes_fixed == "error":
 
-        calculated_value = ""
+            # Quarantined products are left for the deferred retry queue (and stay in the search results)
+            if report_hiccup(driver, product_identity):
+                reviewed_in_pass.add(product_identity)
+                products_left_in_filter += 1
 
-        # check if value contains only numeric digits
-        try:
-            int(attrib_value)
-        except:
-            calculated_value = "not_a_number"
+            needs_requery = True
+            continue
 
-        # capture the length of the attribute value
-        length = len(attrib_value)
+        product_failure_counts.pop(product_identity, None)
+        reviewed_in_pass.add(product_identity)
 
-        if length > 14:
-            calculated_value = "exceeds character limit"
+        # Products which were not fixed for this attribute stay in the search results
+        if attribute_name not in attributes_fixed:
+            products_left_in_filter += 1
 
-        if length < 14:
-            calculated_value = attrib_value.zfill(14)
+        # Saving a correction reloads the grid, so the rows may have moved
+        if attributes_fixed:
+            page_snapshot = None
 
-    except Exception as e:
-        print("Error:: Encountered problem with the calculate_master_gtin function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+    if is_finished:
+        print("\n===============================\n"
+              "Finished filter pass: " + attribute_name + "\n"
+              "===============================\n")
+        logging.info("Finished validation error filter pass: " + attribute_name + ". Products left in filter: " +
+                     str(products_left_in_filter))
 
-    return calculated_value
+    return is_finished
 
 
-def calculate_Company_net_content(web_driver, crnt_row_id):
+def run_work_list(driver, product_numbers):
     """
-    Based on the following requirements from the PIM Business Analyst:
-    * Maximum Number of Characters = 9
-    * No more than 2 digits to the right of the decimal
-    * Should not be blank
-    ---------------------
-    * All values with more than 2 decimal digits should be modified to include only 2
-    * Blank values should be modified to -1 to show that the program has already checked the value
+    Reviews the products in a work list by looking them up directly instead of walking the whole grid.
+
+    The product numbers are searched in batches (see get_work_list_batch_size) using a single "Is One Of" criteria, so
+    one grid load returns the whole batch.  Each product in the search results is reviewed with the same logic as the
+    other targeting modes, picking the rows by product number from a fresh page snapshot after every grid reload.
+    Product numbers which are still pending after a complete pass through the search results were not found in the PIM
+    system.  If a hiccup interrupts a batch, the search is re-run with only the product numbers which have not been
+    reviewed yet.
+
+    Returns the list of product numbers which were not found.
     """
 
-    # Build an xpath for the attribute field based on the current row id
-    attrib_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER]"
+    # Initializing program flow variables for the loop
+    next_batch_start = 0  # Index in product_numbers of the first product in the next batch
+    batch = []  # Product numbers in the current batch
+    pending_product_numbers = set()  # Product numbers in the current batch which have not been reviewed yet
+    not_found = []  # Product numbers which the search did not return
+    page_snapshot = None  # Snapshot of the rows on the current page, None when it needs to be re-read
+    needs_search = True
 
-    try:
-        # Find the attribute element in the current row
-        attrib_elmt = web_driver.find_element(By.XPATH, attrib_path)
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the Company net content element of the current row")
-        logging.error("Error:: WebDriver was not able to locate the Company net content element of the current row",
-                      exc_info=True)
-        return "error"
+    while not is_hiccup_limit_reached() and not is_run_stopping():
 
-    # Click on the attribute element to open the edit attribute dialog
-    if not click_Company_net_content(web_driver, crnt_row_id):
-        print("Error:: WebDriver was not able to double-click the Company net content element of the current row")
-        logging.error("Error:: WebDriver was not able to double-click the Company net content element of the current row",
-                      exc_info=True)
-        return "error"
+        # Make sure the browser session is still alive before touching the grid
+        session_status = supervise_browser_session(driver)
 
-    # Get the attribute value from the edit attribute dialog (only way to see values which exceed character limit)
-    try:
+        if session_status == "error":
+            report_hiccup(driver)
+            continue
 
-        edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
+        if session_status == "restored":
+            page_snapshot = None
+            needs_search = True
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, edit_attrib_path))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+        if needs_search:
 
-        # Setting loop variable to handle wait
-        edit_attrib_deciseconds = 0  # Loop variable
+            # Start the next batch once every product in the current batch is accounted for
+            if not pending_product_numbers:
 
-        # Waiting until the edit attribute dialog display switches to block in the DOM
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            try:
+                if next_batch_start >= len(product_numbers):
+                    break
 
-                # Locate the edit attribute dialog element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+                batch = product_numbers[next_batch_start:next_batch_start + get_work_list_batch_size()]
+                pending_product_numbers = set(batch)
 
-                if "display: block" in edit_elmt_display:
-                    is_display_block = True
-                    edit_attrib_deciseconds = 200
-                    continue
-                else:
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-            except:
-                logging.error("edit attribute dialog display never shifted to block\n")
-                return False
+                print("\nLooking up work list products " + str(next_batch_start + 1) + " - " +
+                      str(next_batch_start + len(batch)) + " of " + str(len(product_numbers)) + "\n")
 
-        # Resetting edit attribute seconds variable for use later in this method
-        edit_attrib_deciseconds = 0
+                next_batch_start += len(batch)
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+            # Search for the product numbers in the batch which have not been reviewed yet
+            search_numbers = [number for number in batch if number in pending_product_numbers]
+            if not apply_search_criteria(driver, [("Company Product Number", "Is One Of", ",".join(search_numbers))]):
+                report_hiccup(driver)
+                continue
 
-        try:
-            # Find the edit attribute dialog
-            edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the edit attribute dialog")
-            logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
-            return False
+            paging_info = parse_paging_info(driver)
 
-        # Setting loop variable to handle wait
-        edit_title_deciseconds = 0  # Loop variable
+            if paging_info == 'No records to view':
+                not_found.extend(search_numbers)
+                pending_product_numbers = set()
+                continue
 
-        # Waiting until the edit attribute title includes the text: Company Net Content
-        while edit_title_deciseconds < 200:  # 20 seconds
-            try:
-                is_Company_net_content = "Company Net Content" in edit_attribute_dialog.text
+            set_last_known_page(1)
+            page_snapshot = None
+            needs_search = False
 
-                if is_Company_net_content:
-                    edit_title_deciseconds = 200
-                    continue
-            except:
-                edit_title_deciseconds += 1
-                time.sleep(0.1)
+        # Read the rows on the current page after every grid reload
+        if page_snapshot is None:
 
-        # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
-        edit_attribute_title = edit_attribute_dialog.text
+            page_snapshot = read_page_snapshot(driver)
 
-        if edit_attribute_title != "Company Net Content":
-            print("Error:: The attribute selected was not Company Net Content")
-            logging.error("The attribute selected was not Company Net Content")
-            return False
+            if page_snapshot == "error":
+                page_snapshot = None
+                report_hiccup(driver)
+                needs_search = True
+                continue
 
-        # Wait to make sure the driver finds the cell edit iframe
-        try:
-            cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: Cell Edit iframe not found")
-            logging.error("Cell Edit iframe not found", exc_info=True)
-            return False
+        pending_rows = [row for row in page_snapshot if row[2] in pending_product_numbers]
 
-        # Switch to the cell edit iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+        # No pending products left on the page, so move on to the next page or close out the batch
+        if not pending_rows:
 
-        # Wait to make sure the driver finds the attribute value field
-        try:
-            attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Attribute Value field not found")
-            logging.error("Attribute Value field not found", exc_info=True)
-            return False
+            # Get the updated paging info
+            paging_info = parse_paging_info(driver)
+            first_record_on_page = get_first_record_on_page(paging_info)
+            last_record_on_page = get_last_record_on_page(paging_info)
+            current_page = get_current_page(first_record_on_page)
+            total_records = get_total_records(paging_info)
 
-        try:
-            # Find the attribute value field
-            attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the attribute value field")
-            logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
-            return False
+            # Anything still pending at the end of the search results was not found
+            if last_record_on_page >= total_records:
+                not_found.extend([number for number in batch if number in pending_product_numbers])
+                pending_product_numbers = set()
+                needs_search = True
+                continue
 
-        try:
-            # Retrieve the value from the attribute value field
-            original_attribute_value = attribute_value_field.text
+            # Navigate to the next page of search results
+            if not navigate_to_nextpage(driver, current_page):
+                report_hiccup(driver)
+                needs_search = True
+                continue
 
-            # Wait to make sure the driver finds the cancel button
-            try:
-                cancel_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-            except Exception as e:
-                print("Error:: Cancel button not found")
-                logging.error("Cancel button not found", exc_info=True)
-                return False
+            # Make sure the main grid has finished loading
+            if not check_lui_maingrid(driver):
+                report_hiccup(driver)
+                needs_search = True
+                continue
 
-            try:
-                # Find the cancel button
-                cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-            except Exception as e:
-                print("Error:: WebDriver was not able to locate the cancel button")
-                logging.error("WebDriver was not able to locate the cancel button", exc_info=True)
-                return False
+            set_last_known_page(current_page + 1)
+            page_snapshot = None
+            continue
 
-            # Click the cancel button
-            cancel_button.click()
+        current_row_on_page, current_row_id, Company_product_number = pending_rows[0]
+        print("Company Product Number: " + str(Company_product_number))
 
-            # Wait to make sure the driver finds the maingrid iframe
-            try:
-                maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-            except Exception as e:
-                print("Error:: maingrid iframe not found")
-                logging.error("maingrid iframe not found", exc_info=True)
-                return False
+        # Review the product and correct any invalid values
+        attributes_fixed = process_product(driver, current_row_id, Company_product_number)
 
-            # Switch to the main grid iframe
-            iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-            web_driver.switch_to.frame(iframe)
+        if attributes_fixed == "error":
 
-            # Used in loop below
-            is_edit_attrib_closed = False
+            # Quarantined products are left for the deferred retry queue
+            if report_hiccup(driver, Company_product_number):
+                pending_product_numbers.discard(Company_product_number)
 
-            # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
-            while edit_attrib_deciseconds < 200:  # 20 seconds
-                # For this situation the except code block is the outcome we're looking for
-                try:
-                    # Check to see if web driver finds the element
-                    edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-                except:
-                    is_edit_attrib_closed = True
-                    edit_attrib_deciseconds = 200
-                    continue
+            needs_search = True
+            continue
 
-            # If edit attribute dialog does not close
-            if not is_edit_attrib_closed:
-                print("Error:: Encountered problem with the update_net_content function.\n")
-                logging.error("The edit attribute dialog never left the DOM")
-                return False
+        product_failure_counts.pop(Company_product_number, None)
+        pending_product_numbers.discard(Company_product_number)
 
-        except Exception as e:
-            print("Error:: WebDriver was not able to retrieve the Company net content value")
-            logging.error("WebDriver was not able to retrieve the Company net content value", exc_info=True)
-            return False
+        # Saving a correction reloads the grid, so the rows may have moved
+        if attributes_fixed:
+            page_snapshot = None
 
-        # Check to see if net content contains a dash
-        has_dash = False
-        if "-" in original_attribute_value:
-            has_dash = True
+    # Product numbers which never got searched because the program stopped early
+    not_searched_count = len(product_numbers) - next_batch_start + len(pending_product_numbers)
 
-        # Check to see if Company net content contains a decimal point
-        has_decimal = False
-        if "." in original_attribute_value:
-            has_decimal = True
+    # Keep the product numbers which still need to be reviewed for the checkpoint
+    work_list_remaining[:] = ([number for number in batch if number in pending_product_numbers] +
+                              product_numbers[next_batch_start:])
 
-        if has_dash:
+    print("\n===============================\n"
+          "Work list products not found: " + str(len(not_found)) + "\n"
+          "Work list products not reviewed: " + str(not_searched_count) + "\n"
+          "===============================\n")
+    logging.info("Work list products not found: " + str(len(not_found)) + ". Work list products not reviewed: " +
+                 str(not_searched_count))
 
-            # Parse the Company net content by the dash
-            Company_net_content_parsed_dash = original_attribute_value.split('-')  # returns a list containing 2 strings
+    if not_found:
+        save_product_number_report(not_found, "not_found")
 
-            # Get the value to the left of the dash
-            min_value = Company_net_content_parsed_dash[0]  # use index to access the value to the left of the dash
+    return not_found
 
-            # Get the value to the right of the dash
-            max_value = Company_net_content_parsed_dash[1]  # use index to access the value to the right of the dash
 
-            # Check the character length of the minimum value
-            if len(min_value) > 4:
+def run_deferred_retry(driver):
+    """
+    Gives the products in the deferred retry queue one more chance at the end of the run by looking them up as a work
+    list.  Products which fail again get quarantined again and end up in the retry queue file saved by save_and_quit.
+    """
 
-                # use only the first 4 digits
-                min_value = min_value[0:4]
+    # Products without a Company product number can't be looked up, so they stay in the queue
+    retry_product_numbers = [product for product in quarantined_products if not product.startswith("row_id:")]
+    quarantined_products[:] = [product for product in quarantined_products if product.startswith("row_id:")]
 
-                # if the 4th character in min_value is a decimal point, remove it
-                if min_value[3] == ".":
+    if not retry_product_numbers:
+        return
 
-                    # use only the first 3 digits
-                    min_value = min_value[0:3]
+    print("\n=====================================================================\n"
+          "Retrying " + str(len(retry_product_numbers)) + " products from the deferred retry queue\n"
+          "=====================================================================\n")
+    logging.info("Retrying " + str(len(retry_product_numbers)) + " products from the deferred retry queue")
 
-            # Check the character length of the maximum value
-            if len(min_value) > 4:
+    run_work_list(driver, retry_product_numbers)
 
-                # use only the 2 digits immediately to the right of decimal
-                min_value = min_value[0:4]
 
-                # if the 4th character in min_value is a decimal point, remove it
-                if min_value[3] == ".":
-                    # use only the first 3 digits
-                    min_value = min_value[0:3]
+def save_product_number_report(product_numbers, report_name):
+    """
+    Saves a list of Company product numbers to a csv file in the reviewed record files directory.  Used for the work
+    list products which were not found and for the deferred retry queue.  The files use the same layout as a work list
+    file, so they can be fed straight back into the work list targeting mode.
+    """
 
-            # build the fixed value
-            fixed_attribute_value = min_value + "-" + max_value
+    try:
+        # Capture current datatime
+        file_dtnow = datetime.datetime.now()
 
-            # go ahead and return the value since the additional checks / corrections are irrelevant when has_dash
-            return fixed_attribute_value
+        # Format datetime
+        file_datetime = file_dtnow.strftime("%m.%d.%Y_%H.%M.%S")
 
-        if has_decimal:
+        report_filename = file_datetime + '_data_cleanup_' + report_name + '.csv'
 
-            # Parse the Company net content
-            Company_net_content_parsed = original_attribute_value.split('.')  # returns a list containing 2 strings
+        with open(reviewed_path + "/" + report_filename, 'w') as report_file:
+            report_file.write("Company Product Number\n")
+            for product_number in product_numbers:
+                report_file.write(product_number + "\n")
 
-            # Get the digits to the left of the decimal point
-            whole_number_digits = Company_net_content_parsed[0]  # use index to access the digits to the left of the decimal
+    except Exception as e:
+        logging.error("Exception occurred while attempting to save the " + report_name + " report.", exc_info=True)
+        print("Error:: Exception occurred while attempting to save the " + report_name + " report.")
 
-            # Get the digits to the right of the decimal point
-            decimal_digits = Company_net_content_parsed[1]  # use index to access the digits to the right of the decimal
 
-            if len(decimal_digits) > 2:
+"""
+Shutdown Controller
+---
+Ctrl+C (SIGINT), SIGTERM, and the Alt+C hotkey all go through request_shutdown.  Rather than saving in the middle of an
+edit, it sets shutdown_event and the main program loops stop once the product in progress is finished (or its dialog is
+cancelled by the hiccup recovery).  The run then saves its activity files and a checkpoint (see save_checkpoint).  If
+that takes longer than shutdown_grace_seconds, or a second shutdown request comes in, the shutdown watcher thread saves
+what it has and exits right away.
+
+The signal handlers run on the main thread in between any two of its instructions, which may be while it holds the
+run recorder's lock or waits on its writer thread.  So request_shutdown only sets the events, and the saving is left to
+the main program loops and the shutdown watcher.
+"""
 
-                # use only the 2 digits immediately to the right of decimal
-                decimal_digits = decimal_digits[0:2]
 
-                if len(whole_number_digits) > 6:
-                    whole_number_digits = whole_number_digits[0:6]
+def init_shutdown_controller():
 
-                # build the fixed value
-                fixed_attribute_value = whole_number_digits + "." + decimal_digits
+    # Signal handlers can only be set from the main thread (CleanupEngine may be running on another one)
+    try:
+        signal.signal(signal.SIGINT, handle_shutdown_signal)
+        signal.signal(signal.SIGTERM, handle_shutdown_signal)
+    except Exception as e:
+        logging.info("Shutdown signal handlers not set: " + str(e))
 
-                return fixed_attribute_value
+    # Setting hotkey to request a shutdown
+    if keyboard is not None:
+        try:
+            keyboard.add_hotkey('alt+c', request_shutdown, args=["Alt+C hotkey"])
+        except Exception as e:
+            logging.info("The Alt+C hotkey is not available in this session")
 
-        else:  # if no decimal (original value is blank)
+    threading.Thread(target=watch_shutdown_requests, daemon=True).start()
 
-            # update value to -1
-            fixed_attribute_value = "-1"
-            return fixed_attribute_value
 
-    except Exception as e:
-        print("Error:: Encountered problem with the calculate_Company_net_content function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return "error"
+def handle_shutdown_signal(signal_number, frame):
+    request_shutdown(signal.Signals(signal_number).name)
 
 
-def click_manufacturer_number(web_driver, crnt_row_id):
+def request_shutdown(reason):
 
-    # Build an xpath for the attribute field based on the current row id
-    attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+    shutdown_reasons.append(reason)
 
-    # Wait to make sure the driver finds the attribute field for the current record
-    try:
-        attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-            lambda document: document.find_element(By.XPATH, attribute_path))
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the manufacturer number element of the current row")
-        logging.error("WebDriver was not able to locate the manufacturer number element of the current row",
-                      exc_info=True)
-        return False
+    # A second request means the user or supervisor doesn't want to wait
+    if shutdown_event.is_set():
+        force_shutdown_event.set()
 
-    try:
-        # Find the attribute element in the current row
-        attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the manufacturer number element of the current row")
-        logging.error("WebDriver was not able to locate the manufacturer number element of the current row",
-                      exc_info=True)
-        return False
+    shutdown_event.set()
 
-    # If frame is scrolled so attribute field is not visible, will scroll to the attribute element
-    try:
 
-        # Scroll to the element
-        ActionChains(web_driver) \
-            .scroll_to_element(attribute_elmt) \
-            .perform()
+def watch_shutdown_requests():
+    """
+    Reports a shutdown request and makes sure the program exits within the grace period, or right away after a second
+    request (see Shutdown Controller).  Runs on its own thread for the whole run.
+    """
 
-    except Exception as e:
-        print("Error:: could not scroll to manufacturer number field")
-        logging.error("could not scroll to manufacturer number field", exc_info=True)
-        return False
+    shutdown_event.wait()
 
-    # Make sure the main grid has finished loading
-    if not check_lui_maingrid_click(web_driver):
-        return False
+    print("\n=====================================================================\n"
+          "Shutdown requested (" + shutdown_reasons[0] + ").  Finishing the current product...\n"
+          "=====================================================================\n")
+    logging.info("Shutdown requested (" + shutdown_reasons[0] + ")")
 
-    try:
-        # Double-click the attribute field
-        dbl_click_action = ActionChains(web_driver)
-        dbl_click_action.double_click(attribute_elmt).perform()
+    shutdown_deadline = time.monotonic() + shutdown_grace_seconds
 
-    except Exception as e:
-        print("Error:: WebDriver was not able to double-click the manufacturer number field")
-        logging.error("WebDriver was not able to double-click the manufacturer number field", exc_info=True)
-        return False
+    # save_and_quit sets the freeze_event once the activity files are saved
+    while not freeze_event.wait(0.5):
 
-    # When function completes without any errors
-    return True
+        if force_shutdown_event.is_set():
+            print("\nSecond shutdown request (" + shutdown_reasons[-1] + ").  Saving and exiting now.\n")
+            logging.info("Second shutdown request (" + shutdown_reasons[-1] + "), saving and exiting now")
+            force_shutdown()
 
+        if time.monotonic() >= shutdown_deadline:
+            print("\nThe program did not stop within " + str(shutdown_grace_seconds) + " seconds.  Saving and exiting "
+                  "now.\n")
+            logging.error("The program did not stop within " + str(shutdown_grace_seconds) + " seconds of the shutdown "
+                          "request")
+            force_shutdown()
 
-def click_start_availability(web_driver, crnt_row_id):
 
-    # Build an xpath for the attribute field based on the current row id
-    attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+def force_shutdown():
 
-    # Wait to make sure the driver finds the attribute field for the current record
-    try:
-        attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-            lambda document: document.find_element(By.XPATH, attribute_path))
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the start availability element of the current row")
-        logging.error("WebDriver was not able to locate the start availability element of the current row",
-                      exc_info=True)
-        return False
+    # Only called from the shutdown watcher thread, never from a signal handler
+    if not freeze_event.is_set():
+        save_and_quit()
 
-    try:
-        # Find the attribute element in the current row
-        attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the start availability element of the current row")
-        logging.error("WebDriver was not able to locate the start availability element of the current row",
-                      exc_info=True)
-        return False
+    logging.shutdown()
+    os._exit(2)
+
+
+def save_checkpoint(targeting_mode, targeting_details):
+    """
+    Saves a run config which picks up where a stopped run left off (see Unattended Runs), so a supervisor can resume the
+    run with --config.  The full view walk resumes on the last page it was working on, the filtered passes resume with
+    the attributes which didn't finish, and the work list resumes with the product numbers which weren't reviewed (saved
+    next to the checkpoint as a work list file).
+    """
 
-    # If frame is scrolled so attribute field is not visible, will scroll to the attribute element
     try:
+        # Capture current datatime
+        file_dtnow = datetime.datetime.now()
 
-        # Scroll to the element
-        ActionChains(web_driver) \
-            .scroll_to_element(attribute_elmt) \
-            .perform()
+        # Format datetime
+        file_datetime = file_dtnow.strftime("%m.%d.%Y_%H.%M.%S")
 
-    except Exception as e:
-        print("Error:: could not scroll to start availability field")
-        logging.error("could not scroll to start availability field", exc_info=True)
-        return False
+        checkpoint_path = summary_path + "/" + file_datetime + "_data_cleanup_checkpoint.json"
+        checkpoint = {"targeting_mode": targeting_mode, "settings": {}}
 
-    # Make sure the main grid has finished loading
-    if not check_lui_maingrid_click(web_driver):
-        return False
+        if targeting_mode == "full_view":
+            checkpoint["settings"]["start_page"] = last_known_page
 
-    try:
-        # Double-click the attribute field
-        dbl_click_action = ActionChains(web_driver)
-        dbl_click_action.double_click(attribute_elmt).perform()
+        elif targeting_mode == "filtered":
+            checkpoint["attributes"] = targeting_details
 
-    except Exception as e:
-        print("Error:: WebDriver was not able to double-click the start availability field")
-        logging.error("WebDriver was not able to double-click the start availability field", exc_info=True)
-        return False
+        elif targeting_mode == "work_list":
+            remaining_path = summary_path + "/" + file_datetime + "_data_cleanup_remaining.csv"
 
-    # When function completes without any errors
-    return True
+            with open(remaining_path, 'w') as remaining_file:
+                remaining_file.write("Company Product Number\n")
+                for product_number in targeting_details:
+                    remaining_file.write(product_number + "\n")
 
+            checkpoint["work_list"] = os.path.abspath(remaining_path)
 
-def click_master_gtin(web_driver, crnt_row_id):
+        with open(checkpoint_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file, indent=4)
 
-    # Build an xpath for the attribute field based on the current row id
-    attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+        print("Checkpoint saved.  Resume the run with: --config \"" + checkpoint_path + "\"\n")
+        logging.info("Checkpoint saved to " + checkpoint_path)
 
-    # Wait to make sure the driver finds the attribute field for the current record
-    try:
-        attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-            lambda document: document.find_element(By.XPATH, attribute_path))
     except Exception as e:
-        print("Error:: WebDriver was not able to locate the master gtin element of the current row")
-        logging.error("WebDriver was not able to locate the master gtin element of the current row",
-                      exc_info=True)
-        return False
+        logging.error("Exception occurred while attempting to save the checkpoint.", exc_info=True)
+        print("Error:: Exception occurred while attempting to save the checkpoint.")
 
-    try:
-        # Find the attribute element in the current row
-        attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the master gtin element of the current row")
-        logging.error("WebDriver was not able to locate the master gtin element of the current row",
-                      exc_info=True)
-        return False
 
-    # If frame is scrolled so attribute field is not visible, will scroll to the attribute element
-    try:
+"""
+Cleanup Engine
+---
+Runs the program from other Python code (worker processes, schedulers, benchmarks) without the interactive prompts.
+The engine is configured with keyword settings named after the settings at the top of the script, runs any of the
+targeting modes, and hands back the run results.  The run state lives in the module globals, so there should only be one
+engine per process (run one process per Chrome instance, see chrome_fleet_launcher).
+
+    engine = CleanupEngine(debugger_address="127.0.0.1:9223", record_reload_trace=False)
+    if engine.connect():
+        results = engine.run_work_list(["100001", "100002"])
+        engine.save()
+"""
+
+
+class CleanupEngine:
+
+    # Module settings which can be changed through the engine
+    configurable_settings = ["required_repo_name", "required_view_preference", "required_records_per_page",
+                             "use_largest_page_size", "debugger_address", "browser_managed_by_fleet", "chrome_path",
+                             "chrome_user_data_dir", "pim_url", "block_nonessential_resources", "blocked_url_patterns",
+                             "allowed_url_patterns", "intercept_grid_data", "grid_data_url_pattern", "grid_data_fields",
+                             "record_reload_trace", "heartbeat_timeout_seconds", "heartbeat_interval_seconds",
+                             "max_session_restores", "health_check_wait_seconds", "tab_check_interval",
+                             "tab_recycle_heap_mb", "tab_recycle_dom_nodes", "tab_recycle_grid_reloads", "hiccup_limit",
+                             "hiccup_window_seconds", "quarantine_threshold", "work_list_batch_size", "start_page",
+                             "correction_cache_size", "audit_store_path", "columnar_export_format",
+                             "columnar_row_group_size", "reviewed_path", "corrected_path", "summary_path", "log_path",
+                             "trace_path"]
+
+    # Settings which are off when set to None, otherwise text
+    optional_settings = ["audit_store_path", "columnar_export_format"]
+
+    def __init__(self, **settings):
+        self.driver = None
+        self.not_found = []
+        self.saved = False
+        self.configure(**settings)
+
+    @classmethod
+    def check_setting(cls, setting_name, setting_value):
+        """
+        Checks a setting value against the type of the module setting and returns it, converted where the conversion
+        is lossless (a whole number for a text setting like required_records_per_page, or digits for a number setting
+        like work_list_batch_size).  Raises ValueError for an unknown setting or a value of the wrong type.
+        """
+
+        if setting_name not in cls.configurable_settings:
+            raise ValueError("Unknown setting: " + setting_name)
 
-        # Scroll to the element
-        ActionChains(web_driver) \
-            .scroll_to_element(attribute_elmt) \
-            .perform()
+        current_value = globals()[setting_name]
+        type_error = ValueError("Setting " + setting_name + " should be " + type(current_value).__name__ + ", not " +
+                                type(setting_value).__name__ + ": " + repr(setting_value))
 
-    except Exception as e:
-        print("Error:: could not scroll to master gtin field")
-        logging.error("could not scroll to master gtin field", exc_info=True)
-        return False
+        if setting_name in cls.optional_settings:
+            if setting_value is None or isinstance(setting_value, str):
+                return setting_value
+            raise ValueError("Setting " + setting_name + " should be str or None, not " + type(setting_value).__name__)
 
-    # Make sure the main grid has finished loading
-    if not check_lui_maingrid_click(web_driver):
-        return False
+        if isinstance(current_value, bool):
+            if isinstance(setting_value, bool):
+                return setting_value
+            raise type_error
 
-    try:
-        # Double-click the attribute field
-        dbl_click_action = ActionChains(web_driver)
-        dbl_click_action.double_click(attribute_elmt).perform()
+        if isinstance(current_value, int):
+            if isinstance(setting_value, int) and not isinstance(setting_value, bool):
+                return setting_value
+            if isinstance(setting_value, str) and is_digit_string(setting_value.strip()):
+                return int(setting_value)
+            raise type_error
 
-    except Exception as e:
-        print("Error:: WebDriver was not able to double-click the master gtin field")
-        logging.error("WebDriver was not able to double-click the master gtin field", exc_info=True)
-        return False
+        if isinstance(current_value, str):
+            if isinstance(setting_value, str):
+                return setting_value
+            if isinstance(setting_value, int) and not isinstance(setting_value, bool):
+                return str(setting_value)
+            raise type_error
 
-    # When function completes without any errors
-    return True
+        if not isinstance(setting_value, type(current_value)):
+            raise type_error
 
+        return setting_value
 
-def click_Company_net_content(web_driver, crnt_row_id):
+    def configure(self, **settings):
+        """
+        Changes module settings (see configurable_settings).  Every setting is checked first (see check_setting), so
+        a ValueError for an unknown setting or a value of the wrong type leaves all the settings unchanged.
+        """
 
-    # Build an xpath for the attribute field based on the current row id
-    attribute_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+        checked_settings = {setting_name: self.check_setting(setting_name, setting_value)
+                            for setting_name, setting_value in settings.items()}
 
-    # Wait to make sure the driver finds the attribute field for the current record
-    try:
-        attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-            lambda document: document.find_element(By.XPATH, attribute_path))
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the Company net content element of the current row")
-        logging.error("WebDriver was not able to locate the Company net content element of the current row",
-                      exc_info=True)
-        return False
+        for setting_name, setting_value in checked_settings.items():
+            globals()[setting_name] = setting_value
 
-    try:
-        # Find the attribute element in the current row
-        attribute_elmt = web_driver.find_element(By.XPATH, attribute_path)
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the Company net content element of the current row")
-        logging.error("WebDriver was not able to locate the Company net content element of the current row",
-                      exc_info=True)
-        return False
+        # The correction cache is sized when it's built
+        if "correction_cache_size" in settings:
+            init_correction_cache()
 
-    # If frame is scrolled so attribute field is not visible, will scroll to the attribute element
-    try:
+    def connect(self):
+        """
+        Creates the output directories, starts the log file, attaches to Chrome, and switches to the main grid iframe.
+        The PIM system should already be logged in.  The repo tab, View Preference, and records per page are checked and
+        fixed where possible (see verify_prerequisites).  Returns True, or False if WebDriver couldn't attach or a
+        prerequisite couldn't be met.
+        """
 
-        # Scroll to the element
-        ActionChains(web_driver) \
-            .scroll_to_element(attribute_elmt) \
-            .perform()
+        init_directories()
+        init_logger()
+        init_audit_store()
+        init_columnar_export()
 
-    except Exception as e:
-        print("Error:: could not scroll to Company net content field")
-        logging.error("could not scroll to Company net content field", exc_info=True)
-        return False
+        try:
+            self.driver = attach_webdriver()
 
-    # Make sure the main grid has finished loading
-    if not check_lui_maingrid_click(web_driver):
-        return False
+            # Check the PIM state and switch to the main grid iframe
+            prerequisites_met = verify_prerequisites(self.driver)
 
-    try:
-        # Double-click the attribute field
-        dbl_click_action = ActionChains(web_driver)
-        dbl_click_action.double_click(attribute_elmt).perform()
+        except Exception as e:
+            print("Error:: Exception occurred while attempting to attach the cleanup engine to Chrome.")
+            logging.error("Exception occurred while attempting to attach the cleanup engine to Chrome.", exc_info=True)
+            self.driver = None
+            return False
 
-    except Exception as e:
-        print("Error:: WebDriver was not able to double-click the Company net content field")
-        logging.error("WebDriver was not able to double-click the Company net content field", exc_info=True)
-        return False
+        if not prerequisites_met:
+            print("Error:: The PIM system is not ready for the cleanup engine (see the log file).")
+            self.driver = None
+            return False
 
-    # When function completes without any errors
-    return True
+        return True
+
+    def run(self, targeting_mode="full_view", targeting_details=None):
+        """
+        Runs one targeting mode (see run_targeting_mode) and returns the results (see get_results), or "error" if the
+        engine couldn't connect to Chrome.
+        """
 
+        # Saving froze the previous run, so start a new one with fresh run results
+        if self.saved:
+            if shutdown_event.is_set():
+                print("Error:: The process is shutting down, so the cleanup engine can't start another run.")
+                logging.error("The cleanup engine can't start another run after a shutdown request")
+                return "error"
 
-def click_net_content(web_driver, crnt_row_id):
+            reset_run_state()
+            self.saved = False
 
-    # Build an xpath for the net content field based on the current row id
-    net_content_path = "//*[@id='" + crnt_row_id + "']/PLACEHOLDER"
+        if self.driver is None and not self.connect():
+            return "error"
 
-    # Wait to make sure the driver finds the net content field for the current record
-    try:
-        net_content_wait = WebDriverWait(web_driver, timeout=20).until(
-            lambda document: document.find_element(By.XPATH, net_content_path))
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the net content element of the current row")
-        logging.error("WebDriver was not able to locate the net content element of the current row", exc_info=True)
-        return False
+        try:
+            self.not_found = run_targeting_mode(self.driver, targeting_mode, targeting_details)
+        except Exception as e:
+            print("Error:: Exception occurred during the cleanup engine run.")
+            logging.error("Exception occurred during the cleanup engine run.", exc_info=True)
+            return "error"
 
-    try:
-        # Find the net content element in the current row
-        net_content_elmt = web_driver.find_element(By.XPATH, net_content_path)
-    except Exception as e:
-        print("Error:: WebDriver was not able to locate the net content element of the current row")
-        logging.error("WebDriver was not able to locate the net content element of the current row", exc_info=True)
-        return False
+        return self.get_results()
 
-    # If frame is scrolled so net content field is not visible, will scroll to the net content element
-    try:
+    def run_full_view_walk(self):
+        return self.run("full_view")
 
-        # Scroll to the element
-        ActionChains(web_driver) \
-            .scroll_to_element(net_content_elmt) \
-            .perform()
+    def run_filtered_passes(self, attribute_names=None):
+        if attribute_names is None:
+            attribute_names = list(target_attribute_names)
+        return self.run("filtered", attribute_names)
 
-    except Exception as e:
-        print("Error:: could not scroll to net content field")
-        logging.error("could not scroll to net content field", exc_info=True)
-        return False
+    def run_work_list(self, product_numbers):
+        return self.run("work_list", list(product_numbers))
 
-    # Make sure the main grid has finished loading
-    if not check_lui_maingrid_click(web_driver):
-        return False
+    def get_results(self):
+        """
+        Returns the results of the run so far: the counters, the reviewed and corrected rows (one list per product,
+        same columns as the activity files, header row first), the products left in the deferred retry queue, and the
+        work list products which were not found.
+        """
 
-    try:
-        # Double-click the net content field
-        dbl_click_action = ActionChains(web_driver)
-        dbl_click_action.double_click(net_content_elmt).perform()
+        run_results = run_recorder.get_snapshot()
+        run_results["quarantined"] = list(quarantined_products)
+        run_results["not_found"] = list(self.not_found)
 
-    except Exception as e:
-        print("Error:: WebDriver was not able to double-click the net content field")
-        logging.error("WebDriver was not able to double-click the net content field", exc_info=True)
-        return False
+        return run_results
 
-    # When function completes without any errors
-    return True
+    def save(self):
+        """
+        Saves the activity files (see save_and_quit).  Like the hotkey, this stops any run in progress.  The engine can
+        run again afterwards, which starts a new run with its own activity files (see reset_run_state).
+        """
+
+        save_and_quit()
+        self.saved = True
 
 
-def update_manufacturer_number(attrib_value, web_driver):
+def reset_run_state():
     """
-    Based on the following requirements from the PIM Business Analyst:
-    * Value should be numeric
-    * Number of Digits = 6
-    * If less than 6 digits, pad the value with leading zeros
+    Starts a new run in the same process once the previous one has been saved: clears the freeze left by save_and_quit,
+    starts new run results, hiccup budget, and retry queue, and reopens the audit store and columnar files.
     """
 
-    try:
+    global run_recorder
+    global number_of_hiccups
+    global heartbeat_due
 
-        edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
+    freeze_event.clear()
+    heartbeat_due = True
+    run_recorder = RunRecorder(reviewed_header, fixed_header)
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, edit_attrib_path))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+    number_of_hiccups = 0
+    recent_hiccup_times.clear()
+    product_failure_counts.clear()
+    quarantined_products.clear()
+    work_list_remaining.clear()
+    recovery_stats.clear()
+    throughput_stats.clear()
+    grid_reload_stats[:] = [0, 0.0]
+    grid_data_stats.update(grid_data=0, cells=0)
 
-        # Setting loop variable to handle wait
-        edit_attrib_deciseconds = 0  # Loop variable
+    init_audit_store()
+    init_columnar_export()
 
-        # Waiting until the edit attribute dialog display switches to block in the DOM
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            try:
 
-                # Locate the edit attribute dialog element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+def run_targeting_mode(driver, targeting_mode, targeting_details):
+    """
+    The Main Program Loop
+    ---------------------
 
-                if "display: block" in edit_elmt_display:
-                    is_display_block = True
-                    edit_attrib_deciseconds = 200
-                    continue
-                else:
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-            except:
-                logging.error("edit attribute dialog display never shifted to block\n")
-                return False
+    Full view walk: cycles through every product in the view (see run_full_view_walk)
 
-        # Resetting edit attribute seconds variable for use later in this method
-        edit_attrib_deciseconds = 0
+    Validation error filter passes: one filtered pass per selected attribute (see run_filtered_pass)
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+    Work list: looks up the product numbers from the work list file in batches (see run_work_list)
 
-        try:
-            # Find the edit attribute dialog
-            edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the edit attribute dialog")
-            logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
-            return False
+    The targeting mode and details are the ones returned by get_user_input_targeting_mode.  Once the main pass is done,
+    the products in the deferred retry queue get one more chance.  Returns the list of work list product numbers which
+    were not found (empty for the other targeting modes).
+    """
 
-        # Setting loop variable to handle wait
-        edit_title_deciseconds = 0  # Loop variable
+    not_found = []
 
-        # Waiting until the edit attribute title includes the text: Manufacturer Number
-        while edit_title_deciseconds < 200:  # 20 seconds
-            try:
-                is_manufacturer_number = "Manufacturer Number" in edit_attribute_dialog.text
+    if targeting_mode == "filtered":
 
-                if is_manufacturer_number:
-                    edit_title_deciseconds = 200
-                    continue
-            except:
-                edit_title_deciseconds += 1
-                time.sleep(0.1)
+        for attribute_index, attribute_name in enumerate(targeting_details):
 
-        # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
-        edit_attribute_title = edit_attribute_dialog.text
+            if is_hiccup_limit_reached() or is_run_stopping():
 
-        if edit_attribute_title != "Manufacturer Number":
-            print("Error:: The attribute selected was not Manufacturer Number")
-            logging.error("The attribute selected was not Manufacturer Number")
-            return False
+                # Keep the attributes which still need a pass for the checkpoint
+                if shutdown_event.is_set():
+                    save_checkpoint("filtered", targeting_details[attribute_index:])
+                break
 
-        # Wait to make sure the driver finds the cell edit iframe
-        try:
-            cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: Cell Edit iframe not found")
-            logging.error("Cell Edit iframe not found", exc_info=True)
-            return False
+            run_filtered_pass(driver, attribute_name)
 
-        # Switch to the cell edit iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+            # A shutdown during the last pass leaves that pass unfinished
+            if shutdown_event.is_set() and attribute_index == len(targeting_details) - 1:
+                save_checkpoint("filtered", targeting_details[attribute_index:])
 
-        # Wait to make sure the driver finds the attribute value field
-        try:
-            attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Attribute Value field not found")
-            logging.error("Attribute Value field not found", exc_info=True)
-            return False
+        # Put the main grid back to its unfiltered state
+        if not freeze_event.is_set():
+            clear_validation_filter(driver)
 
-        try:
-            # Find the attribute value field
-            attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the attribute value field")
-            logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
-            return False
+    elif targeting_mode == "work_list":
 
-        try:
-            # Clear the existing attribute value input text
-            attribute_value_field.clear()
+        not_found = run_work_list(driver, targeting_details)
 
-            # Enter the fixed attribute value
-            attribute_value_field.send_keys(attrib_value)
+        if shutdown_event.is_set() and work_list_remaining:
+            save_checkpoint("work_list", list(work_list_remaining))
 
-        except:
-            # Wait to make sure the driver finds the cancel button
-            try:
-                cancel_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-            except Exception as e:
-                print("Error:: Cancel button not found")
-                logging.error("Cancel button not found", exc_info=True)
-                return False
+        # Put the main grid back to its unfiltered state
+        if not freeze_event.is_set():
+            clear_validation_filter(driver)
 
-            try:
-                # Find the cancel button
-                cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-            except Exception as e:
-                print("Error:: WebDriver was not able to locate the cancel button")
-                logging.error("WebDriver was not able to locate the cancel button", exc_info=True)
-                return False
+    else:
+        run_full_view_walk(driver)
 
-            # Click the cancel button
-            cancel_button.click()
-            return False
+        if shutdown_event.is_set():
+            save_checkpoint("full_view", None)
 
-        # Wait to make sure the driver finds the save button field
-        try:
-            save_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Save button not found")
-            logging.error("Save button not found", exc_info=True)
-            return False
+    # Give the quarantined products one more chance now that the main pass is done
+    if quarantined_products and not is_hiccup_limit_reached() and not is_run_stopping():
 
-        try:
-            # Find the save button
-            save_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the Save button")
-            logging.error("WebDriver was not able to locate the Save button", exc_info=True)
-            return False
+        run_deferred_retry(driver)
 
-        # Click the save button
-        save_button.click()
+        # Put the main grid back to its unfiltered state
+        if not freeze_event.is_set():
+            clear_validation_filter(driver)
 
-        # Wait to make sure the driver finds the maingrid iframe
-        try:
-            maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: maingrid iframe not found")
-            logging.error("maingrid iframe not found", exc_info=True)
-            return False
+    return not_found
 
-        # Switch to the main grid iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
 
-        # Used in loop below
-        is_edit_attrib_closed = False
+"""
+Page Size Benchmark
+---
+Larger pages mean fewer page turns per million records, but each page takes longer to load.  benchmark_page_sizes
+selects each page size the PIM system offers, times a few page turns (the navigation plus the main grid reload), and
+projects the page turn time per million records so the best page size can be picked for the PIM system at hand:
 
-        # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            # For this situation the except code block is the outcome we're looking for
-            try:
-                # Check to see if web driver finds the element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_attrib_deciseconds += 1
-                time.sleep(.1)
-            except:
-                is_edit_attrib_closed = True
-                edit_attrib_deciseconds = 200
-                continue
+    python pim_data_cleanup.py --benchmark-page-sizes
 
-        # When function completes without any errors
-        if is_edit_attrib_closed:
-            return True
-        else:
-            print("Error:: Encountered problem with the update_manufacturer_number function.\n")
-            logging.error("The edit attribute dialog never left the DOM")
-            return False
+The results are printed, logged, and saved to the trace files folder.
+"""
 
-    except Exception as e:
-        print("Error:: Exception encountered when attempting to update the manufacturer number")
-        logging.error("Exception encountered when attemtping to update the manufacturer number", exc_info=True)
-        return False
+# Number of page turns timed at each page size
+benchmark_page_turns = 5
 
 
-def update_start_availability(web_driver):
+def benchmark_page_sizes(web_driver):
     """
-    Based on the following requirements from the PIM Business Analyst:
-    * The year of the datetime can't have 00 for the first two digits (ex: can't be 0007, must be 2007)
-    * Based on product searches, oldest valid datetime has a year of 1982
-    * Parse the datetime, if year less than 1982, clear the datetime completely
+    Times page turns at every page size offered by the records per page selector.  Returns a list of
+    (page size, average reload seconds, average page turn seconds, page turn hours per million records) tuples, or
+    "error".  Leaves the grid on the first page at required_records_per_page.
     """
 
-    try:
-
-        edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
-
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, edit_attrib_path))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
-
-        # Setting loop variable to handle wait
-        edit_attrib_deciseconds = 0  # Loop variable
+    benchmark_results = []
 
-        # Waiting until the edit attribute dialog display switches to block in the DOM
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            try:
+    try:
+        records_per_page_select = Select(web_driver.find_element(By.XPATH, "//select[@id='PLACEHOLDER']"))
+        offered_page_sizes = get_offered_page_sizes(records_per_page_select)
+    except Exception as e:
+        print("Error:: Records per page selector not found.")
+        logging.error("Records per page selector not found", exc_info=True)
+        return "error"
 
-                # Locate the edit attribute dialog element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+    for page_size in offered_page_sizes:
 
-                if "display: block" in edit_elmt_display:
-                    is_display_block = True
-                    edit_attrib_deciseconds = 200
-                    continue
-                else:
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-            except:
-                logging.error("edit attribute dialog display never shifted to block\n")
-                return False
+        print("Timing page turns at " + str(page_size) + " records per page...")
 
-        # Resetting edit attribute seconds variable for use later in this method
-        edit_attrib_deciseconds = 0
+        # Switch the records per page
+        records_per_page_select = Select(web_driver.find_element(By.XPATH, "//select[@id='PLACEHOLDER']"))
+        records_per_page_select.select_by_visible_text(str(page_size))
+        if not check_lui_maingrid(web_driver):
+            return "error"
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+        total_pages = -(-get_total_records(parse_paging_info(web_driver)) // page_size)
 
-        try:
-            # Find the edit attribute dialog
-            edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the edit attribute dialog")
-            logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
-            return False
+        reload_seconds = 0.0
+        turn_seconds = 0.0
+        page_turns = 0
 
-        # Setting loop variable to handle wait
-        edit_title_deciseconds = 0  # Loop variable
+        for page_number in range(2, min(total_pages, benchmark_page_turns + 1) + 1):
+            turn_start = time.perf_counter()
 
-        # Waiting until the edit attribute title includes the text: Start Availability Date Time
-        while edit_title_deciseconds < 200:  # 20 seconds
-            try:
-                is_start_availability = "Start Availability Date Time" in edit_attribute_dialog.text
+            if not navigate_to_page(web_driver, page_number):
+                return "error"
 
-                if is_start_availability:
-                    edit_title_deciseconds = 200
-                    continue
-            except:
-                edit_title_deciseconds += 1
-                time.sleep(0.1)
+            reload_start = time.perf_counter()
 
-        # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
-        edit_attribute_title = edit_attribute_dialog.text
+            if not check_lui_maingrid(web_driver):
+                return "error"
 
-        if edit_attribute_title != "Start Availability Date Time":
-            print("Error:: The attribute selected was not Start Availability Date Time")
-            logging.error("The attribute selected was not Start Availability Date Time")
-            return False
+            turn_end = time.perf_counter()
+            reload_seconds += turn_end - reload_start
+            turn_seconds += turn_end - turn_start
+            page_turns += 1
 
-        # Wait to make sure the driver finds the cell edit iframe
-        try:
-            cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: Cell Edit iframe not found")
-            logging.error("Cell Edit iframe not found", exc_info=True)
-            return False
+        if page_turns == 0:
+            print("Not enough records to turn a page at " + str(page_size) + " records per page.")
+            continue
 
-        # Switch to the cell edit iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+        average_reload_seconds = reload_seconds / page_turns
+        average_turn_seconds = turn_seconds / page_turns
+        hours_per_million = -(-1000000 // page_size) * average_turn_seconds / 3600
 
-        # Wait to make sure the driver finds the attribute value field
-        try:
-            attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Attribute Value field not found")
-            logging.error("Attribute Value field not found", exc_info=True)
-            return False
+        benchmark_results.append((page_size, average_reload_seconds, average_turn_seconds, hours_per_million))
 
-        try:
-            # Find the attribute value field
-            attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the attribute value field")
-            logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
-            return False
+        logging.info("Page size benchmark: " + str(page_size) + " records per page, " +
+                     format(average_reload_seconds, ".2f") + " s reload, " + format(average_turn_seconds, ".2f") +
+                     " s page turn, " + format(hours_per_million, ".1f") + " page turn hours per million records")
 
-        try:
-            # Clear the existing attribute value input text
-            attribute_value_field.clear()
+    # Put the grid back to the page size the program runs with
+    records_per_page_select = Select(web_driver.find_element(By.XPATH, "//select[@id='PLACEHOLDER']"))
+    records_per_page_select.select_by_visible_text(required_records_per_page)
+    if not check_lui_maingrid(web_driver):
+        return "error"
 
-        except:
-            # Wait to make sure the driver finds the cancel button
-            try:
-                cancel_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-            except Exception as e:
-                print("Error:: Cancel button not found")
-                logging.error("Cancel button not found", exc_info=True)
-                return False
+    return benchmark_results
 
-            try:
-                # Find the cancel button
-                cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-            except Exception as e:
-                print("Error:: WebDriver was not able to locate the cancel button")
-                logging.error("WebDriver was not able to locate the cancel button", exc_info=True)
-                return False
 
-            # Click the cancel button
-            cancel_button.click()
-            return False
+def run_page_size_benchmark():
+    """
+    Attaches to Chrome and runs benchmark_page_sizes (see Page Size Benchmark).  Returns the exit code.
+    """
 
-        # Wait to make sure the driver finds the save button field
-        try:
-            save_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Save button not found")
-            logging.error("Save button not found", exc_info=True)
-            return False
+    init_directories()
+    init_logger()
 
-        try:
-            # Find the save button
-            save_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the Save button")
-            logging.error("WebDriver was not able to locate the Save button", exc_info=True)
-            return False
+    driver = init_webdriver()
 
-        # Click the save button
-        save_button.click()
+    if not verify_prerequisites(driver):
+        return 1
 
-        # Wait to make sure the driver finds the maingrid iframe
-        try:
-            maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: maingrid iframe not found")
-            logging.error("maingrid iframe not found", exc_info=True)
-            return False
+    benchmark_results = benchmark_page_sizes(driver)
 
-        # Switch to the main grid iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+    if benchmark_results == "error":
+        print("Error:: The page size benchmark was interrupted (see the log file).")
+        return 1
 
-        # Used in loop below
-        is_edit_attrib_closed = False
+    print("\n=====================================================================\n"
+          "Records/Page   Reload (s)   Page Turn (s)   Page Turn Hours per 1M\n")
+    for page_size, average_reload_seconds, average_turn_seconds, hours_per_million in benchmark_results:
+        print(str(page_size).rjust(12) + format(average_reload_seconds, ".2f").rjust(13) +
+              format(average_turn_seconds, ".2f").rjust(16) + format(hours_per_million, ".1f").rjust(25))
+    print("=====================================================================\n")
 
-        # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            # For this situation the except code block is the outcome we're looking for
-            try:
-                # Check to see if web driver finds the element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_attrib_deciseconds += 1
-                time.sleep(.1)
-            except:
-                is_edit_attrib_closed = True
-                edit_attrib_deciseconds = 200
-                continue
+    # Save the results next to the reload traces
+    try:
+        file_datetime = datetime.datetime.now().strftime("%m.%d.%Y_%H.%M.%S")
 
-        # When function completes without any errors
-        if is_edit_attrib_closed:
-            return True
-        else:
-            print("Error:: Encountered problem with the update_start_availability function.\n")
-            logging.error("The edit attribute dialog never left the DOM")
-            return False
+        with open(trace_path + "/" + file_datetime + "_page_size_benchmark.csv", 'w') as benchmark_file:
+            benchmark_file.write("Records per Page,Reload Seconds,Page Turn Seconds,Page Turn Hours per Million\n")
+            for page_size, average_reload_seconds, average_turn_seconds, hours_per_million in benchmark_results:
+                benchmark_file.write(str(page_size) + "," + format(average_reload_seconds, ".3f") + "," +
+                                     format(average_turn_seconds, ".3f") + "," + format(hours_per_million, ".2f") +
+                                     "\n")
 
     except Exception as e:
-        print("Error:: Exception encountered when attempting to update the start availability date time")
-        logging.error("Exception encountered when attemtping to update the start availability date time", exc_info=True)
-        return False
+        logging.error("Exception occurred while attempting to save the page size benchmark.", exc_info=True)
+        print("Error:: Exception occurred while attempting to save the page size benchmark.")
 
+    return 0
 
-def update_master_gtin(attrib_value, web_driver):
-    """
-    Based on the following requirements from the PIM Business Analyst:
-    * Value should be numeric
-    * Number of Digits = 14
-    * If less than 14 digits, pad the value with leading zeros
-    """
 
-    try:
+"""
+Offline Audit
+---
+A full catalog export (a csv with a header row naming the Company Product Number and the attributes, like the grid
+data fields) can be audited without the PIM system.  The export is memory-mapped and split into byte ranges which end
+on a line break, and a pool of worker processes runs the validators and correction calculations over the ranges, each
+reading only its own range.  The products which need a correction are merged into one work list sorted by product
+number, saved in the layout of the corrected record files, so it can be fed straight into the work list targeting mode:
 
-        edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
+    python pim_data_cleanup.py --offline-audit catalog_export.csv --workers 8
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, edit_attrib_path))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+Values are treated like the values from the grid data response (the true values, see review_product).  Quoted values
+are fine, but line breaks inside a value are not, since the ranges are cut at line breaks.  Each worker only holds the
+results of the range it is working on and its correction caches, so memory per process stays bounded no matter how
+large the export is.
 
-        # Setting loop variable to handle wait
-        edit_attrib_deciseconds = 0  # Loop variable
+    python pim_data_cleanup.py --benchmark-offline-audit
 
-        # Waiting until the edit attribute dialog display switches to block in the DOM
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            try:
+times the audit of synthetic exports of each size in offline_benchmark_row_counts with 1 worker and with every core.
+"""
 
-                # Locate the edit attribute dialog element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+# Worker processes for the offline audit (None uses every core)
+offline_audit_workers = None
 
-                if "display: block" in edit_elmt_display:
-                    is_display_block = True
-                    edit_attrib_deciseconds = 200
-                    continue
-                else:
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-            except:
-                logging.error("edit attribute dialog display never shifted to block\n")
-                return False
+# Largest byte range given to a worker at once
+offline_audit_range_bytes = 16 << 20
 
-        # Resetting edit attribute seconds variable for use later in this method
-        edit_attrib_deciseconds = 0
+# Synthetic export sizes for the offline audit benchmark
+offline_benchmark_row_counts = (1000000, 10000000)
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
 
-        try:
-            # Find the edit attribute dialog
-            edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the edit attribute dialog")
-            logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
-            return False
+def split_export_ranges(export_path, range_bytes, minimum_ranges=1):
+    """
+    Splits the rows of an export (everything after the header line) into (start, end) byte ranges of about
+    range_bytes each, with every range ending just after a line break.  Returns (header line, ranges).
+    """
 
-        # Setting loop variable to handle wait
-        edit_title_deciseconds = 0  # Loop variable
+    with open(export_path, 'rb') as export_file:
+        with mmap.mmap(export_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_export:
+            export_size = len(mapped_export)
+            header_end = mapped_export.find(b"\n") + 1
 
-        # Waiting until the edit attribute title includes the text: Master GTIN
-        while edit_title_deciseconds < 200:  # 20 seconds
-            try:
-                is_master_gtin = "Master GTIN" in edit_attribute_dialog.text
+            if header_end == 0:
+                return mapped_export[:].decode("utf-8-sig"), []
 
-                if is_master_gtin:
-                    edit_title_deciseconds = 200
-                    continue
-            except:
-                edit_title_deciseconds += 1
-                time.sleep(0.1)
+            header_line = mapped_export[:header_end].decode("utf-8-sig")
 
-        # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
-        edit_attribute_title = edit_attribute_dialog.text
+            # Use smaller ranges for small exports so every worker gets some of the work
+            range_bytes = max(min(range_bytes, (export_size - header_end) // minimum_ranges), 1)
 
-        if edit_attribute_title != "Master GTIN":
-            print("Error:: The attribute selected was not Master GTIN")
-            logging.error("The attribute selected was not Master GTIN")
-            return False
+            export_ranges = []
+            range_start = header_end
 
-        # Wait to make sure the driver finds the cell edit iframe
-        try:
-            cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: Cell Edit iframe not found")
-            logging.error("Cell Edit iframe not found", exc_info=True)
-            return False
+            while range_start < export_size:
+                line_break = mapped_export.find(b"\n", min(range_start + range_bytes, export_size) - 1)
+                range_end = export_size if line_break == -1 else line_break + 1
+                export_ranges.append((range_start, range_end))
+                range_start = range_end
 
-        # Switch to the cell edit iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+    return header_line, export_ranges
 
-        # Wait to make sure the driver finds the attribute value field
-        try:
-            attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Attribute Value field not found")
-            logging.error("Attribute Value field not found", exc_info=True)
-            return False
 
-        try:
-            # Find the attribute value field
-            attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the attribute value field")
-            logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
-            return False
+def audit_export_record(record_values):
+    """
+    Validates and calculates the corrections for one product of an export, {attribute: value}, the same way
+    review_product does for a record from the grid data response.  Returns the product values
+    ({attribute: {"original", "valid", "fixed"}}) and the names of the attributes which would be corrected, or "error".
+    """
 
-        try:
-            # Clear the existing attribute value input text
-            attribute_value_field.clear()
+    product_values = {}
+    attributes_fixed = []
 
-            # Enter the fixed attribute value
-            attribute_value_field.send_keys(attrib_value)
+    for attribute_rule in attribute_rules:
 
-        except:
-            # Wait to make sure the driver finds the cancel button
-            try:
-                cancel_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-            except Exception as e:
-                print("Error:: Cancel button not found")
-                logging.error("Cancel button not found", exc_info=True)
-                return False
+        attribute_name = attribute_rule["name"]
+        original_value = normalize_grid_datetime(record_values[attribute_name])
 
-            try:
-                # Find the cancel button
-                cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-            except Exception as e:
-                print("Error:: WebDriver was not able to locate the cancel button")
-                logging.error("WebDriver was not able to locate the cancel button", exc_info=True)
-                return False
+        # Blanks are recorded the same way the getters record them (unless the main grid hides invalid values)
+        if original_value == "" and attribute_rule["dialog_validator"] is None:
+            original_value = "blank_in_main_grid"
 
-            # Click the cancel button
-            cancel_button.click()
-            return False
+        if attribute_rule["dialog_validator"] is not None:
+            value_valid = attribute_rule["dialog_validator"](original_value)
+        else:
+            value_valid = attribute_rule["validator"](original_value)
 
-        # Wait to make sure the driver finds the save button field
-        try:
-            save_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Save button not found")
-            logging.error("Save button not found", exc_info=True)
-            return False
+        if value_valid == "error":
+            return "error"
 
-        try:
-            # Find the save button
-            save_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the Save button")
-            logging.error("WebDriver was not able to locate the Save button", exc_info=True)
-            return False
+        fixed_value = ""
 
-        # Click the save button
-        save_button.click()
+        if not value_valid:
 
-        # Wait to make sure the driver finds the maingrid iframe
-        try:
-            maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: maingrid iframe not found")
-            logging.error("maingrid iframe not found", exc_info=True)
-            return False
+            if attribute_rule["depends_on"] is not None:
+                source_values = product_values[attribute_rule["depends_on"]]
+                fixed_value = attribute_rule["calculator"](original_value, source_values["original"],
+                                                           source_values["fixed"])
+            else:
+                fixed_value = attribute_rule["calculator"](original_value)
 
-        # Switch to the main grid iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+            if fixed_value == "error":
+                return "error"
 
-        # Used in loop below
-        is_edit_attrib_closed = False
+            if fixed_value is not None:
+                attributes_fixed.append(attribute_name)
 
-        # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
-        while edit_attrib_deciseconds < 200:
-            # For this situation the except code block is the outcome we're looking for
-            try:
-                # Check to see if web driver finds the element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_attrib_deciseconds += 1
-                time.sleep(.1)
-            except:
-                is_edit_attrib_closed = True
-                edit_attrib_deciseconds = 200
-                continue
+        product_values[attribute_name] = {"original": original_value, "valid": value_valid, "fixed": fixed_value}
 
-        # When function completes without any errors
-        if is_edit_attrib_closed:
-            return True
-        else:
-            print("Error:: Encountered problem with the update_master_gtin function.\n")
-            logging.error("The edit attribute dialog never left the DOM")
-            return False
+    return product_values, attributes_fixed
 
-    except Exception as e:
-        print("Error:: Exception encountered when attempting to update the master gtin")
-        logging.error("Exception encountered when attemtping to update the master gtinr", exc_info=True)
-        return False
+
+def read_export_range(mapped_export, range_start, range_end):
+    """
+    Yields the lines of a memory-mapped export between two byte offsets, one line at a time.
+    """
+
+    mapped_export.seek(range_start)
+
+    while mapped_export.tell() < range_end:
+        yield mapped_export.readline().decode("utf-8").rstrip("\r\n")
 
 
-def update_Company_net_content(attrib_value, web_driver):
+def audit_export_range(export_path, range_start, range_end, column_indexes):
     """
-    Based on the following requirements from the PIM Business Analyst:
-    * Maximum Number of Characters = 9
-    * No more than 2 digits to the right of the decimal
-    * Should not be blank
-    ---------------------
-    * All values with more than 2 decimal digits should be modified to include only 2
-    * Blank values should be modified to -1 to show that the program has already checked the value
+    Worker process body for the offline audit.  Audits the rows in one byte range of the export and returns
+    (rows audited, corrected record rows, product numbers which couldn't be audited).  column_indexes maps the Company
+    Product Number and each attribute to its column in the export.
     """
 
-    try:
+    rows_audited = 0
+    fixed_rows = []
+    error_product_numbers = []
+    last_index = max(column_indexes.values())
 
-        edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
+    # One copy of each repeated value, which pickle also sends back to the main process only once
+    shared_values = {}
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, edit_attrib_path))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+    with open(export_path, 'rb') as export_file:
+        with mmap.mmap(export_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_export:
+            for export_row in csv.reader(read_export_range(mapped_export, range_start, range_end)):
 
-        # Setting loop variable to handle wait
-        edit_attrib_deciseconds = 0  # Loop variable
+                if len(export_row) <= last_index:
+                    if export_row:
+                        error_product_numbers.append(export_row[0])
+                    continue
 
-        # Waiting until the edit attribute dialog display switches to block in the DOM
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            try:
+                rows_audited += 1
+                record_values = {attribute_name: export_row[column_index]
+                                 for attribute_name, column_index in column_indexes.items()}
+                product_number = record_values["Company Product Number"]
 
-                # Locate the edit attribute dialog element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+                audit_result = audit_export_record(record_values)
 
-                if "display: block" in edit_elmt_display:
-                    is_display_block = True
-                    edit_attrib_deciseconds = 200
+                if audit_result == "error":
+                    error_product_numbers.append(product_number)
                     continue
-                else:
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-            except:
-                logging.error("edit attribute dialog display never shifted to block\n")
-                return False
 
-        # Resetting edit attribute seconds variable for use later in this method
-        edit_attrib_deciseconds = 0
+                product_values, attributes_fixed = audit_result
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+                if attributes_fixed:
+                    fixed_row = [product_number]
+                    for attribute_rule in audit_rules:
+                        attribute_values = product_values[attribute_rule["name"]]
+                        for value in (attribute_values["original"], attribute_values["fixed"] or ""):
+                            fixed_row.append(shared_values.setdefault(value, value))
+                    fixed_rows.append(fixed_row)
 
-        try:
-            # Find the edit attribute dialog
-            edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the edit attribute dialog")
-            logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
-            return False
+    return rows_audited, fixed_rows, error_product_numbers
 
-        # Setting loop variable to handle wait
-        edit_title_deciseconds = 0  # Loop variable
 
-        # Waiting until the edit attribute title includes the text: Company Net Content
-        while edit_title_deciseconds < 200:  # 20 seconds
-            try:
-                is_Company_net_content = "Company Net Content" in edit_attribute_dialog.text
+def audit_export(export_path, workers=None):
+    """
+    Audits a catalog export in a pool of worker processes (see Offline Audit).  Returns (rows audited, corrected record
+    rows sorted by product number, product numbers which couldn't be audited), or "error".
+    """
 
-                if is_Company_net_content:
-                    edit_title_deciseconds = 200
-                    continue
-            except:
-                edit_title_deciseconds += 1
-                time.sleep(0.1)
+    try:
+        header_line, export_ranges = split_export_ranges(export_path, offline_audit_range_bytes,
+                                                         minimum_ranges=workers or os.cpu_count() or 1)
 
-        # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
-        edit_attribute_title = edit_attribute_dialog.text
+        # Find the column of the Company Product Number and each attribute
+        column_names = next(csv.reader([header_line.rstrip("\r\n")]))
+        column_indexes = {}
 
-        if edit_attribute_title != "Company Net Content":
-            print("Error:: The attribute selected was not Company Net Content")
-            logging.error("The attribute selected was not Company Net Content")
-            return False
+        for column_name in ["Company Product Number"] + [attribute_rule["name"] for attribute_rule in attribute_rules]:
+            if column_name not in column_names:
+                print("Error:: The export doesn't have a " + column_name + " column.")
+                logging.error("The export " + export_path + " doesn't have a " + column_name + " column")
+                return "error"
+            column_indexes[column_name] = column_names.index(column_name)
 
-        # Wait to make sure the driver finds the cell edit iframe
-        try:
-            cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: Cell Edit iframe not found")
-            logging.error("Cell Edit iframe not found", exc_info=True)
-            return False
+        range_tasks = [(export_path, range_start, range_end, column_indexes)
+                       for range_start, range_end in export_ranges]
 
-        # Switch to the cell edit iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+        with multiprocessing.Pool(processes=workers) as audit_pool:
+            range_results = audit_pool.starmap(audit_export_range, range_tasks, chunksize=1)
 
-        # Wait to make sure the driver finds the attribute value field
-        try:
-            attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Attribute Value field not found")
-            logging.error("Attribute Value field not found", exc_info=True)
-            return False
+    except Exception as e:
+        print("Error:: Exception occurred while auditing the export " + export_path + ".")
+        logging.error("Exception occurred while auditing the export " + export_path, exc_info=True)
+        return "error"
 
-        try:
-            # Find the attribute value field
-            attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the attribute value field")
-            logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
-            return False
+    # Merge the results of the ranges into one work list
+    rows_audited = 0
+    fixed_rows = []
+    error_product_numbers = []
 
-        try:
-            # Clear the existing attribute value input text
-            attribute_value_field.clear()
+    for range_rows_audited, range_fixed_rows, range_error_product_numbers in range_results:
+        rows_audited += range_rows_audited
+        fixed_rows.extend(range_fixed_rows)
+        error_product_numbers.extend(range_error_product_numbers)
 
-            # Enter the fixed attribute value
-            attribute_value_field.send_keys(attrib_value)
+    fixed_rows.sort(key=lambda fixed_row: fixed_row[0])
 
-        except:
-            # Wait to make sure the driver finds the cancel button
-            try:
-                cancel_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-            except Exception as e:
-                print("Error:: Cancel button not found")
-                logging.error("Cancel button not found", exc_info=True)
-                return False
+    return rows_audited, fixed_rows, error_product_numbers
 
-            try:
-                # Find the cancel button
-                cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-            except Exception as e:
-                print("Error:: WebDriver was not able to locate the cancel button")
-                logging.error("WebDriver was not able to locate the cancel button", exc_info=True)
-                return False
 
-            # Click the cancel button
-            cancel_button.click()
-            return False
+def save_offline_audit(fixed_rows):
+    """
+    Saves the products found by the offline audit to a work list in the reviewed record files directory, in the layout
+    of the corrected record files (the Company product number comes first, so load_work_list can read it).  Returns the
+    path of the work list, or "error".
+    """
 
-        # Wait to make sure the driver finds the save button field
-        try:
-            save_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Save button not found")
-            logging.error("Save button not found", exc_info=True)
-            return False
+    try:
+        file_datetime = datetime.datetime.now().strftime("%m.%d.%Y_%H.%M.%S")
+        work_list_path = reviewed_path + "/" + file_datetime + "_data_cleanup_offline_audit.csv"
 
-        try:
-            # Find the save button
-            save_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the Save button")
-            logging.error("WebDriver was not able to locate the Save button", exc_info=True)
-            return False
+        with open(work_list_path, 'w', newline="") as work_list_file:
+            work_list_writer = csv.writer(work_list_file)
+            work_list_writer.writerow(fixed_header)
+            work_list_writer.writerows(fixed_rows)
+
+    except Exception as e:
+        logging.error("Exception occurred while attempting to save the offline audit work list.", exc_info=True)
+        print("Error:: Exception occurred while attempting to save the offline audit work list.")
+        return "error"
 
-        # Click the save button
-        save_button.click()
+    return work_list_path
 
-        # Wait to make sure the driver finds the maingrid iframe
-        try:
-            maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: maingrid iframe not found")
-            logging.error("maingrid iframe not found", exc_info=True)
-            return False
 
-        # Switch to the main grid iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+def run_offline_audit(export_path, workers=None):
+    """
+    Audits a catalog export for the --offline-audit option and saves the work list.  Returns the exit code.
+    """
 
-        # Used in loop below
-        is_edit_attrib_closed = False
+    init_directories()
+    init_logger()
 
-        # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            # For this situation the except code block is the outcome we're looking for
-            try:
-                # Check to see if web driver finds the element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_attrib_deciseconds += 1
-                time.sleep(.1)
-            except:
-                is_edit_attrib_closed = True
-                edit_attrib_deciseconds = 200
-                continue
+    audit_start = time.perf_counter()
+    audit_results = audit_export(export_path, workers)
 
-        # When function completes without any errors
-        if is_edit_attrib_closed:
-            return True
-        else:
-            print("Error:: Encountered problem with the update_Company_net_content function.\n")
-            logging.error("The edit attribute dialog never left the DOM")
-            return False
+    if audit_results == "error":
+        return 1
 
-    except Exception as e:
-        print("Error:: Exception encountered when attempting to update the Company net content")
-        logging.error("Exception encountered when attemtping to update the Company net content", exc_info=True)
-        return False
+    rows_audited, fixed_rows, error_product_numbers = audit_results
+    audit_seconds = time.perf_counter() - audit_start
+
+    work_list_path = save_offline_audit(fixed_rows)
+
+    if work_list_path == "error":
+        return 1
+
+    audit_summary = ("Audited " + str(rows_audited) + " products in " + format(audit_seconds, ".1f") + " seconds.  " +
+                     str(len(fixed_rows)) + " products need corrections.")
+    print("\n" + audit_summary + "\nWork list saved: " + work_list_path + "\n")
+    logging.info(audit_summary + "  Work list: " + work_list_path)
+
+    if error_product_numbers:
+        print(str(len(error_product_numbers)) + " rows couldn't be audited (see the offline_audit_errors report)")
+        save_product_number_report(error_product_numbers, "offline_audit_errors")
+
+    return 0
 
 
-def update_blank_net_content(attrib_value, web_driver):
+def write_synthetic_export(export_path, row_count):
     """
-    This function is designed to update blank values in the Net Content field based on the Fixed value from the Company Net
-    Content field.  This provides an opportunity to clear even more validation errors in Net Content for products where
-    the Net Content was blank but the Company Net Content was not.
-    ----------------------------------------------------------
-    Based on the following requirements from the PIM Business Analyst:
-    * Maximum Number of Characters = 9
-    * No more than 2 digits to the right of the decimal
-    * Should not be blank
-    ---------------------
-    * All values with more than 2 decimal digits should be modified to include only 2
-    * Blank values should be modified to -1 to show that the program has already checked the value
+    Writes a catalog export with row_count products for the offline audit benchmark.  Each value has a 1 in 20 chance
+    of being invalid, in the shapes found in the PIM system.
     """
 
-    try:
+    # (valid values, invalid values) for each attribute
+    synthetic_values = {
+        "Manufacturer Number": (["%06d" % number for number in range(1, 2001)], ["4417", "83", ""]),
+        "Start Availability Date Time": (["2018-02-06T00:00:01", "01/15/2016 00:00:00", ""], ["03/01/0007 00:00:00"]),
+        "Master GTIN": (["%014d" % number for number in range(10000000, 10004000)], ["7501031311309", "12345"]),
+        "Company Net Content": (["12", "16.5", "1.5-2", "750"], ["33.814", "", "1200.12345"]),
+        "Net Content": (["12", "16.5", "750"], ["", "-1"])}
 
-        edit_attrib_path = "//div[@aria-labelledby='PLACEHOLDER']"
+    column_names = ["Company Product Number"] + [attribute_rule["name"] for attribute_rule in attribute_rules]
+    random_values = random.Random(row_count)
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, edit_attrib_path))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+    with open(export_path, 'w', newline="") as export_file:
+        export_writer = csv.writer(export_file)
+        export_writer.writerow(column_names)
 
-        # Setting loop variable to handle wait
-        edit_attrib_deciseconds = 0  # Loop variable
+        for row_number in range(row_count):
+            export_row = [str(10000000 + row_number)]
 
-        # Waiting until the edit attribute dialog display switches to block in the DOM
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            try:
+            for attribute_name in column_names[1:]:
+                valid_values, invalid_values = synthetic_values[attribute_name]
+                if random_values.random() < 0.05:
+                    export_row.append(random_values.choice(invalid_values))
+                else:
+                    export_row.append(random_values.choice(valid_values))
 
-                # Locate the edit attribute dialog element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_elmt_display = edit_attrib_element.get_dom_attribute("style")
+            export_writer.writerow(export_row)
 
-                if "display: block" in edit_elmt_display:
-                    is_display_block = True
-                    edit_attrib_deciseconds = 200
-                    continue
-                else:
-                    edit_attrib_deciseconds += 1
-                    time.sleep(.1)
-            except:
-                logging.error("edit attribute dialog display never shifted to block\n")
-                return False
 
-        # Resetting edit attribute seconds variable for use later in this method
-        edit_attrib_deciseconds = 0
+def benchmark_offline_audit():
+    """
+    Times the offline audit of a synthetic export of each size in offline_benchmark_row_counts with 1 worker and with
+    every core, and saves the results to the trace files folder.  Returns the exit code.
+    """
 
-        # Wait to make sure the driver finds the edit attribute dialog
-        try:
-            edit_attribute_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Edit Attribute dialog not found")
-            logging.error("Edit Attribute dialog not found", exc_info=True)
-            return False
+    init_directories()
+    init_logger()
 
-        try:
-            # Find the edit attribute dialog
-            edit_attribute_dialog = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the edit attribute dialog")
-            logging.error("WebDriver was not able to locate the edit attribute dialog", exc_info=True)
-            return False
+    worker_counts = sorted({1, os.cpu_count() or 1})
+    benchmark_results = []
 
-        # Setting loop variable to handle wait
-        edit_title_deciseconds = 0  # Loop variable
+    for row_count in offline_benchmark_row_counts:
+        export_path = trace_path + "/offline_benchmark_" + str(row_count) + ".csv"
 
-        # Waiting until the edit attribute title includes the text: Net Content
-        while edit_title_deciseconds < 200:  # 20 seconds
-            try:
-                is_net_content = "Net Content" in edit_attribute_dialog.text
+        print("Writing a synthetic export with " + str(row_count) + " products...")
+        write_synthetic_export(export_path, row_count)
 
-                if is_net_content:
-                    edit_title_deciseconds = 200
-                    continue
-            except:
-                edit_title_deciseconds += 1
-                time.sleep(0.1)
+        try:
+            for worker_count in worker_counts:
+                audit_start = time.perf_counter()
+                audit_results = audit_export(export_path, worker_count)
+                audit_seconds = time.perf_counter() - audit_start
 
-        # Read the title of the edit attribute dialog to make sure we are about to edit the correct attribute
-        edit_attribute_title = edit_attribute_dialog.text
+                if audit_results == "error":
+                    return 1
 
-        if edit_attribute_title != "Net Content":
-            print("Error:: The attribute selected was not Net Content")
-            logging.error("The attribute selected was not Net Content")
-            return False
+                benchmark_results.append((row_count, worker_count, audit_seconds, len(audit_results[1])))
+                print(str(row_count) + " products, " + str(worker_count) + " workers: " +
+                      format(audit_seconds, ".1f") + " seconds (" + format(row_count / audit_seconds, ".0f") +
+                      " products per second)")
+        finally:
+            os.remove(export_path)
 
-        # Wait to make sure the driver finds the cell edit iframe
-        try:
-            cell_edit_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: Cell Edit iframe not found")
-            logging.error("Cell Edit iframe not found", exc_info=True)
-            return False
+    try:
+        file_datetime = datetime.datetime.now().strftime("%m.%d.%Y_%H.%M.%S")
+
+        with open(trace_path + "/" + file_datetime + "_offline_audit_benchmark.csv", 'w') as benchmark_file:
+            benchmark_file.write("Products,Workers,Seconds,Products per Second,Speedup,Products to Correct\n")
+            for row_count, worker_count, audit_seconds, fixed_count in benchmark_results:
+                single_worker_seconds = [result[2] for result in benchmark_results
+                                         if result[0] == row_count and result[1] == 1][0]
+                benchmark_file.write(str(row_count) + "," + str(worker_count) + "," + format(audit_seconds, ".2f") +
+                                     "," + format(row_count / audit_seconds, ".0f") + "," +
+                                     format(single_worker_seconds / audit_seconds, ".2f") + "," + str(fixed_count) +
+                                     "\n")
+
+    except Exception as e:
+        logging.error("Exception occurred while attempting to save the offline audit benchmark.", exc_info=True)
+        print("Error:: Exception occurred while attempting to save the offline audit benchmark.")
 
-        # Switch to the cell edit iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+    return 0
 
-        # Wait to make sure the driver finds the attribute value field
-        try:
-            attribute_value_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Attribute Value field not found")
-            logging.error("Attribute Value field not found", exc_info=True)
-            return False
 
-        try:
-            # Find the attribute value field
-            attribute_value_field = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the attribute value field")
-            logging.error("WebDriver was not able to locate the attribute value field", exc_info=True)
-            return False
+"""
+Capacity Planner
+---
+Predicts how long a run will take from what past runs actually spent on each phase, instead of from the averages in
+the README.  The costs are measured from the product and reload traces in the trace files folder:
 
-        try:
-            # Clear the existing attribute value input text
-            attribute_value_field.clear()
+    reads:              time to read and check a product which needed no corrections
+    dialogs:            extra time for each correction (by attribute), less the reload after saving it
+    post-save reloads:  main grid reloads after saving a correction
+    page loads:         main grid loads for a new page (or a new work list batch)
+    other:              the rest of the wall clock time (snapshots, navigation, hiccup recovery), per product
 
-            # Enter the fixed attribute value
-            attribute_value_field.send_keys(attrib_value)
+The error density (the share of products which need each correction) comes from an offline audit work list of the
+target set if there is one (see Offline Audit), and otherwise from the traced runs.  The planner prints the predicted
+time for each phase, the hours it adds up to, and how many workers (PIM sessions splitting the products evenly) it
+takes to finish by the deadline:
 
-        except:
-            # Wait to make sure the driver finds the cancel button
-            try:
-                cancel_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                    lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-            except Exception as e:
-                print("Error:: Cancel button not found")
-                logging.error("Cancel button not found", exc_info=True)
-                return False
+    python pim_data_cleanup.py --plan-capacity 10000 --deadline-hours 12 --error-density offline_audit.csv
 
-            try:
-                # Find the cancel button
-                cancel_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-            except Exception as e:
-                print("Error:: WebDriver was not able to locate the cancel button")
-                logging.error("WebDriver was not able to locate the cancel button", exc_info=True)
-                return False
+Each traced run is also predicted from the costs measured on the other runs and compared with its actual wall clock
+time, which shows how far to trust the plan.
+"""
 
-            # Click the cancel button
-            cancel_button.click()
-            return False
+# Phases in the order they are reported
+capacity_phases = ["reads", "dialogs", "post-save reloads", "page loads", "other"]
 
-        # Wait to make sure the driver finds the save button field
-        try:
-            save_button_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']"))
-        except Exception as e:
-            print("Error:: Save button not found")
-            logging.error("Save button not found", exc_info=True)
-            return False
 
-        try:
-            # Find the save button
-            save_button = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']")
-        except Exception as e:
-            print("Error:: WebDriver was not able to locate the Save button")
-            logging.error("WebDriver was not able to locate the Save button", exc_info=True)
-            return False
+def parse_trace_timestamp(timestamp):
+    return datetime.datetime.strptime(timestamp, "%m/%d/%Y %H:%M:%S.%f")
 
-        # Click the save button
-        save_button.click()
 
-        # Wait to make sure the driver finds the maingrid iframe
-        try:
-            maingrid_iframe_wait = WebDriverWait(web_driver, timeout=20).until(
-                lambda document: document.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe"))
-        except Exception as e:
-            print("Error:: maingrid iframe not found")
-            logging.error("maingrid iframe not found", exc_info=True)
-            return False
+def load_capacity_traces(trace_folder):
+    """
+    Reads the product and reload traces in a folder.  Returns one dictionary per traced run (one per product trace
+    file) holding its product spans, the reload spans recorded while it ran, and its wall clock seconds.
+    """
+
+    reload_spans = []
 
-        # Switch to the main grid iframe
-        iframe = web_driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        web_driver.switch_to.frame(iframe)
+    for file_name in sorted(os.listdir(trace_folder)):
+        if file_name.endswith("_reload_trace.csv"):
+            with open(trace_folder + "/" + file_name, newline="") as trace_file:
+                for span in csv.DictReader(trace_file):
+                    reload_spans.append((parse_trace_timestamp(span["Timestamp"]), span["Reload Kind"],
+                                         float(span["Reload Seconds"])))
 
-        # Used in loop below
-        is_edit_attrib_closed = False
+    traced_runs = []
 
-        # Waiting to make sure the edit attribute dialog is removed from the DOM before proceeding
-        while edit_attrib_deciseconds < 200:  # 20 seconds
-            # For this situation the except code block is the outcome we're looking for
-            try:
-                # Check to see if web driver finds the element
-                edit_attrib_element = web_driver.find_element(By.XPATH, edit_attrib_path)
-                edit_attrib_deciseconds += 1
-                time.sleep(.1)
-            except:
-                is_edit_attrib_closed = True
-                edit_attrib_deciseconds = 200
-                continue
+    for file_name in sorted(os.listdir(trace_folder)):
+        if not file_name.endswith("_product_trace.csv"):
+            continue
 
-        # When function completes without any errors
-        if is_edit_attrib_closed:
-            return True
-        else:
-            print("Error:: Encountered problem with the update_net_content function.\n")
-            logging.error("The edit attribute dialog never left the DOM")
-            return False
+        with open(trace_folder + "/" + file_name, newline="") as trace_file:
+            product_spans = [(parse_trace_timestamp(span["Timestamp"]), float(span["Product Seconds"]),
+                              [attribute_name for attribute_name in span["Attributes Fixed"].split("|")
+                               if attribute_name])
+                             for span in csv.DictReader(trace_file)]
 
-    except Exception as e:
-        print("Error:: Exception encountered when attempting to update the net content")
-        logging.error("Exception encountered when attemtping to update the net content", exc_info=True)
-        return False
+        if not product_spans:
+            continue
 
+        # The run started when its first product did
+        run_start = product_spans[0][0] - datetime.timedelta(seconds=product_spans[0][1])
+        run_end = product_spans[-1][0]
 
-def navigate_to_nextpage(web_driver, current_pg):
+        traced_runs.append({"name": file_name,
+                            "product_spans": product_spans,
+                            "reload_spans": [reload_span for reload_span in reload_spans
+                                             if run_start <= reload_span[0] <= run_end],
+                            "wall_seconds": (run_end - run_start).total_seconds()})
 
-    # Using page_number_input instead of the next element because the next element is not directly interactable
-    try:
-        # Wait to make sure the driver finds the page_number_input field
-        page_number_input_wait = WebDriverWait(web_driver, timeout=20).until(
-            lambda document: document.find_element(By.XPATH, "//input[@class='PLACEHOLDER']"))
-    except Exception as e:
-        print("Error:: Page Number Input field not found")
-        logging.error("Page Number Input field not found", exc_info=True)
-        return False
+    return traced_runs
 
-    # Brief wait to account for browser latency
-    time.sleep(1)
 
-    current_pg_int = int(current_pg)
-    next_pg = current_pg_int + 1
+def measure_phase_costs(traced_runs):
+    """
+    Measures the cost of each phase across traced runs (see Capacity Planner).  Returns a dictionary of the costs in
+    seconds, or None if the runs don't have any products without corrections to measure the read cost from.
+    """
 
-    try:
-        # Retrieve updated data for the page number input field
-        page_number_input = web_driver.find_element(By.XPATH, "//input[@class='PLACEHOLDER']")
+    read_seconds = []
+    single_fix_seconds = {}
+    fixed_product_seconds = 0.0
+    fix_count = 0
+    fix_counts = collections.Counter()
+    page_load_seconds = []
+    post_save_seconds = []
+    product_count = 0
+    product_total_seconds = 0.0
+    wall_seconds = 0.0
+
+    for traced_run in traced_runs:
+        for span_timestamp, product_seconds, attributes_fixed in traced_run["product_spans"]:
+            if not attributes_fixed:
+                read_seconds.append(product_seconds)
+            else:
+                fixed_product_seconds += product_seconds
+                fix_count += len(attributes_fixed)
+                fix_counts.update(attributes_fixed)
+                if len(attributes_fixed) == 1:
+                    single_fix_seconds.setdefault(attributes_fixed[0], []).append(product_seconds)
 
-        # Clear the page_number_input text
-        page_number_input.clear()
-        # Brief delay to account for browser latency
-        time.sleep(.5)
-        # Enter the number for the next page
-        page_number_input.send_keys(str(next_pg))
-        # Brief delay to account for browser latency
-        time.sleep(.5)
-        # Hit the RETURN key to navigate to the next page of search results
-        page_number_input.send_keys(Keys.RETURN)
+            product_total_seconds += product_seconds
 
-    except Exception as e:
-        print("Error:: Encountered problem with the navigate_to_nextpage function.\n")
-        logging.error("Exception occurred", exc_info=True)
-        return False
+        for span_timestamp, reload_kind, reload_seconds in traced_run["reload_spans"]:
+            if reload_kind == "page_load":
+                page_load_seconds.append(reload_seconds)
+            elif reload_kind == "post_save":
+                post_save_seconds.append(reload_seconds)
 
-    # When function completes without any errors
-    return True
+        product_count += len(traced_run["product_spans"])
+        wall_seconds += traced_run["wall_seconds"]
 
+    if not read_seconds:
+        return None
 
-def print_activity_summary():
+    read_cost = sum(read_seconds) / len(read_seconds)
 
-    # Call the flash_window function
-    flash_window()
+    # A correction costs what a product with only that correction took over a plain read.  Attributes which were
+    # never the only correction on a product use the average over every correction.
+    if fix_count:
+        average_fix_cost = max((fixed_product_seconds - read_cost * (product_count - len(read_seconds))) / fix_count, 0)
+    else:
+        average_fix_cost = 0.0
 
-    logging.info("\n\n                               *********************************\n"
-                 "                               *        Activity Summary        *\n"
-                 "                               *********************************")
+    fix_costs = {}
+    for attribute_rule in attribute_rules:
+        attribute_seconds = single_fix_seconds.get(attribute_rule["name"])
+        if attribute_seconds:
+            fix_costs[attribute_rule["name"]] = max(sum(attribute_seconds) / len(attribute_seconds) - read_cost, 0)
+        else:
+            fix_costs[attribute_rule["name"]] = average_fix_cost
 
-    print("\n\n*********************************\n"
-          "*        Activity Summary       *\n"
-          "*********************************\n"
-          "                               ")
-    logging.info(
-        "\n\n                               Total Products Reviewed: " + str(items_reviewed_counter))
-    print("Total Products Reviewed:  " + str(items_reviewed_counter))
+    post_save_cost = sum(post_save_seconds) / len(post_save_seconds) if post_save_seconds else 0.0
+    page_load_cost = sum(page_load_seconds) / len(page_load_seconds) if page_load_seconds else 0.0
 
-    logging.info(
-        "\n\n                               Total Products Fixed:    " + str(items_fixed_counter))
-    print("Total Products Corrected: " + str(items_fixed_counter))
+    # Everything the spans don't account for
+    other_cost = max(wall_seconds - product_total_seconds - sum(page_load_seconds), 0) / product_count
 
-    logging.info(
-        "\n\n                               Fixed " + str(errors_fixed_counter))
-    print("Total Errors Corrected:   " + str(errors_fixed_counter) + "\n")
-    print("*********************************\n")
+    return {"read": read_cost,
+            "fix": fix_costs,
+            "post_save": post_save_cost,
+            "page_load": page_load_cost,
+            "other": other_cost,
+            "error_density": {attribute_name: fix_counts[attribute_name] / product_count
+                              for attribute_name in fix_costs}}
 
 
-def save_and_quit():
+def estimate_error_density(work_list_path, product_count=None):
     """
-    Saves program activity to files and exits the program. Saves data for the records which were reviewed to one file,
-    and saves data for the records which were corrected to another file.
-    There is also a hotkey set up to call this method even while the program is still running to make sure the
-    activity gets saved to file if the program needs to be interrupted.
-    *******************
-    *  Hotkey: <Alt+C>  *
-    *******************
+    Estimates the share of products which need each correction from an offline audit work list (see Offline Audit),
+    by checking the original values in it again.  product_count is the size of the audited set, which defaults to the
+    length of the work list (every product in it needs a correction).  Returns {attribute: share}, or "error".
     """
 
+    fix_counts = collections.Counter()
+    work_list_rows = 0
+
     try:
-        print("\n\n*********************************\n"
-              "Preparing data to be saved to file...\n")
+        with open(work_list_path, newline="") as work_list_file:
+            work_list_reader = csv.reader(work_list_file)
+            column_names = next(work_list_reader)
+
+            for work_list_row in work_list_reader:
+                record_values = {}
+                for attribute_rule in attribute_rules:
+                    original_value = work_list_row[column_names.index(attribute_rule["audit_columns"][1])]
+                    record_values[attribute_rule["name"]] = "" if original_value == "blank_in_main_grid" else \
+                        original_value
+
+                audit_result = audit_export_record(record_values)
+
+                if audit_result != "error":
+                    fix_counts.update(audit_result[1])
+                work_list_rows += 1
+
     except Exception as e:
-        logging.error("Exception occurred while attempting to save and exit.",
-                      exc_info=True)
-        print("Error:: Exception occurred while attempting to save and exit.")
+        print("Error:: Unable to read the error density from " + str(work_list_path) + ".")
+        logging.error("Unable to read the error density from " + str(work_list_path), exc_info=True)
+        return "error"
 
-    try:
-        try:
-            # Calculating number of products reviewed and number of products fixed using global list variables
-            reviewed_count = int(len(reviewed) / 6)    # 7 pieces of data were added per product
-            fixed_count = int(len(fixed) / 11)          # 13 pieces of data were added per product
+    product_count = product_count or work_list_rows
 
-            # Create 2D numpy arrays
-            reviewed_items = numpy.array(reviewed, dtype=str).reshape(reviewed_count, 6)
-            fixed_items = numpy.array(fixed, dtype=str).reshape(fixed_count, 11)
+    return {attribute_rule["name"]: fix_counts[attribute_rule["name"]] / max(product_count, 1)
+            for attribute_rule in attribute_rules}
 
-            print("Data preparation completed.  Saving data to files...\n")
 
-        except Exception as e:
-            logging.error("Exception occurred while attempting to create numpy arrays for reviewed and corrected items.",
-                          exc_info=True)
-            print("Error:: Exception occurred while attempting to create numpy arrays for reviewed and corrected items.")
+def predict_run_time(phase_costs, product_count, error_density, targeting_mode="work_list", deadline_hours=None):
+    """
+    Predicts the wall clock time of a run over product_count products from measured phase costs (see
+    measure_phase_costs).  Returns a dictionary with the seconds for each phase, the total hours, the dominant phase,
+    and the workers needed to finish within deadline_hours.
+    """
 
-        # Capture current datatime
-        file_dtnow = datetime.datetime.now()
+    # A work list is searched in batches, the other targeting modes go page by page
+    products_per_load = get_work_list_batch_size() if targeting_mode == "work_list" else records_per_page
 
-        # Format datetime
-        file_datetime = file_dtnow.strftime("%m.%d.%Y_%H.%M.%S")
+    dialog_seconds = 0.0
+    post_save_seconds = 0.0
 
-        # Define filenames for each file
-        summary_filename = file_datetime + '_data_cleanup_summary.txt'
-        reviewed_filename = file_datetime + '_data_cleanup_reviewed.csv'
-        corrected_filename = file_datetime + '_data_cleanup_fixed.csv'
+    for attribute_name, attribute_density in error_density.items():
+        corrections = product_count * attribute_density
+        dialog_seconds += corrections * max(phase_costs["fix"][attribute_name] - phase_costs["post_save"], 0)
+        post_save_seconds += corrections * min(phase_costs["post_save"], phase_costs["fix"][attribute_name])
 
-        # Save the activity summary data to a txt file
-        try:
-            with open(summary_path + "/" + summary_filename, 'w') as summary_file:
-                summary_file.write(
-                    "PIM Data Cleanup Activity Summary\n"
-                    "----------------------------------\n"
-                    "Total Products Reviewed: " + str(items_reviewed_counter) + "\n"
-                    "Total Products Fixed:    " + str(items_fixed_counter) + "\n"
-                    "Total Errors Fixed:      " + str(errors_fixed_counter) + "\n"
-                )
-        except Exception as e:
-            logging.error("Exception occurred while attempting to save activity summary data to txt file.",
-                          exc_info=True)
-            print(
-                "Error:: Exception occurred while attempting to save activity summary data to txt file.")
+    phase_seconds = {"reads": product_count * phase_costs["read"],
+                     "dialogs": dialog_seconds,
+                     "post-save reloads": post_save_seconds,
+                     "page loads": -(-product_count // products_per_load) * phase_costs["page_load"],
+                     "other": product_count * phase_costs["other"]}
 
-        # Save the reviewed items data to a csv file
-        try:
-            numpy.savetxt(reviewed_path + "/" + reviewed_filename, reviewed_items, fmt='%s', delimiter=",")
-            print("Reviewed item data saved successfully.  Now saving corrected item data...\n")
-        except Exception as e:
-            logging.error("Exception occurred while attempting to save reviewed item data to csv file.", exc_info=True)
-            print(
-                "Error:: Exception occurred while attempting to save reviewed item data to csv file.")
+    total_hours = sum(phase_seconds.values()) / 3600
 
-        # Save the fixed items data to a csv file
-        try:
-            numpy.savetxt(corrected_path + "/" + corrected_filename, fixed_items, fmt='%s', delimiter=",")
-            print("Corrected item data saved successfully.\n")
-            print("Please close the application.")
+    if deadline_hours:
+        workers_needed = max(math.ceil(total_hours / deadline_hours), 1)
+    else:
+        workers_needed = 1
 
-            # Effectively freeze the program to give user an opportunity to review console info before closing
-            freeze_event.set()
+    return {"phase_seconds": phase_seconds,
+            "total_hours": total_hours,
+            "dominant_phase": max(capacity_phases, key=lambda phase: phase_seconds[phase]),
+            "workers_needed": workers_needed}
 
 
-        except Exception as e:
-            logging.error("Exception occurred while attempting to save reviewed item data to csv file.", exc_info=True)
-            print(
-                "Error:: Exception occurred while attempting to save reviewed item data to csv file.")
-            print("Please close the application.")
+def backtest_capacity_plan(traced_runs, targeting_mode="work_list"):
+    """
+    Predicts each traced run from the phase costs measured on the other runs, using the run's own product count and
+    error density.  Returns (run name, actual hours, predicted hours) for each run that could be predicted.
+    """
 
-            # Effectively freeze the program to give user an opportunity to review console info before closing
-            freeze_event.set()
+    backtest_results = []
 
-        # Effectively freeze the program to give user an opportunity to review console info before closing
-        freeze_event.set()
+    for traced_run in traced_runs:
+        other_runs = [other_run for other_run in traced_runs if other_run is not traced_run]
+        phase_costs = measure_phase_costs(other_runs)
+        run_costs = measure_phase_costs([traced_run])
 
-    except Exception as e:
-        logging.error("Exception occurred while attempting to create reviewed and corrected files.", exc_info=True)
-        print("Error:: Exception occurred while attempting to create reviewed and corrected files.")
-        print("Please close the application.")
+        if phase_costs is None or run_costs is None:
+            continue
 
-        # Effectively freeze the program to give user an opportunity to review console info before closing
-        freeze_event.set()
+        run_prediction = predict_run_time(phase_costs, len(traced_run["product_spans"]), run_costs["error_density"],
+                                          targeting_mode)
+        backtest_results.append((traced_run["name"], traced_run["wall_seconds"] / 3600,
+                                 run_prediction["total_hours"]))
 
-    # Effectively freeze the program to give user an opportunity to review console info before closing
-    freeze_event.set()
+    return backtest_results
 
 
-def main():
+def run_capacity_planner(product_count, deadline_hours, error_density_path=None, targeting_mode="work_list"):
     """
-    The Main Method
+    Prints the capacity plan for the --plan-capacity option.  Returns the exit code.
     """
 
-    # Setting hotkey to call the save_and_exit method
-    keyboard.add_hotkey('alt+c', save_and_quit)
+    init_directories()
+    init_logger()
 
-    try:
-        # Initializing program
-        init_logger()
-        get_user_input_prerequisites()
-        driver = init_webdriver()
+    traced_runs = load_capacity_traces(trace_path)
+    phase_costs = measure_phase_costs(traced_runs)
 
-        # Initializing window flash to let user know when main program loop is completed
-        kernel32.GetConsoleWindow.restype = wintypes.HWND
-        user32.FlashWindowEx.argtypes = (ctypes.POINTER(WindowFlash),)
+    if phase_costs is None:
+        print("Error:: No product traces to plan from.  Run with record_reload_trace on first.")
+        return 1
 
-        # Switch to the main grid iframe
-        iframe = driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
-        driver.switch_to.frame(iframe)
+    if error_density_path:
+        error_density = estimate_error_density(error_density_path)
+        if error_density == "error":
+            return 1
+    else:
+        error_density = phase_costs["error_density"]
+
+    capacity_plan = predict_run_time(phase_costs, product_count, error_density, targeting_mode, deadline_hours)
+    traced_product_count = sum(len(traced_run["product_spans"]) for traced_run in traced_runs)
+
+    print("\n=====================================================================\n"
+          "Capacity plan for " + str(product_count) + " products (" + targeting_mode + "), measured from " +
+          str(len(traced_runs)) + " traced runs and " + str(traced_product_count) + " products\n")
+    print("Error density: " + ", ".join(attribute_name + " " + format(attribute_density * 100, ".1f") + "%"
+                                        for attribute_name, attribute_density in error_density.items()) + "\n")
+    print("Phase                 Hours   Share")
+    for phase in capacity_phases:
+        phase_hours = capacity_plan["phase_seconds"][phase] / 3600
+        print(phase.ljust(18) + format(phase_hours, ".2f").rjust(9) +
+              format(phase_hours * 100 / max(capacity_plan["total_hours"], 1e-9), ".0f").rjust(7) + "%")
+    print("\nPredicted time with 1 worker: " + format(capacity_plan["total_hours"], ".1f") + " hours (" +
+          capacity_plan["dominant_phase"] + " dominate)")
+    print("Workers needed to finish within " + format(deadline_hours, "g") + " hours: " +
+          str(capacity_plan["workers_needed"]))
+
+    backtest_results = backtest_capacity_plan(traced_runs, targeting_mode)
+
+    if backtest_results:
+        print("\nPredicted vs. actual hours for the traced runs (each predicted from the others):")
+        for run_name, actual_hours, predicted_hours in backtest_results:
+            print("  " + run_name + ": predicted " + format(predicted_hours, ".2f") + ", actual " +
+                  format(actual_hours, ".2f") + " (" +
+                  format((predicted_hours - actual_hours) * 100 / max(actual_hours, 1e-9), "+.0f") + "%)")
+    print("=====================================================================\n")
+
+    logging.info("Capacity plan for " + str(product_count) + " products: " +
+                 format(capacity_plan["total_hours"], ".1f") + " hours, " + str(capacity_plan["workers_needed"]) +
+                 " workers for " + format(deadline_hours, "g") + " hours, dominated by " +
+                 capacity_plan["dominant_phase"])
+
+    return 0
 
-        paging_info = parse_paging_info(driver)
-        current_row_on_page = 1  # Variable to track which row on the page we're reviewing
-        total_records = get_total_records(paging_info)
-        total_pages = get_total_pages(total_records)
 
-        # Print and log initial values used for main program loop
-        print_initial_values(total_pages, total_records)
+"""
+Unattended Runs
+---
+A run can be started from a scheduler or a worker pool with no prompts by passing a JSON run config:
 
-        # Initializing program flow variables for main program loop
-        is_finished = False
-        product_updated = False
-        first_iteration = True
-        number_of_hiccups = 0
-
-        # Bringing global counters into the main method
-        global items_reviewed_counter
-        global items_fixed_counter
-        global errors_fixed_counter
-
-        # Initializing attribute value variables for main program loop
-        original_manufacturer_number = ""
-        fixed_manufacturer_number = ""
-        original_start_availability = ""
-        fixed_start_availability = ""
-        original_master_gtin = ""
-        fixed_master_gtin = ""
-        original_net_content = ""
-        fixed_net_content = ""
-        original_Company_net_content = ""
-        fixed_Company_net_content = ""
+    python pim_data_cleanup.py --config nightly_run.json
 
-        '''
-        The Main Program Loop
-        ---------------------
-        
-        General flow: 
-        
-            - Get original values for the product
-            - Check values to see if any are invalid
-            - For any invalid values:
-                - calculate valid value 
-                - fix it
-                
-        '''
+    {
+        "targeting_mode": "filtered",
+        "attributes": ["Master GTIN", "Net Content"],
+        "settings": {"debugger_address": "127.0.0.1:9223", "required_records_per_page": "50"}
+    }
 
-        while number_of_hiccups < 10 and not is_finished and not freeze_event.is_set():
+targeting_mode is "full_view", "filtered" (with "attributes", all attributes if left out), or "work_list" (with
+"work_list" set to the path of a work list file).  "settings" takes any of the CleanupEngine settings.  Instead of the
+prerequisite prompt, the repo tab, View Preference, and records per page are verified from the DOM and fixed where
+possible (see verify_prerequisites).  The exit code is 0 when the run completes, 1 if it couldn't start, or 2 if it was
+stopped early (see Shutdown Controller), in which case the checkpoint it saved can be passed to --config to resume.
+"""
 
-            # Not triggered first time through loop, but IS triggered every other time
-            if not first_iteration:
 
-                # Flip first_iteration to False so the program knows that any iteration after this is NOT the first
-                first_iteration = False
+def run_audit_store_query(command_line):
+    """
+    Answers the --product-history and --export-run options from the audit store.  Returns the exit code.
+    """
 
-                # Make sure the main grid has finished loading
-                if not check_lui_maingrid(driver):
-                    # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                    number_of_hiccups += 1
-                    print("\nEncountered hiccup in the system.\n"
-                          "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                    flash_window()
-                    continue
+    store_path = command_line.audit_store or audit_store_path
 
-            '''
-            Collecting data from the current product record
-            '''
+    if store_path is None or not os.path.exists(store_path):
+        print("Error:: No audit store found.  Pass its path with --audit-store.")
+        return 1
 
-            # Get the element id for the current table row
-            current_row_id = get_row_id(driver, current_row_on_page)
+    if command_line.product_history:
+        print("Run ID, Recorded At, Attribute, Original Value, Corrected Value")
+        for history_row in find_product_history(store_path, command_line.product_history):
+            print(", ".join("" if value is None else str(value) for value in history_row))
 
-            if current_row_id == "error":  # If there was an error
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+    if command_line.export_run:
+        init_directories()
+        exported_files = export_audit_run(store_path, command_line.export_run)
 
-            # Get the Company product number from the current record
-            Company_product_number = get_Company_prod_number(driver, current_row_id)
-            print("Company Product Number: " + str(Company_product_number))
+        if exported_files == "error":
+            return 1
 
-            if Company_product_number == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+        print("Saved " + exported_files[0] + " and " + exported_files[1])
 
-            # Get the manufacturer number value from the current record
-            original_manufacturer_number = get_manufacturer_number(driver, current_row_id)
+    return 0
 
-            if original_manufacturer_number == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
 
-            # Get the start availability date time value from the current record
-            original_start_availability = get_start_availability(driver, current_row_id)
+def run_csv_conversion(csv_paths, export_format):
+    """
+    Converts csv files saved by earlier runs for the --convert-csv option.  Returns the exit code.
+    """
 
-            if original_start_availability == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+    exit_code = 0
 
-            # Get the master gtin value from the current record
-            original_master_gtin = get_master_gtin(driver, current_row_id)
+    for csv_path in csv_paths:
+        columnar_path = convert_csv_to_columnar(csv_path, export_format)
 
-            if original_master_gtin == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+        if columnar_path == "error":
+            exit_code = 1
+        else:
+            print("Saved " + columnar_path)
+
+    return exit_code
+
+
+def parse_command_line():
+
+    argument_parser = argparse.ArgumentParser(description="PIM Data Cleanup")
+    argument_parser.add_argument("--config", help="path to a JSON run config for an unattended run (no prompts)")
+    argument_parser.add_argument("--benchmark-page-sizes", action="store_true",
+                                 help="time page turns at each page size the PIM offers instead of cleaning up")
+    argument_parser.add_argument("--audit-store", help="path of the SQLite audit store for --product-history and "
+                                                       "--export-run (defaults to audit_store_path)")
+    argument_parser.add_argument("--product-history", metavar="PRODUCT_NUMBER",
+                                 help="print every recorded value of a product from the audit store")
+    argument_parser.add_argument("--export-run", metavar="RUN_ID",
+                                 help="generate the reviewed and corrected csv files for a run from the audit store")
+    argument_parser.add_argument("--offline-audit", metavar="EXPORT_PATH",
+                                 help="audit a catalog export without the PIM system and save a work list")
+    argument_parser.add_argument("--workers", type=int,
+                                 help="worker processes for --offline-audit (default every core)")
+    argument_parser.add_argument("--benchmark-offline-audit", action="store_true",
+                                 help="time the offline audit of synthetic exports")
+    argument_parser.add_argument("--plan-capacity", metavar="PRODUCTS", type=int,
+                                 help="predict the run time for a number of products from the trace files")
+    argument_parser.add_argument("--deadline-hours", type=float, default=24,
+                                 help="deadline for --plan-capacity (default 24)")
+    argument_parser.add_argument("--error-density", metavar="WORK_LIST",
+                                 help="offline audit work list of the target set for --plan-capacity")
+    argument_parser.add_argument("--plan-mode", choices=["full_view", "filtered", "work_list"], default="work_list",
+                                 help="targeting mode for --plan-capacity (default work_list)")
+    argument_parser.add_argument("--convert-csv", metavar="CSV_PATH", nargs="+",
+                                 help="convert reviewed or corrected csv files to columnar files")
+    argument_parser.add_argument("--columnar-format", choices=sorted(columnar_extensions), default="parquet",
+                                 help="format for --convert-csv (default parquet)")
+
+    return argument_parser.parse_args()
+
+
+def load_run_config(config_path):
+    """
+    Reads and checks an unattended run config (see Unattended Runs).  Returns a dict with the settings, targeting mode,
+    and targeting details, or "error" if the config can't be used (the problem is printed and logged).
+    """
 
-            # Get the net content value from the current record
-            original_net_content = get_net_content(driver, current_row_id)
+    try:
+        with open(config_path, 'r') as config_file:
+            config_data = json.load(config_file)
 
-            if original_net_content == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+    except Exception as e:
+        print("Error:: Unable to read the run config file: " + str(config_path))
+        logging.error("Unable to read the run config file: " + str(config_path), exc_info=True)
+        return "error"
 
-            # Get the Company net content value from the current record
-            original_Company_net_content = get_Company_net_content(driver, current_row_id)
+    settings = config_data.get("settings", {})
+    targeting_mode = config_data.get("targeting_mode", "full_view")
+    targeting_details = None
 
-            if original_Company_net_content == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+    unknown_settings = [setting_name for setting_name in settings
+                        if setting_name not in CleanupEngine.configurable_settings]
+    if unknown_settings:
+        print("Error:: Unknown settings in the run config: " + ", ".join(unknown_settings))
+        logging.error("Unknown settings in the run config: " + ", ".join(unknown_settings))
+        return "error"
 
-            '''
-            Checking data for validity
-            '''
+    # Check the setting types now rather than partway through the run
+    try:
+        settings = {setting_name: CleanupEngine.check_setting(setting_name, setting_value)
+                    for setting_name, setting_value in settings.items()}
+    except ValueError as e:
+        print("Error:: " + str(e))
+        logging.error("Invalid setting in the run config: " + str(e))
+        return "error"
 
-            # Check to see if value in manufacturer number field is valid
-            manufacturer_number_valid = is_manufacturer_number_valid(original_manufacturer_number)
+    if targeting_mode == "filtered":
+        targeting_details = config_data.get("attributes", list(target_attribute_names))
 
-            # If error
-            if manufacturer_number_valid == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+        unknown_attributes = [attribute_name for attribute_name in targeting_details
+                              if attribute_name not in target_attribute_names]
+        if unknown_attributes:
+            print("Error:: Unknown attributes in the run config: " + ", ".join(unknown_attributes))
+            logging.error("Unknown attributes in the run config: " + ", ".join(unknown_attributes))
+            return "error"
 
-            # Check to see if value in start availability date time field is valid
-            start_availability_valid = is_start_availability_valid(original_start_availability)
+    elif targeting_mode == "work_list":
+        targeting_details = load_work_list(config_data.get("work_list", ""))
 
-            # If error
-            if start_availability_valid == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+        if targeting_details == "error" or len(targeting_details) == 0:
+            print("Error:: The work list in the run config is missing or empty.")
+            logging.error("The work list in the run config is missing or empty: " + str(config_data.get("work_list")))
+            return "error"
 
-            # Doublecheck start availability date time by checking the edit attribute dialog
-            if not start_availability_valid:
+    elif targeting_mode != "full_view":
+        print("Error:: Unknown targeting mode in the run config: " + str(targeting_mode))
+        logging.error("Unknown targeting mode in the run config: " + str(targeting_mode))
+        return "error"
 
-                # capture the value from the edit attribute dialog
-                original_start_availability = get_start_availability_dialog(driver, current_row_id)
+    return {"settings": settings, "targeting_mode": targeting_mode, "targeting_details": targeting_details}
 
-                # If error
-                if start_availability_valid == "error":
-                    # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                    number_of_hiccups += 1
-                    print("\nEncountered hiccup in the system.\n"
-                          "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                    flash_window()
-                    continue
 
-                # Check to see if the value from the edit attribute dialog is valid
-                start_availability_valid = doublecheck_start_availability(original_start_availability)
+def run_unattended(config_path):
+    """
+    Runs the program from a run config without any prompts (see Unattended Runs).  Returns the exit code.
+    """
 
-                # If error
-                if start_availability_valid == "error":
-                    # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                    number_of_hiccups += 1
-                    print("\nEncountered hiccup in the system.\n"
-                          "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                    flash_window()
-                    continue
+    init_directories()
+    init_logger()
 
-            # Check to see if value in master gtin field is valid
-            master_gtin_valid = is_master_gtin_valid(original_master_gtin)
+    run_config = load_run_config(config_path)
 
-            # If error
-            if master_gtin_valid == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+    if run_config == "error":
+        return 1
 
-            # Check to see if value in net content field is blank
-            net_content_blank = is_net_content_blank(original_net_content)
+    logging.info("Starting unattended run from " + config_path + ": " + run_config["targeting_mode"])
 
-            # If error
-            if net_content_blank == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+    init_shutdown_controller()
 
-            # Check to see if value in Company net content field is valid
-            Company_net_content_valid = is_Company_net_content_valid(original_Company_net_content)
+    engine = CleanupEngine(**run_config["settings"])
 
-            # If error
-            if Company_net_content_valid == "error":
-                # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                number_of_hiccups += 1
-                print("\nEncountered hiccup in the system.\n"
-                      "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                flash_window()
-                continue
+    if not engine.connect():
+        logging.error("Unattended run could not start")
+        return 1
 
-            '''
-            Calculating valid values
-            '''
+    try:
+        paging_info = parse_paging_info(engine.driver)
+        if paging_info != 'No records to view':
+            update_records_per_page(paging_info)
+            total_records = get_total_records(paging_info)
+            print_initial_values(get_total_pages(total_records), total_records)
 
-            # Calculate the valid manufacturer number if value is invalid
-            if not manufacturer_number_valid:
+        engine.run(run_config["targeting_mode"], run_config["targeting_details"])
 
-                # calculate the correct value
-                fixed_manufacturer_number = calculate_manufacturer_number(original_manufacturer_number)
+    except Exception as e:
+        logging.error("Exception occurred during the unattended run.", exc_info=True)
+        print("Exception occurred during the unattended run.")
 
-                # If error
-                if fixed_manufacturer_number == "error":
-                    # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                    number_of_hiccups += 1
-                    print("\nEncountered hiccup in the system.\n"
-                          "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                    flash_window()
-                    continue
+    # Only call the save_and_quit function if it hasn't already been called
+    if not freeze_event.is_set():
+        save_and_quit()
 
-            # Calculate the valid master gtin if value is invalid
-            if not master_gtin_valid:
+    print_activity_summary()
 
-                # calculate the correct value
-                fixed_master_gtin = calculate_master_gtin(original_master_gtin)
+    # Let a supervisor know the run was stopped early and can be resumed from its checkpoint
+    if shutdown_event.is_set():
+        return 2
 
-                # If error
-                if fixed_master_gtin == "error":
-                    # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                    number_of_hiccups += 1
-                    print("\nEncountered hiccup in the system.\n"
-                          "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                    flash_window()
-                    continue
+    return 0
 
-            # Calculate the valid Company net content if value is invalid
-            if not Company_net_content_valid:
 
-                # calculate the correct value
-                fixed_Company_net_content = calculate_Company_net_content(driver, current_row_id)
+def main():
+    """
+    The Main Method
+    """
 
-                # If error
-                if fixed_Company_net_content == "error":
-                    # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                    number_of_hiccups += 1
-                    print("\nEncountered hiccup in the system.\n"
-                          "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                    flash_window()
-                    continue
+    command_line = parse_command_line()
 
-            '''
-            Updating products to fix invalid data
-            '''
-
-            # Manage program flow related to threading in case the alt+c hotkey is pressed
-            if not freeze_event.is_set():
-
-                # Set product_updated to False, will flip to True if product is updated in sections below
-                product_updated = False
-
-                if not manufacturer_number_valid:
-
-                    # Double-click the manufacturer number field to open the edit attribute dialog
-                    if not click_manufacturer_number(driver, current_row_id):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Update the manufacturer number for the selected record
-                    if not update_manufacturer_number(fixed_manufacturer_number, driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Make sure the main grid has finished loading
-                    if not check_lui_maingrid_click(driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    product_updated = True
-
-                    # Update error counter
-                    errors_fixed_counter += 1
-
-                    print("Original Manufacturer Number: " + original_manufacturer_number)
-                    print("Corrected Manufacturer Number: " + fixed_manufacturer_number)
-
-            # Manage program flow related to threading in case the alt+c hotkey is pressed
-            if not freeze_event.is_set():
-
-                if not start_availability_valid:
-
-                    fixed_start_availability = ""
-
-                    # Double-click the start availability date time field to open the edit attribute dialog
-                    if not click_start_availability(driver, current_row_id):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Update the start availability date time for the selected record
-                    if not update_start_availability(driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Make sure the main grid has finished loading
-                    if not check_lui_maingrid_click(driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    product_updated = True
-
-                    # Update error counter
-                    errors_fixed_counter += 1
-
-                    print("Original Start Availability Date Time: " + original_start_availability)
-                    print("Corrected Start Availability Date Time: " + fixed_start_availability)
-
-            # Manage program flow related to threading in case the alt+c hotkey is pressed
-            if not freeze_event.is_set():
-
-                if not master_gtin_valid:
-
-                    # Double-click the master gtin field to open the edit attribute dialog
-                    if not click_master_gtin(driver, current_row_id):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Update the master gtin for the selected record
-                    if not update_master_gtin(fixed_master_gtin, driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Make sure the main grid has finished loading
-                    if not check_lui_maingrid_click(driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    product_updated = True
-
-                    # Update error counter
-                    errors_fixed_counter += 1
-
-                    print("Original Master GTIN: " + original_master_gtin)
-                    print("Corrected Master GTIN: " + fixed_master_gtin)
-
-            # Manage program flow related to threading in case the alt+c hotkey is pressed
-            if not freeze_event.is_set():
-
-                if not Company_net_content_valid:
-
-                    # Double-click the Company net content field to open the edit attribute dialog
-                    if not click_Company_net_content(driver, current_row_id):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Update the Company net content for the selected record
-                    if not update_Company_net_content(fixed_Company_net_content, driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    # Make sure the main grid has finished loading
-                    if not check_lui_maingrid_click(driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
-
-                    product_updated = True
-
-                    # Update error counter
-                    errors_fixed_counter += 1
-
-                    print("Original Company Net Content: " + original_Company_net_content)
-                    print("Corrected Company Net Content: " + fixed_Company_net_content)
-
-            # Manage program flow related to threading in case the alt+c hotkey is pressed
-            if not freeze_event.is_set():
-
-                if net_content_blank:
-
-                    # Check if the Company net content is valid so we can use that
-                    if is_Company_net_content_valid(original_Company_net_content) or is_Company_net_content_valid(fixed_Company_net_content):
-
-                        if is_Company_net_content_valid(original_Company_net_content):
-                            fixed_net_content = original_Company_net_content
-                        elif is_Company_net_content_valid(fixed_Company_net_content):
-                            fixed_net_content = fixed_Company_net_content
-
-                        # Double-click the net content field to open the edit attribute dialog
-                        if not click_net_content(driver, current_row_id):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        # Update the net content for the selected record
-                        if not update_blank_net_content(fixed_net_content, driver):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        # Make sure the main grid has finished loading
-                        if not check_lui_maingrid_click(driver):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        product_updated = True
-
-                        # Update error counter
-                        errors_fixed_counter += 1
-
-                        print("Original Net Content: " + original_net_content)
-                        print("Corrected Net Content: " + fixed_net_content)
-
-                    # Check if Company net content was fixed to -1 so we can use that
-                    elif fixed_Company_net_content == '-1':
-
-                        fixed_net_content = fixed_Company_net_content
-
-                        # Double-click the net content field to open the edit attribute dialog
-                        if not click_net_content(driver, current_row_id):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        # Update the net content for the selected record
-                        if not update_blank_net_content(fixed_net_content, driver):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        # Make sure the main grid has finished loading
-                        if not check_lui_maingrid_click(driver):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        product_updated = True
-
-                        # Update error counter
-                        errors_fixed_counter += 1
-
-                        print("Original Net Content: " + original_net_content)
-                        print("Corrected Net Content: " + fixed_net_content)
-
-                    # Check if Company net content was fixed to a valid value (not -1) so we can use that
-                    elif original_net_content != '-1':
-
-                        fixed_net_content = '-1'
-
-                        # Double-click the net content field to open the edit attribute dialog
-                        if not click_net_content(driver, current_row_id):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        # Update the net content for the selected record
-                        if not update_blank_net_content(fixed_net_content, driver):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        # Make sure the main grid has finished loading
-                        if not check_lui_maingrid_click(driver):
-                            # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                            number_of_hiccups += 1
-                            print("\nEncountered hiccup in the system.\n"
-                                  "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                            flash_window()
-                            continue
-
-                        product_updated = True
-
-                        # Update error counter
-                        errors_fixed_counter += 1
-
-                        print("Original Net Content: " + original_net_content)
-                        print("Corrected Net Content: " + fixed_net_content)
-
-                # Add the Company product number and net content for the current item to the main reviewed array
-                current_reviewed_data = [Company_product_number, original_manufacturer_number, original_start_availability,
-                                         original_master_gtin, original_net_content,
-                                         original_Company_net_content]
-                reviewed.extend(current_reviewed_data)
-
-            if product_updated:
-
-                # Manage program flow related to threading in case the alt+c hotkey is pressed
-                if not freeze_event.is_set():
-
-                    # Update items fixed counter
-                    items_fixed_counter += 1
-                    print("\nTotal Products Updated: " + str(items_fixed_counter))
-
-                    # Print errors corrected counter
-                    print("Total Errors Corrected: " + str(errors_fixed_counter) + "\n")
-
-                # Add the Company product number, original attribute values, and fixed values to the main fixed array
-                current_fixed_data = [Company_product_number, original_manufacturer_number, fixed_manufacturer_number,
-                                      original_start_availability, fixed_start_availability, original_master_gtin,
-                                      fixed_master_gtin, original_net_content, fixed_net_content,
-                                      original_Company_net_content, fixed_Company_net_content]
-                fixed.extend(current_fixed_data)
-
-                # Reset all the fixed value variables
-                fixed_manufacturer_number = ""
-                fixed_start_availability = ""
-                fixed_master_gtin = ""
-                fixed_net_content = ""
-                fixed_Company_net_content = ""
-
-            # Manage program flow related to threading in case the alt+c hotkey is pressed
-            if not freeze_event.is_set():
-
-                # Update items reviewed counter
-                items_reviewed_counter += 1
+    # Unattended runs skip the banner and prompts
+    if command_line.config:
+        sys.exit(run_unattended(command_line.config))
 
-            # Get the updated paging info
-            paging_info = parse_paging_info(driver)
-            first_record_on_page = get_first_record_on_page(paging_info)
-            last_record_on_page = get_last_record_on_page(paging_info)
-            current_record = first_record_on_page + current_row_on_page  # Variable to track which record we're on
-            current_page = get_current_page(first_record_on_page)
-            total_records = get_total_records(paging_info)
+    if command_line.benchmark_page_sizes:
+        sys.exit(run_page_size_benchmark())
 
-            # Check to see if the program has reviewed all records
-            if current_record == total_records:
+    if command_line.product_history or command_line.export_run:
+        sys.exit(run_audit_store_query(command_line))
 
-                is_finished = True
-                print("\n===============================\n"
-                      "End of product records.\n"
-                      "===============================\n")
-                logging.info("\n\n==========================\n"
-                             "End of product records.\n"
-                             "==========================\n")
+    if command_line.offline_audit:
+        sys.exit(run_offline_audit(command_line.offline_audit, command_line.workers or offline_audit_workers))
 
-                # Exit the while loop
-                break
+    if command_line.benchmark_offline_audit:
+        sys.exit(benchmark_offline_audit())
 
-            # Else if there are still records to review
-            else:
+    if command_line.plan_capacity:
+        sys.exit(run_capacity_planner(command_line.plan_capacity, command_line.deadline_hours,
+                                      command_line.error_density, command_line.plan_mode))
 
-                # Check to see if on the last record of the page
-                if current_record > last_record_on_page and not freeze_event.is_set():
+    if command_line.convert_csv:
+        sys.exit(run_csv_conversion(command_line.convert_csv, command_line.columnar_format))
 
-                    print("\nNavigating to next page...\n")
-                    print("Hit Alt+C at any time to save program activity to file and exit.\n")
+    print_banner()
+    init_directories()
+    init_shutdown_controller()
 
-                    # Navigate to the next page of search results
-                    if not navigate_to_nextpage(driver, current_page):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
+    try:
+        # Initializing program
+        init_logger()
+        init_audit_store()
+        init_columnar_export()
+        get_user_input_prerequisites()
+        targeting_mode, targeting_details = get_user_input_targeting_mode()
+        driver = init_webdriver()
 
-                    # Make sure the main grid has finished loading
-                    if not check_lui_maingrid(driver):
-                        # Increment the number of hiccups and try to overcome the system hiccup without crashing
-                        number_of_hiccups += 1
-                        print("\nEncountered hiccup in the system.\n"
-                              "Number of system hiccups encountered so far: " + str(number_of_hiccups) + "\n")
-                        flash_window()
-                        continue
+        # Initializing window flash to let user know when main program loop is completed
+        init_window_flash()
 
-                    # Reset the current_row_on_page variable
-                    current_row_on_page = 1
+        # Switch to the main grid iframe
+        iframe = driver.find_element(By.XPATH, "//*[@id='PLACEHOLDER']/iframe")
+        driver.switch_to.frame(iframe)
 
-                    # Increment the current_page variable
-                    current_page += 1
+        paging_info = parse_paging_info(driver)
+        update_records_per_page(paging_info)
+        total_records = get_total_records(paging_info)
+        total_pages = get_total_pages(total_records)
 
-                # If not the last record on the page, advance to the next record on the page
-                elif current_record <= last_record_on_page:
+        # Print and log initial values used for main program loop
+        print_initial_values(total_pages, total_records)
 
-                    # Increment current record on page
-                    current_row_on_page += 1
+        # The Main Program Loop
+        run_targeting_mode(driver, targeting_mode, targeting_details)
 
         # Flash the tray icon in the taskbar to let user know the program is finished
         flash_window()
@@ -4110,7 +6574,9 @@ def main():
         # Print the activity summary
         print_activity_summary()
 
-        input("\nPress ENTER to Exit the PIM Data Cleanup program.\n\n")
+        # Nobody is waiting to read the console after a shutdown request
+        if not shutdown_event.is_set():
+            input("\nPress ENTER to Exit the PIM Data Cleanup program.\n\n")
 
     except Exception as e:
         flash_window()
@@ -4123,5 +6589,5 @@ def main():
 if __name__ == "__main__":
     main()
 
-# If program flow does not get caught by exceptions to trigger save_and_quit method, program exits here
-sys.exit()
+    # If program flow does not get caught by exceptions to trigger save_and_quit method, program exits here
+    sys.exit()
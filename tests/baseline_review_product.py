@@ -0,0 +1,417 @@
+"""
+review_product as it was before every attribute was driven from attribute_rules (kept verbatim as the reference for
+test_review_product_parity.py).  The module-level names it uses (getters, clicks, updates, validators, counters, and
+activity arrays) are supplied by the test.
+"""
+
+
+def review_product(driver, current_row_id, Company_product_number):
+    """
+    Reads, validates, and corrects the attributes for the product in the current row of the main grid.  This is the
+    body of the main program loop, pulled into its own function so the same logic can be used by each of the targeting
+    modes (full view walk, validation error filter passes, etc.).
+
+    Returns the list of attribute names which were corrected on the product (empty list if the product was already
+    valid) or "error" if the program encountered a hiccup and the row needs to be reviewed again.
+    """
+
+    # Bringing global counters into the method
+    global items_reviewed_counter
+    global items_fixed_counter
+    global errors_fixed_counter
+
+    # Initializing attribute value variables
+    fixed_manufacturer_number = ""
+    fixed_start_availability = ""
+    fixed_master_gtin = ""
+    fixed_net_content = ""
+    fixed_Company_net_content = ""
+
+    # Set product_updated to False, will flip to True if product is updated in sections below
+    product_updated = False
+
+    # Names of the attributes corrected on this product
+    attributes_fixed = []
+
+    # Values for the current record from the grid data response, if one was captured for this page
+    grid_record = grid_data_records.get(current_row_id)
+
+    if grid_record is not None:
+
+        grid_data_stats["grid_data"] += 1
+
+        # Blanks are recorded the same way the getters record them
+        original_manufacturer_number = grid_record["Manufacturer Number"] or "blank_in_main_grid"
+        original_master_gtin = grid_record["Master GTIN"] or "blank_in_main_grid"
+        original_net_content = grid_record["Net Content"] or "blank_in_main_grid"
+        original_Company_net_content = grid_record["Company Net Content"] or "blank_in_main_grid"
+
+        # The response holds the true start availability date time, even when the main grid shows it as blank
+        original_start_availability = normalize_grid_datetime(grid_record["Start Availability Date Time"])
+
+    else:
+
+        grid_data_stats["cells"] += 1
+
+        # Get the manufacturer number value from the current record
+        original_manufacturer_number = get_manufacturer_number(driver, current_row_id)
+
+        if original_manufacturer_number == "error":
+            return "error"
+
+        # Get the start availability date time value from the current record
+        original_start_availability = get_start_availability(driver, current_row_id)
+
+        if original_start_availability == "error":
+            return "error"
+
+        # Get the master gtin value from the current record
+        original_master_gtin = get_master_gtin(driver, current_row_id)
+
+        if original_master_gtin == "error":
+            return "error"
+
+        # Get the net content value from the current record
+        original_net_content = get_net_content(driver, current_row_id)
+
+        if original_net_content == "error":
+            return "error"
+
+        # Get the Company net content value from the current record
+        original_Company_net_content = get_Company_net_content(driver, current_row_id)
+
+        if original_Company_net_content == "error":
+            return "error"
+
+    '''
+    Checking data for validity
+    '''
+
+    # Check to see if value in manufacturer number field is valid
+    manufacturer_number_valid = is_manufacturer_number_valid(original_manufacturer_number)
+
+    # If error
+    if manufacturer_number_valid == "error":
+        return "error"
+
+    # Check to see if value in start availability date time field is valid (values from the grid data response are
+    # already the true values, so they are checked the same way as values from the edit attribute dialog)
+    if grid_record is not None:
+        start_availability_valid = doublecheck_start_availability(original_start_availability)
+    else:
+        start_availability_valid = is_start_availability_valid(original_start_availability)
+
+    # If error
+    if start_availability_valid == "error":
+        return "error"
+
+    # Doublecheck start availability date time by checking the edit attribute dialog
+    if not start_availability_valid and grid_record is None:
+
+        # capture the value from the edit attribute dialog
+        original_start_availability = get_start_availability_dialog(driver, current_row_id)
+
+        # If error
+        if start_availability_valid == "error":
+            return "error"
+
+        # Check to see if the value from the edit attribute dialog is valid
+        start_availability_valid = doublecheck_start_availability(original_start_availability)
+
+        # If error
+        if start_availability_valid == "error":
+            return "error"
+
+    # Check to see if value in master gtin field is valid
+    master_gtin_valid = is_master_gtin_valid(original_master_gtin)
+
+    # If error
+    if master_gtin_valid == "error":
+        return "error"
+
+    # Check to see if value in net content field is blank
+    net_content_blank = is_net_content_blank(original_net_content)
+
+    # If error
+    if net_content_blank == "error":
+        return "error"
+
+    # Check to see if value in Company net content field is valid
+    Company_net_content_valid = is_Company_net_content_valid(original_Company_net_content)
+
+    # If error
+    if Company_net_content_valid == "error":
+        return "error"
+
+    '''
+    Calculating valid values
+    '''
+
+    # Calculate the valid manufacturer number if value is invalid
+    if not manufacturer_number_valid:
+
+        # calculate the correct value
+        fixed_manufacturer_number = calculate_manufacturer_number(original_manufacturer_number)
+
+        # If error
+        if fixed_manufacturer_number == "error":
+            return "error"
+
+    # Calculate the valid master gtin if value is invalid
+    if not master_gtin_valid:
+
+        # calculate the correct value
+        fixed_master_gtin = calculate_master_gtin(original_master_gtin)
+
+        # If error
+        if fixed_master_gtin == "error":
+            return "error"
+
+    # Calculate the valid Company net content if value is invalid
+    if not Company_net_content_valid:
+
+        # calculate the correct value
+        fixed_Company_net_content = calculate_Company_net_content(driver, current_row_id)
+
+        # If error
+        if fixed_Company_net_content == "error":
+            return "error"
+
+    '''
+    Updating products to fix invalid data
+    '''
+
+    # Manage program flow related to threading in case the alt+c hotkey is pressed
+    if not freeze_event.is_set():
+
+        # Set product_updated to False, will flip to True if product is updated in sections below
+        product_updated = False
+
+        if not manufacturer_number_valid:
+
+            # Double-click the manufacturer number field to open the edit attribute dialog
+            if not click_manufacturer_number(driver, current_row_id):
+                return "error"
+
+            # Update the manufacturer number for the selected record
+            if not update_manufacturer_number(fixed_manufacturer_number, driver):
+                return "error"
+
+            # Make sure the main grid has finished loading
+            if not check_lui_maingrid_click(driver, "post_save"):
+                return "error"
+
+            product_updated = True
+            attributes_fixed.append("Manufacturer Number")
+
+            # Update error counter
+            errors_fixed_counter += 1
+
+            print("Original Manufacturer Number: " + original_manufacturer_number)
+            print("Corrected Manufacturer Number: " + fixed_manufacturer_number)
+
+    # Manage program flow related to threading in case the alt+c hotkey is pressed
+    if not freeze_event.is_set():
+
+        if not start_availability_valid:
+
+            fixed_start_availability = ""
+
+            # Double-click the start availability date time field to open the edit attribute dialog
+            if not click_start_availability(driver, current_row_id):
+                return "error"
+
+            # Update the start availability date time for the selected record
+            if not update_start_availability(driver):
+                return "error"
+
+            # Make sure the main grid has finished loading
+            if not check_lui_maingrid_click(driver, "post_save"):
+                return "error"
+
+            product_updated = True
+            attributes_fixed.append("Start Availability Date Time")
+
+            # Update error counter
+            errors_fixed_counter += 1
+
+            print("Original Start Availability Date Time: " + original_start_availability)
+            print("Corrected Start Availability Date Time: " + fixed_start_availability)
+
+    # Manage program flow related to threading in case the alt+c hotkey is pressed
+    if not freeze_event.is_set():
+
+        if not master_gtin_valid:
+
+            # Double-click the master gtin field to open the edit attribute dialog
+            if not click_master_gtin(driver, current_row_id):
+                return "error"
+
+            # Update the master gtin for the selected record
+            if not update_master_gtin(fixed_master_gtin, driver):
+                return "error"
+
+            # Make sure the main grid has finished loading
+            if not check_lui_maingrid_click(driver, "post_save"):
+                return "error"
+
+            product_updated = True
+            attributes_fixed.append("Master GTIN")
+
+            # Update error counter
+            errors_fixed_counter += 1
+
+            print("Original Master GTIN: " + original_master_gtin)
+            print("Corrected Master GTIN: " + fixed_master_gtin)
+
+    # Manage program flow related to threading in case the alt+c hotkey is pressed
+    if not freeze_event.is_set():
+
+        if not Company_net_content_valid:
+
+            # Double-click the Company net content field to open the edit attribute dialog
+            if not click_Company_net_content(driver, current_row_id):
+                return "error"
+
+            # Update the Company net content for the selected record
+            if not update_Company_net_content(fixed_Company_net_content, driver):
+                return "error"
+
+            # Make sure the main grid has finished loading
+            if not check_lui_maingrid_click(driver, "post_save"):
+                return "error"
+
+            product_updated = True
+            attributes_fixed.append("Company Net Content")
+
+            # Update error counter
+            errors_fixed_counter += 1
+
+            print("Original Company Net Content: " + original_Company_net_content)
+            print("Corrected Company Net Content: " + fixed_Company_net_content)
+
+    # Manage program flow related to threading in case the alt+c hotkey is pressed
+    if not freeze_event.is_set():
+
+        if net_content_blank:
+
+            # Check if the Company net content is valid so we can use that
+            if is_Company_net_content_valid(original_Company_net_content) or is_Company_net_content_valid(fixed_Company_net_content):
+
+                if is_Company_net_content_valid(original_Company_net_content):
+                    fixed_net_content = original_Company_net_content
+                elif is_Company_net_content_valid(fixed_Company_net_content):
+                    fixed_net_content = fixed_Company_net_content
+
+                # Double-click the net content field to open the edit attribute dialog
+                if not click_net_content(driver, current_row_id):
+                    return "error"
+
+                # Update the net content for the selected record
+                if not update_blank_net_content(fixed_net_content, driver):
+                    return "error"
+
+                # Make sure the main grid has finished loading
+                if not check_lui_maingrid_click(driver, "post_save"):
+                    return "error"
+
+                product_updated = True
+                attributes_fixed.append("Net Content")
+
+                # Update error counter
+                errors_fixed_counter += 1
+
+                print("Original Net Content: " + original_net_content)
+                print("Corrected Net Content: " + fixed_net_content)
+
+            # Check if Company net content was fixed to -1 so we can use that
+            elif fixed_Company_net_content == '-1':
+
+                fixed_net_content = fixed_Company_net_content
+
+                # Double-click the net content field to open the edit attribute dialog
+                if not click_net_content(driver, current_row_id):
+                    return "error"
+
+                # Update the net content for the selected record
+                if not update_blank_net_content(fixed_net_content, driver):
+                    return "error"
+
+                # Make sure the main grid has finished loading
+                if not check_lui_maingrid_click(driver, "post_save"):
+                    return "error"
+
+                product_updated = True
+                attributes_fixed.append("Net Content")
+
+                # Update error counter
+                errors_fixed_counter += 1
+
+                print("Original Net Content: " + original_net_content)
+                print("Corrected Net Content: " + fixed_net_content)
+
+            # Check if Company net content was fixed to a valid value (not -1) so we can use that
+            elif original_net_content != '-1':
+
+                fixed_net_content = '-1'
+
+                # Double-click the net content field to open the edit attribute dialog
+                if not click_net_content(driver, current_row_id):
+                    return "error"
+
+                # Update the net content for the selected record
+                if not update_blank_net_content(fixed_net_content, driver):
+                    return "error"
+
+                # Make sure the main grid has finished loading
+                if not check_lui_maingrid_click(driver, "post_save"):
+                    return "error"
+
+                product_updated = True
+                attributes_fixed.append("Net Content")
+
+                # Update error counter
+                errors_fixed_counter += 1
+
+                print("Original Net Content: " + original_net_content)
+                print("Corrected Net Content: " + fixed_net_content)
+
+        # Add the Company product number and net content for the current item to the main reviewed array
+        current_reviewed_data = [Company_product_number, original_manufacturer_number, original_start_availability,
+                                 original_master_gtin, original_net_content,
+                                 original_Company_net_content]
+        reviewed.extend(current_reviewed_data)
+
+    if product_updated:
+
+        # Manage program flow related to threading in case the alt+c hotkey is pressed
+        if not freeze_event.is_set():
+
+            # Update items fixed counter
+            items_fixed_counter += 1
+            print("\nTotal Products Updated: " + str(items_fixed_counter))
+
+            # Print errors corrected counter
+            print("Total Errors Corrected: " + str(errors_fixed_counter) + "\n")
+
+        # Add the Company product number, original attribute values, and fixed values to the main fixed array
+        current_fixed_data = [Company_product_number, original_manufacturer_number, fixed_manufacturer_number,
+                              original_start_availability, fixed_start_availability, original_master_gtin,
+                              fixed_master_gtin, original_net_content, fixed_net_content,
+                              original_Company_net_content, fixed_Company_net_content]
+        fixed.extend(current_fixed_data)
+
+        # Reset all the fixed value variables
+        fixed_manufacturer_number = ""
+        fixed_start_availability = ""
+        fixed_master_gtin = ""
+        fixed_net_content = ""
+        fixed_Company_net_content = ""
+
+    # Manage program flow related to threading in case the alt+c hotkey is pressed
+    if not freeze_event.is_set():
+
+        # Update items reviewed counter
+        items_reviewed_counter += 1
+
+    return attributes_fixed
@@ -0,0 +1,290 @@
+"""
+Validators and calculators as they were before they stopped using int() to check for numbers (kept verbatim as the
+reference for test_validator_parity.py and benchmark_validators.py).
+"""
+
+import logging
+
+
+def is_manufacturer_number_valid(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Value should be numeric
+    * Number of Digits = 6
+    """
+
+    try:
+        # Variable for whether the value is valid, initialized to False
+        is_valid_value = False
+
+        # Check if the value contains only numeric digits
+        try:
+            int(attrib_value)
+        except:
+            return is_valid_value
+
+        # Check if the field is blank
+        if attrib_value == "":
+            return is_valid_value
+
+        elif attrib_value == "blank_in_main_grid":
+            return is_valid_value
+
+        # Check if manufacturer number has less than 6 characters
+        elif len(attrib_value) < 6:
+            return is_valid_value
+
+        else:
+            is_valid_value = True
+
+    except Exception as e:
+        print("Error:: Encountered problem with the is_manufacturer_number_valid function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return is_valid_value
+
+
+def is_start_availability_valid(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * The year of the datetime can't have 00 for the first two digits (ex: can't be 0007, must be 2007)
+    * Based on product searches, oldest valid datetime has a year of 1982
+    * Parse the datetime, if year less than 1982 then it's invalid
+    * NOTE: Invalid values appear to be blank from the maingrid, so they should be considered invalid in this function
+    """
+
+    # Example of attribute value = "02/06/2018 00:00:01"
+
+    try:
+
+        # Variable for whether the value is valid, initialized to False
+        is_valid_value = False
+
+        # Check if attribute value is blank
+        if attrib_value == "":
+            return is_valid_value
+        elif attrib_value == "blank_in_main_grid":
+            return is_valid_value
+        elif attrib_value is None:
+            return is_valid_value
+
+        # If not blank, parse the value and check for validity
+        else:
+            # Parse the attribute value by space, should yield a list with 2 elements
+            attrib_value_parsed = attrib_value.split(' ')
+
+        # pull the date from the parsed attribute value
+        date = attrib_value_parsed[0]
+
+        # check length of the date value
+        if len(date) != 10:
+            return is_valid_value
+        else:
+            # Parse the date by forward slash, should yield a list with 3 elements
+            date_parsed = date.split('/')
+
+        # pull the year from the parsed date
+        year = date_parsed[2]
+
+        try:
+            # Convert year to an integer
+            year = int(year)
+        except:
+            return is_valid_value
+
+        # check if year is within valid range
+        if year < 1982:
+            return is_valid_value
+        elif year >= 1982:
+            is_valid_value = True
+
+    except Exception as e:
+        print("Error:: Encountered problem with the is_start_availability_valid function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return is_valid_value
+
+
+def doublecheck_start_availability(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * The year of the datetime can't have 00 for the first two digits (ex: can't be 0007, must be 2007)
+    * Based on product searches, oldest valid datetime has a year of 1982
+    * Parse the datetime, if year less than 1982 then it's invalid
+    * This function is designed to check values taken from the edit attribute dialog (see main method for function call
+      and arguments). Unlike values read from the maingrid, the edit attribute dialog properly displays values for the
+      start availability date time even if they are invalid.  Therefore, blank values are considered valid in this
+      function.
+    """
+
+    # Example of attribute value = "02/06/2018 00:00:01"
+
+    try:
+
+        # Variable for whether the value is valid, initialized to False
+        is_valid_value = False
+
+        # Check if attribute value is blank
+        if attrib_value == "":
+            is_valid_value = True
+            return is_valid_value
+        elif attrib_value == "blank_in_main_grid":
+            is_valid_value = True
+            return is_valid_value
+        elif attrib_value is None:
+            is_valid_value = True
+            return is_valid_value
+
+        # If not blank, parse the value and check for validity
+        else:
+            # Parse the attribute value by space, should yield a list with 2 elements
+            attrib_value_parsed = attrib_value.split(' ')
+
+        # pull the date from the parsed attribute value
+        date = attrib_value_parsed[0]
+
+        # check length of the date value
+        if len(date) != 10:
+            return is_valid_value
+        else:
+            # Parse the date by forward slash, should yield a list with 3 elements
+            date_parsed = date.split('/')
+
+        # pull the year from the parsed date
+        year = date_parsed[2]
+
+        try:
+            # Convert year to an integer
+            year = int(year)
+        except:
+            return is_valid_value
+
+        # check if year is within valid range
+        if year < 1982:
+            return is_valid_value
+        elif year >= 1982:
+            is_valid_value = True
+
+    except Exception as e:
+        print("Error:: Encountered problem with the is_start_availability_valid function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return is_valid_value
+
+
+def is_master_gtin_valid(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * If value present, must be 14 digits long
+    * If value present and less than 14 digits, pad the front with leading zeros until it is 14 digits
+    * Blank values are allowed
+    """
+
+    try:
+        # Variable for whether the value is valid, initialized to False
+        is_valid_value = False
+
+        # Check if the value is blank
+        if attrib_value == "blank_in_main_grid":
+            is_valid_value = True
+            return is_valid_value
+
+        # Check if the value contains only numeric digits
+        try:
+            int(attrib_value)
+        except:
+            return is_valid_value
+
+        # Check if the value has valid character length
+        if len(attrib_value) < 14:
+            return is_valid_value
+        elif len(attrib_value) > 14:
+            return is_valid_value
+        elif len(attrib_value) == 14:
+            is_valid_value = True
+
+    except Exception as e:
+        print("Error:: Encountered problem with the is_master_gtin_valid function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return is_valid_value
+
+
+def calculate_manufacturer_number(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Value should be numeric
+    * Number of Digits = 6
+    * If less than 6 digits, pad the value with leading zeros
+    """
+
+    try:
+
+        calculated_value = ""
+
+        if attrib_value == "blank_in_main_grid":
+            calculated_value = "000000"
+            return calculated_value
+
+        # check if value contains only numeric digits
+        try:
+            int(attrib_value)
+        except:
+            calculated_value = "not_a_number"
+
+        # capture the length of the attribute value
+        length = len(attrib_value)
+
+
+
+        if length > 6:
+            calculated_value = "exceeds character limit"
+
+        if length < 6:
+            calculated_value = attrib_value.zfill(6)
+
+    except Exception as e:
+        print("Error:: Encountered problem with the calculate_manufacturer_number function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return calculated_value
+
+
+def calculate_master_gtin(attrib_value):
+    """
+    Based on the following requirements from the PIM Business Analyst:
+    * Value should be numeric
+    * Number of Digits = 14
+    * If less than 14 digits, pad the value with leading zeros
+    """
+
+    try:
+
+        calculated_value = ""
+
+        # check if value contains only numeric digits
+        try:
+            int(attrib_value)
+        except:
+            calculated_value = "not_a_number"
+
+        # capture the length of the attribute value
+        length = len(attrib_value)
+
+        if length > 14:
+            calculated_value = "exceeds character limit"
+
+        if length < 14:
+            calculated_value = attrib_value.zfill(14)
+
+    except Exception as e:
+        print("Error:: Encountered problem with the calculate_master_gtin function.\n")
+        logging.error("Exception occurred", exc_info=True)
+        return "error"
+
+    return calculated_value
@@ -0,0 +1,63 @@
+"""
+Per-call cost of the validators and calculators before and after they stopped using int() to check for numbers
+(timeit, best of 5).  Run from the repository root:
+
+    python tests/benchmark_validators.py
+"""
+
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import baseline_validators
+from pim_data_cleanup import pim_data_cleanup
+
+# (function name, argument) for each timed call
+benchmark_calls = [
+    ("is_manufacturer_number_valid", "12a456"),
+    ("is_manufacturer_number_valid", "123456"),
+    ("is_master_gtin_valid", "0001234567890X"),
+    ("is_master_gtin_valid", "00012345678905"),
+    ("calculate_manufacturer_number", "12a456"),
+    ("calculate_master_gtin", "1234567890123"),
+    ("is_start_availability_valid", "02/06/0007 00:00:01"),
+    ("is_start_availability_valid", "02/06/2018 00:00:01"),
+    ("doublecheck_start_availability", "02/06/20x8 00:00:01"),
+]
+
+call_count = 200000
+
+
+def time_call(function, argument):
+    """
+    Returns the best per-call time in microseconds over 5 repeats.
+    """
+
+    call_timer = timeit.Timer(lambda: function(argument))
+    return min(call_timer.repeat(repeat=5, number=call_count)) / call_count * 1e6
+
+
+def main():
+
+    # Neither version logs for these values, but keep any surprises out of the timings
+    logging.disable(logging.CRITICAL)
+
+    print("Function".ljust(33) + "Argument".ljust(24) + "Before (us)".rjust(12) + "After (us)".rjust(12))
+
+    for function_name, argument in benchmark_calls:
+        # Time the unwrapped functions, so the correction cache doesn't hide the per-call cost
+        new_function = getattr(pim_data_cleanup, function_name)
+        new_function = getattr(new_function, "__wrapped__", new_function)
+
+        before_microseconds = time_call(getattr(baseline_validators, function_name), argument)
+        after_microseconds = time_call(new_function, argument)
+
+        print(function_name.ljust(33) + repr(argument).ljust(24) + format(before_microseconds, ".3f").rjust(12) +
+              format(after_microseconds, ".3f").rjust(12))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Tests for the SQLite audit store and its queries, on a database in a temporary folder.
+"""
+
+import csv
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def make_product_values(net_content, fixed_net_content=None):
+    """
+    Returns review_product's {attribute: {"original", "fixed"}} dictionary with every attribute valid except Net
+    Content.
+    """
+
+    product_values = {attribute_rule["name"]: {"original": "valid_value", "fixed": None}
+                      for attribute_rule in pim_data_cleanup.audit_rules}
+    product_values["Net Content"] = {"original": net_content, "fixed": fixed_net_content}
+
+    return product_values
+
+
+def record_run(store_path, reviewed_products):
+
+    audit_store = pim_data_cleanup.AuditStore(store_path)
+
+    for product_number, net_content, fixed_net_content in reviewed_products:
+        attributes_fixed = ["Net Content"] if fixed_net_content else []
+        audit_store.record_product(product_number, make_product_values(net_content, fixed_net_content),
+                                   attributes_fixed)
+
+    assert audit_store.close()
+
+    return audit_store.run_id
+
+
+def test_batched_rows_are_all_written(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "audit_store_batch_size", 4)
+    store_path = str(tmp_path / "audit.sqlite")
+
+    run_id = record_run(store_path, [("100001", "-1", "12"), ("100002", "12", None), ("100003", "-1", "8")])
+
+    connection = pim_data_cleanup.open_audit_store(store_path)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM audit_values WHERE run_id = ?", (run_id,)).fetchone()[0] == \
+            3 * len(pim_data_cleanup.audit_rules)
+        assert connection.execute("SELECT finished_at FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_queries_by_product_and_attribute(tmp_path):
+
+    store_path = str(tmp_path / "audit.sqlite")
+
+    record_run(store_path, [("100001", "-1", "12"), ("100002", "12", None)])
+
+    product_history = pim_data_cleanup.find_product_history(store_path, "100001")
+    assert len(product_history) == len(pim_data_cleanup.audit_rules)
+    assert [history_row[2:] for history_row in product_history if history_row[2] == "Net Content"] == \
+        [("Net Content", "-1", "12")]
+
+    corrections = pim_data_cleanup.find_corrections_since(store_path, "2000-01-01 00:00:00", "Net Content")
+    assert [correction[1:] for correction in corrections] == [("100001", "Net Content", "-1", "12")]
+    assert pim_data_cleanup.find_corrections_since(store_path, "2000-01-01 00:00:00", "Master GTIN") == []
+
+
+def test_rerun_adds_a_separate_run_without_duplicating_rows(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "reviewed_path", str(tmp_path))
+    monkeypatch.setattr(pim_data_cleanup, "corrected_path", str(tmp_path))
+    store_path = str(tmp_path / "audit.sqlite")
+
+    # Both runs start within the same second in the same process
+    first_run_id = record_run(store_path, [("100001", "-1", "12"), ("100002", "12", None)])
+    second_run_id = record_run(store_path, [("100001", "12", None)])
+
+    assert first_run_id != second_run_id
+    assert len(pim_data_cleanup.find_product_history(store_path, "100001")) == 2 * len(pim_data_cleanup.audit_rules)
+
+    # Exporting a run only picks up its own reviews, once each
+    reviewed_file_path, corrected_file_path = pim_data_cleanup.export_audit_run(store_path, first_run_id)
+
+    with open(reviewed_file_path, newline="") as reviewed_file:
+        reviewed_rows = list(csv.reader(reviewed_file))
+    with open(corrected_file_path, newline="") as corrected_file:
+        corrected_rows = list(csv.reader(corrected_file))
+
+    assert reviewed_rows[0] == pim_data_cleanup.reviewed_header
+    assert [reviewed_row[0] for reviewed_row in reviewed_rows[1:]] == ["100001", "100002"]
+    assert [corrected_row[0] for corrected_row in corrected_rows[1:]] == ["100001"]
+
+    reviewed_file_path, corrected_file_path = pim_data_cleanup.export_audit_run(store_path, second_run_id)
+
+    with open(reviewed_file_path, newline="") as reviewed_file:
+        assert [reviewed_row[0] for reviewed_row in list(csv.reader(reviewed_file))[1:]] == ["100001"]
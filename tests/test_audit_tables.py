@@ -0,0 +1,73 @@
+"""
+Tests for the dictionary-encoded audit tables behind the reviewed and corrected rows.
+"""
+
+import numpy
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def test_encode_decode_round_trip():
+
+    value_dictionary = pim_data_cleanup.ValueDictionary()
+
+    for value in ["12345", "", "blank_in_main_grid", "12 oz", "-1", "Ünïcode", "12345"]:
+        assert value_dictionary.decode(value_dictionary.encode(value)) == value
+
+
+def test_repeated_value_keeps_its_code():
+
+    value_dictionary = pim_data_cleanup.ValueDictionary()
+
+    # The common values are encoded up front, in order
+    assert [value_dictionary.encode(value) for value in ["", "blank_in_main_grid", "-1"]] == [0, 1, 2]
+
+    first_code = value_dictionary.encode("00012345678905")
+    assert first_code == 3
+    assert value_dictionary.encode("00012345678905") == first_code
+    assert value_dictionary.encode("00012345678906") == 4
+    assert len(value_dictionary) == 5
+
+
+def test_table_rows_and_columns():
+
+    value_dictionary = pim_data_cleanup.ValueDictionary()
+    audit_table = pim_data_cleanup.AuditTable(["Company Product Number", "Net Content"], value_dictionary)
+    other_table = pim_data_cleanup.AuditTable(["Company Product Number"], value_dictionary)
+
+    audit_table.append(["100001", "-1"])
+    audit_table.append(["100002", "12"])
+    audit_table.append(["100003", "-1"])
+    other_table.append(["100002"])
+
+    assert len(audit_table) == 3
+    assert audit_table.get_rows() == [["100001", "-1"], ["100002", "12"], ["100003", "-1"]]
+    assert audit_table.get_row(1) == ["100002", "12"]
+    assert audit_table.get_column("Net Content") == ["-1", "12", "-1"]
+    assert audit_table.count_values("Net Content") == {"-1": 2, "12": 1}
+
+    # Tables sharing a dictionary store a value once
+    assert other_table.columns[0][0] == audit_table.columns[0][1]
+    assert audit_table.columns[0].typecode == 'I'
+
+
+def test_snapshot_rows_line_up_with_the_headers():
+
+    run_recorder = pim_data_cleanup.RunRecorder(pim_data_cleanup.reviewed_header, pim_data_cleanup.fixed_header)
+
+    reviewed_row = ["100001"] + ["value_" + str(column_index)
+                                 for column_index in range(1, len(pim_data_cleanup.reviewed_header))]
+    fixed_row = ["100001"] + ["value_" + str(column_index)
+                              for column_index in range(1, len(pim_data_cleanup.fixed_header))]
+    run_recorder.record_reviewed(reviewed_row)
+    run_recorder.record_fixed(fixed_row)
+
+    run_snapshot = run_recorder.get_snapshot()
+
+    assert run_snapshot["reviewed"] == [pim_data_cleanup.reviewed_header, reviewed_row]
+    assert run_snapshot["fixed"] == [pim_data_cleanup.fixed_header, fixed_row]
+
+    # save_and_quit writes the snapshot through a 2D numpy array, header row first
+    fixed_items = numpy.array(run_snapshot["fixed"], dtype=str)
+    assert fixed_items.shape == (2, len(pim_data_cleanup.fixed_header))
+    assert dict(zip(fixed_items[0], fixed_items[1]))[pim_data_cleanup.fixed_header[-1]] == fixed_row[-1]
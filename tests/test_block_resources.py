@@ -0,0 +1,74 @@
+"""
+Tests for block_resources against a fake execute_cdp_cmd, for Chrome versions with and without allowed URL patterns.
+"""
+
+import contextlib
+import io
+import logging
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+class FakeDevTools:
+    """
+    Records the DevTools commands sent to it.  An older Chrome rejects the urlPatterns form of Network.setBlockedURLs.
+    """
+
+    def __init__(self, supports_url_patterns):
+        self.supports_url_patterns = supports_url_patterns
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, parameters):
+        if command == "Network.setBlockedURLs" and "urlPatterns" in parameters and not self.supports_url_patterns:
+            raise Exception("Invalid parameters: urls: array expected")
+        self.commands.append((command, parameters))
+        return {}
+
+
+def block_with(monkeypatch, fake_devtools, allowed_patterns):
+
+    monkeypatch.setattr(pim_data_cleanup, "blocked_url_patterns", ["*://*/*.woff", "*://*/*.png"])
+    monkeypatch.setattr(pim_data_cleanup, "allowed_url_patterns", allowed_patterns)
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as console_output:
+            block_result = pim_data_cleanup.block_resources(fake_devtools)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return block_result, console_output.getvalue()
+
+
+def test_allow_list_goes_first(monkeypatch):
+
+    fake_devtools = FakeDevTools(supports_url_patterns=True)
+
+    block_result, console_output = block_with(monkeypatch, fake_devtools, ["*://*/grid_icons/*.png"])
+
+    assert block_result is True
+    assert fake_devtools.commands[-1] == ("Network.setBlockedURLs", {"urlPatterns": [
+        {"urlPattern": "*://*/grid_icons/*.png", "block": False},
+        {"urlPattern": "*://*/*.woff", "block": True},
+        {"urlPattern": "*://*/*.png", "block": True}]})
+
+
+def test_older_chrome_blocks_the_plain_list_without_an_allow_list(monkeypatch):
+
+    fake_devtools = FakeDevTools(supports_url_patterns=False)
+
+    block_result, console_output = block_with(monkeypatch, fake_devtools, [])
+
+    assert block_result is True
+    assert fake_devtools.commands[-1] == ("Network.setBlockedURLs", {"urls": ["*://*/*.woff", "*://*/*.png"]})
+
+
+def test_older_chrome_blocks_nothing_with_an_allow_list(monkeypatch):
+
+    fake_devtools = FakeDevTools(supports_url_patterns=False)
+
+    block_result, console_output = block_with(monkeypatch, fake_devtools, ["*://*/grid_icons/*.png"])
+
+    assert block_result is False
+    assert [command for command, parameters in fake_devtools.commands] == ["Network.enable"]
+    assert "Error::" in console_output
@@ -0,0 +1,133 @@
+"""
+Tests for the capacity planner's phase costs and predictions, measured from synthetic trace files.
+"""
+
+import datetime
+
+import pytest
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+# One traced run: (seconds since the previous product ended, product seconds, attributes fixed).  Eight plain reads of
+# 2 seconds and two Master GTIN corrections of 5 seconds, 0.5 seconds between products, and a 4 second page load in
+# front of the sixth product.
+traced_products = [(0.0, 2.0, []), (0.5, 2.0, []), (0.5, 5.0, ["Master GTIN"]), (0.5, 2.0, []), (0.5, 2.0, []),
+                   (4.5, 2.0, []), (0.5, 5.0, ["Master GTIN"]), (0.5, 2.0, []), (0.5, 2.0, []), (0.5, 2.0, [])]
+
+trace_timestamp_format = "%m/%d/%Y %H:%M:%S.%f"
+
+
+def write_traced_run(trace_folder, run_start):
+    """
+    Writes the product and reload traces of one run of traced_products starting at run_start.  Each correction's span
+    includes a 1 second post-save reload.
+    """
+
+    file_prefix = run_start.strftime("%m.%d.%Y_%H.%M.%S")
+    product_lines = ["Timestamp,Company Product Number,Product Seconds,Read Source,Attributes Fixed"]
+    reload_lines = ["Timestamp,Reload Kind,Reload Seconds,Requests,Bytes Received,Grid Server ms,Grid Total ms,"
+                    "Script ms,Layout ms,Style ms,Task ms,JS Heap MB,DOM Nodes"]
+    span_end = run_start
+
+    for product_index, (gap_seconds, product_seconds, attributes_fixed) in enumerate(traced_products):
+        if gap_seconds > 1:
+            page_load_end = span_end + datetime.timedelta(seconds=4)
+            reload_lines.append(page_load_end.strftime(trace_timestamp_format)[:-3] + ",page_load,4.000,0,0,0,0,0,0,0,"
+                                                                                     "0,0,0")
+
+        span_end += datetime.timedelta(seconds=gap_seconds + product_seconds)
+
+        if attributes_fixed:
+            reload_lines.append(span_end.strftime(trace_timestamp_format)[:-3] + ",post_save,1.000,0,0,0,0,0,0,0,0,0,0")
+
+        product_lines.append(span_end.strftime(trace_timestamp_format)[:-3] + "," + str(100001 + product_index) + "," +
+                             format(product_seconds, ".3f") + ",cells," + "|".join(attributes_fixed))
+
+    (trace_folder / (file_prefix + "_product_trace.csv")).write_text("\n".join(product_lines) + "\n")
+    (trace_folder / (file_prefix + "_reload_trace.csv")).write_text("\n".join(reload_lines) + "\n")
+
+
+@pytest.fixture
+def phase_costs(tmp_path):
+    write_traced_run(tmp_path, datetime.datetime(2026, 1, 5, 8, 0, 0))
+    return pim_data_cleanup.measure_phase_costs(pim_data_cleanup.load_capacity_traces(str(tmp_path)))
+
+
+def test_load_capacity_traces_matches_spans(tmp_path):
+
+    write_traced_run(tmp_path, datetime.datetime(2026, 1, 5, 8, 0, 0))
+    traced_runs = pim_data_cleanup.load_capacity_traces(str(tmp_path))
+
+    assert len(traced_runs) == 1
+    assert len(traced_runs[0]["product_spans"]) == 10
+    assert [reload_span[1] for reload_span in traced_runs[0]["reload_spans"]] == ["post_save", "page_load",
+                                                                                  "post_save"]
+    assert traced_runs[0]["wall_seconds"] == pytest.approx(34.5)
+
+
+def test_phase_costs(phase_costs):
+
+    assert phase_costs["read"] == pytest.approx(2.0)
+    assert phase_costs["post_save"] == pytest.approx(1.0)
+    assert phase_costs["page_load"] == pytest.approx(4.0)
+
+    # 34.5 wall seconds less 26 product seconds and 4 page load seconds, over 10 products
+    assert phase_costs["other"] == pytest.approx(0.45)
+
+    # Attributes which were never corrected use the average cost of a correction
+    assert all(fix_cost == pytest.approx(3.0) for fix_cost in phase_costs["fix"].values())
+    assert phase_costs["error_density"]["Master GTIN"] == pytest.approx(0.2)
+    assert phase_costs["error_density"]["Net Content"] == 0
+
+
+def test_prediction_and_workers_for_a_deadline(phase_costs, monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "work_list_batch_size", 50)
+
+    capacity_plan = pim_data_cleanup.predict_run_time(phase_costs, 1000, {"Master GTIN": 0.2}, "work_list", 0.25)
+
+    assert capacity_plan["phase_seconds"] == pytest.approx({"reads": 2000, "dialogs": 400, "post-save reloads": 200,
+                                                            "page loads": 80, "other": 450})
+    assert capacity_plan["total_hours"] == pytest.approx(3130 / 3600)
+    assert capacity_plan["workers_needed"] == 4
+    assert capacity_plan["dominant_phase"] == "reads"
+
+
+def test_error_density_scales_the_correction_phases(phase_costs, monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "work_list_batch_size", 50)
+
+    capacity_plan = pim_data_cleanup.predict_run_time(phase_costs, 1000, {"Master GTIN": 1.0, "Net Content": 1.0},
+                                                      "work_list", 24)
+
+    assert capacity_plan["phase_seconds"]["dialogs"] == pytest.approx(4000)
+    assert capacity_plan["phase_seconds"]["post-save reloads"] == pytest.approx(2000)
+    assert capacity_plan["dominant_phase"] == "dialogs"
+    assert capacity_plan["workers_needed"] == 1
+
+
+def test_page_loads_follow_the_targeting_mode(phase_costs, monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "work_list_batch_size", 50)
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 200)
+
+    work_list_plan = pim_data_cleanup.predict_run_time(phase_costs, 1001, {}, "work_list")
+    full_view_plan = pim_data_cleanup.predict_run_time(phase_costs, 1001, {}, "full_view")
+
+    assert work_list_plan["phase_seconds"]["page loads"] == pytest.approx(21 * 4)
+    assert full_view_plan["phase_seconds"]["page loads"] == pytest.approx(6 * 4)
+
+
+def test_backtest_predicts_a_repeated_run_exactly(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "work_list_batch_size", 50)
+
+    write_traced_run(tmp_path, datetime.datetime(2026, 1, 5, 8, 0, 0))
+    write_traced_run(tmp_path, datetime.datetime(2026, 1, 6, 8, 0, 0))
+
+    backtest_results = pim_data_cleanup.backtest_capacity_plan(pim_data_cleanup.load_capacity_traces(str(tmp_path)))
+
+    assert len(backtest_results) == 2
+    for run_name, actual_hours, predicted_hours in backtest_results:
+        assert predicted_hours == pytest.approx(actual_hours)
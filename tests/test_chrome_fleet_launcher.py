@@ -0,0 +1,96 @@
+"""
+Tests for the fleet launcher's restart counting and startup wait, using fake Chrome processes and a fake health check.
+"""
+
+import contextlib
+import io
+
+from chrome_fleet_launcher import chrome_fleet_launcher
+
+
+class FakeProcess:
+
+    def __init__(self, healthy):
+        self.healthy = healthy
+        self.pid = 0
+
+    def poll(self):
+        # A finished process keeps stop_worker_instance from sending any signals
+        return 0
+
+
+class FakeTime:
+    """
+    Records sleeps instead of waiting, so each health check interval counts as one sleep.
+    """
+
+    def __init__(self):
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+def patch_fleet(monkeypatch, launches_healthy):
+    launched_processes = []
+    fake_time = FakeTime()
+
+    def fake_popen(command, **kwargs):
+        launched_processes.append(FakeProcess(launches_healthy))
+        return launched_processes[-1]
+
+    monkeypatch.setattr(chrome_fleet_launcher.subprocess, "Popen", fake_popen)
+    monkeypatch.setattr(chrome_fleet_launcher, "is_worker_healthy", lambda worker: worker["process"].healthy)
+    monkeypatch.setattr(chrome_fleet_launcher, "time", fake_time)
+    monkeypatch.setattr(chrome_fleet_launcher, "health_check_interval_seconds", .1)
+
+    return launched_processes, fake_time
+
+
+def make_worker(tmp_path):
+    return {"worker": 0,
+            "port": 9222,
+            "debugger_address": "127.0.0.1:9222",
+            "profile_dir": str(tmp_path / "worker_0"),
+            "process": FakeProcess(False),
+            "restarts": 0}
+
+
+def test_crashed_instance_is_restarted_once(monkeypatch, tmp_path):
+    launched_processes, fake_time = patch_fleet(monkeypatch, True)
+    worker = make_worker(tmp_path)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        chrome_fleet_launcher.monitor_fleet("chrome", [worker], True, lambda: len(fake_time.sleeps) >= 3)
+
+    assert worker["restarts"] == 1
+    assert len(launched_processes) == 1
+    assert worker["process"] is launched_processes[0]
+
+
+def test_gives_up_after_max_restarts(monkeypatch, tmp_path):
+    launched_processes, fake_time = patch_fleet(monkeypatch, False)
+    monkeypatch.setattr(chrome_fleet_launcher, "max_restarts", 2)
+    monkeypatch.setattr(chrome_fleet_launcher, "startup_timeout_seconds", 0)
+    worker = make_worker(tmp_path)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        chrome_fleet_launcher.monitor_fleet("chrome", [worker], True, lambda: len(fake_time.sleeps) >= 6)
+
+    assert len(launched_processes) == 2
+    assert worker["restarts"] == 3
+    assert output.getvalue().count("failed too many times") == 1
+
+
+def test_startup_wait_stops_when_asked(monkeypatch, tmp_path):
+    launched_processes, fake_time = patch_fleet(monkeypatch, False)
+    worker = make_worker(tmp_path)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert chrome_fleet_launcher.launch_worker_instance("chrome", worker, True, lambda: True) is False
+
+    assert len(launched_processes) == 1
+    assert fake_time.sleeps == []
+    assert "Error::" not in output.getvalue()
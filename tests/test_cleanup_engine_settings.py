@@ -0,0 +1,83 @@
+"""
+Tests for the setting checks in CleanupEngine.configure and load_run_config.
+"""
+
+import json
+import logging
+
+import pytest
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def test_lossless_conversions():
+
+    check_setting = pim_data_cleanup.CleanupEngine.check_setting
+
+    assert check_setting("work_list_batch_size", "20") == 20
+    assert check_setting("work_list_batch_size", 20) == 20
+    assert check_setting("required_records_per_page", 50) == "50"
+    assert check_setting("audit_store_path", None) is None
+    assert check_setting("audit_store_path", "audit.sqlite") == "audit.sqlite"
+
+
+@pytest.mark.parametrize("setting_name, setting_value", [("work_list_batch_size", [20]),
+                                                         ("work_list_batch_size", "20.5"),
+                                                         ("work_list_batch_size", True),
+                                                         ("use_largest_page_size", "yes"),
+                                                         ("required_records_per_page", 50.0),
+                                                         ("blocked_url_patterns", "*.png"),
+                                                         ("columnar_export_format", 1),
+                                                         ("no_such_setting", 1)])
+def test_wrong_types_are_rejected(setting_name, setting_value):
+
+    with pytest.raises(ValueError):
+        pim_data_cleanup.CleanupEngine.check_setting(setting_name, setting_value)
+
+
+def test_configure_leaves_settings_unchanged_on_error():
+
+    engine = pim_data_cleanup.CleanupEngine()
+    work_list_batch_size = pim_data_cleanup.work_list_batch_size
+
+    with pytest.raises(ValueError):
+        engine.configure(work_list_batch_size=work_list_batch_size + 1, hiccup_limit="many")
+
+    assert pim_data_cleanup.work_list_batch_size == work_list_batch_size
+
+
+def test_load_run_config_rejects_wrong_types(tmp_path, capsys):
+
+    config_path = tmp_path / "run_config.json"
+    config_path.write_text(json.dumps({"settings": {"work_list_batch_size": "twenty"}, "targeting_mode": "1"}))
+
+    logging.disable(logging.CRITICAL)
+    try:
+        assert pim_data_cleanup.load_run_config(str(config_path)) == "error"
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert "work_list_batch_size" in capsys.readouterr().out
+
+
+def test_run_after_save_starts_a_new_run(monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "freeze_event", pim_data_cleanup.threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "shutdown_event", pim_data_cleanup.threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "init_audit_store", lambda: None)
+    monkeypatch.setattr(pim_data_cleanup, "init_columnar_export", lambda: None)
+    monkeypatch.setattr(pim_data_cleanup, "run_targeting_mode", lambda driver, targeting_mode, targeting_details: [])
+    monkeypatch.setattr(pim_data_cleanup, "run_recorder", pim_data_cleanup.run_recorder)
+    monkeypatch.setattr(pim_data_cleanup, "number_of_hiccups", 3)
+
+    engine = pim_data_cleanup.CleanupEngine()
+    engine.driver = object()
+    engine.saved = True
+    pim_data_cleanup.freeze_event.set()
+    previous_run_recorder = pim_data_cleanup.run_recorder
+
+    assert engine.run("full_view")["not_found"] == []
+    assert not engine.saved
+    assert not pim_data_cleanup.freeze_event.is_set()
+    assert pim_data_cleanup.number_of_hiccups == 0
+    assert pim_data_cleanup.run_recorder is not previous_run_recorder
@@ -0,0 +1,111 @@
+"""
+Tests for the columnar export: streaming row groups into Parquet and Arrow files, converting csv files, and running
+without pyarrow.
+"""
+
+import contextlib
+import io
+import logging
+
+import pytest
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+column_names = ["Company Product Number", "Net Content"]
+rows = [["100001", "-1"], ["100002", "12"], ["100003", ""], ["100004", "blank_in_main_grid"], ["100005", "8"]]
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_row_groups_read_back(tmp_path, monkeypatch, export_format):
+
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(pim_data_cleanup, "columnar_row_group_size", 2)
+
+    file_path = str(tmp_path / ("reviewed" + pim_data_cleanup.columnar_extensions[export_format]))
+    columnar_writer = pim_data_cleanup.ColumnarWriter(file_path, column_names, export_format)
+
+    for row in rows:
+        columnar_writer.write_row(row)
+    columnar_writer.close()
+
+    columnar_table = pim_data_cleanup.load_columnar_file(file_path)
+
+    assert columnar_writer.row_count == 5
+    assert columnar_table.column_names == column_names
+    assert [list(row.values()) for row in columnar_table.to_pylist()] == rows
+
+    # Two full row groups and the rest written on close
+    if export_format == "parquet":
+        assert pim_data_cleanup.pyarrow.parquet.ParquetFile(file_path).num_row_groups == 3
+    else:
+        with pim_data_cleanup.pyarrow.memory_map(file_path) as mapped_file:
+            assert pim_data_cleanup.pyarrow.ipc.open_file(mapped_file).num_record_batches == 3
+
+
+def test_run_rows_stream_into_the_files(tmp_path, monkeypatch):
+
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(pim_data_cleanup, "columnar_export_format", "parquet")
+    monkeypatch.setattr(pim_data_cleanup, "columnar_writers", None)
+    monkeypatch.setattr(pim_data_cleanup, "reviewed_path", str(tmp_path))
+    monkeypatch.setattr(pim_data_cleanup, "corrected_path", str(tmp_path))
+    monkeypatch.setattr(pim_data_cleanup, "run_recorder", pim_data_cleanup.RunRecorder(
+        pim_data_cleanup.reviewed_header, pim_data_cleanup.fixed_header))
+
+    pim_data_cleanup.init_columnar_export()
+
+    reviewed_row = ["100001"] + ["-1"] * (len(pim_data_cleanup.reviewed_header) - 1)
+    pim_data_cleanup.run_recorder.record_reviewed(reviewed_row)
+    pim_data_cleanup.run_recorder.record_reviewed(reviewed_row)
+
+    file_paths = pim_data_cleanup.close_columnar_export()
+
+    assert len(file_paths) == 2
+    reviewed_table = pim_data_cleanup.load_columnar_file(file_paths[0])
+    assert reviewed_table.column_names == pim_data_cleanup.reviewed_header
+    assert reviewed_table.num_rows == 2
+    assert pim_data_cleanup.load_columnar_file(file_paths[1]).num_rows == 0
+
+
+def test_csv_conversion_skips_rows_with_extra_commas(tmp_path):
+
+    pytest.importorskip("pyarrow")
+
+    csv_path = tmp_path / "09.06.2023_08.00.00_data_cleanup_reviewed.csv"
+    csv_path.write_text("Company Product Number,Net Content\n100001,-1\n100002,12,5 oz\n100003,\n")
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            columnar_path = pim_data_cleanup.convert_csv_to_columnar(str(csv_path))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert columnar_path.endswith("_data_cleanup_reviewed.parquet")
+    assert pim_data_cleanup.load_columnar_file(columnar_path).to_pylist() == [
+        {"Company Product Number": "100001", "Net Content": "-1"},
+        {"Company Product Number": "100003", "Net Content": ""}]
+
+
+def test_without_pyarrow_the_run_carries_on(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "pyarrow", None)
+    monkeypatch.setattr(pim_data_cleanup, "columnar_export_format", "parquet")
+    monkeypatch.setattr(pim_data_cleanup, "columnar_writers", None)
+
+    csv_path = tmp_path / "reviewed.csv"
+    csv_path.write_text("Company Product Number,Net Content\n100001,-1\n")
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as console_output:
+            pim_data_cleanup.init_columnar_export()
+            assert pim_data_cleanup.columnar_writers is None
+            assert pim_data_cleanup.close_columnar_export() == []
+            assert pim_data_cleanup.convert_csv_to_columnar(str(csv_path)) == "error"
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert "pyarrow package is needed" in console_output.getvalue()
+    assert not (tmp_path / "reviewed.parquet").exists()
@@ -0,0 +1,61 @@
+"""
+Tests for the correction cache around the validators and calculators in attribute_rules.
+"""
+
+import logging
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def test_error_results_are_not_cached():
+
+    call_results = ["error", True]
+
+    def flaky_validator(attrib_value):
+        return call_results.pop(0)
+
+    cached_validator = pim_data_cleanup.cache_correction_function(flaky_validator)
+
+    assert cached_validator("123456") == "error"
+    assert cached_validator("123456") is True
+    assert cached_validator("123456") is True
+    assert cached_validator.cache_info().hits == 1
+
+
+def test_configure_resizes_the_cache():
+
+    engine = pim_data_cleanup.CleanupEngine()
+    default_cache_size = pim_data_cleanup.correction_cache_size
+
+    try:
+        engine.configure(correction_cache_size=2)
+
+        validator = pim_data_cleanup.attribute_rules[0]["validator"]
+        assert validator.cache_info().maxsize == 2
+        assert validator.__wrapped__ is pim_data_cleanup.is_manufacturer_number_valid
+
+        for attrib_value in ["1", "12", "123", "1"]:
+            validator(attrib_value)
+        assert validator.cache_info().currsize == 2
+        assert pim_data_cleanup.get_correction_cache_stats()["Manufacturer Number"] == (0, 4)
+
+    finally:
+        engine.configure(correction_cache_size=default_cache_size)
+
+    assert pim_data_cleanup.attribute_rules[0]["validator"].cache_info().maxsize == default_cache_size
+
+
+def test_start_availability_error_is_checked_again():
+
+    logging.disable(logging.CRITICAL)
+
+    try:
+        validator = pim_data_cleanup.attribute_rules[1]["validator"]
+        validator.cache_clear()
+
+        assert validator("0206201800") == "error"
+        assert validator("0206201800") == "error"
+        assert validator.cache_info().misses == 2
+        assert validator.cache_info().currsize == 0
+    finally:
+        logging.disable(logging.NOTSET)
@@ -0,0 +1,99 @@
+"""
+Tests for run_filtered_pass against a fake PIM search whose results change between queries.
+"""
+
+import contextlib
+import io
+import logging
+import threading
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+class FakeFilteredGrid:
+    """
+    Search results for one validation filter, two records per page.  Fixed products drop out when the search is re-run,
+    and new_failures lists products which start failing validation (sorted to the front) at each re-query.
+    """
+
+    def __init__(self, product_numbers, unfixable_products, new_failures):
+        self.results = list(product_numbers)
+        self.unfixable_products = set(unfixable_products)
+        self.new_failures = list(new_failures)
+        self.fixed_products = set()
+        self.reviewed = []
+        self.page = 1
+        self.query_count = 0
+
+    def apply_validation_filter(self, driver, attribute_name):
+        self.query_count += 1
+        self.results = [product for product in self.results if product not in self.fixed_products]
+        if self.query_count > 1 and self.new_failures:
+            self.results = self.new_failures.pop(0) + self.results
+        self.page = 1
+        return True
+
+    def parse_paging_info(self, driver):
+        if not self.results:
+            return 'No records to view'
+        first_record = (self.page - 1) * 2 + 1
+        last_record = min(self.page * 2, len(self.results))
+        return ["View", str(first_record), "-", str(last_record), "of", str(len(self.results))]
+
+    def read_page_snapshot(self, driver):
+        page_rows = self.results[(self.page - 1) * 2:self.page * 2]
+        return [(row_number, "row_" + product, product) for row_number, product in enumerate(page_rows, 1)]
+
+    def navigate_to_page(self, driver, page_number):
+        self.page = page_number
+        return True
+
+    def navigate_to_nextpage(self, driver, current_page):
+        self.page = current_page + 1
+        return True
+
+    def process_product(self, driver, row_id, product_number):
+        self.reviewed.append(product_number)
+        if product_number in self.unfixable_products:
+            return []
+        self.fixed_products.add(product_number)
+        return ["Master GTIN"]
+
+
+def run_fake_pass(monkeypatch, fake_grid):
+
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 2)
+    monkeypatch.setattr(pim_data_cleanup, "freeze_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "shutdown_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "supervise_browser_session", lambda driver: "ok")
+    monkeypatch.setattr(pim_data_cleanup, "check_lui_maingrid", lambda driver: True)
+
+    for function_name in ["apply_validation_filter", "parse_paging_info", "read_page_snapshot", "navigate_to_page",
+                          "navigate_to_nextpage", "process_product"]:
+        monkeypatch.setattr(pim_data_cleanup, function_name, getattr(fake_grid, function_name))
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return pim_data_cleanup.run_filtered_pass(None, "Master GTIN")
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def test_pass_reviews_every_product_once(monkeypatch):
+
+    fake_grid = FakeFilteredGrid(["100001", "100002", "100003", "100004", "100005"], {"100002", "100004"}, [])
+
+    assert run_fake_pass(monkeypatch, fake_grid)
+    assert sorted(fake_grid.reviewed) == ["100001", "100002", "100003", "100004", "100005"]
+
+
+def test_new_failure_in_front_of_the_cursor_is_reviewed(monkeypatch):
+
+    # After the first query 100001 and 100002 are left, and 100009 starts failing and sorts first.  Jumping to record 3
+    # would skip it, so the changed count sends the pass back to page 1.
+    fake_grid = FakeFilteredGrid(["100001", "100002", "100003", "100004", "100005", "100006"],
+                                 {"100001", "100002", "100009"}, [["100009"]])
+
+    assert run_fake_pass(monkeypatch, fake_grid)
+    assert sorted(fake_grid.reviewed) == ["100001", "100002", "100003", "100004", "100005", "100006", "100009"]
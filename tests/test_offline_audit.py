@@ -0,0 +1,102 @@
+"""
+Tests for the offline audit's byte range splitting and its worker pool, on small synthetic exports.
+"""
+
+import csv
+
+import pytest
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def write_export(export_path, row_count, trailing_line_break=True):
+
+    pim_data_cleanup.write_synthetic_export(str(export_path), row_count)
+
+    if not trailing_line_break:
+        export_path.write_bytes(export_path.read_bytes().rstrip(b"\r\n"))
+
+
+def get_column_indexes(header_line):
+
+    column_names = next(csv.reader([header_line.rstrip("\r\n")]))
+    return {column_name: column_names.index(column_name)
+            for column_name in ["Company Product Number"] + [attribute_rule["name"]
+                                                             for attribute_rule in pim_data_cleanup.attribute_rules]}
+
+
+@pytest.mark.parametrize("trailing_line_break", [True, False])
+@pytest.mark.parametrize("range_bytes, minimum_ranges", [(1, 1), (7, 1), (100, 3), (16 << 20, 1), (16 << 20, 8)])
+def test_ranges_end_on_line_breaks(tmp_path, range_bytes, minimum_ranges, trailing_line_break):
+
+    export_path = tmp_path / "catalog_export.csv"
+    write_export(export_path, 40, trailing_line_break)
+    export_bytes = export_path.read_bytes()
+
+    header_line, export_ranges = pim_data_cleanup.split_export_ranges(str(export_path), range_bytes, minimum_ranges)
+
+    assert header_line.startswith("Company Product Number,")
+    assert export_ranges[0][0] == len(header_line.encode("utf-8"))
+    assert export_ranges[-1][1] == len(export_bytes)
+
+    # The ranges cover the rows with no gaps or overlaps, and every range ends right after a line break
+    for (range_start, range_end), (next_start, next_end) in zip(export_ranges, export_ranges[1:]):
+        assert range_end == next_start
+    for range_start, range_end in export_ranges:
+        assert range_start < range_end
+        assert export_bytes[range_end - 1:range_end] == b"\n" or range_end == len(export_bytes)
+
+    if minimum_ranges > 1:
+        assert len(export_ranges) >= minimum_ranges
+
+    # Reading the ranges one after the other gives back every row once, in order
+    with open(export_path, 'rb') as export_file:
+        with pim_data_cleanup.mmap.mmap(export_file.fileno(), 0, access=pim_data_cleanup.mmap.ACCESS_READ) as \
+                mapped_export:
+            range_lines = [line for range_start, range_end in export_ranges
+                           for line in pim_data_cleanup.read_export_range(mapped_export, range_start, range_end)]
+
+    assert range_lines == export_bytes.decode("utf-8").splitlines()[1:]
+
+
+@pytest.mark.parametrize("minimum_ranges", [1, 2, 3, 7, 40])
+def test_every_row_is_audited_once(tmp_path, minimum_ranges):
+
+    export_path = tmp_path / "catalog_export.csv"
+    write_export(export_path, 300)
+
+    header_line, export_ranges = pim_data_cleanup.split_export_ranges(str(export_path), 16 << 20, minimum_ranges)
+    column_indexes = get_column_indexes(header_line)
+
+    rows_audited = 0
+    fixed_product_numbers = []
+
+    for range_start, range_end in export_ranges:
+        range_rows_audited, range_fixed_rows, range_errors = pim_data_cleanup.audit_export_range(
+            str(export_path), range_start, range_end, column_indexes)
+        rows_audited += range_rows_audited
+        fixed_product_numbers.extend(fixed_row[0] for fixed_row in range_fixed_rows)
+        assert range_errors == []
+
+    assert rows_audited == 300
+    assert len(fixed_product_numbers) == len(set(fixed_product_numbers))
+    assert fixed_product_numbers
+
+
+def test_worker_pool_matches_a_single_process(tmp_path, monkeypatch):
+
+    export_path = tmp_path / "catalog_export.csv"
+    write_export(export_path, 500)
+
+    # Audit the whole export in this process as one range
+    header_line, export_ranges = pim_data_cleanup.split_export_ranges(str(export_path), 16 << 20)
+    assert len(export_ranges) == 1
+    single_rows_audited, single_fixed_rows, single_errors = pim_data_cleanup.audit_export_range(
+        str(export_path), export_ranges[0][0], export_ranges[0][1], get_column_indexes(header_line))
+    single_fixed_rows.sort(key=lambda fixed_row: fixed_row[0])
+
+    # Small ranges so each worker gets several
+    monkeypatch.setattr(pim_data_cleanup, "offline_audit_range_bytes", 2000)
+
+    for worker_count in [1, 2, 3]:
+        assert pim_data_cleanup.audit_export(str(export_path), worker_count) == (500, single_fixed_rows, single_errors)
@@ -0,0 +1,82 @@
+"""
+Tests for the page math: reading the paging text, detecting the records per page, and the work list batch size.
+"""
+
+import pytest
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+class FakeOption:
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeSelect:
+
+    def __init__(self, option_texts):
+        self.options = [FakeOption(option_text) for option_text in option_texts]
+
+
+def make_paging_info(paging_text):
+    return paging_text.split(' ')
+
+
+@pytest.mark.parametrize("paging_text, detected_records_per_page", [
+    ("View 1 - 100 of 1,003,948", 100),  # First page
+    ("View 401 - 500 of 1,003,948", 100),  # Middle page
+    ("View 1,003,901 - 1,003,948 of 1,003,948", 50),  # Short last page keeps the current setting
+    ("View 1 - 37 of 37", 50),  # Catalog smaller than the page size keeps the current setting
+    ("View 1 - 250 of 250", 250),  # One full page holding more than the current setting
+])
+def test_records_per_page_detection(monkeypatch, paging_text, detected_records_per_page):
+
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 50)
+
+    pim_data_cleanup.update_records_per_page(make_paging_info(paging_text))
+
+    assert pim_data_cleanup.records_per_page == detected_records_per_page
+
+
+def test_no_records_keeps_the_setting(monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 50)
+
+    pim_data_cleanup.update_records_per_page('No records to view')
+
+    assert pim_data_cleanup.records_per_page == 50
+
+
+@pytest.mark.parametrize("paging_text, first_record, last_record, current_page, total_pages", [
+    ("View 1 - 50 of 1,003,948", 1, 50, 1, 20079),  # First page
+    ("View 401 - 450 of 1,003,948", 401, 450, 9, 20079),  # Middle page
+    ("View 1,003,901 - 1,003,948 of 1,003,948", 1003901, 1003948, 20079, 20079),  # Short last page
+    ("View 1 - 37 of 37", 1, 37, 1, 1),  # Catalog smaller than the page size
+])
+def test_page_numbers(monkeypatch, paging_text, first_record, last_record, current_page, total_pages):
+
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 50)
+    paging_info = make_paging_info(paging_text)
+
+    assert pim_data_cleanup.get_first_record_on_page(paging_info) == first_record
+    assert pim_data_cleanup.get_last_record_on_page(paging_info) == last_record
+    assert pim_data_cleanup.get_current_page(first_record) == current_page
+    assert pim_data_cleanup.get_current_page(last_record) == current_page
+    assert pim_data_cleanup.get_total_pages(pim_data_cleanup.get_total_records(paging_info)) == total_pages
+
+
+def test_offered_page_sizes_skip_text_options():
+
+    assert pim_data_cleanup.get_offered_page_sizes(FakeSelect(["25", " 50 ", "100", "All"])) == [25, 50, 100]
+
+
+def test_work_list_batch_size_follows_the_page_size(monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 200)
+
+    monkeypatch.setattr(pim_data_cleanup, "work_list_batch_size", 0)
+    assert pim_data_cleanup.get_work_list_batch_size() == 200
+
+    monkeypatch.setattr(pim_data_cleanup, "work_list_batch_size", 20)
+    assert pim_data_cleanup.get_work_list_batch_size() == 20
@@ -0,0 +1,206 @@
+"""
+Regression test for the attribute_rules rewrite of review_product.  Every combination of main grid values (and
+start availability dialog values) is reviewed by the current review_product and by the previous one
+(baseline_review_product.py) against the same fake PIM page, and the results, the values written, and the reviewed
+and corrected rows have to match.
+
+The only intended difference: when calculate_Company_net_content can't correct a value (it returns None), the
+current review_product skips the update.  The previous one passed None to update_Company_net_content, whose
+send_keys(None) failed, so the product came back as "error" and was retried until it was quarantined.
+"""
+
+import contextlib
+import io
+import itertools
+import logging
+import threading
+
+import baseline_review_product
+from pim_data_cleanup import pim_data_cleanup
+
+
+# Main grid values for each attribute (blank cells are read as "blank_in_main_grid")
+grid_values = {"Manufacturer Number": ["", "12345", "123456", "1234567", "abc", "12a456"],
+               "Start Availability Date Time": ["", "02/06/2018 00:00:01"],
+               "Master GTIN": ["", "123", "12345678901234", "123456789012345"],
+               "Net Content": ["", "-1", "12"],
+               "Company Net Content": ["", "12", "12.345", "12-16", "1234567890", "12345-1234"]}
+
+# Values the edit attribute dialog shows when the main grid hides them
+start_availability_dialog_values = ["", "02/06/0018 00:00:01", "02/06/2018 00:00:01"]
+Company_net_content_dialog_values = ["", "12.3456", "123456.789", "12345-16", "1234567.12"]
+
+# Dialog values which calculate_Company_net_content can't correct
+uncorrectable_Company_net_contents = {"1234567.12"}
+
+
+class FakePimPage:
+    """
+    One product row of the PIM main grid and its edit attribute dialogs.  Provides the page functions of both
+    versions of review_product and records the values written to each attribute.
+    """
+
+    def __init__(self, row_values, dialog_values):
+        self.row_values = row_values
+        self.dialog_values = dialog_values
+        self.writes = []
+
+    def read_grid(self, attribute_name):
+        return self.row_values[attribute_name] or "blank_in_main_grid"
+
+    def write(self, attribute_name, value):
+        # send_keys(None) raises in Selenium, which the update functions report as a failed update
+        if value is None:
+            return False
+        self.writes.append((attribute_name, value))
+        return True
+
+    # Page functions used by the current review_product
+
+    def get_attribute_value(self, driver, row_id, attribute_rule):
+        return self.read_grid(attribute_rule["name"])
+
+    def read_attribute_dialog(self, driver, row_id, attribute_rule):
+        return self.dialog_values[attribute_rule["name"]]
+
+    def click_attribute(self, driver, row_id, attribute_rule):
+        return True
+
+    def update_attribute_value(self, value, driver, attribute_rule):
+        return self.write(attribute_rule["name"], value)
+
+    # Page functions used by the previous review_product
+
+    def get_baseline_functions(self):
+        baseline_functions = {
+            "get_manufacturer_number": lambda driver, row_id: self.read_grid("Manufacturer Number"),
+            "get_start_availability": lambda driver, row_id: self.read_grid("Start Availability Date Time"),
+            "get_master_gtin": lambda driver, row_id: self.read_grid("Master GTIN"),
+            "get_net_content": lambda driver, row_id: self.read_grid("Net Content"),
+            "get_Company_net_content": lambda driver, row_id: self.read_grid("Company Net Content"),
+            "get_start_availability_dialog":
+                lambda driver, row_id: self.dialog_values["Start Availability Date Time"],
+            # The previous calculation read the dialog itself, then applied the same rules as the current one
+            "calculate_Company_net_content": lambda driver, row_id: pim_data_cleanup.calculate_Company_net_content(
+                self.dialog_values["Company Net Content"]),
+            "update_manufacturer_number": lambda value, driver: self.write("Manufacturer Number", value),
+            "update_start_availability": lambda driver: self.write("Start Availability Date Time", ""),
+            "update_master_gtin": lambda value, driver: self.write("Master GTIN", value),
+            "update_Company_net_content": lambda value, driver: self.write("Company Net Content", value),
+            "update_blank_net_content": lambda value, driver: self.write("Net Content", value)}
+
+        for click_name in ["click_manufacturer_number", "click_start_availability", "click_master_gtin",
+                           "click_Company_net_content", "click_net_content"]:
+            baseline_functions[click_name] = lambda driver, row_id: True
+
+        return baseline_functions
+
+
+def generate_cases():
+    """
+    Yields (grid values, dialog values) for all 2,592 combinations.  The Company Net Content dialog shows the grid
+    value when the grid can show it, and cycles through the dialog values when the grid hides it.
+    """
+
+    case_number = 0
+
+    for grid_combination in itertools.product(*grid_values.values()):
+        row_values = dict(zip(grid_values.keys(), grid_combination))
+
+        for start_availability_dialog_value in start_availability_dialog_values:
+            Company_net_content = row_values["Company Net Content"]
+
+            if Company_net_content and len(Company_net_content) <= 9:
+                Company_net_content_dialog_value = Company_net_content
+            else:
+                Company_net_content_dialog_value = Company_net_content_dialog_values[
+                    case_number % len(Company_net_content_dialog_values)]
+
+            case_number += 1
+
+            yield row_values, {"Start Availability Date Time": start_availability_dialog_value,
+                               "Company Net Content": Company_net_content_dialog_value}
+
+
+def run_baseline_review(fake_page):
+
+    baseline_namespace = vars(baseline_review_product)
+    baseline_namespace.update(fake_page.get_baseline_functions())
+    baseline_namespace.update(
+        freeze_event=threading.Event(), grid_data_records={}, grid_data_stats={"grid_data": 0, "cells": 0},
+        items_reviewed_counter=0, items_fixed_counter=0, errors_fixed_counter=0, reviewed=[], fixed=[],
+        check_lui_maingrid_click=lambda driver, reload_kind=None: True,
+        normalize_grid_datetime=pim_data_cleanup.normalize_grid_datetime,
+        is_net_content_blank=pim_data_cleanup.is_net_content_blank,
+        is_Company_net_content_valid=pim_data_cleanup.is_Company_net_content_valid)
+
+    for function_name in ["is_manufacturer_number_valid", "is_start_availability_valid",
+                          "doublecheck_start_availability", "is_master_gtin_valid", "calculate_manufacturer_number",
+                          "calculate_master_gtin"]:
+        baseline_namespace[function_name] = getattr(pim_data_cleanup, function_name)
+
+    review_result = baseline_review_product.review_product(None, "row_1", "100001")
+
+    return (review_result, fake_page.writes, baseline_namespace["reviewed"], baseline_namespace["fixed"],
+            baseline_namespace["errors_fixed_counter"])
+
+
+def run_current_review(fake_page, monkeypatch):
+
+    run_recorder = pim_data_cleanup.RunRecorder(pim_data_cleanup.reviewed_header, pim_data_cleanup.fixed_header)
+
+    monkeypatch.setattr(pim_data_cleanup, "run_recorder", run_recorder)
+    monkeypatch.setattr(pim_data_cleanup, "audit_store", None)
+    monkeypatch.setattr(pim_data_cleanup, "freeze_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "grid_data_records", {})
+    monkeypatch.setattr(pim_data_cleanup, "get_attribute_value", fake_page.get_attribute_value)
+    monkeypatch.setattr(pim_data_cleanup, "read_attribute_dialog", fake_page.read_attribute_dialog)
+    monkeypatch.setattr(pim_data_cleanup, "click_attribute", fake_page.click_attribute)
+    monkeypatch.setattr(pim_data_cleanup, "update_attribute_value", fake_page.update_attribute_value)
+    monkeypatch.setattr(pim_data_cleanup, "check_lui_maingrid_click", lambda driver, reload_kind=None: True)
+
+    review_result = pim_data_cleanup.review_product(None, "row_1", "100001")
+    run_snapshot = run_recorder.get_snapshot()
+
+    # Flatten the rows the way the previous version kept them
+    return (review_result, fake_page.writes, [value for row in run_snapshot["reviewed"][1:] for value in row],
+            [value for row in run_snapshot["fixed"][1:] for value in row], run_snapshot["errors_fixed"])
+
+
+def test_review_product_matches_baseline(monkeypatch):
+
+    logging.disable(logging.CRITICAL)
+    case_count = 0
+    uncorrectable_count = 0
+    mismatches = []
+
+    try:
+        for row_values, dialog_values in generate_cases():
+            case_count += 1
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                baseline_result = run_baseline_review(FakePimPage(row_values, dialog_values))
+                current_result = run_current_review(FakePimPage(row_values, dialog_values), monkeypatch)
+
+            Company_net_content_uncorrectable = (
+                not pim_data_cleanup.is_Company_net_content_valid(row_values["Company Net Content"] or
+                                                                  "blank_in_main_grid") and
+                dialog_values["Company Net Content"] in uncorrectable_Company_net_contents)
+
+            if Company_net_content_uncorrectable:
+                # The previous version failed on the update, the current one leaves the value as is
+                uncorrectable_count += 1
+                assert baseline_result[0] == "error"
+                assert current_result[0] != "error"
+                assert "Company Net Content" not in current_result[0]
+                assert ("Company Net Content", None) not in current_result[1]
+                continue
+
+            if baseline_result != current_result:
+                mismatches.append((row_values, dialog_values, baseline_result, current_result))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert case_count == 2592
+    assert uncorrectable_count > 0
+    assert mismatches == []
@@ -0,0 +1,62 @@
+"""
+Tests for the RunRecorder row listeners and flush timeouts.
+"""
+
+import contextlib
+import io
+import logging
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def test_row_listeners_run_without_the_state_lock():
+
+    run_recorder = pim_data_cleanup.RunRecorder(["Company Product Number"], ["Company Product Number"])
+    lock_held_by_listener = []
+
+    def row_listener(table_name, row):
+        lock_held_by_listener.append(run_recorder.state_lock.locked())
+
+        # A reader can take the lock while a listener is still running
+        with run_recorder.state_lock:
+            pass
+
+    run_recorder.add_row_listener(row_listener)
+    run_recorder.record_reviewed(["100001"])
+    run_recorder.record_error_fixed()
+    run_recorder.record_fixed(["100001"])
+
+    assert run_recorder.get_counts() == (1, 1, 1)
+    assert lock_held_by_listener == [False, False]
+
+
+def test_failing_row_listener_doesnt_stop_the_writer():
+
+    run_recorder = pim_data_cleanup.RunRecorder(["Company Product Number"], ["Company Product Number"])
+
+    def row_listener(table_name, row):
+        raise OSError("disk full")
+
+    run_recorder.add_row_listener(row_listener)
+
+    logging.disable(logging.CRITICAL)
+    try:
+        run_recorder.record_reviewed(["100001"])
+        run_recorder.record_reviewed(["100002"])
+        assert run_recorder.flush(timeout=5)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert run_recorder.get_counts() == (2, 0, 0)
+
+
+def test_flush_timeout_is_reported(caplog, monkeypatch):
+
+    run_recorder = pim_data_cleanup.RunRecorder(["Company Product Number"], ["Company Product Number"])
+    monkeypatch.setattr(run_recorder, "flush", lambda timeout=10: False)
+
+    with contextlib.redirect_stdout(io.StringIO()) as console_output:
+        run_recorder.get_snapshot()
+
+    assert "get_snapshot" in console_output.getvalue()
+    assert "flush timed out in get_snapshot" in caplog.text
@@ -0,0 +1,110 @@
+"""
+Tests for SeenProductNumbers and for the full view walk re-reading a page whose rows moved after a correction.
+"""
+
+import contextlib
+import io
+import logging
+import threading
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def test_add_and_contains():
+
+    seen_products = pim_data_cleanup.SeenProductNumbers()
+
+    for product_number in ["100001", "0", "row_id:grid_row_17", "12345678901234567890", "ABC-100"]:
+        assert product_number not in seen_products
+        seen_products.add(product_number)
+        assert product_number in seen_products
+
+    # Adding a product again doesn't count it twice
+    seen_products.add("100001")
+    assert len(seen_products) == 5
+
+    # Leading zeros and hashed keys don't collide with the numeric keys
+    assert "0100001" not in seen_products
+    assert "100002" not in seen_products
+    assert "row_id:grid_row_18" not in seen_products
+
+
+def test_keys_survive_merging_into_the_sorted_array():
+
+    seen_products = pim_data_cleanup.SeenProductNumbers()
+
+    # Enough products to merge the buffer into the sorted array, with the non-numeric keys mixed in
+    product_numbers = [str(10000000 + number * 7) for number in range(9000)] + ["row_id:" + str(number)
+                                                                                 for number in range(50)]
+    for product_number in product_numbers:
+        seen_products.add(product_number)
+
+    assert len(seen_products.sorted_keys) > 0
+    assert len(seen_products) == len(product_numbers)
+    assert all(product_number in seen_products for product_number in product_numbers)
+    assert not any(str(10000000 + number * 7 + 1) in seen_products for number in range(9000))
+
+
+class FakeViewGrid:
+    """
+    The main grid of a view, three records per page, sorted so a corrected product moves to the end of the view.
+    """
+
+    def __init__(self, product_numbers, products_to_fix):
+        self.view = list(product_numbers)
+        self.products_to_fix = set(products_to_fix)
+        self.reviewed = []
+        self.page = 1
+
+    def parse_paging_info(self, driver):
+        first_record = (self.page - 1) * 3 + 1
+        last_record = min(self.page * 3, len(self.view))
+        return ["View", str(first_record), "-", str(last_record), "of", str(len(self.view))]
+
+    def read_page_snapshot(self, driver):
+        page_rows = self.view[(self.page - 1) * 3:self.page * 3]
+        return [(row_number, "row_" + product, product) for row_number, product in enumerate(page_rows, 1)]
+
+    def navigate_to_nextpage(self, driver, current_page):
+        self.page = current_page + 1
+        return True
+
+    def process_product(self, driver, row_id, product_number):
+        self.reviewed.append(product_number)
+
+        if product_number not in self.products_to_fix:
+            return []
+
+        # Saving the correction reloads the grid with the product at the end of the view
+        self.products_to_fix.discard(product_number)
+        self.view.remove(product_number)
+        self.view.append(product_number)
+        return ["Net Content"]
+
+
+def test_full_view_walk_reviews_moved_products_once(monkeypatch):
+
+    fake_grid = FakeViewGrid(["100001", "100002", "100003", "100004", "100005", "100006", "100007"],
+                             ["100001", "100005"])
+
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 3)
+    monkeypatch.setattr(pim_data_cleanup, "start_page", 1)
+    monkeypatch.setattr(pim_data_cleanup, "freeze_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "shutdown_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "product_failure_counts", {})
+    monkeypatch.setattr(pim_data_cleanup, "supervise_browser_session", lambda driver: "ok")
+    monkeypatch.setattr(pim_data_cleanup, "check_lui_maingrid", lambda driver: True)
+
+    for function_name in ["parse_paging_info", "read_page_snapshot", "navigate_to_nextpage", "process_product"]:
+        monkeypatch.setattr(pim_data_cleanup, function_name, getattr(fake_grid, function_name))
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pim_data_cleanup.run_full_view_walk(None)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    # 100002 slides onto row 1 of page 1 after the first correction, and the corrected products show up again on the
+    # last page without being reviewed twice
+    assert fake_grid.reviewed == ["100001", "100002", "100003", "100004", "100005", "100006", "100007"]
@@ -0,0 +1,66 @@
+"""
+Tests for the session supervisor's driver swap and heartbeat schedule.
+"""
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+class FakeService:
+
+    def __init__(self):
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakeDriver:
+
+    def __init__(self, session_id):
+        self.command_executor = "executor_" + session_id
+        self.session_id = session_id
+        self.service = FakeService()
+        self.caps = {}
+        self.scripts_run = 0
+
+    def execute_script(self, script):
+        self.scripts_run += 1
+        return 1
+
+
+def test_swap_stops_the_old_chromedriver(monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "attach_webdriver", lambda: FakeDriver("new"))
+
+    web_driver = FakeDriver("old")
+    old_service = web_driver.service
+
+    pim_data_cleanup.swap_webdriver_session(web_driver)
+
+    assert old_service.stopped
+    assert web_driver.session_id == "new"
+    assert web_driver.command_executor == "executor_new"
+    assert not web_driver.service.stopped
+
+
+def test_heartbeat_only_runs_when_due(monkeypatch):
+
+    monkeypatch.setattr(pim_data_cleanup, "heartbeat_due", True)
+    monkeypatch.setattr(pim_data_cleanup, "heartbeat_interval_seconds", 3600)
+    monkeypatch.setattr(pim_data_cleanup, "is_tab_recycle_due", lambda web_driver: False)
+    monkeypatch.setattr(pim_data_cleanup, "recover_browser_state", lambda web_driver: None)
+    monkeypatch.setattr(pim_data_cleanup, "flash_window", lambda: None)
+    monkeypatch.setattr(pim_data_cleanup, "number_of_hiccups", 0)
+    monkeypatch.setattr(pim_data_cleanup, "recent_hiccup_times", pim_data_cleanup.collections.deque())
+
+    web_driver = FakeDriver("session")
+
+    for iteration in range(5):
+        assert pim_data_cleanup.supervise_browser_session(web_driver) == "ok"
+    assert web_driver.scripts_run == 1
+
+    # A hiccup asks for a heartbeat at the next check
+    pim_data_cleanup.report_hiccup(web_driver)
+    assert pim_data_cleanup.supervise_browser_session(web_driver) == "ok"
+    assert pim_data_cleanup.supervise_browser_session(web_driver) == "ok"
+    assert web_driver.scripts_run == 2
@@ -0,0 +1,84 @@
+"""
+Tests for the shutdown controller: the signal handlers only set the events, and the shutdown watcher does the saving.
+"""
+
+import contextlib
+import io
+import logging
+import threading
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+def set_up_shutdown_state(monkeypatch, saves):
+
+    monkeypatch.setattr(pim_data_cleanup, "shutdown_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "force_shutdown_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "freeze_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "shutdown_reasons", [])
+
+    def record_forced_save():
+        saves.append(threading.current_thread())
+        pim_data_cleanup.freeze_event.set()
+
+    monkeypatch.setattr(pim_data_cleanup, "force_shutdown", record_forced_save)
+
+
+def test_requests_only_set_the_events(monkeypatch):
+
+    saves = []
+    set_up_shutdown_state(monkeypatch, saves)
+
+    pim_data_cleanup.request_shutdown("SIGINT")
+    assert pim_data_cleanup.shutdown_event.is_set()
+    assert not pim_data_cleanup.force_shutdown_event.is_set()
+
+    pim_data_cleanup.request_shutdown("SIGTERM")
+    assert pim_data_cleanup.force_shutdown_event.is_set()
+    assert pim_data_cleanup.shutdown_reasons == ["SIGINT", "SIGTERM"]
+    assert saves == []
+
+
+def test_watcher_saves_after_a_second_request(monkeypatch):
+
+    saves = []
+    set_up_shutdown_state(monkeypatch, saves)
+    monkeypatch.setattr(pim_data_cleanup, "shutdown_grace_seconds", 3600)
+
+    pim_data_cleanup.request_shutdown("SIGINT")
+    pim_data_cleanup.request_shutdown("SIGINT")
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            watcher_thread = threading.Thread(target=pim_data_cleanup.watch_shutdown_requests)
+            watcher_thread.start()
+            watcher_thread.join(10)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert not watcher_thread.is_alive()
+    assert saves == [watcher_thread]
+
+
+def test_watcher_leaves_the_save_to_the_main_thread(monkeypatch):
+
+    saves = []
+    set_up_shutdown_state(monkeypatch, saves)
+
+    pim_data_cleanup.request_shutdown("Alt+C hotkey")
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            watcher_thread = threading.Thread(target=pim_data_cleanup.watch_shutdown_requests)
+            watcher_thread.start()
+
+            # The main program loop finished the product and saved the activity files
+            pim_data_cleanup.freeze_event.set()
+            watcher_thread.join(10)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert not watcher_thread.is_alive()
+    assert saves == []
@@ -0,0 +1,167 @@
+"""
+Parity tests for the validators and calculators which stopped using int() to check for numbers.  The new functions are
+run over generated values next to the previous ones (baseline_validators.py), and the only differences allowed are
+the int() quirks documented on is_digit_string: surrounding whitespace, signs, underscores, and non-ASCII digits.
+"""
+
+import itertools
+import logging
+import random
+
+import pytest
+
+import baseline_validators
+from pim_data_cleanup import pim_data_cleanup
+
+
+# The functions which were rewritten, by name in both modules
+parity_function_names = ["is_manufacturer_number_valid", "is_master_gtin_valid", "calculate_manufacturer_number",
+                         "calculate_master_gtin", "is_start_availability_valid", "doublecheck_start_availability"]
+
+# Characters int() accepts around or between digits, and non-ASCII digits it converts
+int_quirk_characters = [" ", "\t", "\n", "+", "-", "_", "٣", "１", "²"]
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    # Both versions log the values they can't parse, which would flood the output
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def is_int_quirk(value):
+    """
+    True if int() accepts the value even though it isn't a plain ASCII digit string.
+    """
+
+    try:
+        int(value)
+    except (TypeError, ValueError):
+        return False
+
+    return not (value.isdigit() and value.isascii())
+
+
+def get_year_segment(value):
+    date = value.split(' ')[0]
+    date_parsed = date.split('/')
+    return date_parsed[2] if len(date) == 10 and len(date_parsed) >= 3 else None
+
+
+def generate_number_values():
+    """
+    Digit strings of every length up to 16, with and without the characters int() treats specially, plus blanks.
+    """
+
+    number_values = ["", "blank_in_main_grid", "-1", "0", "not a number", "1.5", "12a456", "0001234567890X"]
+    random_values = random.Random(39)
+
+    for length in range(17):
+        for repeat in range(40):
+            digits = "".join(random_values.choice("0123456789") for position in range(length))
+            number_values.append(digits)
+
+            for quirk_character in int_quirk_characters + ["a", ".", "/"]:
+                position = random_values.randint(0, length)
+                number_values.append(digits[:position] + quirk_character + digits[position:])
+
+            number_values.append(" " + digits + " ")
+            number_values.append("+" + digits)
+
+    return number_values
+
+
+def generate_date_values():
+    """
+    Start availability date times in the dialog format, with years on both sides of 1982, malformed dates, and the
+    int() quirks in the year.
+    """
+
+    date_values = ["", "blank_in_main_grid", "02/06/2018 00:00:01", "2018-02-06T00:00:01", "0206201800", "2/6/2018",
+                   "02/06/2018", "02/06/18 00:00:00", "02-06-2018 00:00:00", "02/06/2018/ 00:00:00", "//////////"]
+
+    for month, day, year in itertools.product(["1", "01", "12"], ["1", "06", "31"],
+                                             ["0007", "1981", "1982", "2023", "9999", "198", "19821", "20x3"]):
+        for time_part in ["", " 00:00:01", " 12:00:00 AM"]:
+            date_values.append(month + "/" + day + "/" + year + time_part)
+
+    for year in ["1999", "2001", "1950"]:
+        for quirk_character in int_quirk_characters:
+            for quirk_year in [quirk_character + year[1:], year[:3] + quirk_character, year[:2] + quirk_character +
+                               year[3:]]:
+                date_values.append("01/01/" + quirk_year + " 00:00:00")
+                date_values.append("1/01/" + year[:2] + "_" + year[2:] + " 00:00:00")
+
+    # Non-ASCII digit years which keep the date 10 characters long
+    date_values.append("01/01/２００１ 00:00:00")
+    date_values.append("01/01/١٩٩٩")
+
+    return date_values
+
+
+@pytest.mark.parametrize("function_name", parity_function_names)
+def test_parity_with_baseline(function_name):
+
+    baseline_function = getattr(baseline_validators, function_name)
+    new_function = getattr(pim_data_cleanup, function_name)
+
+    if "start_availability" in function_name:
+        test_values = generate_date_values()
+        quirk_check = lambda value: value is not None and get_year_segment(value) is not None and \
+            is_int_quirk(get_year_segment(value))
+    else:
+        test_values = generate_number_values()
+        quirk_check = is_int_quirk
+
+    mismatches = []
+
+    for test_value in test_values + [None] * ("calculate" not in function_name):
+        if baseline_function(test_value) != new_function(test_value) and not quirk_check(test_value):
+            mismatches.append((test_value, baseline_function(test_value), new_function(test_value)))
+
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("test_value", [" 123456", "123456 ", "+123456", "123_456", "١٢٣٤٥٦",
+                                        "１２３４５６"])
+def test_manufacturer_number_int_quirks_are_invalid(test_value):
+
+    assert baseline_validators.is_manufacturer_number_valid(test_value) is True
+    assert pim_data_cleanup.is_manufacturer_number_valid(test_value) is False
+
+
+@pytest.mark.parametrize("test_value", [" 1234567890123", "1234567890123 ", "+1234567890123", "123456789012_3",
+                                        "١" * 14])
+def test_master_gtin_int_quirks_are_invalid(test_value):
+
+    assert baseline_validators.is_master_gtin_valid(test_value) is True
+    assert pim_data_cleanup.is_master_gtin_valid(test_value) is False
+
+
+@pytest.mark.parametrize("test_value, baseline_result, new_result", [
+    (" 12345", "", "not_a_number"),
+    ("+12345", "", "not_a_number"),
+    ("12_345", "", "not_a_number"),
+    ("١٢٣٤٥٦", "", "not_a_number"),
+])
+def test_manufacturer_number_calculation_int_quirks(test_value, baseline_result, new_result):
+
+    assert baseline_validators.calculate_manufacturer_number(test_value) == baseline_result
+    assert pim_data_cleanup.calculate_manufacturer_number(test_value) == new_result
+
+
+@pytest.mark.parametrize("test_value", ["01/1/1_999 00:00:00", "01/01/２００１ 00:00:00",
+                                        "01/01/١٩٩٩"])
+def test_start_availability_int_quirk_years_are_invalid(test_value):
+
+    for function_name in ["is_start_availability_valid", "doublecheck_start_availability"]:
+        assert getattr(baseline_validators, function_name)(test_value) is True
+        assert getattr(pim_data_cleanup, function_name)(test_value) is False
+
+
+def test_missing_slashes_are_still_errors():
+
+    for function_name in ["is_start_availability_valid", "doublecheck_start_availability"]:
+        assert getattr(baseline_validators, function_name)("0206201800") == "error"
+        assert getattr(pim_data_cleanup, function_name)("0206201800") == "error"
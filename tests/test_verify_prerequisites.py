@@ -0,0 +1,117 @@
+"""
+Tests for verify_prerequisites against a fake driver and fake selectors.
+"""
+
+import contextlib
+import io
+import logging
+
+from selenium.common.exceptions import ElementClickInterceptedException
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+class FakeElement:
+
+    def __init__(self, text="", click_error=None):
+        self.text = text
+        self.click_error = click_error
+        self.click_count = 0
+
+    def click(self):
+        if self.click_error:
+            raise self.click_error
+        self.click_count += 1
+
+
+class FakeSwitchTo:
+
+    def default_content(self):
+        pass
+
+
+class FakeDriver:
+
+    def __init__(self, active_repo_name, repo_tab):
+        self.active_repo_name = active_repo_name
+        self.repo_tab = repo_tab
+        self.switch_to = FakeSwitchTo()
+
+    def find_element(self, by, xpath):
+        if "aria-selected" in xpath:
+            return FakeElement(self.active_repo_name)
+        return self.repo_tab
+
+
+class FakeSelect:
+    """
+    Stands in for selenium's Select: the view preference selector first, then the records per page selector.
+    """
+
+    def __init__(self, selected_text, option_texts):
+        self.first_selected_option = FakeElement(selected_text)
+        self.options = [FakeElement(option_text) for option_text in option_texts]
+        self.selections = []
+
+    def select_by_visible_text(self, text):
+        self.selections.append(text)
+        self.first_selected_option = FakeElement(text)
+
+
+def patch_grid(monkeypatch, selects, grid_checks):
+    monkeypatch.setattr(pim_data_cleanup, "Select", lambda element: selects.pop(0))
+    monkeypatch.setattr(pim_data_cleanup, "switch_to_maingrid_iframe", lambda driver: True)
+    monkeypatch.setattr(pim_data_cleanup, "check_lui_maingrid", lambda driver: grid_checks.append(driver) or True)
+    monkeypatch.setattr(pim_data_cleanup, "check_lui_maingrid_click", lambda driver: True)
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 0)
+
+
+def test_unclickable_repo_tab_returns_false(monkeypatch):
+    grid_checks = []
+    patch_grid(monkeypatch, [], grid_checks)
+    repo_tab = FakeElement(click_error=ElementClickInterceptedException("covered"))
+    driver = FakeDriver("Other Repo", repo_tab)
+
+    output = io.StringIO()
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(output):
+            assert pim_data_cleanup.verify_prerequisites(driver) is False
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert "Error::" in output.getvalue()
+    assert grid_checks == []
+
+
+def test_repo_tab_switch_waits_for_the_grid(monkeypatch):
+    grid_checks = []
+    selects = [FakeSelect(pim_data_cleanup.required_view_preference, []),
+               FakeSelect(pim_data_cleanup.required_records_per_page, [pim_data_cleanup.required_records_per_page])]
+    patch_grid(monkeypatch, selects, grid_checks)
+    repo_tab = FakeElement()
+    driver = FakeDriver("Other Repo", repo_tab)
+
+    assert pim_data_cleanup.verify_prerequisites(driver) is True
+    assert repo_tab.click_count == 1
+    assert grid_checks == [driver]
+
+
+def test_largest_page_size_leaves_the_required_size_alone(monkeypatch):
+    grid_checks = []
+    records_per_page_select = FakeSelect("50", ["25", "50", "100", "All"])
+    selects = [FakeSelect(pim_data_cleanup.required_view_preference, []), records_per_page_select]
+    patch_grid(monkeypatch, selects, grid_checks)
+    monkeypatch.setattr(pim_data_cleanup, "use_largest_page_size", True)
+    monkeypatch.setattr(pim_data_cleanup, "required_records_per_page", "50")
+    driver = FakeDriver(pim_data_cleanup.required_repo_name, FakeElement())
+
+    logging.disable(logging.CRITICAL)
+    try:
+        assert pim_data_cleanup.verify_prerequisites(driver) is True
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert records_per_page_select.selections == ["100"]
+    assert pim_data_cleanup.records_per_page == 100
+    assert pim_data_cleanup.required_records_per_page == "50"
@@ -0,0 +1,140 @@
+"""
+Tests for reading work list files and for run_work_list against a fake PIM search which only finds some of the
+product numbers.
+"""
+
+import contextlib
+import io
+import logging
+import threading
+
+from pim_data_cleanup import pim_data_cleanup
+
+
+class FakeProductSearch:
+    """
+    PIM search over a catalog, two records per page.  The search results come back in catalog order, not in the order
+    of the "Is One Of" values.  failing_reviews lists products whose first review fails.
+    """
+
+    def __init__(self, catalog, failing_reviews=()):
+        self.catalog = list(catalog)
+        self.failing_reviews = set(failing_reviews)
+        self.results = []
+        self.searches = []
+        self.reviewed = []
+        self.page = 1
+
+    def apply_search_criteria(self, driver, criteria):
+        attribute_name, operator, search_value = criteria[0]
+        search_numbers = search_value.split(",")
+        self.searches.append(search_numbers)
+        self.results = [product for product in self.catalog if product in search_numbers]
+        self.page = 1
+        return True
+
+    def parse_paging_info(self, driver):
+        if not self.results:
+            return 'No records to view'
+        first_record = (self.page - 1) * 2 + 1
+        last_record = min(self.page * 2, len(self.results))
+        return ["View", str(first_record), "-", str(last_record), "of", str(len(self.results))]
+
+    def read_page_snapshot(self, driver):
+        page_rows = self.results[(self.page - 1) * 2:self.page * 2]
+        return [(row_number, "row_" + product, product) for row_number, product in enumerate(page_rows, 1)]
+
+    def navigate_to_nextpage(self, driver, current_page):
+        self.page = current_page + 1
+        return True
+
+    def process_product(self, driver, row_id, product_number):
+        if product_number in self.failing_reviews:
+            self.failing_reviews.discard(product_number)
+            return "error"
+        self.reviewed.append(product_number)
+        return ["Net Content"] if product_number.endswith("1") else []
+
+
+def run_fake_work_list(monkeypatch, fake_search, product_numbers):
+
+    saved_reports = []
+
+    monkeypatch.setattr(pim_data_cleanup, "records_per_page", 2)
+    monkeypatch.setattr(pim_data_cleanup, "work_list_batch_size", 3)
+    monkeypatch.setattr(pim_data_cleanup, "freeze_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "shutdown_event", threading.Event())
+    monkeypatch.setattr(pim_data_cleanup, "work_list_remaining", [])
+    monkeypatch.setattr(pim_data_cleanup, "product_failure_counts", {})
+    monkeypatch.setattr(pim_data_cleanup, "supervise_browser_session", lambda driver: "ok")
+    monkeypatch.setattr(pim_data_cleanup, "check_lui_maingrid", lambda driver: True)
+    monkeypatch.setattr(pim_data_cleanup, "report_hiccup", lambda driver, product_identity=None: False)
+    monkeypatch.setattr(pim_data_cleanup, "save_product_number_report",
+                        lambda report_numbers, report_name: saved_reports.append((report_name, list(report_numbers))))
+
+    for function_name in ["apply_search_criteria", "parse_paging_info", "read_page_snapshot", "navigate_to_nextpage",
+                          "process_product"]:
+        monkeypatch.setattr(pim_data_cleanup, function_name, getattr(fake_search, function_name))
+
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            not_found = pim_data_cleanup.run_work_list(None, product_numbers)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return not_found, saved_reports
+
+
+def test_load_work_list_cleans_up_the_file(tmp_path):
+
+    work_list_path = tmp_path / "work_list.csv"
+    work_list_path.write_text('Company Product Number,Original Net Content\r\n'
+                              '100001,-1\r\n'
+                              '\r\n'
+                              '  100002  \r\n'
+                              '"100003",12\r\n'
+                              '100001\r\n'
+                              '   \r\n'
+                              '100004')
+
+    assert pim_data_cleanup.load_work_list(str(work_list_path)) == ["100001", "100002", "100003", "100004"]
+
+
+def test_load_work_list_missing_file(tmp_path):
+
+    logging.disable(logging.CRITICAL)
+    try:
+        assert pim_data_cleanup.load_work_list(str(tmp_path / "missing.csv")) == "error"
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def test_products_missing_from_the_search_are_reported(monkeypatch):
+
+    # 100003 and 100005 aren't in the catalog, and neither is any product of the third batch
+    fake_search = FakeProductSearch(["100006", "100004", "100002", "100001"])
+    product_numbers = ["100001", "100002", "100003", "100004", "100005", "100006", "100007", "100008", "100009"]
+
+    not_found, saved_reports = run_fake_work_list(monkeypatch, fake_search, product_numbers)
+
+    assert not_found == ["100003", "100005", "100007", "100008", "100009"]
+    assert saved_reports == [("not_found", not_found)]
+    assert sorted(fake_search.reviewed) == ["100001", "100002", "100004", "100006"]
+    assert fake_search.searches == [["100001", "100002", "100003"], ["100004", "100005", "100006"],
+                                    ["100007", "100008", "100009"]]
+    assert pim_data_cleanup.work_list_remaining == []
+
+
+def test_hiccup_searches_again_for_the_pending_products(monkeypatch):
+
+    fake_search = FakeProductSearch(["100001", "100002", "100003", "100004"], failing_reviews=["100002"])
+
+    not_found, saved_reports = run_fake_work_list(monkeypatch, fake_search, ["100001", "100002", "100003", "100004"])
+
+    assert not_found == []
+    assert saved_reports == []
+    assert fake_search.reviewed == ["100001", "100002", "100003", "100004"]
+
+    # The failed review re-runs the search without the product already reviewed
+    assert fake_search.searches == [["100001", "100002", "100003"], ["100002", "100003"], ["100004"]]